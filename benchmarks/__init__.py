@@ -0,0 +1,17 @@
+"""
+Benchmarks of the hot paths of connexion.
+
+Each benchmark times one piece of the request pipeline in isolation (parameter
+and body validation, URI parsing, argument passing, JSON serialization, spec
+loading) or a whole request through the test client of the Flask and aiohttp
+apps, using the specs of `tests/fixtures`::
+
+    $ python -m benchmarks run -o before.json
+    $ git checkout my-branch
+    $ python -m benchmarks run -o after.json
+    $ python -m benchmarks compare before.json after.json
+
+`python -m benchmarks run 'flask.*'` only runs the matching benchmarks.
+`python -m benchmarks overload` simulates an overloaded operation and compares
+the goodput of the concurrency limiters.
+"""
@@ -0,0 +1,144 @@
+import sys
+
+import click
+
+from . import memory, overload, runner, stats, validators
+
+CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
+
+
+def format_duration(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if seconds * scale >= 1:
+            return '{:.2f} {}'.format(seconds * scale, unit)
+    return '{:.0f} ns'.format(seconds * 1e9)
+
+
+@click.group(context_settings=CONTEXT_SETTINGS)
+def main():
+    pass
+
+
+@main.command('list')
+@click.argument('patterns', nargs=-1)
+def list_benchmarks(patterns):
+    """
+    List the benchmarks matching the glob PATTERNS (all by default).
+    """
+    for bench in runner.get_benchmarks(patterns):
+        click.echo(bench.name)
+
+
+@main.command()
+@click.argument('patterns', nargs=-1)
+@click.option('--output', '-o', type=click.Path(dir_okay=False, writable=True),
+              help='Write the results as JSON to this file.')
+@click.option('--samples', '-n', type=click.IntRange(2), default=20, show_default=True,
+              help='Number of samples per benchmark.')
+@click.option('--warmups', type=click.IntRange(0), default=1, show_default=True,
+              help='Number of samples run before recording.')
+@click.option('--min-time', type=float, default=0.1, show_default=True,
+              help='Minimum duration of one sample in seconds.')
+@click.option('--loops', type=click.IntRange(1), default=None,
+              help='Calls per sample instead of calibrating them.')
+def run(patterns, output, samples, warmups, min_time, loops):
+    """
+    Run the benchmarks matching the glob PATTERNS (all by default).
+    """
+    benchmarks = runner.get_benchmarks(patterns)
+    if not benchmarks:
+        raise click.UsageError('No benchmark matches {}'.format(' '.join(patterns)))
+
+    def progress(name, result):
+        click.echo('{:<45} {:>12} +- {:>10} ({} loops)'.format(
+            name, format_duration(result['median']), format_duration(result['stdev']), result['loops']))
+
+    results = runner.run(benchmarks, samples=samples, warmups=warmups, min_time=min_time, loops=loops,
+                         progress=progress)
+    if output:
+        runner.save_results(results, output)
+
+
+@main.command()
+@click.argument('base', type=click.Path(exists=True, dir_okay=False))
+@click.argument('head', type=click.Path(exists=True, dir_okay=False))
+@click.option('--alpha', type=click.FloatRange(0, 1), default=0.05, show_default=True,
+              help='Significance level of the Mann-Whitney U test.')
+@click.option('--fail-above', type=float, default=None,
+              help='Exit with status 1 if a benchmark is significantly slower by more than this ratio, e.g. 1.1.')
+def compare(base, head, alpha, fail_above):
+    """
+    Compare the results of two runs, BASE being the reference.
+    """
+    comparison = stats.compare_results(runner.load_results(base), runner.load_results(head), alpha)
+    regressions = []
+    for name, result in comparison.items():
+        click.echo('{:<45} {:>12} -> {:>12} {:>6.2f}x  p={:.4f}  {}'.format(
+            name, format_duration(result['base']), format_duration(result['head']),
+            result['ratio'], result['p_value'], result['verdict']))
+        if fail_above is not None and result['verdict'] == stats.SLOWER and result['ratio'] > fail_above:
+            regressions.append(name)
+    if regressions:
+        click.echo('Significant regressions: {}'.format(', '.join(regressions)), err=True)
+        sys.exit(1)
+
+
+@main.command('overload')
+@click.option('--framework', '-f', 'frameworks', type=click.Choice(['flask', 'aiohttp']), multiple=True,
+              help='Framework to simulate, both by default.')
+@click.option('--limiter', '-l', 'limiters', type=click.Choice(sorted(overload.LIMITERS)), multiple=True,
+              help='Concurrency limiter to compare, all by default.')
+@click.option('--clients', type=click.IntRange(1), default=32, show_default=True,
+              help='Number of concurrent clients.')
+@click.option('--capacity', type=click.IntRange(1), default=4, show_default=True,
+              help='Requests served at once without slowing down.')
+@click.option('--latency', type=float, default=0.02, show_default=True,
+              help='Seconds a request takes without load.')
+@click.option('--timeout', type=float, default=0.1, show_default=True,
+              help='Seconds after which the clients give up on a response.')
+@click.option('--duration', type=float, default=5.0, show_default=True,
+              help='Seconds each simulation runs.')
+def simulate_overload(frameworks, limiters, clients, capacity, latency, timeout, duration):
+    """
+    Simulate an overloaded operation and compare the goodput of the concurrency limiters.
+    """
+    click.echo('capacity: {:.0f} requests/s'.format(capacity / latency))
+    for framework in frameworks or ('flask', 'aiohttp'):
+        for limiter in limiters or sorted(overload.LIMITERS):
+            result = overload.simulate(framework, limiter, clients=clients, capacity=capacity, latency=latency,
+                                       timeout=timeout, duration=duration)
+            click.echo('{:<8} {:<9} goodput {:>8.1f}/s  good {:>6}  late {:>6}  rejected {:>6}  limit {}'.format(
+                framework, limiter, result['goodput'], result['good'], result['late'], result['rejected'],
+                result['limit'] if result['limit'] is not None else '-'))
+
+
+@main.command('memory')
+@click.option('--framework', '-f', 'frameworks', type=click.Choice(['flask', 'aiohttp']), multiple=True,
+              help='Framework to measure, both by default.')
+@click.option('--size', type=float, default=50.0, show_default=True,
+              help='MB of JSON in the response.')
+def measure_memory(frameworks, size):
+    """
+    Measure the peak RSS of a large JSON response, buffered and sent in chunks.
+    """
+    for framework in frameworks or ('flask', 'aiohttp'):
+        for buffered in (True, False):
+            result = memory.run(framework, size=size, buffered=buffered)
+            click.echo('{:<8} {:<9} peak RSS +{:>8.1f} MB  ({:.1f} MB sent)'.format(
+                framework, 'buffered' if buffered else 'chunked', result['peak_rss'] / 1e6, result['size'] / 1e6))
+
+
+@main.command('validators')
+@click.option('--operations', type=click.IntRange(1), default=400, show_default=True,
+              help='Number of operations of the API.')
+def measure_validators(operations):
+    """
+    Measure the memory of the validators of an API, with one validator per operation and shared.
+    """
+    for mode, result in validators.run(operations).items():
+        click.echo('{:<9} {:>6} validators  {:>8.2f} MB allocated'.format(
+            mode, result['validators'], result['memory'] / 1e6))
+
+
+if __name__ == '__main__':  # pragma: no cover
+    main(prog_name='python -m benchmarks')
@@ -0,0 +1,132 @@
+"""
+End to end benchmarks through the in-process test clients of the apps.
+"""
+import asyncio
+import json
+import sys
+
+from connexion import App
+
+from .runner import benchmark
+from .specs import ARGUMENTS, EXAMPLES_FOLDER, FIXTURES_FOLDER
+
+try:
+    from aiohttp.test_utils import TestClient, TestServer
+    from connexion import AioHttpApp
+except ImportError:  # pragma: no cover
+    AioHttpApp = None
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover
+    uvloop = None
+
+HELLOWORLD_AIOHTTP_FOLDER = EXAMPLES_FOLDER / 'openapi3' / 'helloworld_aiohttp'
+# requests sent at once to measure the throughput of the server rather than the latency
+CONCURRENT_REQUESTS = 20
+
+
+def flask_client(folder, spec_file='openapi.yaml', **kwargs):
+    app = App(__name__, specification_dir=FIXTURES_FOLDER / folder)
+    app.add_api(spec_file, arguments=ARGUMENTS, **kwargs)
+    return app.app.test_client()
+
+
+def flask_request(client, method, url, status=200, **kwargs):
+    def call():
+        response = client.open(url, method=method, **kwargs)
+        if response.status_code != status:
+            raise RuntimeError('{} {} returned {}: {}'.format(method, url, response.status_code, response.data))
+    return call
+
+
+@benchmark('flask.post_path_param')
+def flask_post_path_param():
+    client = flask_client('simple')
+    yield flask_request(client, 'POST', '/v1.0/greeting/jsantos')
+
+
+@benchmark('flask.get_query_params')
+def flask_get_query_params():
+    client = flask_client('simple')
+    yield flask_request(client, 'GET', '/v1.0/test_parameter_validation?date=2020-09-23&int=123&bool=true')
+
+
+@benchmark('flask.get_array_query_param')
+def flask_get_array_query_param():
+    client = flask_client('simple')
+    yield flask_request(client, 'GET', '/v1.0/test_array_csv_query_param?items=squash,banana,apple')
+
+
+@benchmark('flask.post_json_body')
+def flask_post_json_body():
+    client = flask_client('json_validation', validate_responses=True)
+    body = json.dumps({'name': 'max', 'password': 'secret'})
+    yield flask_request(client, 'POST', '/v1.0/user', data=body, content_type='application/json')
+
+
+if AioHttpApp is not None:
+    async def aiohttp_client(folder, spec_file, **kwargs):
+        app = AioHttpApp(__name__, specification_dir=FIXTURES_FOLDER / folder)
+        app.add_api(spec_file, arguments=ARGUMENTS, **kwargs)
+        client = TestClient(TestServer(app.app))
+        await client.start_server()
+        return client
+
+    def aiohttp_request(client, method, url, status=200, **kwargs):
+        async def call():
+            response = await client.request(method, url, **kwargs)
+            body = await response.read()
+            if response.status != status:
+                raise RuntimeError('{} {} returned {}: {}'.format(method, url, response.status, body))
+        return call
+
+    @benchmark('aiohttp.get_path_param')
+    async def aiohttp_get_path_param():
+        client = await aiohttp_client('aiohttp', 'swagger_simple.yaml')
+        try:
+            yield aiohttp_request(client, 'GET', '/v1.0/bye/jsantos')
+        finally:
+            await client.close()
+
+    @benchmark('aiohttp.get_integer_path_param')
+    async def aiohttp_get_integer_path_param():
+        client = await aiohttp_client('aiohttp', 'openapi_simple.yaml', pythonic_params=True)
+        try:
+            yield aiohttp_request(client, 'GET', '/v1.0/pythonic/100')
+        finally:
+            await client.close()
+
+    @benchmark('aiohttp.get_array_query_param')
+    async def aiohttp_get_array_query_param():
+        client = await aiohttp_client('aiohttp', 'swagger_simple.yaml')
+        try:
+            yield aiohttp_request(client, 'GET', '/v1.0/aiohttp_query_parsing_array?query=a,b,c')
+        finally:
+            await client.close()
+
+    async def helloworld_aiohttp_client():
+        if str(HELLOWORLD_AIOHTTP_FOLDER) not in sys.path:
+            sys.path.insert(0, str(HELLOWORLD_AIOHTTP_FOLDER))
+        app = AioHttpApp(__name__, specification_dir=HELLOWORLD_AIOHTTP_FOLDER / 'openapi')
+        app.add_api('helloworld-api.yaml', arguments={'title': 'Hello World Example'})
+        client = TestClient(TestServer(app.app))
+        await client.start_server()
+        return client
+
+    def concurrent_requests(call):
+        async def call_concurrently():
+            await asyncio.gather(*(call() for _ in range(CONCURRENT_REQUESTS)))
+        return call_concurrently
+
+    async def helloworld_aiohttp():
+        client = await helloworld_aiohttp_client()
+        try:
+            yield concurrent_requests(aiohttp_request(client, 'POST', '/v1.0/greeting/dave'))
+        finally:
+            await client.close()
+
+    # the same benchmark on the default and on the uvloop event loop, as with AioHttpApp.run(use_uvloop=True)
+    benchmark('aiohttp.helloworld_concurrent')(helloworld_aiohttp)
+    if uvloop is not None:
+        benchmark('aiohttp.helloworld_concurrent_uvloop', loop_factory=uvloop.new_event_loop)(helloworld_aiohttp)
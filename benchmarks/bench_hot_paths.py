@@ -0,0 +1,126 @@
+"""
+Benchmarks of the hot paths of a request, each in isolation.
+"""
+import datetime
+import json
+import uuid
+
+from connexion.decorators.parameter import parameter_to_arg
+from connexion.decorators.uri_parsing import OpenAPIURIParser
+from connexion.decorators.validation import (ParameterValidator,
+                                             RequestBodyValidator)
+from connexion.jsonifier import JSONEncoder, Jsonifier
+from connexion.lifecycle import ConnexionRequest
+from connexion.spec import Specification
+
+from .runner import benchmark
+from .specs import ARGUMENTS, get_operation, get_spec_path, load_spec
+
+
+def make_request(url, method='GET', path_params=None, query=None, headers=None, body=None):
+    data = json.dumps(body).encode() if body is not None else b''
+    return ConnexionRequest(url, method,
+                            path_params=path_params,
+                            query=query,
+                            headers=headers,
+                            body=data,
+                            json_getter=lambda: body,
+                            files={})
+
+
+def handler(request):
+    return request
+
+
+@benchmark('parameter_validator.query')
+def parameter_validator_query():
+    operation = get_operation(load_spec('simple'), '/test_parameter_validation', 'get')
+    validate = ParameterValidator(operation.parameters, api=None)(handler)
+    request = make_request('/v1.0/test_parameter_validation',
+                           query={'date': '2020-09-23', 'int': '123', 'bool': 'true'})
+    yield lambda: validate(request)
+
+
+@benchmark('parameter_validator.path_strict')
+def parameter_validator_path_strict():
+    operation = get_operation(load_spec('simple'), '/test-array-in-path/{names}', 'get')
+    validate = ParameterValidator(operation.parameters, api=None, strict_validation=True)(handler)
+    request = make_request('/v1.0/test-array-in-path/one,two,three',
+                           path_params={'names': ['one', 'two', 'three']})
+    yield lambda: validate(request)
+
+
+@benchmark('request_body_validator.object')
+def request_body_validator_object():
+    operation = get_operation(load_spec('json_validation'), '/user', 'post')
+    validate = RequestBodyValidator(operation.body_schema, operation.consumes, api=None)(handler)
+    request = make_request('/v1.0/user', 'POST',
+                           headers={'Content-Type': 'application/json'},
+                           body={'name': 'max', 'password': 'secret'})
+    yield lambda: validate(request)
+
+
+@benchmark('uri_parser.resolve_query')
+def uri_parser_resolve_query():
+    operation = get_operation(load_spec('simple'), '/test_array_csv_query_param', 'get')
+    parser = OpenAPIURIParser(operation.parameters, operation.body_definition)
+    query = {'items': ['squash,banana,apple,pear'], 'other': ['1']}
+    yield lambda: parser.resolve_query(query)
+
+
+@benchmark('uri_parser.resolve_query_deep_object')
+def uri_parser_resolve_query_deep_object():
+    operation = get_operation(load_spec('simple'), '/exploded-deep-object-param', 'get')
+    parser = OpenAPIURIParser(operation.parameters, operation.body_definition)
+    query = {'id[foo]': ['bar'], 'id[fooint]': ['2'], 'id[fooboo]': ['false']}
+    yield lambda: parser.resolve_query(query)
+
+
+@benchmark('parameter_to_arg.query')
+def parameter_to_arg_query():
+    operation = get_operation(load_spec('simple'), '/test_array_csv_query_param', 'get')
+    call = parameter_to_arg(operation, operation._resolution.function)
+    request = make_request('/v1.0/test_array_csv_query_param',
+                           query={'items': ['squash', 'banana']})
+    yield lambda: call(request)
+
+
+@benchmark('parameter_to_arg.path_and_body')
+def parameter_to_arg_path_and_body():
+    operation = get_operation(load_spec('simple'), '/test-nested-additional-properties', 'post')
+    call = parameter_to_arg(operation, operation._resolution.function)
+    request = make_request('/v1.0/test-nested-additional-properties', 'POST',
+                           body={'nested': {'object': True}})
+    yield lambda: call(request)
+
+
+@benchmark('jsonifier.dumps_small')
+def jsonifier_dumps_small():
+    jsonifier = Jsonifier(cls=JSONEncoder)
+    data = {'greeting': 'Hello jsantos'}
+    yield lambda: jsonifier.dumps(data)
+
+
+@benchmark('jsonifier.dumps_list')
+def jsonifier_dumps_list():
+    jsonifier = Jsonifier(cls=JSONEncoder)
+    created = datetime.datetime(2020, 9, 23, 12, 0, 0)
+    data = [{'id': index,
+             'uuid': uuid.UUID(int=index),
+             'name': 'user {}'.format(index),
+             'created': created,
+             'tags': ['a', 'b', 'c']}
+            for index in range(100)]
+    yield lambda: jsonifier.dumps(data)
+
+
+@benchmark('specification.load_openapi')
+def specification_load_openapi():
+    path = get_spec_path('simple', 'openapi.yaml')
+    yield lambda: Specification.load(path, arguments=ARGUMENTS)
+
+
+@benchmark('specification.load_swagger')
+def specification_load_swagger():
+    path = get_spec_path('simple', 'swagger.yaml')
+    yield lambda: Specification.load(path, arguments=ARGUMENTS)
@@ -0,0 +1,157 @@
+"""
+Peak memory of the large JSON responses.
+
+The handler returns rows adding up to `size` MB of JSON, sent either at once
+or in chunks as it is encoded. Every measure runs in a new process, whose peak
+resident set size (RSS) can only grow: the peak reached while responding is
+reported above the one reached once the rows were built::
+
+    $ python -m benchmarks memory --size 50
+"""
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+
+from connexion import App
+from connexion.apis.flask_api import FlaskApi
+from connexion.streaming import CHUNK_SIZE
+
+try:
+    from aiohttp.test_utils import TestClient, TestServer
+    from connexion import AioHttpApp
+    from connexion.apis.aiohttp_api import AioHttpApi
+except ImportError:  # pragma: no cover
+    AioHttpApp = None
+
+SPEC = {
+    'openapi': '3.0.0',
+    'info': {'title': 'Memory', 'version': '1.0'},
+    'paths': {
+        '/rows': {
+            'get': {
+                'operationId': 'benchmarks.memory.get_rows',
+                'responses': {'200': {'description': 'Rows', 'content': {'application/json': {}}}}
+            }
+        }
+    }
+}
+
+# rows of the running measure
+rows = None
+
+
+def get_rows():
+    return rows
+
+
+async def get_rows_async():
+    return rows
+
+
+def make_rows(size):
+    """
+    :param size: MB of JSON of the rows
+    :type size: float
+    :rtype: list
+    """
+    def row(i):
+        return {'id': i, 'name': 'row {}'.format(i), 'value': i / 7, 'tags': ['alpha', 'beta'], 'active': True}
+
+    row_size = len(json.dumps(row(10 ** 6))) + 2
+    return [row(i) for i in range(int(size * 10 ** 6 / row_size))]
+
+
+def peak_rss():
+    """
+    :return: the peak RSS of the process in bytes
+    :rtype: int
+    """
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def get_flask():
+    app = App(__name__)
+    app.add_api(SPEC)
+    response = app.app.test_client().get('/rows', buffered=False)
+    size = 0
+    for chunk in response.iter_encoded():
+        size += len(chunk)
+    response.close()
+    return size
+
+
+async def get_aiohttp():
+    spec = dict(SPEC, paths={'/rows': {'get': dict(SPEC['paths']['/rows']['get'],
+                                                   operationId='benchmarks.memory.get_rows_async')}})
+    app = AioHttpApp(__name__)
+    app.add_api(spec, base_path='/memory')
+    test_client = TestClient(TestServer(app.app))
+    await test_client.start_server()
+    try:
+        response = await test_client.get('/memory/rows')
+        size = 0
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            size += len(chunk)
+        return size
+    finally:
+        await test_client.close()
+
+
+def measure(framework, size, buffered):
+    """
+    Measures the peak RSS of one response in the current process.
+
+    :type framework: str
+    :type size: float
+    :param buffered: whether the response is encoded at once
+    :type buffered: bool
+    :return: the peak RSS above the one with the rows built, and the size of the response, in bytes
+    :rtype: dict
+    """
+    global rows
+    rows = make_rows(size)
+    api_class = FlaskApi if framework == 'flask' else AioHttpApi
+    if buffered:
+        api_class.response_buffer_size = sys.maxsize
+    base_rss = peak_rss()
+    if framework == 'flask':
+        response_size = get_flask()
+    else:
+        loop = asyncio.new_event_loop()
+        try:
+            response_size = loop.run_until_complete(get_aiohttp())
+        finally:
+            loop.close()
+    return {'peak_rss': peak_rss() - base_rss, 'size': response_size}
+
+
+def run(framework, size=50.0, buffered=False):
+    """
+    Measures the peak RSS of one response in a new process.
+
+    :param framework: `flask` or `aiohttp`
+    :type framework: str
+    :param size: MB of JSON in the response
+    :type size: float
+    :param buffered: whether the response is encoded at once
+    :type buffered: bool
+    :rtype: dict
+    """
+    if framework not in ('flask', 'aiohttp') or (framework == 'aiohttp' and AioHttpApp is None):
+        raise ValueError('Unknown framework {}'.format(framework))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    args = [sys.executable, '-m', 'benchmarks.memory', framework, str(size)]
+    if buffered:
+        args.append('--buffered')
+    output = subprocess.run(args, cwd=root, stdout=subprocess.PIPE, check=True).stdout
+    return json.loads(output.decode())
+
+
+if __name__ == '__main__':  # pragma: no cover
+    # the handlers import this module as benchmarks.memory, not __main__
+    from benchmarks import memory
+    print(json.dumps(memory.measure(sys.argv[1], float(sys.argv[2]), '--buffered' in sys.argv[3:])))
@@ -0,0 +1,210 @@
+"""
+Simulation of an overloaded operation, to compare the goodput of the
+concurrency limiters.
+
+The operation uses a simulated resource (e.g. a database) serving `capacity`
+requests at once in `latency` seconds each; more requests share it and all
+take proportionally longer. Closed-loop clients send more requests than it can
+serve, give up on the responses taking more than `timeout` seconds and retry
+the rejected requests after `backoff` seconds. The goodput is the number of
+successful responses per second received before the timeout::
+
+    $ python -m benchmarks overload --clients 64 --capacity 4
+"""
+import asyncio
+import threading
+import time
+
+from connexion import App
+from connexion.decorators.concurrency import AIMDConcurrencyLimiter, GradientConcurrencyLimiter
+
+try:
+    from aiohttp.test_utils import TestClient, TestServer
+    from connexion import AioHttpApp
+except ImportError:  # pragma: no cover
+    AioHttpApp = None
+
+LIMITERS = {
+    'none': lambda: None,
+    'gradient': GradientConcurrencyLimiter,
+    'aimd': AIMDConcurrencyLimiter,
+}
+
+SPEC = {
+    'openapi': '3.0.0',
+    'info': {'title': 'Overload', 'version': '1.0'},
+    'paths': {
+        '/work': {
+            'get': {
+                'operationId': 'benchmarks.overload.work',
+                'responses': {'200': {'description': 'Done', 'content': {'text/plain': {}}}}
+            }
+        }
+    }
+}
+
+
+class SharedResource(object):
+    """
+    Resource serving `capacity` requests at once in `latency` seconds, more requests take longer.
+    """
+
+    def __init__(self, capacity, latency):
+        self.capacity = capacity
+        self.latency = latency
+        self.active = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        :return: the time the new request takes
+        :rtype: float
+        """
+        with self._lock:
+            self.active += 1
+            return self.latency * max(1.0, self.active / self.capacity)
+
+    def finish(self):
+        with self._lock:
+            self.active -= 1
+
+
+# resource of the running simulation
+resource = None
+
+
+def work():
+    duration = resource.start()
+    try:
+        time.sleep(duration)
+    finally:
+        resource.finish()
+    return 'done'
+
+
+async def work_async():
+    duration = resource.start()
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        resource.finish()
+    return 'done'
+
+
+class Stats(object):
+
+    def __init__(self):
+        self.good = 0
+        self.late = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def record(self, status, latency, timeout):
+        with self._lock:
+            if status == 503:
+                self.rejected += 1
+            elif status == 200 and latency <= timeout:
+                self.good += 1
+            else:
+                self.late += 1
+
+
+def options(limiter):
+    if limiter is None:
+        return {}
+    return {'adaptive_concurrency': limiter}
+
+
+def run_flask(limiter, clients, timeout, backoff, duration):
+    app = App(__name__)
+    app.add_api(SPEC, options=options(limiter))
+    stats = Stats()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        test_client = app.app.test_client()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = test_client.get('/work').status_code
+            stats.record(status, time.perf_counter() - start, timeout)
+            if status == 503:
+                time.sleep(backoff)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return stats
+
+
+async def run_aiohttp(limiter, clients, timeout, backoff, duration):
+    spec = dict(SPEC, paths={'/work': {'get': dict(SPEC['paths']['/work']['get'],
+                                                   operationId='benchmarks.overload.work_async')}})
+    app = AioHttpApp(__name__)
+    app.add_api(spec, base_path='/overload', options=options(limiter))
+    test_client = TestClient(TestServer(app.app))
+    await test_client.start_server()
+    stats = Stats()
+    loop = asyncio.get_event_loop()
+    deadline = loop.time() + duration
+
+    async def client():
+        while loop.time() < deadline:
+            start = loop.time()
+            response = await test_client.get('/overload/work')
+            await response.read()
+            stats.record(response.status, loop.time() - start, timeout)
+            if response.status == 503:
+                await asyncio.sleep(backoff)
+
+    try:
+        await asyncio.gather(*(client() for _ in range(clients)))
+    finally:
+        await test_client.close()
+    return stats
+
+
+def simulate(framework, limiter='gradient', clients=32, capacity=4, latency=0.02, timeout=0.1, backoff=0.01,
+             duration=5.0):
+    """
+    :param framework: `flask` or `aiohttp`
+    :type framework: str
+    :param limiter: name of the limiter in `LIMITERS`
+    :type limiter: str
+    :param clients: number of concurrent clients
+    :type clients: int
+    :param capacity: number of requests the resource serves at once without slowing down
+    :type capacity: int
+    :param latency: seconds a request takes without load
+    :type latency: float
+    :param timeout: seconds after which the clients give up on a response
+    :type timeout: float
+    :param backoff: seconds the clients wait before retrying a rejected request
+    :type backoff: float
+    :param duration: seconds the simulation runs
+    :type duration: float
+    :return: the goodput per second and the counts of good, late and rejected responses
+    :rtype: dict
+    """
+    global resource
+    resource = SharedResource(capacity, latency)
+    concurrency_limiter = LIMITERS[limiter]()
+    if framework == 'flask':
+        stats = run_flask(concurrency_limiter, clients, timeout, backoff, duration)
+    elif framework == 'aiohttp' and AioHttpApp is not None:
+        loop = asyncio.new_event_loop()
+        try:
+            stats = loop.run_until_complete(run_aiohttp(concurrency_limiter, clients, timeout, backoff, duration))
+        finally:
+            loop.close()
+    else:
+        raise ValueError('Unknown framework {}'.format(framework))
+
+    return {
+        'goodput': stats.good / duration,
+        'good': stats.good,
+        'late': stats.late,
+        'rejected': stats.rejected,
+        'limit': concurrency_limiter.limit if concurrency_limiter is not None else None,
+    }
@@ -0,0 +1,205 @@
+"""
+Registry and timing loop of the benchmarks.
+
+A benchmark is a generator (or async generator) function registered with
+`@benchmark(name)`. It sets up its fixtures, yields the callable to time and
+tears the fixtures down when it resumes. The callable is called in a loop,
+the number of loops is calibrated so that each sample takes at least
+`min_time` seconds, and the mean time per call of every sample is recorded.
+"""
+import asyncio
+import datetime
+import fnmatch
+import gc
+import inspect
+import json
+import platform
+import sys
+import time
+
+import connexion
+
+from . import stats
+
+RESULTS_VERSION = 1
+
+_benchmarks = {}
+
+
+class Benchmark(object):
+
+    def __init__(self, name, function, loop_factory=None):
+        """
+        :param name: dotted name of the benchmark, e.g. `parameter_validator.query`
+        :type name: str
+        :param function: generator function yielding the callable to time
+        :param loop_factory: function creating the event loop of an async benchmark, asyncio's by default
+        """
+        self.name = name
+        self.function = function
+        self.is_async = inspect.isasyncgenfunction(function)
+        self.loop_factory = loop_factory or asyncio.new_event_loop
+
+    def __repr__(self):  # pragma: no cover
+        return '<Benchmark {}>'.format(self.name)
+
+
+def benchmark(name, loop_factory=None):
+    """
+    Registers a benchmark.
+
+    :type name: str
+    :param loop_factory: function creating the event loop of an async benchmark, asyncio's by default
+    """
+    def decorator(function):
+        if name in _benchmarks:
+            raise ValueError('Duplicate benchmark {}'.format(name))
+        _benchmarks[name] = Benchmark(name, function, loop_factory)
+        return function
+    return decorator
+
+
+def get_benchmarks(patterns=None):
+    """
+    :param patterns: glob patterns of the benchmark names to select, all if empty
+    :type patterns: list | None
+    :rtype: list[Benchmark]
+    """
+    # importing the modules registers their benchmarks
+    from . import bench_apps, bench_hot_paths  # NOQA
+    selected = []
+    for name in sorted(_benchmarks):
+        if not patterns or any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+            selected.append(_benchmarks[name])
+    return selected
+
+
+def time_loops(call, loops):
+    perf_counter = time.perf_counter
+    start = perf_counter()
+    for _ in range(loops):
+        call()
+    return perf_counter() - start
+
+
+async def time_loops_async(call, loops):
+    perf_counter = time.perf_counter
+    start = perf_counter()
+    for _ in range(loops):
+        await call()
+    return perf_counter() - start
+
+
+def calibrate(timer, min_time):
+    """
+    :return: the number of loops after which `timer` takes at least `min_time` seconds
+    :rtype: int
+    """
+    loops = 1
+    while True:
+        duration = timer(loops)
+        if duration >= min_time or loops >= 2 ** 24:
+            return loops
+        if duration <= 0:
+            loops *= 10
+        else:
+            loops = max(loops * 2, int(loops * min_time * 1.2 / duration))
+
+
+def run_benchmark(bench, samples=20, warmups=1, min_time=0.1, loops=None):
+    """
+    :param samples: number of recorded samples
+    :type samples: int
+    :param warmups: number of samples run before recording
+    :type warmups: int
+    :param min_time: minimum duration of one sample in seconds
+    :type min_time: float
+    :param loops: calls per sample, calibrated if None
+    :type loops: int | None
+    :return: the mean time per call of every sample and the statistics of the samples
+    :rtype: dict
+    """
+    if bench.is_async:
+        loop = bench.loop_factory()
+        fixtures = bench.function()
+        call = loop.run_until_complete(fixtures.__anext__())
+
+        def timer(count):
+            return loop.run_until_complete(time_loops_async(call, count))
+    else:
+        loop = None
+        fixtures = bench.function()
+        call = next(fixtures)
+
+        def timer(count):
+            return time_loops(call, count)
+
+    gc_enabled = gc.isenabled()
+    try:
+        if loops is None:
+            loops = calibrate(timer, min_time)
+        for _ in range(warmups):
+            timer(loops)
+        results = []
+        for _ in range(samples):
+            # collect between samples, not within one
+            gc.collect()
+            gc.disable()
+            try:
+                results.append(timer(loops) / loops)
+            finally:
+                if gc_enabled:
+                    gc.enable()
+    finally:
+        if loop is not None:
+            loop.run_until_complete(fixtures.aclose())
+            loop.close()
+        else:
+            fixtures.close()
+
+    result = {'loops': loops, 'samples': results}
+    result.update(stats.describe(results))
+    return result
+
+
+def get_metadata():
+    return {
+        'connexion': connexion.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'argv': sys.argv,
+    }
+
+
+def run(benchmarks, samples=20, warmups=1, min_time=0.1, loops=None, progress=None):
+    """
+    Runs the benchmarks one after the other.
+
+    :type benchmarks: list[Benchmark]
+    :param progress: called with the name and result of every finished benchmark
+    :return: machine-readable results, see `save_results`
+    :rtype: dict
+    """
+    results = {'version': RESULTS_VERSION, 'metadata': get_metadata(), 'benchmarks': {}}
+    for bench in benchmarks:
+        result = run_benchmark(bench, samples=samples, warmups=warmups, min_time=min_time, loops=loops)
+        results['benchmarks'][bench.name] = result
+        if progress is not None:
+            progress(bench.name, result)
+    return results
+
+
+def save_results(results, path):
+    with open(path, 'w') as results_file:
+        json.dump(results, results_file, indent=2)
+        results_file.write('\n')
+
+
+def load_results(path):
+    with open(path) as results_file:
+        results = json.load(results_file)
+    if results.get('version') != RESULTS_VERSION:
+        raise ValueError('{} is not a benchmark results file of version {}'.format(path, RESULTS_VERSION))
+    return results
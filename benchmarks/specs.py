@@ -0,0 +1,45 @@
+"""
+Access to the specs and handlers of the test suite.
+"""
+import pathlib
+import sys
+
+from connexion.operations import make_operation
+from connexion.resolver import Resolver
+from connexion.spec import Specification
+
+TEST_FOLDER = pathlib.Path(__file__).resolve().parent.parent / 'tests'
+FIXTURES_FOLDER = TEST_FOLDER / 'fixtures'
+EXAMPLES_FOLDER = TEST_FOLDER.parent / 'examples'
+ARGUMENTS = {'title': 'Benchmark'}
+
+# the operation ids of the specs refer to the `fakeapi` package of the tests
+if str(TEST_FOLDER) not in sys.path:
+    sys.path.insert(0, str(TEST_FOLDER))
+
+
+def get_spec_path(folder, spec_file='openapi.yaml'):
+    """
+    :param folder: folder of `tests/fixtures`
+    :type folder: str
+    :type spec_file: str
+    :rtype: pathlib.Path
+    """
+    return FIXTURES_FOLDER / folder / spec_file
+
+
+def load_spec(folder, spec_file='openapi.yaml'):
+    """
+    :rtype: connexion.spec.Specification
+    """
+    return Specification.load(get_spec_path(folder, spec_file), arguments=ARGUMENTS)
+
+
+def get_operation(spec, path, method):
+    """
+    Builds an operation of a spec without an API, as input of the decorators.
+
+    :type spec: connexion.spec.Specification
+    :rtype: connexion.operations.AbstractOperation
+    """
+    return make_operation(spec, api=None, path=path, method=method, resolver=Resolver())
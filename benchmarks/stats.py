@@ -0,0 +1,123 @@
+"""
+Statistics of benchmark samples and comparison of two runs.
+
+Timings are not normally distributed (they have a long tail of slow samples),
+so two runs are compared with the Mann-Whitney U test, which only assumes
+that the samples of each run are independent.
+"""
+import math
+import statistics
+
+FASTER = 'faster'
+SLOWER = 'slower'
+NOT_SIGNIFICANT = 'not significant'
+
+
+def describe(samples):
+    """
+    :type samples: list[float]
+    :rtype: dict
+    """
+    return {
+        'mean': statistics.mean(samples),
+        'median': statistics.median(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'min': min(samples),
+        'max': max(samples),
+    }
+
+
+def rank(values):
+    """
+    :return: the ranks of the values, starting at 1, ties get the mean of their ranks
+    :rtype: list[float]
+    """
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    start = 0
+    while start < len(order):
+        end = start
+        while end + 1 < len(order) and values[order[end + 1]] == values[order[start]]:
+            end += 1
+        for index in order[start:end + 1]:
+            ranks[index] = (start + end) / 2.0 + 1
+        start = end + 1
+    return ranks
+
+
+def mann_whitney_u(first, second):
+    """
+    Two-sided Mann-Whitney U test using the normal approximation with tie and
+    continuity correction, accurate from about 8 samples per run.
+
+    :type first: list[float]
+    :type second: list[float]
+    :return: the U statistic of `first` and the p-value of the samples coming
+        from the same distribution
+    :rtype: tuple[float, float]
+    """
+    n1, n2 = len(first), len(second)
+    if not n1 or not n2:
+        raise ValueError('Both runs need at least one sample')
+    values = list(first) + list(second)
+    ranks = rank(values)
+    u1 = sum(ranks[:n1]) - n1 * (n1 + 1) / 2.0
+
+    n = n1 + n2
+    tie_sum = 0
+    for value in set(values):
+        count = values.count(value)
+        tie_sum += count ** 3 - count
+    variance = n1 * n2 / 12.0 * ((n + 1) - tie_sum / float(n * (n - 1)))
+    if variance <= 0:
+        # all samples are equal
+        return u1, 1.0
+    mean = n1 * n2 / 2.0
+    z = (abs(u1 - mean) - 0.5) / math.sqrt(variance)
+    p_value = math.erfc(max(z, 0.0) / math.sqrt(2))
+    return u1, min(p_value, 1.0)
+
+
+def compare_samples(base, head, alpha=0.05):
+    """
+    :param base: samples of the reference run
+    :type base: list[float]
+    :param head: samples of the compared run
+    :type head: list[float]
+    :param alpha: significance level
+    :type alpha: float
+    :rtype: dict
+    """
+    _, p_value = mann_whitney_u(base, head)
+    base_median = statistics.median(base)
+    head_median = statistics.median(head)
+    ratio = head_median / base_median if base_median else float('inf')
+    if p_value >= alpha:
+        verdict = NOT_SIGNIFICANT
+    elif head_median < base_median:
+        verdict = FASTER
+    else:
+        verdict = SLOWER
+    return {
+        'base': base_median,
+        'head': head_median,
+        'ratio': ratio,
+        'p_value': p_value,
+        'verdict': verdict,
+    }
+
+
+def compare_results(base, head, alpha=0.05):
+    """
+    Compares the benchmarks of two runs, see `runner.run`.
+
+    :return: the comparison of every benchmark run in both, by name
+    :rtype: dict
+    """
+    comparison = {}
+    for name, base_result in sorted(base['benchmarks'].items()):
+        head_result = head['benchmarks'].get(name)
+        if head_result is None:
+            continue
+        comparison[name] = compare_samples(base_result['samples'], head_result['samples'], alpha)
+    return comparison
@@ -0,0 +1,132 @@
+"""
+Memory of the validators of the schemas of a large API.
+
+Every operation of the API takes and returns an `Order` and fails with an
+`Error`, the schemas of the spec being shared by the operations. The memory
+allocated by the API, its operations and their validators is traced while
+the API is added to an application and every operation called once, with the
+equal schemas sharing a validator or each getting its own::
+
+    $ python -m benchmarks validators --operations 400
+"""
+import gc
+import json
+import tracemalloc
+
+from connexion import App
+from connexion.json_schema import ValidatorRegistry
+from connexion.resolver import Resolver
+
+ORDER = {
+    'type': 'object',
+    'required': ['id', 'lines'],
+    'properties': {
+        'id': {'type': 'integer', 'minimum': 1},
+        'status': {'type': 'string', 'enum': ['placed', 'paid', 'shipped', 'delivered']},
+        'placed_at': {'type': 'string', 'format': 'date-time'},
+        'customer': {
+            'type': 'object',
+            'properties': {
+                'name': {'type': 'string', 'maxLength': 100},
+                'email': {'type': 'string', 'format': 'email'},
+                'address': {'type': 'string'}
+            }
+        },
+        'lines': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'required': ['sku', 'quantity'],
+                'properties': {
+                    'sku': {'type': 'string', 'pattern': '^[A-Z0-9-]+$'},
+                    'quantity': {'type': 'integer', 'minimum': 1},
+                    'price': {'type': 'number', 'minimum': 0}
+                }
+            }
+        }
+    }
+}
+
+ERROR = {
+    'type': 'object',
+    'required': ['status', 'title'],
+    'properties': {
+        'type': {'type': 'string'},
+        'title': {'type': 'string'},
+        'status': {'type': 'integer'},
+        'detail': {'type': 'string'}
+    }
+}
+
+ORDER_BODY = {'id': 1, 'status': 'placed', 'lines': [{'sku': 'A-1', 'quantity': 2, 'price': 9.5}]}
+
+
+def post_order(body):
+    return body
+
+
+def make_spec(operations):
+    """
+    :param operations: number of operations of the API
+    :type operations: int
+    :rtype: dict
+    """
+    def content(name):
+        return {'application/json': {'schema': {'$ref': '#/components/schemas/{}'.format(name)}}}
+
+    paths = {}
+    for i in range(operations):
+        paths['/orders{}'.format(i)] = {
+            'post': {
+                'operationId': 'post_order{}'.format(i),
+                'requestBody': {'required': True, 'content': content('Order')},
+                'responses': {
+                    '200': {'description': 'Order', 'content': content('Order')},
+                    'default': {'description': 'Error', 'content': content('Error')}
+                }
+            }
+        }
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': 'Validators', 'version': '1.0'},
+        'paths': paths,
+        'components': {'schemas': {'Order': ORDER, 'Error': ERROR}}
+    }
+
+
+def measure(operations, shared):
+    """
+    :type operations: int
+    :param shared: whether the equal schemas share a validator
+    :type shared: bool
+    :return: the number of validators created and the bytes allocated
+    :rtype: dict
+    """
+    spec = make_spec(operations)
+    data = json.dumps(ORDER_BODY)
+    ValidatorRegistry.shared = shared
+    gc.collect()
+    tracemalloc.start()
+    try:
+        app = App(__name__)
+        api = app.add_api(spec, validate_responses=True, resolver=Resolver(lambda operation_id: post_order))
+        client = app.app.test_client()
+        for path in spec['paths']:
+            response = client.post(path, data=data, content_type='application/json')
+            assert response.status_code == 200, response.data
+        gc.collect()
+        memory = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+        ValidatorRegistry.shared = True
+    return {'validators': len(api.validator_registry), 'memory': memory}
+
+
+def run(operations=400):
+    """
+    :param operations: number of operations of the API
+    :type operations: int
+    :return: the measures with one validator per operation and with the validators shared
+    :rtype: dict
+    """
+    return {'unshared': measure(operations, shared=False), 'shared': measure(operations, shared=True)}
@@ -14,6 +14,7 @@ from ..operations import make_operation
 from ..options import ConnexionOptions
 from ..resolver import Resolver
 from ..spec import Specification
+from ..streaming import encode_json, encode_stream, is_stream
 from ..utils import is_json_mimetype
 
 MODULE_PATH = pathlib.Path(__file__).absolute().parent.parent
@@ -34,12 +35,15 @@ class AbstractAPI(metaclass=AbstractAPIMeta):
     Defines an abstract interface for a Swagger API
     """
 
+    # characters of an encoded JSON body above which it is sent in chunks as it is encoded
+    response_buffer_size = 1024 * 1024
+
     def __init__(self, specification, base_path=None, arguments=None,
                  validate_responses=False, strict_validation=False, resolver=None,
                  auth_all_paths=False, debug=False, resolver_error_handler=None,
                  validator_map=None, pythonic_params=False, pass_context_arg_name=None, options=None):
         """
-        :type specification: pathlib.Path | dict
+        :type specification: pathlib.Path | dict | connexion.spec.Specification
         :type base_path: str | None
         :type arguments: dict | None
         :type validate_responses: bool
@@ -101,6 +105,12 @@ class AbstractAPI(metaclass=AbstractAPIMeta):
         logger.debug('pass_context_arg_name: %s', pass_context_arg_name)
         self.pass_context_arg_name = pass_context_arg_name
 
+        # (method, path) -> limiter of the operations with a concurrency limit
+        self.concurrency_limiters = {}
+
+        # validators of the schemas, shared by the APIs of the specification
+        self.validator_registry = self.specification.validator_registry
+
         if self.options.openapi_spec_available:
             self.add_openapi_json()
             self.add_openapi_yaml()
@@ -108,6 +118,12 @@ class AbstractAPI(metaclass=AbstractAPIMeta):
         if self.options.openapi_console_ui_available:
             self.add_swagger_ui()
 
+        if self.options.metrics is not None and self.options.metrics_path:
+            self.add_metrics()
+
+        if self.options.batch_path:
+            self.add_batch()
+
         self.add_paths()
 
         if auth_all_paths:
@@ -119,7 +135,7 @@ class AbstractAPI(metaclass=AbstractAPIMeta):
     def _set_base_path(self, base_path=None):
         if base_path is not None:
             # update spec to include user-provided base_path
-            self.specification.base_path = base_path
+            self.specification = self.specification.with_base_path(base_path)
             self.base_path = base_path
         else:
             self.base_path = self.specification.base_path
@@ -137,6 +153,18 @@ class AbstractAPI(metaclass=AbstractAPIMeta):
         Adds swagger ui to {base_path}/ui/
         """
 
+    @abc.abstractmethod
+    def add_metrics(self):
+        """
+        Adds the metrics endpoint to {base_path}/metrics
+        """
+
+    @abc.abstractmethod
+    def add_batch(self):
+        """
+        Adds the batch endpoint to {base_path}{batch_path}
+        """
+
     @abc.abstractmethod
     def add_auth_on_not_found(self, security, security_definitions):
         """
@@ -173,6 +201,8 @@ class AbstractAPI(metaclass=AbstractAPIMeta):
             pass_context_arg_name=self.pass_context_arg_name
         )
         self._add_operation_internal(method, path, operation)
+        if operation.concurrency_limiter is not None:
+            self.concurrency_limiters[(method.upper(), path)] = operation.concurrency_limiter
 
     @abc.abstractmethod
     def _add_operation_internal(self, method, path, operation):
@@ -237,6 +267,24 @@ class AbstractAPI(metaclass=AbstractAPIMeta):
         This method converts the user framework request to a ConnexionRequest.
         """
 
+    @classmethod
+    @abc.abstractmethod
+    def get_streamed_request(self, *args, **kwargs):
+        """
+        This method converts the user framework request to a ConnexionRequest
+        whose body is left unread in its `stream`, for the operations streaming
+        their request body.
+        """
+
+    @classmethod
+    @abc.abstractmethod
+    def get_limited_request(self, body_limits):
+        """
+        :type body_limits: connexion.limits.BodyLimits
+        :return: a `get_request` function whose request bodies beyond the limits
+            are rejected before they are buffered or parsed
+        """
+
     @classmethod
     @abc.abstractmethod
     def get_response(self, response, mimetype=None, request=None):
@@ -399,7 +447,12 @@ class AbstractAPI(metaclass=AbstractAPIMeta):
             # If we got an enum instead of an int, extract the value.
             status_code = status_code.value
 
-        if data is not None:
+        if is_stream(data):
+            # encoded while the response is sent
+            body = encode_stream(data, mimetype, cls.jsonifier)
+        elif isinstance(mimetype, str) and is_json_mimetype(mimetype) and isinstance(data, (dict, list, tuple)):
+            body = encode_json(data, cls.jsonifier, cls.response_buffer_size)
+        elif data is not None:
             body, mimetype = cls._serialize_data(data, mimetype)
         else:
             body = data
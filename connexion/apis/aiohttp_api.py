@@ -1,28 +1,46 @@
 import asyncio
+import functools
+import inspect
 import logging
 import re
 import traceback
 from contextlib import suppress
 from http import HTTPStatus
+from pathlib import PurePath
 from urllib.parse import parse_qs
 
+import aiohttp
 import aiohttp_jinja2
 import jinja2
-from aiohttp import web
+from aiohttp import hdrs, web
+from aiohttp.payload import Payload
 from aiohttp.web_exceptions import HTTPNotFound, HTTPPermanentRedirect
 from aiohttp.web_middlewares import normalize_path_middleware
+from connexion import batch
 from connexion.apis.abstract import AbstractAPI
-from connexion.exceptions import ProblemException
+from connexion.apis.aiohttp_multipart import FormLimits, is_form, read_form
+from connexion.decorators.security import close_async_session
+from connexion.exceptions import BadRequestProblem, ProblemException
 from connexion.handlers import AuthErrorHandler
 from connexion.jsonifier import JSONEncoder, Jsonifier
 from connexion.lifecycle import ConnexionRequest, ConnexionResponse
+from connexion.limits import BodyLimits, limit_json
+from connexion.metrics import CONTENT_TYPE
 from connexion.problem import problem
+from connexion.streaming import (CHUNK_SIZE, AsyncRequestStream, BufferFile,
+                                 FileBody, check_content_length, is_file)
 from connexion.utils import yamldumper
+from multidict import CIMultiDict
 from werkzeug.exceptions import HTTPException as werkzeug_HTTPException
+from werkzeug.http import parse_if_range_header, parse_range_header
+from yarl import URL
 
 
 logger = logging.getLogger('connexion.apis.aiohttp_api')
 
+# key of the FormLimits of an API in the state of its aiohttp application
+FORM_LIMITS_KEY = 'connexion.form_limits'
+
 
 def _generic_problem(http_status: HTTPStatus, exc: Exception = None):
     extra = None
@@ -94,6 +112,8 @@ class AioHttpApi(AbstractAPI):
                 trailing_slash_redirect
             ]
         )
+        self._batch_semaphore = None
+        self._batch_sessions = {}
         AbstractAPI.__init__(self, *args, **kwargs)
 
         aiohttp_jinja2.setup(
@@ -104,6 +124,20 @@ class AioHttpApi(AbstractAPI):
         )
         middlewares = self.options.as_dict().get('middlewares', [])
         self.subapp.middlewares.extend(middlewares)
+        self.subapp.on_cleanup.append(self._close_security_session)
+        self.subapp.on_cleanup.append(self._close_batch_sessions)
+        self.subapp[FORM_LIMITS_KEY] = FormLimits(
+            spool_size=self.options.multipart_spool_size,
+            max_part_size=self.options.multipart_max_part_size,
+            max_size=self.options.multipart_max_size
+        )
+
+    @staticmethod
+    async def _close_security_session(app):
+        """
+        Closes the pooled connections used for remote token introspection.
+        """
+        await close_async_session()
 
     def _set_base_path(self, base_path):
         AbstractAPI._set_base_path(self, base_path)
@@ -178,6 +212,117 @@ class AioHttpApi(AbstractAPI):
             body=yamldumper(self._spec_for_prefix(request))
         )
 
+    def add_metrics(self):
+        """
+        Adds the metrics endpoint to {base_path}/metrics
+        """
+        logger.debug('Adding metrics: %s%s', self.base_path, self.options.metrics_path)
+        self.subapp.router.add_route(
+            'GET',
+            self.options.metrics_path,
+            self._get_metrics
+        )
+
+    async def _get_metrics(self, request):
+        return web.Response(
+            status=200,
+            headers={'Content-Type': CONTENT_TYPE},
+            text=self.options.metrics.render()
+        )
+
+    def add_batch(self):
+        """
+        Adds the batch endpoint to {base_path}{batch_path}
+        """
+        logger.debug('Adding batch: %s%s', self.base_path, self.options.batch_path)
+        self.subapp.router.add_route(
+            'POST',
+            self.options.batch_path,
+            self._batch
+        )
+
+    async def _batch(self, request):
+        if batch.BATCH_HEADER in request.headers:
+            raise BadRequestProblem(detail='Batches can not be nested')
+        body_limits = BodyLimits.from_options(self.options)
+        if body_limits.max_size is not None:
+            check_content_length(request.headers, body_limits.max_size)
+            # counted while it is read, the limit replaces client_max_size
+            data = await AsyncRequestStream(request.content, body_limits.max_size).read()
+        else:
+            data = await request.read()
+        sub_requests = batch.parse_batch(data, request.headers,
+                                         self.options.batch_max_size, self.options.batch_path, body_limits)
+        # the sub-requests are sent back to the socket the batch request was received on, so that
+        # they go through the routing, middlewares and operation pipeline of the API as any request
+        base_url = URL.build(scheme='https' if request.transport.get_extra_info('sslcontext') else 'http',
+                             host='localhost')
+        socket_name = request.transport.get_extra_info('sockname')
+        if isinstance(socket_name, str):
+            session = self._batch_session(socket_name)
+        else:
+            session = self._batch_session()
+            base_url = base_url.with_host(socket_name[0]).with_port(socket_name[1])
+        # the path prefix of the API, as it is mounted
+        prefix = request.path[:len(request.path) - len(self.options.batch_path)]
+        if self._batch_semaphore is None:
+            # shared by the batches, so that they don't run more than `batch_concurrency` requests at once
+            self._batch_semaphore = asyncio.Semaphore(self.options.batch_concurrency)
+        semaphore = self._batch_semaphore
+
+        async def execute(sub_request):
+            headers = CIMultiDict(sub_request.headers)
+            # set by the client for the body of the sub-request, which is included as it is received
+            for name in (hdrs.CONTENT_LENGTH, hdrs.TRANSFER_ENCODING, hdrs.ACCEPT_ENCODING):
+                headers.popall(name, None)
+            headers[batch.BATCH_HEADER] = '1'
+            url = URL(str(base_url) + prefix + sub_request.path).with_query(sub_request.query)
+            async with semaphore:
+                try:
+                    async with session.request(sub_request.method, url, headers=headers, data=sub_request.body,
+                                               allow_redirects=False, ssl=False) as response:
+                        body = await response.read()
+                except Exception as exc:
+                    # only this sub-request fails
+                    logger.exception('Error executing %s %s in a batch', sub_request.method, sub_request.path)
+                    response = await self.get_response(_generic_problem(HTTPStatus.INTERNAL_SERVER_ERROR, exc))
+                    body = response.body
+            return batch.response_item(response.status, response.headers, body, response.content_type)
+
+        results = await asyncio.gather(*(execute(sub_request) for sub_request in sub_requests))
+        return web.Response(
+            status=200,
+            content_type='application/json',
+            body=self.jsonifier.dumps(results)
+        )
+
+    def _batch_session(self, unix_path=None):
+        """
+        The client session sending the sub-requests of the batches back to the server.
+
+        :param unix_path: path of the unix socket the server listens on, None for TCP
+        :type unix_path: str | None
+        :rtype: aiohttp.ClientSession
+        """
+        session = self._batch_sessions.get(unix_path)
+        if session is None or session.closed:
+            connector = aiohttp.UnixConnector(unix_path) if unix_path else aiohttp.TCPConnector()
+            # no cookies kept between the batches, and no header the batch request did not send
+            session = aiohttp.ClientSession(connector=connector,
+                                            cookie_jar=aiohttp.DummyCookieJar(),
+                                            skip_auto_headers=(hdrs.ACCEPT, hdrs.ACCEPT_ENCODING, hdrs.USER_AGENT),
+                                            timeout=aiohttp.ClientTimeout(total=None))
+            self._batch_sessions[unix_path] = session
+        return session
+
+    async def _close_batch_sessions(self, app):
+        """
+        Closes the connections used for the sub-requests of the batches.
+        """
+        sessions, self._batch_sessions = self._batch_sessions, {}
+        for session in sessions.values():
+            await session.close()
+
     def add_swagger_ui(self):
         """
         Adds swagger ui to {base_path}/ui/
@@ -285,10 +430,12 @@ class AioHttpApi(AbstractAPI):
             )
 
     @classmethod
-    async def get_request(cls, req):
+    async def get_request(cls, req, body_limits=None):
         """Convert aiohttp request to connexion
 
         :param req: instance of aiohttp.web.Request
+        :param body_limits: limits of the request body, enforced before it is buffered or parsed
+        :type body_limits: connexion.limits.BodyLimits | None
         :return: connexion request instance
         :rtype: ConnexionRequest
         """
@@ -299,18 +446,66 @@ class AioHttpApi(AbstractAPI):
         query = parse_qs(req.rel_url.query_string)
         headers = req.headers
         body = None
+        form = files = None
+        max_size = body_limits and body_limits.max_size
         if req.body_exists:
-            body = await req.read()
+            if max_size is not None:
+                check_content_length(headers, max_size)
+            if is_form(req.content_type):
+                # the files are streamed to temporary files, as werkzeug does for Flask
+                limits = req.config_dict.get(FORM_LIMITS_KEY) or FormLimits()
+                if max_size is not None:
+                    limits = FormLimits(limits.spool_size, limits.max_part_size,
+                                        max_size if limits.max_size is None else min(limits.max_size, max_size))
+                form, files = await read_form(req, limits)
+                body = b''
+            elif max_size is not None:
+                # counted while it is read, the limit replaces client_max_size
+                body = await AsyncRequestStream(req.content, max_size).read()
+            else:
+                body = await req.read()
+
+        request = ConnexionRequest(url=url,
+                                   method=req.method.lower(),
+                                   path_params=dict(req.match_info),
+                                   query=query,
+                                   headers=headers,
+                                   form=form,
+                                   body=body,
+                                   json_getter=lambda: cls.jsonifier.loads(body),
+                                   files=files if files is not None else {},
+                                   context=req)
+        if body_limits is not None and body_limits.limits_json:
+            limit_json(request, body_limits)
+        return request
+
+    @classmethod
+    async def get_streamed_request(cls, req):
+        """Convert aiohttp request to connexion, leaving the body unread in the
+        stream of the request.
 
-        return ConnexionRequest(url=url,
+        :param req: instance of aiohttp.web.Request
+        :return: connexion request instance
+        :rtype: ConnexionRequest
+        """
+        return ConnexionRequest(url=str(req.url),
                                 method=req.method.lower(),
                                 path_params=dict(req.match_info),
-                                query=query,
-                                headers=headers,
-                                body=body,
-                                json_getter=lambda: cls.jsonifier.loads(body),
+                                query=parse_qs(req.rel_url.query_string),
+                                headers=req.headers,
+                                json_getter=lambda: None,
                                 files={},
-                                context=req)
+                                context=req,
+                                stream=AsyncRequestStream(req.content))
+
+    @classmethod
+    def get_limited_request(cls, body_limits):
+        """
+        :type body_limits: connexion.limits.BodyLimits
+        :return: a `get_request` function whose request bodies beyond the limits
+            are rejected before they are buffered or parsed
+        """
+        return functools.partial(cls.get_request, body_limits=body_limits)
 
     @classmethod
     async def get_response(cls, response, mimetype=None, request=None):
@@ -338,6 +533,8 @@ class AioHttpApi(AbstractAPI):
         body = None
         if hasattr(response, "body"):  # StreamResponse and FileResponse don't have body
             body = response.body
+            if isinstance(body, _ChunksPayload):
+                body = body.read()
         return ConnexionResponse(
             status_code=response.status,
             mimetype=mimetype,
@@ -362,12 +559,18 @@ class AioHttpApi(AbstractAPI):
     def _build_response(cls, data, mimetype, content_type=None, headers=None, status_code=None, extra_context=None):
         if cls._is_framework_response(data):
             raise TypeError("Cannot return web.StreamResponse in tuple. Only raw data can be returned in tuple.")
+        if is_file(data):
+            return cls._build_file_response(data, mimetype, content_type, headers, status_code)
 
         data, status_code, serialized_mimetype = cls._prepare_body_and_status_code(data=data, mimetype=mimetype, status_code=status_code, extra_context=extra_context)
 
         if isinstance(data, str):
             text = data
             body = None
+        elif inspect.isgenerator(data):
+            # sent with chunked transfer encoding as it is produced
+            text = None
+            body = _ChunksPayload(data)
         else:
             text = None
             body = data
@@ -375,11 +578,150 @@ class AioHttpApi(AbstractAPI):
         content_type = content_type or mimetype or serialized_mimetype
         return web.Response(body=body, text=text, headers=headers, status=status_code, content_type=content_type)
 
+    @classmethod
+    def _build_file_response(cls, data, mimetype, content_type=None, headers=None, status_code=None):
+        """
+        Sends a file with sendfile where possible, restricted to the byte range requested. The
+        file is not read for HEAD requests.
+        """
+        headers = CIMultiDict(headers or {})
+        if content_type or mimetype:
+            headers.setdefault(hdrs.CONTENT_TYPE, content_type or mimetype)
+        if isinstance(data, PurePath):
+            # guesses the missing Content-Type from the file name
+            return web.FileResponse(data, status=status_code or 200, headers=headers)
+
+        body = FileBody(data)
+        headers.setdefault(hdrs.CONTENT_TYPE, body.mimetype)
+        return _FileBodyResponse(body, status=status_code or 200, headers=headers)
+
     @classmethod
     def _set_jsonifier(cls):
         cls.jsonifier = Jsonifier(cls=JSONEncoder)
 
 
+class _ChunksPayload(Payload):
+    """
+    Body produced by a generator of bytes, written to the transport chunk by chunk.
+
+    The generator may block, e.g. on the database cursor of a handler: each chunk
+    is produced in the default executor, so that the event loop serves the other
+    requests meanwhile.
+    """
+
+    @property
+    def size(self):
+        # unknown, the body is sent with chunked transfer encoding
+        return None
+
+    async def _chunks(self):
+        loop = asyncio.get_event_loop()
+        # StopIteration can't be raised into a future, the end is marked by None instead
+        chunk = await loop.run_in_executor(None, next, self._value, None)
+        while chunk is not None:
+            yield chunk
+            chunk = await loop.run_in_executor(None, next, self._value, None)
+
+    async def write(self, writer):
+        async for chunk in self._chunks():
+            await writer.write(chunk)
+
+    def read(self):
+        """
+        Reads the whole body, for the response validation.
+
+        :rtype: bytes
+        """
+        return b''.join(self._value)
+
+
+class _FileBodyResponse(web.StreamResponse):
+    """
+    Response sending an open file or a buffer, the counterpart of `web.FileResponse` for paths.
+    """
+
+    def __init__(self, body, status=200, headers=None):
+        """
+        :type body: connexion.streaming.FileBody
+        """
+        super().__init__(status=status, headers=headers)
+        self._body = body
+        if body.mtime is not None:
+            # in whole seconds, as the If-Range dates sent back
+            self.last_modified = int(body.mtime)
+
+    def _requested_range(self, request):
+        """
+        :return: the (start, stop) of the byte range requested, None for the whole file
+        :raises ValueError: if the range is not satisfiable
+        """
+        if self.status != 200 or hdrs.RANGE not in request.headers:
+            return None
+        if hdrs.IF_RANGE in request.headers:
+            # the range only applies if the file wasn't modified since the date,
+            # which has whole seconds as the Last-Modified header
+            if_range = parse_if_range_header(request.headers[hdrs.IF_RANGE])
+            if (if_range.date is None or self._body.mtime is None or
+                    int(self._body.mtime) > if_range.date.timestamp()):
+                return None
+        byte_range = parse_range_header(request.headers[hdrs.RANGE])
+        byte_range = byte_range and byte_range.range_for_length(self._body.size)
+        if byte_range is None:
+            raise ValueError('Range not satisfiable')
+        return byte_range
+
+    async def prepare(self, request):
+        body = self._body
+        start, count = 0, body.size
+        try:
+            if body.size is not None:
+                self.headers[hdrs.ACCEPT_RANGES] = 'bytes'
+                try:
+                    byte_range = self._requested_range(request)
+                except ValueError:
+                    self.set_status(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                    self.headers[hdrs.CONTENT_RANGE] = 'bytes */{}'.format(body.size)
+                    return await super().prepare(request)
+                if byte_range is not None:
+                    start, stop = byte_range
+                    count = stop - start
+                    self.set_status(HTTPStatus.PARTIAL_CONTENT)
+                    self.headers[hdrs.CONTENT_RANGE] = 'bytes {}-{}/{}'.format(start, stop - 1, body.size)
+                self.content_length = count
+
+            writer = await super().prepare(request)
+            if request.method != hdrs.METH_HEAD:
+                await self._send(request, writer, start, count)
+            return writer
+        finally:
+            body.close()
+
+    async def _send(self, request, writer, start, count):
+        file = self._body.file
+        loop = asyncio.get_event_loop()
+        if isinstance(file, BufferFile):
+            end = start + count
+            for offset in range(start, end, CHUNK_SIZE):
+                await writer.write(file.view[offset:min(offset + CHUNK_SIZE, end)])
+            return
+        if count is not None and self._body.mtime is not None and not self.compression:
+            # regular file, sent by the kernel
+            await writer.drain()
+            with suppress(NotImplementedError):
+                await loop.sendfile(request.transport, file, start, count)
+                return
+
+        if count is not None:
+            await loop.run_in_executor(None, file.seek, start)
+        while count is None or count > 0:
+            chunk = await loop.run_in_executor(None, file.read, CHUNK_SIZE if count is None else min(CHUNK_SIZE, count))
+            if not chunk:
+                break
+            await writer.write(chunk)
+            if count is not None:
+                count -= len(chunk)
+
+
 class _HttpNotFoundError(HTTPNotFound):
     def __init__(self):
         self.name = 'Not Found'
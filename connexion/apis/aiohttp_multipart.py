@@ -0,0 +1,154 @@
+"""
+Streaming parsing of the form bodies of aiohttp requests.
+
+The parts of a multipart/form-data body are read chunk by chunk: the fields
+are kept in memory, the files are written to temporary files which stay in
+memory up to `spool_size` bytes and spill to disk beyond. The results are
+werkzeug `MultiDict` and `FileStorage` objects, as in the requests of Flask.
+"""
+import tempfile
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import FileStorage, Headers, MultiDict
+
+from ..exceptions import BadRequestProblem, PayloadTooLargeProblem
+
+CHUNK_SIZE = 64 * 1024
+# same threshold as werkzeug's default_stream_factory
+DEFAULT_SPOOL_SIZE = 500 * 1024
+
+FORM_URLENCODED = 'application/x-www-form-urlencoded'
+MULTIPART_FORM_DATA = 'multipart/form-data'
+
+
+class FormLimits(object):
+    __slots__ = ('spool_size', 'max_part_size', 'max_size')
+
+    def __init__(self, spool_size=DEFAULT_SPOOL_SIZE, max_part_size=None, max_size=None):
+        """
+        :param spool_size: bytes of a file kept in memory before it is written to disk
+        :type spool_size: int
+        :param max_part_size: maximum size of a field or file in bytes, unlimited if None
+        :type max_part_size: int | None
+        :param max_size: maximum size of all the fields and files in bytes, the
+            client_max_size of the aiohttp application if None
+        :type max_size: int | None
+        """
+        self.spool_size = spool_size
+        self.max_part_size = max_part_size
+        self.max_size = max_size
+
+
+def is_form(content_type):
+    """
+    :type content_type: str
+    :rtype: bool
+    """
+    return content_type in (FORM_URLENCODED, MULTIPART_FORM_DATA)
+
+
+async def read_form(req, limits):
+    """
+    Parses the form body of a request.
+
+    :type req: aiohttp.web.Request
+    :type limits: FormLimits
+    :return: the fields and the files
+    :rtype: (MultiDict, MultiDict)
+    """
+    max_size = limits.max_size
+    if max_size is None:
+        # the form is read in chunks, which only read() limits to client_max_size, and aiohttp has
+        # no public accessor for it
+        max_size = getattr(req, '_client_max_size', None)
+    if req.content_type == FORM_URLENCODED:
+        return await read_urlencoded(req, max_size), MultiDict()
+    return await read_multipart(req, limits, max_size)
+
+
+async def read_urlencoded(req, max_size):
+    """
+    :type req: aiohttp.web.Request
+    :param max_size: maximum size of the form in bytes, unlimited if None
+    :type max_size: int | None
+    :rtype: MultiDict
+    """
+    body = bytearray()
+    chunk = await req.content.read(CHUNK_SIZE)
+    while chunk:
+        body.extend(chunk)
+        if max_size and len(body) > max_size:
+            raise PayloadTooLargeProblem(detail='The form is larger than {} bytes'.format(max_size))
+        chunk = await req.content.read(CHUNK_SIZE)
+    charset = req.charset or 'utf-8'
+    try:
+        return MultiDict(parse_qsl(body.decode(charset), keep_blank_values=True))
+    except UnicodeDecodeError:
+        raise BadRequestProblem(detail='The form is not valid {}'.format(charset))
+
+
+async def read_multipart(req, limits, max_size):
+    """
+    :type req: aiohttp.web.Request
+    :type limits: FormLimits
+    :param max_size: maximum size of all the fields and files in bytes, unlimited if None
+    :type max_size: int | None
+    :rtype: (MultiDict, MultiDict)
+    """
+    fields = MultiDict()
+    files = MultiDict()
+    stream = None
+    total_size = 0
+    try:
+        reader = await req.multipart()
+        part = await reader.next()
+        while part is not None:
+            if part.filename is None:
+                data = bytearray()
+                write = data.extend
+            else:
+                stream = tempfile.SpooledTemporaryFile(max_size=limits.spool_size)
+                write = stream.write
+
+            part_size = 0
+            chunk = await part.read_chunk(CHUNK_SIZE)
+            while chunk:
+                part_size += len(chunk)
+                total_size += len(chunk)
+                if limits.max_part_size is not None and part_size > limits.max_part_size:
+                    raise PayloadTooLargeProblem(detail="The part '{}' of the form is larger than {} bytes".format(
+                        part.name, limits.max_part_size))
+                if max_size and total_size > max_size:
+                    raise PayloadTooLargeProblem(detail='The form is larger than {} bytes'.format(max_size))
+                write(chunk)
+                chunk = await part.read_chunk(CHUNK_SIZE)
+
+            if part.filename is None:
+                fields.add(part.name, bytes(data).decode(part.get_charset(default='utf-8')))
+            else:
+                stream.seek(0)
+                files.add(part.name, FileStorage(stream=stream, filename=part.filename, name=part.name,
+                                                 content_type=part.headers.get('Content-Type'),
+                                                 headers=Headers(list(part.headers.items()))))
+                stream = None
+            part = await reader.next()
+    except BaseException as e:
+        # the temporary files are released whatever interrupted the parsing, cancellation included
+        close_files(files)
+        if stream is not None:
+            stream.close()
+        if isinstance(e, (ValueError, AssertionError, UnicodeDecodeError)):
+            # aiohttp raises these for malformed bodies
+            raise BadRequestProblem(detail='The multipart body is not valid: {}'.format(e))
+        raise
+    return fields, files
+
+
+def close_files(files):
+    """
+    Releases the temporary files of a form.
+
+    :type files: MultiDict
+    """
+    for file_storage in files.values():
+        file_storage.close()
@@ -1,15 +1,27 @@
+import inspect
 import logging
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
 
 import flask
 import werkzeug.exceptions
+from connexion import batch
 from connexion.apis import flask_utils
 from connexion.apis.abstract import AbstractAPI
+from connexion.exceptions import BadRequestProblem
 from connexion.handlers import AuthErrorHandler
 from connexion.jsonifier import Jsonifier
 from connexion.lifecycle import ConnexionRequest, ConnexionResponse
+from connexion.limits import BodyLimits, limit_json
+from connexion.metrics import CONTENT_TYPE
+from connexion.streaming import (FileBody, RequestStream, check_content_length,
+                                 is_file)
 from connexion.utils import is_json_mimetype, yamldumper
 from werkzeug.local import LocalProxy
+from werkzeug.test import EnvironBuilder
+from werkzeug.wsgi import wrap_file
 
 logger = logging.getLogger('connexion.apis.flask_api')
 
@@ -92,6 +104,27 @@ class FlaskApi(AbstractAPI):
                                     index_endpoint_name,
                                     self._handlers.console_ui_home)
 
+    def add_metrics(self):
+        """
+        Adds the metrics endpoint to {base_path}/metrics
+        """
+        logger.debug('Adding metrics: %s%s', self.base_path, self.options.metrics_path)
+        endpoint_name = "{name}_metrics".format(name=self.blueprint.name)
+        self.blueprint.add_url_rule(self.options.metrics_path,
+                                    endpoint_name,
+                                    self._handlers.get_metrics)
+
+    def add_batch(self):
+        """
+        Adds the batch endpoint to {base_path}{batch_path}
+        """
+        logger.debug('Adding batch: %s%s', self.base_path, self.options.batch_path)
+        endpoint_name = "{name}_batch".format(name=self.blueprint.name)
+        self.blueprint.add_url_rule(self.options.batch_path,
+                                    endpoint_name,
+                                    self._handlers.batch,
+                                    methods=['POST'])
+
     def add_auth_on_not_found(self, security, security_definitions):
         """
         Adds a 404 error handler to authenticate and only expose the 404 status if the security validation pass.
@@ -169,8 +202,15 @@ class FlaskApi(AbstractAPI):
     def _build_response(cls, mimetype, content_type=None, headers=None, status_code=None, data=None, extra_context=None):
         if cls._is_framework_response(data):
             return flask.current_app.make_response((data, status_code, headers))
+        if is_file(data):
+            return cls._build_file_response(data, mimetype, content_type, headers, status_code)
 
         data, status_code, serialized_mimetype = cls._prepare_body_and_status_code(data=data, mimetype=mimetype, status_code=status_code, extra_context=extra_context)
+        if inspect.isasyncgen(data):
+            raise TypeError('Flask can not stream async generators, return a generator instead')
+        if inspect.isgenerator(data):
+            # the body is produced once the handler returned, with the request still available
+            data = flask.stream_with_context(data)
 
         kwargs = {
             'mimetype': mimetype or serialized_mimetype,
@@ -182,13 +222,45 @@ class FlaskApi(AbstractAPI):
         kwargs = {k: v for k, v in kwargs.items() if v is not None}
         return flask.current_app.response_class(**kwargs)  # type: flask.Response
 
+    @classmethod
+    def _build_file_response(cls, data, mimetype, content_type=None, headers=None, status_code=None):
+        """
+        Sends a file through the file wrapper of the WSGI server (e.g. with sendfile), restricted
+        to the byte range requested. The file is not read for HEAD requests.
+        """
+        body = FileBody(data)
+        kwargs = {
+            'mimetype': None if content_type else mimetype or body.mimetype,
+            'content_type': content_type,
+            'headers': headers,
+            'status': status_code
+        }
+        kwargs = {k: v for k, v in kwargs.items() if v is not None}
+        response = flask.current_app.response_class(wrap_file(flask.request.environ, body.file),
+                                                    direct_passthrough=True, **kwargs)
+        if body.size is not None:
+            response.content_length = body.size
+            # werkzeug only sets it on the responses to range requests
+            response.accept_ranges = 'bytes'
+        if body.mtime is not None:
+            response.last_modified = body.mtime
+        try:
+            return response.make_conditional(flask.request.environ, accept_ranges=body.size is not None,
+                                             complete_length=body.size)
+        except werkzeug.exceptions.RequestedRangeNotSatisfiable:
+            body.close()
+            raise
+
     @classmethod
     def _serialize_data(cls, data, mimetype):
         # TODO: harmonize flask and aiohttp serialization when mimetype=None or mimetype is not JSON
         #       (cases where it might not make sense to jsonify the data)
-        if (isinstance(mimetype, str) and is_json_mimetype(mimetype)):
+        if isinstance(data, bytes):
+            # already serialized, like the rendered mock responses
+            body = data
+        elif (isinstance(mimetype, str) and is_json_mimetype(mimetype)):
             body = cls.jsonifier.dumps(data)
-        elif not (isinstance(data, bytes) or isinstance(data, str)):
+        elif not isinstance(data, str):
             warnings.warn(
                 "Implicit (flask) JSON serialization will change in the next major version. "
                 "This is triggered because a response body is being serialized as JSON "
@@ -240,6 +312,50 @@ class FlaskApi(AbstractAPI):
                      })
         return request
 
+    @classmethod
+    def get_streamed_request(cls, *args, **params):
+        # type: (*Any, **Any) -> ConnexionRequest
+        """Gets ConnexionRequest instance for the operation handler
+        streaming its request body: the body is left unread in the stream of
+        the request.
+
+        :rtype: ConnexionRequest
+        """
+        context_dict = {}
+        setattr(flask._request_ctx_stack.top, 'connexion_context', context_dict)
+        flask_request = flask.request
+        return ConnexionRequest(
+            flask_request.url,
+            flask_request.method,
+            headers=flask_request.headers,
+            query=flask_request.args,
+            json_getter=lambda: None,
+            files={},
+            path_params=params,
+            context=context_dict,
+            stream=RequestStream(flask_request.stream)
+        )
+
+    @classmethod
+    def get_limited_request(cls, body_limits):
+        """
+        :type body_limits: connexion.limits.BodyLimits
+        :return: a `get_request` function whose request bodies beyond the limits
+            are rejected before they are buffered or parsed
+        """
+        def get_request(*args, **params):
+            flask_request = flask.request
+            if body_limits.max_size is not None:
+                check_content_length(flask_request.headers, body_limits.max_size)
+                # the chunked bodies are counted while they are read
+                flask_request.stream = RequestStream(flask_request.stream, body_limits.max_size)
+            request = cls.get_request(*args, **params)
+            if body_limits.limits_json:
+                limit_json(request, body_limits)
+            return request
+
+        return get_request
+
     @classmethod
     def _set_jsonifier(cls):
         """
@@ -264,6 +380,8 @@ class InternalHandlers(object):
         self.base_path = base_path
         self.options = options
         self.specification = specification
+        self._executor = None
+        self._executor_lock = threading.Lock()
 
     def console_ui_home(self):
         """
@@ -301,6 +419,60 @@ class InternalHandlers(object):
     def get_yaml_spec(self):
         return yamldumper(self._spec_for_prefix()), 200, {"Content-Type": "text/yaml"}
 
+    def get_metrics(self):
+        return self.options.metrics.render(), 200, {"Content-Type": CONTENT_TYPE}
+
+    def batch(self):
+        """
+        Executes the requests of a batch in a thread pool, each one in its own request context.
+        """
+        request = flask.request
+        if request.environ.get(batch.BATCH_KEY):
+            raise BadRequestProblem(detail='Batches can not be nested')
+        body_limits = BodyLimits.from_options(self.options)
+        if body_limits.max_size is not None:
+            check_content_length(request.headers, body_limits.max_size)
+            # the chunked bodies are counted while they are read
+            request.stream = RequestStream(request.stream, body_limits.max_size)
+        sub_requests = batch.parse_batch(request.get_data(), request.headers,
+                                         self.options.batch_max_size, self.options.batch_path, body_limits)
+        app = flask.current_app._get_current_object()
+        # the path prefix of the API, as it is mounted
+        prefix = request.path[:len(request.path) - len(self.options.batch_path)]
+        base_url = request.host_url.rstrip('/') + request.script_root
+        environ_base = {'REMOTE_ADDR': request.remote_addr, batch.BATCH_KEY: True}
+
+        def execute(sub_request):
+            environ = EnvironBuilder(path=prefix + sub_request.path,
+                                     base_url=base_url,
+                                     method=sub_request.method,
+                                     headers=list(sub_request.headers.items()),
+                                     query_string=urlencode(sub_request.query),
+                                     data=sub_request.body,
+                                     environ_base=environ_base).get_environ()
+            with app.request_context(environ):
+                try:
+                    response = app.full_dispatch_request()
+                except Exception as e:
+                    response = app.handle_exception(e)
+                try:
+                    return batch.response_item(response.status_code, response.headers,
+                                               response.get_data(), response.mimetype)
+                finally:
+                    response.close()
+
+        return flask.jsonify(list(self._batch_executor.map(execute, sub_requests)))
+
+    @property
+    def _batch_executor(self):
+        # shared by the batches, so that they don't run more than `batch_concurrency` requests at once
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.options.batch_concurrency,
+                                                        thread_name_prefix='connexion-batch')
+        return self._executor
+
     def _spec_for_prefix(self):
         """
         Modify base_path in the spec based on incoming url
@@ -4,6 +4,7 @@ import pathlib
 
 from ..options import ConnexionOptions
 from ..resolver import Resolver
+from ..spec import Specification
 
 logger = logging.getLogger('connexion.app')
 
@@ -41,6 +42,8 @@ class AbstractApp(metaclass=abc.ABCMeta):
         self.arguments = arguments or {}
         self.api_cls = api_cls
         self.resolver_error = None
+        # content hash -> Specification of the APIs added
+        self._specifications = {}
 
         # Options
         self.auth_all_paths = auth_all_paths
@@ -93,8 +96,8 @@ class AbstractApp(metaclass=abc.ABCMeta):
         """
         Adds an API to the application based on a swagger file or API dict
 
-        :param specification: swagger file with the specification | specification dict
-        :type specification: pathlib.Path or str or dict
+        :param specification: swagger file with the specification | specification dict | loaded specification
+        :type specification: pathlib.Path or str or dict or connexion.spec.Specification
         :param base_path: base path where to add this api
         :type base_path: str | None
         :param arguments: api version specific arguments to replace on the specification
@@ -134,10 +137,10 @@ class AbstractApp(metaclass=abc.ABCMeta):
         arguments = arguments or dict()
         arguments = dict(self.arguments, **arguments)  # copy global arguments and update with api specfic
 
-        if isinstance(specification, dict):
-            specification = specification
-        else:
+        if not isinstance(specification, (dict, Specification)):
             specification = self.specification_dir / specification
+        # the APIs mounting the same specification share it
+        specification = Specification.load(specification, arguments=arguments, cache=self._specifications)
 
         api_options = self.options.extend(options)
 
@@ -225,7 +228,7 @@ class AbstractApp(metaclass=abc.ABCMeta):
         return self.app.route(rule, **options)
 
     @abc.abstractmethod
-    def run(self, port=None, server=None, debug=None, host=None, **options):  # pragma: no cover
+    def run(self, port=None, server=None, debug=None, host=None, workers=None, **options):  # pragma: no cover
         """
         Runs the application on a local development server.
         :param host: the host interface to bind on.
@@ -236,6 +239,8 @@ class AbstractApp(metaclass=abc.ABCMeta):
         :type server: str | None
         :param debug: include debugging information
         :type debug: bool
+        :param workers: number of worker processes forked to serve the requests
+        :type workers: int | None
         :param options: options to be forwarded to the underlying server
         """
 
@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import logging
 import os.path
 import pkgutil
@@ -7,8 +9,14 @@ from aiohttp import web
 
 from ..apis.aiohttp_api import AioHttpApi
 from ..exceptions import ConnexionException
+from . import prefork
 from .abstract import AbstractApp
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover
+    uvloop = None
+
 logger = logging.getLogger('connexion.aiohttp_app')
 
 
@@ -68,7 +76,30 @@ class AioHttpApp(AbstractApp):
     def _get_api(self, specification, kwargs):
         return super(AioHttpApp, self).add_api(specification, **kwargs)
 
-    def run(self, port=None, server=None, debug=None, host=None, **options):
+    def run(self, port=None, server=None, debug=None, host=None, workers=None, use_uvloop=False,
+            backlog=None, keepalive_timeout=None, shutdown_timeout=None, **options):
+        """
+        Runs the application with aiohttp.web.run_app.
+        :param host: the host interface to bind on.
+        :type host: str
+        :param port: port to listen to
+        :type port: int
+        :param server: which server to use
+        :type server: str | None
+        :param debug: include debugging information
+        :type debug: bool
+        :param workers: number of worker processes forked to serve the requests
+        :type workers: int | None
+        :param use_uvloop: run on the uvloop event loop, if uvloop is installed
+        :type use_uvloop: bool
+        :param backlog: maximum number of pending connections
+        :type backlog: int | None
+        :param keepalive_timeout: seconds an idle keep-alive connection stays open
+        :type keepalive_timeout: float | None
+        :param shutdown_timeout: seconds the pending requests have to complete when the server stops
+        :type shutdown_timeout: float | None
+        :param options: options to be forwarded to aiohttp.web.run_app
+        """
         if port is not None:
             self.port = port
         elif self.port is None:
@@ -90,6 +121,30 @@ class AioHttpApp(AbstractApp):
             if options.pop('use_default_access_log', None):
                 access_log = logger
 
-            web.run_app(self.app, port=self.port, host=self.host, access_log=access_log, **options)
+            for name, value in (('backlog', backlog), ('keepalive_timeout', keepalive_timeout),
+                                ('shutdown_timeout', shutdown_timeout)):
+                if value is not None:
+                    options[name] = value
+
+            if use_uvloop:
+                if uvloop is None:
+                    logger.warning('uvloop is not installed, using the default asyncio event loop')
+                else:
+                    # the loop of the server, also in the workers, is created by the policy
+                    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+            if workers is not None and workers > 1:
+                # the workers listen again on the socket of the master, with the same backlog
+                options.setdefault('backlog', prefork.DEFAULT_BACKLOG)
+                serve = functools.partial(self._serve_socket, access_log=access_log, **options)
+                prefork.run(self.host, self.port, serve, workers, backlog=options['backlog'])
+            else:
+                web.run_app(self.app, port=self.port, host=self.host, access_log=access_log, **options)
         else:
             raise Exception('Server {} not recognized'.format(self.server))
+
+    def _serve_socket(self, sock, **options):
+        """
+        Serves the application on a listening socket, in a worker process.
+        """
+        web.run_app(self.app, sock=sock, print=None, **options)
@@ -1,4 +1,5 @@
 import datetime
+import functools
 import logging
 import pathlib
 from decimal import Decimal
@@ -11,6 +12,7 @@ from flask import json
 from ..apis.flask_api import FlaskApi
 from ..exceptions import ProblemException
 from ..problem import problem
+from . import prefork
 from .abstract import AbstractApp
 
 logger = logging.getLogger('connexion.app')
@@ -62,7 +64,7 @@ class FlaskApp(AbstractApp):
         # type: (int, FunctionType) -> None
         self.app.register_error_handler(error_code, function)
 
-    def run(self, port=None, server=None, debug=None, host=None, **options):  # pragma: no cover
+    def run(self, port=None, server=None, debug=None, host=None, workers=None, **options):  # pragma: no cover
         """
         Runs the application on a local development server.
         :param host: the host interface to bind on.
@@ -73,6 +75,8 @@ class FlaskApp(AbstractApp):
         :type server: str | None
         :param debug: include debugging information
         :type debug: bool
+        :param workers: number of worker processes forked to serve the requests
+        :type workers: int | None
         :param options: options to be forwarded to the underlying server
         """
         # this functions is not covered in unit tests because we would effectively testing the mocks
@@ -92,7 +96,9 @@ class FlaskApp(AbstractApp):
             self.debug = debug
 
         logger.debug('Starting %s HTTP server..', self.server, extra=vars(self))
-        if self.server == 'flask':
+        if workers is not None and workers > 1:
+            prefork.run(self.host, self.port, functools.partial(self._serve_socket, **options), workers)
+        elif self.server == 'flask':
             self.app.run(self.host, port=self.port, debug=self.debug, **options)
         elif self.server == 'tornado':
             try:
@@ -117,6 +123,31 @@ class FlaskApp(AbstractApp):
         else:
             raise Exception('Server {} not recognized'.format(self.server))
 
+    def _serve_socket(self, sock, **options):  # pragma: no cover
+        """
+        Serves the application on a listening socket, in a worker process.
+        """
+        if self.server == 'flask':
+            import werkzeug.serving
+            self.app.debug = self.debug
+            http_server = werkzeug.serving.make_server(self.host, self.port, self.app, threaded=True,
+                                                       fd=sock.fileno(), **options)
+            http_server.serve_forever()
+        elif self.server == 'tornado':
+            import tornado.wsgi
+            import tornado.httpserver
+            import tornado.ioloop
+            wsgi_container = tornado.wsgi.WSGIContainer(self.app)
+            http_server = tornado.httpserver.HTTPServer(wsgi_container, **options)
+            http_server.add_sockets([sock])
+            tornado.ioloop.IOLoop.current().start()
+        elif self.server == 'gevent':
+            import gevent.pywsgi
+            http_server = gevent.pywsgi.WSGIServer(sock, self.app, **options)
+            http_server.serve_forever()
+        else:
+            raise Exception('Server {} not recognized'.format(self.server))
+
 
 class FlaskJSONEncoder(json.JSONEncoder):
     def default(self, o):
@@ -0,0 +1,162 @@
+"""
+Pre-forking multi-process server.
+
+The app is built once in a master process which binds the listening socket,
+then forks the workers serving requests on that shared socket. The master
+restarts the workers that exit unexpectedly until it is asked to stop.
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+
+from ..metrics import flush_multi_process_registries
+
+logger = logging.getLogger('connexion.apps.prefork')
+
+STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+DEFAULT_BACKLOG = 2048
+
+
+def bind_socket(host, port, backlog=DEFAULT_BACKLOG):
+    """
+    Returns a listening TCP socket bound to host and port, to be shared by the workers.
+
+    :type host: str
+    :type port: int
+    :param backlog: maximum number of pending connections
+    :type backlog: int
+    :rtype: socket.socket
+    """
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    return sock
+
+
+class PreforkServer(object):
+
+    def __init__(self, sock, serve, workers, restart_delay=1.0):
+        """
+        :param sock: the listening socket shared by the workers
+        :type sock: socket.socket
+        :param serve: function serving requests on the socket in a worker, until the worker is terminated
+        :type serve: types.FunctionType
+        :param workers: number of worker processes
+        :type workers: int
+        :param restart_delay: seconds to wait before restarting a worker which crashed right after it started
+        :type restart_delay: float
+        """
+        if not hasattr(os, 'fork'):  # pragma: no cover
+            raise RuntimeError('Multiple workers need os.fork(), which is not available on this platform')
+        self.sock = sock
+        self.serve = serve
+        self.workers = workers
+        self.restart_delay = restart_delay
+        self.stopping = False
+        # pid -> start time of the running workers
+        self._running = {}
+
+    def run(self):
+        """
+        Forks the workers, then supervises them until SIGINT or SIGTERM.
+        """
+        # the objects created so far, like the resolved specification and its compiled validators,
+        # are moved out of the garbage collector so that the workers don't copy their memory pages
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+
+        previous_handlers = {signum: signal.signal(signum, self._handle_stop) for signum in STOP_SIGNALS}
+        try:
+            for _ in range(self.workers):
+                self.spawn()
+            logger.info('Started %d workers on %s', self.workers, self.sock.getsockname())
+            self.supervise()
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+    def spawn(self):
+        """
+        :return: the pid of the new worker, None if the server is stopping
+        :rtype: int | None
+        """
+        # the stop signals are held until the worker is registered, so that the master terminates it
+        mask = signal.pthread_sigmask(signal.SIG_BLOCK, STOP_SIGNALS)
+        try:
+            if self.stopping:
+                return None
+            pid = os.fork()
+            if pid:
+                self._running[pid] = time.monotonic()
+                return pid
+            # worker process: Ctrl-C is handled by the master, which terminates its workers
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        finally:
+            signal.pthread_sigmask(signal.SIG_SETMASK, mask)
+
+        status = 0
+        try:
+            self.serve(self.sock)
+        except BaseException:
+            logger.exception('Worker %d crashed', os.getpid())
+            status = 1
+        finally:
+            try:
+                # os._exit() skips the atexit handlers
+                flush_multi_process_registries()
+            finally:
+                os._exit(status)
+
+    def supervise(self):
+        while self._running:
+            pid, status = os.wait()
+            started = self._running.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+
+            if os.WIFSIGNALED(status):
+                logger.warning('Worker %d was killed by signal %d, restarting it', pid, os.WTERMSIG(status))
+            else:
+                logger.warning('Worker %d exited with status %d, restarting it', pid, os.WEXITSTATUS(status))
+            if time.monotonic() - started < self.restart_delay:
+                # don't burn the CPU if the workers can't start
+                time.sleep(self.restart_delay)
+            if not self.stopping:
+                self.spawn()
+
+    def stop(self):
+        self.stopping = True
+        for pid in self._running:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:  # pragma: no cover
+                pass
+
+    def _handle_stop(self, signum, frame):
+        logger.info('Stopping the workers..')
+        self.stop()
+
+
+def run(host, port, serve, workers, backlog=None):
+    """
+    Serves on host and port with the given number of worker processes.
+
+    :param serve: function serving requests on the listening socket, until the worker is terminated
+    :type serve: types.FunctionType
+    :param backlog: maximum number of pending connections, `DEFAULT_BACKLOG` if None
+    :type backlog: int | None
+    """
+    sock = bind_socket(host, port, DEFAULT_BACKLOG if backlog is None else backlog)
+    try:
+        PreforkServer(sock, serve, workers).run()
+    finally:
+        sock.close()
@@ -0,0 +1,183 @@
+"""
+Batch endpoint executing several operations of an API in one HTTP request.
+
+The body of a batch request is a JSON array of sub-requests:
+
+    [{"method": "GET", "path": "/pets/1", "query": {"fields": "name"}, "headers": {}, "body": null}, ...]
+
+Every sub-request goes through the pipeline of its operation (security,
+validation, handler and serialization) as if it was sent on its own, and the
+response is the JSON array of their responses, in the same order:
+
+    [{"status": 200, "headers": {"Content-Type": "application/json"}, "body": {"name": "Rex"}}, ...]
+"""
+import base64
+import json
+import posixpath
+import re
+from urllib.parse import unquote
+
+from .exceptions import BadRequestProblem, PayloadTooLargeProblem
+from .http_facts import METHODS
+from .limits import check_json
+from .utils import is_json_mimetype
+
+# key of the WSGI environ of the sub-requests, a batch carrying it is nested
+BATCH_KEY = 'connexion.batch'
+# header of the sub-requests sent back to the aiohttp server, a batch carrying it is nested
+BATCH_HEADER = 'X-Connexion-Batch'
+
+# headers of the batch request which don't apply to its sub-requests
+BATCH_ONLY_HEADERS = frozenset([
+    'content-type', 'content-length', 'content-encoding', 'transfer-encoding', 'expect', 'connection'
+])
+# headers of the sub-responses which don't apply to their serialization in the batch response
+RESPONSE_SKIPPED_HEADERS = frozenset(['content-length', 'transfer-encoding', 'connection'])
+
+
+class SubRequest(object):
+    __slots__ = ('method', 'path', 'query', 'headers', 'body')
+
+    def __init__(self, method, path, query, headers, body):
+        """
+        :type method: str
+        :param path: path of the operation, relative to the base path of the API
+        :type path: str
+        :param query: list of the (name, value) query parameters
+        :type query: list
+        :type headers: dict
+        :param body: the encoded body, None if there is none
+        :type body: bytes | None
+        """
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+
+def parse_batch(data, batch_headers, max_size, batch_path, body_limits=None):
+    """
+    Parses the body of a batch request into its sub-requests.
+
+    :param data: body of the batch request
+    :type data: bytes
+    :param batch_headers: headers of the batch request, inherited by the sub-requests (e.g. Authorization)
+    :param max_size: maximum number of sub-requests
+    :type max_size: int
+    :param batch_path: path of the batch endpoint, which can't be a sub-request
+    :type batch_path: str
+    :param body_limits: limits of the JSON of the body, checked before it is parsed
+    :type body_limits: connexion.limits.BodyLimits | None
+    :rtype: list[SubRequest]
+    """
+    if body_limits is not None and body_limits.limits_json:
+        check_json(data, body_limits.max_json_depth, body_limits.max_json_items)
+    try:
+        items = json.loads(data.decode('utf-8'))
+    except ValueError as e:
+        raise BadRequestProblem(detail='The batch request body is not valid JSON: {}'.format(e))
+    if not isinstance(items, list):
+        raise BadRequestProblem(detail='The batch request body must be an array of requests')
+    if len(items) > max_size:
+        raise PayloadTooLargeProblem(
+            detail='The batch has {} requests, the maximum is {}'.format(len(items), max_size))
+
+    inherited_headers = {name: value for name, value in batch_headers.items()
+                         if name.lower() not in BATCH_ONLY_HEADERS}
+    return [_parse_sub_request(index, item, inherited_headers, batch_path) for index, item in enumerate(items)]
+
+
+def _parse_sub_request(index, item, inherited_headers, batch_path):
+    def invalid(detail):
+        return BadRequestProblem(detail='Invalid request {} of the batch: {}'.format(index, detail))
+
+    if not isinstance(item, dict):
+        raise invalid('not an object')
+    method = item.get('method', 'GET')
+    if not isinstance(method, str) or method.lower() not in METHODS:
+        raise invalid("'{}' is not an HTTP method".format(method))
+    path = item.get('path')
+    if not isinstance(path, str) or not path.startswith('/'):
+        raise invalid("'path' must be a string starting with '/'")
+    if '?' in path:
+        raise invalid("the query parameters go in 'query', not in 'path'")
+    if normalize_path(path) == normalize_path(batch_path):
+        raise invalid('batches can not be nested')
+
+    query = item.get('query') or {}
+    if not isinstance(query, dict):
+        raise invalid("'query' must be an object")
+    query_pairs = []
+    for name, value in query.items():
+        for single_value in (value if isinstance(value, list) else [value]):
+            if isinstance(single_value, bool):
+                single_value = 'true' if single_value else 'false'
+            query_pairs.append((name, str(single_value)))
+
+    headers = item.get('headers') or {}
+    if not isinstance(headers, dict) or not all(isinstance(value, str) for value in headers.values()):
+        raise invalid("'headers' must be an object of strings")
+    sub_headers = dict(inherited_headers)
+    sub_headers.update(headers)
+
+    body = None
+    if item.get('body') is not None:
+        content_type = next((value for name, value in headers.items() if name.lower() == 'content-type'), None)
+        if content_type is not None and not _is_json(content_type):
+            if not isinstance(item['body'], str):
+                raise invalid("the 'body' of a {} request must be a string".format(content_type))
+            body = item['body'].encode('utf-8')
+        else:
+            body = json.dumps(item['body']).encode('utf-8')
+            if content_type is None:
+                sub_headers['Content-Type'] = 'application/json'
+
+    return SubRequest(method.upper(), path, query_pairs, sub_headers, body)
+
+
+def normalize_path(path):
+    """
+    Normalizes a path as the routers see it: decoded, without repeated slashes nor dot segments.
+
+    :type path: str
+    :rtype: str
+    """
+    return posixpath.normpath(re.sub('/+', '/', unquote(path))).rstrip('/')
+
+
+def response_item(status_code, headers, body, mimetype):
+    """
+    Serializable result of a sub-request in the batch response.
+
+    :type status_code: int
+    :type headers: dict
+    :type body: bytes
+    :type mimetype: str | None
+    :rtype: dict
+    """
+    item = {
+        'status': status_code,
+        'headers': {name: value for name, value in headers.items()
+                    if name.lower() not in RESPONSE_SKIPPED_HEADERS},
+    }
+    if not body:
+        item['body'] = None
+        return item
+    if mimetype and _is_json(mimetype):
+        try:
+            item['body'] = json.loads(body.decode('utf-8'))
+            return item
+        except ValueError:
+            pass
+    try:
+        item['body'] = body.decode('utf-8')
+    except UnicodeDecodeError:
+        item['body'] = base64.b64encode(body).decode('ascii')
+        item['bodyEncoding'] = 'base64'
+    return item
+
+
+def _is_json(content_type):
+    mimetype = content_type.split(';', 1)[0].strip()
+    return '/' in mimetype and is_json_mimetype(mimetype)
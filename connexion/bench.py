@@ -0,0 +1,626 @@
+"""
+In-process load generator for an API specification, see `connexion bench`.
+
+A valid request is generated for every operation from the examples and
+schemas of its parameters and request body. The requests are sent
+concurrently through the Flask test client or, for aiohttp, to a server on a
+local socket, and the latency of every request is recorded per operation.
+"""
+import asyncio
+import cProfile
+import fnmatch
+import itertools
+import json
+import math
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urlencode
+
+from .http_facts import METHODS
+from .mock import MockResolver
+from .operations import OpenAPIOperation, make_operation
+from .utils import all_json
+
+MULTIPART_BOUNDARY = 'connexion-bench-boundary'
+FORM_CONTENT_TYPE = 'application/x-www-form-urlencoded'
+MULTIPART_CONTENT_TYPE = 'multipart/form-data'
+COLLECTION_DELIMITERS = {'csv': ',', 'ssv': ' ', 'tsv': '\t', 'pipes': '|'}
+STYLE_DELIMITERS = {'spaceDelimited': ' ', 'pipeDelimited': '|'}
+STRING_FORMATS = {
+    'date': '2020-01-01',
+    'date-time': '2020-01-01T00:00:00Z',
+    'time': '00:00:00',
+    'email': 'user@example.com',
+    'uuid': '00000000-0000-4000-8000-000000000000',
+    'uri': 'https://example.com/',
+    'url': 'https://example.com/',
+    'hostname': 'example.com',
+    'ipv4': '127.0.0.1',
+    'ipv6': '::1',
+    'byte': 'Ynl0ZXM=',
+    'binary': 'bytes',
+    'password': 'password',
+}
+PERCENTILES = (50, 95, 99)
+
+
+def sample_value(schema):
+    """
+    Returns a value valid against a JSON schema, preferring its example,
+    default and enum values.
+
+    :type schema: dict
+    """
+    for key in ('example', 'x-example', 'default'):
+        if key in schema:
+            return schema[key]
+    if schema.get('enum'):
+        return schema['enum'][0]
+    if 'allOf' in schema:
+        value = {}
+        for sub_schema in schema['allOf']:
+            sub_value = sample_value(sub_schema)
+            if not isinstance(sub_value, dict):
+                return sub_value
+            value.update(sub_value)
+        return value
+    for key in ('oneOf', 'anyOf'):
+        if schema.get(key):
+            return sample_value(schema[key][0])
+
+    schema_type = schema.get('type')
+    if schema_type is None:
+        schema_type = 'object' if 'properties' in schema else 'string'
+    if schema_type == 'object':
+        return {name: sample_value(property_schema)
+                for name, property_schema in schema.get('properties', {}).items()
+                if not property_schema.get('readOnly')}
+    if schema_type == 'array':
+        return [sample_value(schema.get('items', {}))] * max(schema.get('minItems', 1), 1)
+    if schema_type in ('integer', 'number'):
+        value = schema.get('minimum', 0)
+        if schema.get('exclusiveMinimum') is True:
+            value += 1
+        elif not isinstance(schema.get('exclusiveMinimum'), bool) and 'exclusiveMinimum' in schema:
+            value = schema['exclusiveMinimum'] + 1
+        if 'maximum' in schema and value > schema['maximum']:
+            value = schema['maximum']
+        if schema.get('multipleOf'):
+            value = value + (-value % schema['multipleOf'])
+        return int(value) if schema_type == 'integer' else float(value)
+    if schema_type == 'boolean':
+        return True
+    if schema_type == 'null':
+        return None
+    if schema_type == 'file':
+        return STRING_FORMATS['binary']
+    value = STRING_FORMATS.get(schema.get('format'), 'string')
+    if len(value) < schema.get('minLength', 0):
+        value = value + 'x' * (schema['minLength'] - len(value))
+    if 'maxLength' in schema:
+        value = value[:schema['maxLength']]
+    return value
+
+
+def format_value(value):
+    """
+    :rtype: str
+    """
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+class RequestTemplate(object):
+    """
+    A request generated for an operation, sent as is on every iteration.
+    """
+
+    __slots__ = ('name', 'operation_id', 'method', 'url', 'headers', 'body')
+
+    def __init__(self, name, operation_id, method, url, headers, body):
+        self.name = name
+        self.operation_id = operation_id
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.body = body
+
+    def __repr__(self):  # pragma: no cover
+        return '<RequestTemplate {} {}>'.format(self.method, self.url)
+
+
+class RequestGenerator(object):
+    """
+    Generates the request of an operation of an OpenAPI 3 or Swagger 2 spec.
+    """
+
+    def __init__(self, operation, base_path):
+        """
+        :type operation: connexion.operations.AbstractOperation
+        :param base_path: base path of the API the operation is mounted on
+        :type base_path: str
+        """
+        self.operation = operation
+        self.base_path = base_path
+        self.is_openapi = isinstance(operation, OpenAPIOperation)
+
+    def parameter_value(self, parameter):
+        if 'example' in parameter:
+            return parameter['example']
+        if parameter.get('examples'):
+            return next(iter(parameter['examples'].values())).get('value')
+        if 'x-example' in parameter:
+            return parameter['x-example']
+        return sample_value(parameter.get('schema', parameter))
+
+    def query_pairs(self, parameter, value):
+        name = parameter['name']
+        if self.is_openapi:
+            style = parameter.get('style', 'form')
+            explode = parameter.get('explode', style == 'form')
+            if isinstance(value, dict):
+                if style == 'deepObject':
+                    return [('{}[{}]'.format(name, key), format_value(item)) for key, item in value.items()]
+                if explode:
+                    return [(key, format_value(item)) for key, item in value.items()]
+                return [(name, ','.join(format_value(part) for item in value.items() for part in item))]
+            if isinstance(value, list):
+                if explode and style == 'form':
+                    return [(name, format_value(item)) for item in value]
+                delimiter = STYLE_DELIMITERS.get(style, ',')
+                return [(name, delimiter.join(format_value(item) for item in value))]
+        elif isinstance(value, list):
+            collection_format = parameter.get('collectionFormat', 'csv')
+            if collection_format == 'multi':
+                return [(name, format_value(item)) for item in value]
+            delimiter = COLLECTION_DELIMITERS.get(collection_format, ',')
+            return [(name, delimiter.join(format_value(item) for item in value))]
+        return [(name, format_value(value))]
+
+    def is_included(self, parameter):
+        # optional parameters are only sent if the spec gives an example
+        return (parameter.get('required') or
+                any(key in parameter for key in ('example', 'examples', 'x-example')))
+
+    def body(self, headers, form):
+        """
+        :param form: values of the formData parameters (Swagger 2)
+        :type form: dict
+        :rtype: bytes
+        """
+        operation = self.operation
+        if self.is_openapi:
+            if not operation.request_body:
+                return b''
+            body_definition = operation.body_definition
+            if 'example' in body_definition:
+                value = body_definition['example']
+            elif body_definition.get('examples'):
+                value = next(iter(body_definition['examples'].values())).get('value')
+            else:
+                value = sample_value(body_definition.get('schema', {}))
+        elif form:
+            value = form
+        elif operation.body_definition:
+            body_definition = operation.body_definition
+            value = body_definition.get('x-example', sample_value(body_definition.get('schema', {})))
+        else:
+            return b''
+
+        content_type = operation.consumes[0] if operation.consumes else 'application/json'
+        if all_json([content_type]):
+            headers['Content-Type'] = content_type
+            return json.dumps(value).encode()
+        if content_type == FORM_CONTENT_TYPE:
+            headers['Content-Type'] = content_type
+            return urlencode([(name, format_value(item))
+                              for name, values in (value or {}).items()
+                              for item in (values if isinstance(values, list) else [values])]).encode()
+        if content_type == MULTIPART_CONTENT_TYPE:
+            headers['Content-Type'] = '{}; boundary={}'.format(MULTIPART_CONTENT_TYPE, MULTIPART_BOUNDARY)
+            return encode_multipart(value or {})
+        headers['Content-Type'] = content_type
+        if isinstance(value, bytes):
+            return value
+        return format_value(value).encode()
+
+    def generate(self):
+        """
+        :rtype: RequestTemplate
+        """
+        operation = self.operation
+        path = operation.path
+        query = []
+        headers = {}
+        cookies = []
+        form = {}
+        for parameter in operation.parameters:
+            location = parameter['in']
+            if location == 'body' or not (location == 'path' or self.is_included(parameter)):
+                continue
+            value = self.parameter_value(parameter)
+            if location == 'path':
+                if isinstance(value, list):
+                    value = ','.join(format_value(item) for item in value)
+                path = path.replace('{' + parameter['name'] + '}', quote(format_value(value), safe=''))
+            elif location == 'query':
+                query.extend(self.query_pairs(parameter, value))
+            elif location == 'header':
+                headers[parameter['name']] = format_value(value)
+            elif location == 'cookie':
+                cookies.append('{}={}'.format(parameter['name'], quote(format_value(value))))
+            elif location == 'formData':
+                form[parameter['name']] = value
+        if cookies:
+            headers['Cookie'] = '; '.join(cookies)
+        body = self.body(headers, form)
+
+        url = self.base_path + path
+        if query:
+            url = '{}?{}'.format(url, urlencode(query))
+        method = operation.method.upper()
+        return RequestTemplate('{} {}'.format(method, operation.path), operation.operation_id,
+                               method, url, headers, body)
+
+
+def encode_multipart(fields):
+    """
+    :type fields: dict
+    :rtype: bytes
+    """
+    parts = []
+    for name, value in fields.items():
+        disposition = 'form-data; name="{}"'.format(name)
+        if value == STRING_FORMATS['binary']:
+            disposition += '; filename="{}"'.format(name)
+        parts.append('--{}\r\nContent-Disposition: {}\r\n\r\n{}\r\n'.format(
+            MULTIPART_BOUNDARY, disposition, format_value(value)))
+    parts.append('--{}--\r\n'.format(MULTIPART_BOUNDARY))
+    return ''.join(parts).encode()
+
+
+def generate_requests(api, patterns=None):
+    """
+    Generates one request per operation of an API.
+
+    :type api: connexion.apis.AbstractAPI
+    :param patterns: glob patterns of the operation ids or `METHOD /path` names to include, all if empty
+    :type patterns: list | None
+    :rtype: list[RequestTemplate]
+    """
+    spec = api.specification
+    # the operations are only built to read their parameters, not to be called
+    resolver = MockResolver(mock_all=True)
+    templates = []
+    for path, methods in spec.get('paths', {}).items():
+        for method in methods:
+            if method not in METHODS:
+                continue
+            operation = make_operation(spec, None, path, method, resolver)
+            template = RequestGenerator(operation, api.base_path).generate()
+            if patterns and not any(fnmatch.fnmatchcase(template.operation_id, pattern) or
+                                    fnmatch.fnmatchcase(template.name, pattern)
+                                    for pattern in patterns):
+                continue
+            templates.append(template)
+    return templates
+
+
+def percentile(sorted_values, percent):
+    """
+    :param sorted_values: values in ascending order
+    :type sorted_values: list
+    :param percent: 0 - 100
+    :rtype: float
+    """
+    if not sorted_values:
+        return 0.0
+    # nearest rank
+    index = max(math.ceil(percent / 100.0 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class OperationStats(object):
+
+    def __init__(self, template):
+        """
+        :type template: RequestTemplate
+        """
+        self.template = template
+        self.latencies = []
+        self.statuses = Counter()
+        self.errors = Counter()
+
+    def record(self, latency, status=None, error=None):
+        self.latencies.append(latency)
+        if error is not None:
+            self.errors[type(error).__name__] += 1
+        else:
+            self.statuses[status] += 1
+
+    def to_dict(self, elapsed):
+        """
+        :param elapsed: duration of the whole run in seconds
+        :type elapsed: float
+        :rtype: dict
+        """
+        latencies = sorted(self.latencies)
+        result = {
+            'operation_id': self.template.operation_id,
+            'method': self.template.method,
+            'url': self.template.url,
+            'requests': len(latencies),
+            'throughput': len(latencies) / elapsed if elapsed else 0.0,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            'errors': dict(self.errors),
+        }
+        for percent in PERCENTILES:
+            result['p{}'.format(percent)] = percentile(latencies, percent)
+        result['max'] = latencies[-1] if latencies else 0.0
+        return result
+
+
+class Profiler(object):
+    """
+    Records the CPU time per function and the memory allocated per line of
+    code while the requests are sent.
+    """
+
+    def __init__(self):
+        self._profiles = []
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    def start(self):
+        """
+        Starts tracing the memory allocations, after the warmup requests.
+        """
+        tracemalloc.start()
+        self._snapshot = tracemalloc.take_snapshot()
+
+    def profile(self):
+        """
+        :return: a started profile of the current thread
+        :rtype: cProfile.Profile
+        """
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        profile.enable()
+        return profile
+
+    def stop(self, top=10):
+        """
+        :param top: number of functions and lines of code reported
+        :type top: int
+        :rtype: dict
+        """
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        allocations = []
+        for diff in snapshot.compare_to(self._snapshot, 'lineno')[:top]:
+            frame = diff.traceback[0]
+            allocations.append({'location': '{}:{}'.format(frame.filename, frame.lineno),
+                                'size': diff.size_diff,
+                                'count': diff.count_diff})
+
+        functions = []
+        if self._profiles:
+            stats = pstats.Stats(self._profiles[0])
+            for profile in self._profiles[1:]:
+                stats.add(profile)
+            entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+            for (filename, lineno, function), (_, calls, tottime, cumtime, _) in entries:
+                functions.append({'function': '{}:{}({})'.format(filename, lineno, function),
+                                  'calls': calls,
+                                  'tottime': tottime,
+                                  'cumtime': cumtime})
+        return {'peak_memory': peak, 'allocations': allocations, 'cpu': functions}
+
+
+def schedule(templates, total, stats):
+    """
+    :return: an iterator over `total` (template, stats) pairs, the operations taking turns
+    """
+    pairs = [(template, stats[template.name]) for template in templates]
+    return itertools.islice(itertools.cycle(pairs), total)
+
+
+def run_flask(app, templates, total, concurrency, warmup=1, profiler=None):
+    """
+    Sends the requests through the Flask test client.
+
+    :type app: connexion.apps.flask_app.FlaskApp
+    :return: the stats by operation and the duration of the run in seconds
+    :rtype: tuple[dict, float]
+    """
+    stats = {template.name: OperationStats(template) for template in templates}
+    perf_counter = time.perf_counter
+
+    def send(client, template):
+        response = client.open(template.url, method=template.method, headers=template.headers,
+                               data=template.body, content_type=template.headers.get('Content-Type'))
+        response.close()
+        return response.status_code
+
+    client = app.app.test_client()
+    for template in templates:
+        for _ in range(warmup):
+            try:
+                send(client, template)
+            except Exception:
+                pass
+
+    pairs = schedule(templates, total, stats)
+    lock = threading.Lock()
+    if profiler is not None:
+        profiler.start()
+
+    def worker():
+        client = app.app.test_client()
+        profile = profiler.profile() if profiler is not None else None
+        try:
+            while True:
+                with lock:
+                    pair = next(pairs, None)
+                if pair is None:
+                    return
+                template, operation_stats = pair
+                start = perf_counter()
+                try:
+                    status = send(client, template)
+                except Exception as e:
+                    operation_stats.record(perf_counter() - start, error=e)
+                else:
+                    operation_stats.record(perf_counter() - start, status)
+        finally:
+            if profile is not None:
+                profile.disable()
+
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return stats, perf_counter() - start
+
+
+def run_aiohttp(app, templates, total, concurrency, warmup=1, profiler=None):
+    """
+    Sends the requests to the aiohttp app served on a local socket.
+
+    :type app: connexion.apps.aiohttp_app.AioHttpApp
+    :return: the stats by operation and the duration of the run in seconds
+    :rtype: tuple[dict, float]
+    """
+    from aiohttp.test_utils import TestClient, TestServer
+
+    stats = {template.name: OperationStats(template) for template in templates}
+    perf_counter = time.perf_counter
+
+    async def send(client, template):
+        async with client.request(template.method, template.url, headers=template.headers,
+                                  data=template.body) as response:
+            await response.read()
+            return response.status
+
+    async def worker(client, pairs):
+        for template, operation_stats in pairs:
+            start = perf_counter()
+            try:
+                status = await send(client, template)
+            except Exception as e:
+                operation_stats.record(perf_counter() - start, error=e)
+            else:
+                operation_stats.record(perf_counter() - start, status)
+
+    async def run():
+        client = TestClient(TestServer(app.app))
+        await client.start_server()
+        try:
+            for template in templates:
+                for _ in range(warmup):
+                    try:
+                        await send(client, template)
+                    except Exception:
+                        pass
+            pairs = schedule(templates, total, stats)
+            profile = None
+            if profiler is not None:
+                profiler.start()
+                profile = profiler.profile()
+            start = perf_counter()
+            try:
+                await asyncio.gather(*[worker(client, pairs) for _ in range(concurrency)])
+            finally:
+                elapsed = perf_counter() - start
+                if profile is not None:
+                    profile.disable()
+            return elapsed
+        finally:
+            await client.close()
+
+    loop = asyncio.new_event_loop()
+    try:
+        elapsed = loop.run_until_complete(run())
+    finally:
+        loop.close()
+    return stats, elapsed
+
+
+RUNNERS = {
+    'flask': run_flask,
+    'aiohttp': run_aiohttp,
+}
+
+
+def bench(app, app_framework, templates, total, concurrency, warmup=1, profile=False, top=10):
+    """
+    Sends `total` requests, the operations taking turns, from `concurrency`
+    concurrent clients.
+
+    :param app: app the API of the templates is added to
+    :param app_framework: 'flask' or 'aiohttp'
+    :type templates: list[RequestTemplate]
+    :param warmup: requests per operation sent before measuring
+    :param profile: report the CPU time and memory allocations, which slows the requests down
+    :param top: number of functions and lines of code in the profile
+    :return: the report of the run
+    :rtype: dict
+    """
+    profiler = Profiler() if profile else None
+    stats, elapsed = RUNNERS[app_framework](app, templates, total, concurrency, warmup, profiler)
+    report = {
+        'app_framework': app_framework,
+        'concurrency': concurrency,
+        'requests': sum(len(operation_stats.latencies) for operation_stats in stats.values()),
+        'elapsed': elapsed,
+        'operations': {name: operation_stats.to_dict(elapsed) for name, operation_stats in stats.items()},
+    }
+    report['throughput'] = report['requests'] / elapsed if elapsed else 0.0
+    if profiler is not None:
+        report['profile'] = profiler.stop(top)
+    return report
+
+
+def format_report(report):
+    """
+    :rtype: str
+    """
+    lines = ['{:<50} {:>8} {:>10} {:>9} {:>9} {:>9}  {}'.format(
+        'Operation', 'Requests', 'Req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'Statuses')]
+    for name, result in sorted(report['operations'].items()):
+        statuses = ', '.join('{}: {}'.format(status, count) for status, count in result['statuses'].items())
+        errors = ', '.join('{}: {}'.format(error, count) for error, count in result['errors'].items())
+        lines.append('{:<50} {:>8} {:>10.1f} {:>9.2f} {:>9.2f} {:>9.2f}  {}'.format(
+            name[:50], result['requests'], result['throughput'],
+            result['p50'] * 1000, result['p95'] * 1000, result['p99'] * 1000,
+            '; '.join(part for part in (statuses, errors) if part)))
+    lines.append('')
+    lines.append('{} requests in {:.2f} s with {} concurrent clients ({}): {:.1f} requests/s'.format(
+        report['requests'], report['elapsed'], report['concurrency'], report['app_framework'],
+        report['throughput']))
+
+    profile = report.get('profile')
+    if profile is not None:
+        lines.append('')
+        lines.append('Peak traced memory: {:.1f} KiB'.format(profile['peak_memory'] / 1024))
+        lines.append('Top allocations:')
+        for allocation in profile['allocations']:
+            lines.append('  {:>10.1f} KiB {:>8} blocks  {}'.format(
+                allocation['size'] / 1024, allocation['count'], allocation['location']))
+        lines.append('Top CPU time (own time):')
+        for function in profile['cpu']:
+            lines.append('  {:>8.3f} s {:>8.3f} s cumulative {:>9} calls  {}'.format(
+                function['tottime'], function['cumtime'], function['calls'], function['function']))
+    return '\n'.join(lines)
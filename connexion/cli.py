@@ -1,3 +1,4 @@
+import json
 import logging
 import sys
 from os import path
@@ -69,12 +70,27 @@ def main():
               type=click.Choice(AVAILABLE_SERVERS.keys()),
               callback=validate_server_requirements,
               help='Which server container to use.')
+@click.option('--workers', default=1, type=click.IntRange(1), show_default=True,
+              help='Number of worker processes forked to serve the requests on the same port.')
+@click.option('--uvloop', 'use_uvloop', is_flag=True, default=False,
+              help='Use the uvloop event loop if it is installed (aiohttp only).')
+@click.option('--backlog', type=click.IntRange(1),
+              help='Maximum number of pending connections (aiohttp only).')
+@click.option('--keepalive-timeout', type=click.FloatRange(0), metavar='SECONDS',
+              help='Close idle keep-alive connections after this time (aiohttp only).')
+@click.option('--shutdown-timeout', type=click.FloatRange(0), metavar='SECONDS',
+              help='Time given to the pending requests to complete when the server stops (aiohttp only).')
+@click.option('--access-log', is_flag=True, default=False,
+              help='Log every request (aiohttp only).')
 @click.option('--stub',
               help='Returns status code 501, and `Not Implemented Yet` payload, for '
               'the endpoints which handlers are not found.',
               is_flag=True, default=False)
 @click.option('--mock', type=click.Choice(['all', 'notimplemented']),
               help='Returns example data for all endpoints or for which handlers are not found.')
+@click.option('--mock-prefer',
+              help='Let clients choose the mocked example with a `Prefer: code=404, example=name` header.',
+              is_flag=True, default=False)
 @click.option('--hide-spec',
               help='Hides the API spec in JSON format which is by default available at `/swagger.json`.',
               is_flag=True, default=False)
@@ -108,8 +124,15 @@ def run(spec_file,
         host,
         wsgi_server,
         server,
+        workers,
+        use_uvloop,
+        backlog,
+        keepalive_timeout,
+        shutdown_timeout,
+        access_log,
         stub,
         mock,
+        mock_prefer,
         hide_spec,
         hide_console_ui,
         console_ui_url,
@@ -147,11 +170,23 @@ def run(spec_file,
         )
         raise click.UsageError(message)
 
+    aiohttp_options = {
+        'use_uvloop': use_uvloop,
+        'backlog': backlog,
+        'keepalive_timeout': keepalive_timeout,
+        'shutdown_timeout': shutdown_timeout,
+        'use_default_access_log': access_log
+    }
+    aiohttp_options = {name: value for name, value in aiohttp_options.items()
+                       if value is not None and value is not False}
     if app_framework == AIOHTTP_APP:
         try:
             import aiohttp  # NOQA
         except Exception:
             fatal_error('aiohttp library is not installed')
+    elif aiohttp_options:
+        raise click.UsageError('--uvloop, --backlog, --keepalive-timeout, --shutdown-timeout and --access-log '
+                               'can only be used with the aiohttp app-framework')
 
     logging_level = logging.WARN
     if verbose > 0:
@@ -174,7 +209,7 @@ def run(spec_file,
 
     api_extra_args = {}
     if mock:
-        resolver = MockResolver(mock_all=mock == 'all')
+        resolver = MockResolver(mock_all=mock == 'all', prefer=mock_prefer)
         api_extra_args['resolver'] = resolver
 
     app_cls = connexion.utils.get_function_from_name(
@@ -200,10 +235,128 @@ def run(spec_file,
                 strict_validation=strict_validation,
                 **api_extra_args)
 
+    run_options = dict(aiohttp_options)
+    if workers > 1:
+        run_options['workers'] = workers
+    if access_log:
+        logging.getLogger('connexion.aiohttp_app').setLevel(min(logging_level, logging.INFO))
+
     app.run(port=port,
             host=host,
             server=server,
-            debug=debug)
+            debug=debug,
+            **run_options)
+
+
+def parse_header(ctx, param, value):
+    headers = {}
+    for header in value:
+        name, separator, header_value = header.partition(':')
+        if not separator or not name.strip():
+            raise click.BadParameter("'{}' is not a 'Name: value' header".format(header))
+        headers[name.strip()] = header_value.strip()
+    return headers
+
+
+@main.command()
+@click.argument('spec_file')
+@click.argument('base_module_path', required=False)
+@click.option('--mock', type=click.Choice(['all', 'notimplemented']),
+              help='Returns example data for all endpoints or for which handlers are not found.')
+@click.option('--requests', '-n', 'total', default=1000, type=click.IntRange(1), show_default=True,
+              help='Number of requests sent, the operations taking turns.')
+@click.option('--concurrency', '-c', default=10, type=click.IntRange(1), show_default=True,
+              help='Number of concurrent clients.')
+@click.option('--warmup', default=1, type=click.IntRange(0), show_default=True,
+              help='Requests per operation sent before measuring.')
+@click.option('--operation', '-o', 'operations', multiple=True, metavar='PATTERN',
+              help="Only benchmark the operations whose operationId or 'METHOD /path' matches the glob PATTERN.")
+@click.option('--header', 'headers', multiple=True, callback=parse_header, metavar='"NAME: VALUE"',
+              help='Header added to every request, e.g. for authorization.')
+@click.option('--profile', is_flag=True, default=False,
+              help='Report the top CPU time and memory allocations (slows the requests down).')
+@click.option('--top', default=10, type=click.IntRange(1), show_default=True,
+              help='Number of functions and lines of code in the profile.')
+@click.option('--output', type=click.Path(dir_okay=False, writable=True),
+              help='Write the report as JSON to this file.')
+@click.option('--validate-responses',
+              help='Enable validation of response values from operation handlers.',
+              is_flag=True, default=False)
+@click.option('--strict-validation',
+              help='Enable strict validation of request payloads.',
+              is_flag=True, default=False)
+@click.option('--base-path', metavar='PATH',
+              help='Override the basePath in the API spec.')
+@click.option('--app-framework', '-f', default=FLASK_APP,
+              type=click.Choice(AVAILABLE_APPS.keys()),
+              help='The app framework used to serve the requests')
+def bench(spec_file,
+          base_module_path,
+          mock,
+          total,
+          concurrency,
+          warmup,
+          operations,
+          headers,
+          profile,
+          top,
+          output,
+          validate_responses,
+          strict_validation,
+          base_path,
+          app_framework):
+    """
+    Sends generated requests to the operations of an OpenAPI/Swagger 2.0 Specification file in-process
+    and reports the throughput and latency of each operation.
+
+    The request of every operation is generated from the examples and schemas of its parameters and body.
+
+    Arguments:
+
+    - SPEC_FILE: specification file that describes the server endpoints.
+
+    - BASE_MODULE_PATH (optional): filesystem path where the API endpoints handlers are going to be imported from.
+    """
+    from connexion import bench as bench_module
+
+    if app_framework == AIOHTTP_APP:
+        try:
+            import aiohttp  # NOQA
+        except Exception:
+            fatal_error('aiohttp library is not installed')
+
+    logging.basicConfig(level=logging.ERROR)
+
+    spec_file_full_path = path.abspath(spec_file)
+    py_module_path = base_module_path or path.dirname(spec_file_full_path)
+    sys.path.insert(1, path.abspath(py_module_path))
+
+    api_extra_args = {}
+    if mock:
+        api_extra_args['resolver'] = MockResolver(mock_all=mock == 'all')
+
+    app_cls = connexion.utils.get_function_from_name(
+      AVAILABLE_APPS[app_framework]
+    )
+    app = app_cls(__name__, options={'swagger_ui': False})
+    api = app.add_api(spec_file_full_path,
+                      base_path=base_path,
+                      validate_responses=validate_responses,
+                      strict_validation=strict_validation,
+                      **api_extra_args)
+
+    templates = bench_module.generate_requests(api, operations)
+    if not templates:
+        raise click.UsageError('No operation to benchmark')
+    for template in templates:
+        template.headers.update(headers)
+
+    report = bench_module.bench(app, app_framework, templates, total, concurrency,
+                                warmup=warmup, profile=profile, top=top)
+    click.echo(bench_module.format_report(report))
+    if output:
+        with open(output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
 
 
 if __name__ == '__main__':  # pragma: no cover
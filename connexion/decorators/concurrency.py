@@ -0,0 +1,319 @@
+"""
+Concurrency limits of the operations.
+
+A limiter bounds the number of requests of an operation handled at the same
+time. The requests above the limit wait in a bounded queue for a slot, and the
+requests which don't fit in the queue are rejected right away with a 503
+problem response, before security checks or request body parsing, so that an
+overloaded operation can't starve the others of workers.
+
+The limit is either static or adjusted to the latency of the requests by an
+`AdaptiveConcurrencyLimiter`.
+"""
+import abc
+import asyncio
+import collections
+import functools
+import logging
+import math
+import threading
+import time
+
+from ..exceptions import ServiceUnavailableProblem
+
+logger = logging.getLogger('connexion.decorators.concurrency')
+
+
+class ConcurrencyLimiter(object):
+    """
+    Limits the number of requests of an operation handled at the same time.
+
+    Works with threaded servers (Flask) and with the event loop (aiohttp),
+    depending on the function it decorates.
+    """
+
+    def __init__(self, limit, max_queue=0, retry_after=1):
+        """
+        :param limit: maximum number of requests handled at the same time
+        :type limit: int
+        :param max_queue: maximum number of requests waiting for a slot, the others are rejected
+        :type max_queue: int
+        :param retry_after: value of the Retry-After header of the rejections, in seconds
+        :type retry_after: int
+        """
+        if limit < 1:
+            raise ValueError('The concurrency limit must be at least 1, got {}'.format(limit))
+        if max_queue < 0:
+            raise ValueError('The maximum queue size can not be negative, got {}'.format(max_queue))
+        self.limit = limit
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected = 0
+        self._condition = threading.Condition()
+        # futures of the coroutines waiting for a slot, in arrival order
+        self._waiters = collections.deque()
+
+    def __call__(self, function):
+        """
+        :type function: types.FunctionType
+        :rtype: types.FunctionType
+        """
+        perf_counter = time.perf_counter
+
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                await self.acquire_async()
+                start = perf_counter()
+                try:
+                    response = function(*args, **kwargs)
+                    while asyncio.iscoroutine(response):
+                        response = await response
+                    return response
+                finally:
+                    self.release_async(perf_counter() - start)
+
+        else:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                self.acquire()
+                start = perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.release(perf_counter() - start)
+
+        return wrapper
+
+    def reject(self):
+        """
+        Counts a rejected request and returns the problem it is answered with.
+
+        :rtype: ServiceUnavailableProblem
+        """
+        self.rejected += 1
+        logger.debug('... Rejecting request: %d in flight, %d queued', self.in_flight, self.queued)
+        return ServiceUnavailableProblem(
+            detail='The server is handling too many requests for this operation, please retry later',
+            headers={'Retry-After': str(self.retry_after)})
+
+    def acquire(self):
+        """
+        Waits for a slot in a worker thread.
+
+        :raises ServiceUnavailableProblem: if the queue is full
+        """
+        with self._condition:
+            if self.in_flight >= self.limit:
+                if self.queued >= self.max_queue:
+                    raise self.reject()
+                self.queued += 1
+                try:
+                    while self.in_flight >= self.limit:
+                        self._condition.wait()
+                finally:
+                    self.queued -= 1
+            self.in_flight += 1
+
+    def release(self, latency=None):
+        """
+        :param latency: seconds the request took once admitted, None if it was cancelled
+        :type latency: float | None
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if latency is not None:
+                self.observe(latency)
+            self._condition.notify(max(1, self.limit - self.in_flight))
+
+    async def acquire_async(self):
+        """
+        Waits for a slot in the event loop. The slots are handed over to the waiting
+        coroutines in arrival order.
+
+        :raises ServiceUnavailableProblem: if the queue is full
+        """
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return
+        if self.queued >= self.max_queue:
+            raise self.reject()
+
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was handed over while the request was cancelled
+                self.release_async()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+        finally:
+            self.queued -= 1
+
+    def release_async(self, latency=None):
+        """
+        :param latency: seconds the request took once admitted, None if it was cancelled
+        :type latency: float | None
+        """
+        self.in_flight -= 1
+        if latency is not None:
+            self.observe(latency)
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # the slot is taken for the waiter, so that no new request gets it first
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def observe(self, latency):
+        """
+        Called with the latency of every finished request, under the lock of the limiter in threads.
+
+        :param latency: seconds the request took once admitted
+        :type latency: float
+        """
+
+    def __repr__(self):  # pragma: no cover
+        """
+        :rtype: str
+        """
+        return '<ConcurrencyLimiter: {}/{} in flight, {}/{} queued>'.format(
+            self.in_flight, self.limit, self.queued, self.max_queue)
+
+
+class AdaptiveConcurrencyLimiter(ConcurrencyLimiter, metaclass=abc.ABCMeta):
+    """
+    Concurrency limiter adjusting its limit to the latency of the requests, like
+    the congestion window of TCP.
+
+    The latency is averaged over windows of `window` requests. The lowest
+    average seen is the latency without load, and the limit goes down when the
+    latency rises above `tolerance` times this baseline, as requests then spend
+    more time waiting for a shared resource (CPU, database connections, ...)
+    than being served. The limit goes up while the latency stays close to the
+    baseline and the requests use at least half of it.
+
+    The limit starts low so that the first windows measure the latency without
+    load, and doubles after every window until the latency rises (slow start).
+    """
+
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=1000, window=20, tolerance=1.5,
+                 max_queue=0, retry_after=1):
+        """
+        :param initial_limit: limit before the first adjustment
+        :type initial_limit: int
+        :type min_limit: int
+        :type max_limit: int
+        :param window: number of requests between two adjustments
+        :type window: int
+        :param tolerance: ratio of the latency to the baseline above which the limit goes down
+        :type tolerance: float
+        """
+        super(AdaptiveConcurrencyLimiter, self).__init__(initial_limit, max_queue, retry_after)
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError('The limits must be 1 <= min_limit <= initial_limit <= max_limit')
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.window = window
+        self.tolerance = tolerance
+        self.baseline = None
+        self.estimate = float(initial_limit)
+        self.slow_start = True
+        self._samples = 0
+        self._total_latency = 0.0
+
+    def observe(self, latency):
+        self._samples += 1
+        self._total_latency += latency
+        if self._samples < self.window:
+            return
+        latency = self._total_latency / self._samples
+        self._samples = 0
+        self._total_latency = 0.0
+
+        if self.baseline is None or latency < self.baseline or self.limit <= self.min_limit:
+            # the latency at the minimum limit is as close to the latency without load as it gets,
+            # e.g. after a lasting slowdown of a dependency
+            self.baseline = latency
+        # the finished request is not in flight anymore
+        utilized = (self.in_flight + 1) * 2 >= self.limit
+        if self.slow_start:
+            if latency <= self.tolerance * self.baseline:
+                estimate = self.estimate * 2 if utilized else self.estimate
+            else:
+                self.slow_start = False
+        if not self.slow_start:
+            estimate = self.adjust(self.estimate, latency, utilized)
+        self.estimate = min(max(estimate, self.min_limit), self.max_limit)
+        self.limit = int(self.estimate)
+
+    @abc.abstractmethod
+    def adjust(self, estimate, latency, utilized):
+        """
+        :param estimate: current estimate of the ideal limit
+        :type estimate: float
+        :param latency: average latency of the last window
+        :type latency: float
+        :param utilized: whether at least half of the limit was in use
+        :type utilized: bool
+        :return: the new estimate, before clamping to the limits
+        :rtype: float
+        """
+
+    def __repr__(self):  # pragma: no cover
+        """
+        :rtype: str
+        """
+        return '<{}: {}/{} in flight, {}/{} queued>'.format(
+            type(self).__name__, self.in_flight, self.limit, self.queued, self.max_queue)
+
+
+class GradientConcurrencyLimiter(AdaptiveConcurrencyLimiter):
+    """
+    Scales the limit by the ratio of the tolerated latency to the measured one,
+    by at most half at once, and adds the square root of the limit as headroom
+    for bursts when the latency is tolerated.
+    """
+
+    def __init__(self, smoothing=0.2, **kwargs):
+        """
+        :param smoothing: weight of the new estimate in the limit
+        :type smoothing: float
+        """
+        super(GradientConcurrencyLimiter, self).__init__(**kwargs)
+        self.smoothing = smoothing
+
+    def adjust(self, estimate, latency, utilized):
+        gradient = max(0.5, min(1.0, self.tolerance * self.baseline / latency))
+        if gradient == 1.0 and not utilized:
+            return estimate
+        new_estimate = estimate * gradient + math.sqrt(estimate)
+        return estimate * (1 - self.smoothing) + new_estimate * self.smoothing
+
+
+class AIMDConcurrencyLimiter(AdaptiveConcurrencyLimiter):
+    """
+    Additive increase, multiplicative decrease: the limit grows by one while the
+    latency is tolerated and is multiplied by `backoff` when it is not.
+    """
+
+    def __init__(self, backoff=0.9, **kwargs):
+        """
+        :param backoff: factor applied to the limit when the latency is too high
+        :type backoff: float
+        """
+        super(AIMDConcurrencyLimiter, self).__init__(**kwargs)
+        self.backoff = backoff
+
+    def adjust(self, estimate, latency, utilized):
+        if latency > self.tolerance * self.baseline:
+            return estimate * self.backoff
+        if utilized:
+            return estimate + 1
+        return estimate
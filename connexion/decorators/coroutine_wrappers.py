@@ -2,7 +2,7 @@ import asyncio
 import functools
 
 
-def get_request_life_cycle_wrapper(function, api, mimetype):
+def get_request_life_cycle_wrapper(function, api, mimetype, get_request=None):
     """
     It is a wrapper used on `RequestResponseDecorator` class.
     This function is located in an extra module because python2.7 don't
@@ -12,9 +12,11 @@ def get_request_life_cycle_wrapper(function, api, mimetype):
 
     :rtype asyncio.coroutine
     """
+    get_request = get_request or api.get_request
+
     @functools.wraps(function)
     def wrapper(*args, **kwargs):
-        connexion_request = api.get_request(*args, **kwargs)
+        connexion_request = get_request(*args, **kwargs)
         while asyncio.iscoroutine(connexion_request):
             connexion_request = yield from connexion_request
 
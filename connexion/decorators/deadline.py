@@ -0,0 +1,170 @@
+"""
+Deadlines of the requests.
+
+The deadline of a request is the earliest of the `x-timeout` of its operation
+(or the `timeout` option of the API) and of the deadline sent by the client in
+the `deadline_header`, as a Unix timestamp. A request already past its
+deadline is rejected before its validation, and the handlers find the
+`Deadline` in `request.context['deadline']` to check the remaining budget.
+
+With aiohttp the operation is cancelled when the deadline is exceeded. Flask
+can't interrupt a worker thread, the deadline is checked before the validation
+and before the handler, and the handlers can call `Deadline.check()` between
+the steps of a long computation.
+"""
+import asyncio
+import functools
+import logging
+import time
+
+from ..exceptions import DeadlineExceededProblem
+
+logger = logging.getLogger('connexion.decorators.deadline')
+
+CONTEXT_KEY = 'deadline'
+
+
+class Deadline(object):
+    """
+    Point in time after which the response of a request is useless to the client.
+    """
+
+    __slots__ = ('at',)
+
+    def __init__(self, at):
+        """
+        :param at: Unix timestamp of the deadline
+        :type at: float
+        """
+        self.at = at
+
+    def remaining(self):
+        """
+        :return: seconds until the deadline, negative once it is past
+        :rtype: float
+        """
+        return self.at - time.time()
+
+    @property
+    def expired(self):
+        """
+        :rtype: bool
+        """
+        return self.remaining() <= 0
+
+    def check(self):
+        """
+        :raises DeadlineExceededProblem: if the deadline is past
+        """
+        if self.expired:
+            raise DeadlineExceededProblem()
+
+    def __repr__(self):  # pragma: no cover
+        """
+        :rtype: str
+        """
+        return '<Deadline: {:.3f}s remaining>'.format(self.remaining())
+
+
+class DeadlineDecorator(object):
+    """
+    Sets the deadline of the requests of an operation and enforces it.
+    """
+
+    def __init__(self, timeout=None, header=None, is_async=False):
+        """
+        :param timeout: seconds the operation has to respond
+        :type timeout: float | None
+        :param header: name of the request header with the deadline of the client, as a Unix timestamp
+        :type header: str | None
+        :param is_async: cancel the operation once the deadline is past
+        :type is_async: bool
+        """
+        self.timeout = timeout
+        self.header = header
+        self.is_async = is_async
+
+    def get_deadline(self, request):
+        """
+        :type request: connexion.lifecycle.ConnexionRequest
+        :rtype: Deadline | None
+        """
+        deadline = None
+        if self.timeout is not None:
+            deadline = time.time() + self.timeout
+        if self.header is not None:
+            value = request.headers.get(self.header)
+            if value:
+                try:
+                    client_deadline = float(value)
+                except ValueError:
+                    logger.debug('... Ignoring invalid %s header: %r', self.header, value)
+                else:
+                    deadline = client_deadline if deadline is None else min(deadline, client_deadline)
+        if deadline is None:
+            return None
+        return Deadline(deadline)
+
+    def __call__(self, function):
+        """
+        :type function: types.FunctionType
+        :rtype: types.FunctionType
+        """
+        if self.is_async:
+            async def call(request):
+                response = function(request)
+                while asyncio.iscoroutine(response):
+                    response = await response
+                return response
+
+            @functools.wraps(function)
+            async def wrapper(request):
+                deadline = self.get_deadline(request)
+                if deadline is None:
+                    return await call(request)
+
+                deadline.check()
+                request.context[CONTEXT_KEY] = deadline
+                try:
+                    return await asyncio.wait_for(call(request), deadline.remaining())
+                except asyncio.TimeoutError:
+                    if not deadline.expired:
+                        # raised by the handler itself, e.g. a timeout of one of its own requests
+                        raise
+                    logger.debug('... Cancelled the request after its deadline')
+                    raise DeadlineExceededProblem()
+
+        else:
+            @functools.wraps(function)
+            def wrapper(request):
+                deadline = self.get_deadline(request)
+                if deadline is not None:
+                    deadline.check()
+                    request.context[CONTEXT_KEY] = deadline
+                return function(request)
+
+        return wrapper
+
+    def __repr__(self):  # pragma: no cover
+        """
+        :rtype: str
+        """
+        return '<DeadlineDecorator: timeout={}, header={}>'.format(self.timeout, self.header)
+
+
+def check_deadline(function):
+    """
+    Checks the deadline of the request, if any, before calling the function.
+    Used in the threads of Flask, where the requests can't be cancelled.
+
+    :type function: types.FunctionType
+    :rtype: types.FunctionType
+    """
+    @functools.wraps(function)
+    def wrapper(request):
+        deadline = request.context.get(CONTEXT_KEY)
+        if deadline is not None:
+            deadline.check()
+        return function(request)
+
+    return wrapper
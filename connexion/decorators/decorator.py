@@ -1,7 +1,10 @@
+import asyncio
 import functools
 import logging
+import time
 
 from ..utils import has_coroutine
+from .timing import REQUEST, RESPONSE
 
 logger = logging.getLogger('connexion.decorators.decorator')
 
@@ -28,9 +31,21 @@ class RequestResponseDecorator(BaseDecorator):
     framework specific object.
     """
 
-    def __init__(self, api, mimetype):
+    def __init__(self, api, mimetype, stream_body=False, body_limits=None):
+        """
+        :param stream_body: leave the request body unread in the `stream` of the request
+        :type stream_body: bool
+        :param body_limits: limits of the buffered request bodies, if any
+        :type body_limits: connexion.limits.BodyLimits | None
+        """
         self.api = api
         self.mimetype = mimetype
+        if stream_body:
+            self.get_request = api.get_streamed_request
+        elif body_limits is not None:
+            self.get_request = api.get_limited_request(body_limits)
+        else:
+            self.get_request = api.get_request
 
     def __call__(self, function):
         """
@@ -39,13 +54,105 @@ class RequestResponseDecorator(BaseDecorator):
         """
         if has_coroutine(function, self.api):
             from .coroutine_wrappers import get_request_life_cycle_wrapper
-            wrapper = get_request_life_cycle_wrapper(function, self.api, self.mimetype)
+            wrapper = get_request_life_cycle_wrapper(function, self.api, self.mimetype, self.get_request)
 
         else:  # pragma: 3 no cover
             @functools.wraps(function)
             def wrapper(*args, **kwargs):
-                request = self.api.get_request(*args, **kwargs)
+                request = self.get_request(*args, **kwargs)
                 response = function(request)
                 return self.api.get_response(response, self.mimetype, request)
 
         return wrapper
+
+
+class InstrumentedRequestResponseDecorator(RequestResponseDecorator):
+    """Manages the lifecycle of the request like `RequestResponseDecorator`
+    and notifies instruments (e.g. stage timings or tracing) of the start and
+    the end of every request. Only used if an operation has instruments.
+    """
+
+    def __init__(self, api, mimetype, instruments, stream_body=False, body_limits=None):
+        """
+        :param instruments: objects with `request_started(request)` and
+            `request_finished(request, response, error)` methods
+        :type instruments: list
+        """
+        super(InstrumentedRequestResponseDecorator, self).__init__(api, mimetype, stream_body, body_limits)
+        self.instruments = tuple(instruments)
+
+    def __call__(self, function):
+        """
+        :type function: types.FunctionType
+        :rtype: types.FunctionType
+        """
+        api = self.api
+        get_request = self.get_request
+        mimetype = self.mimetype
+        instruments = self.instruments
+        perf_counter = time.perf_counter
+
+        def request_started(request, started):
+            request.timings = {REQUEST: perf_counter() - started}
+            for instrument in instruments:
+                instrument.request_started(request)
+
+        def request_finished(request, response, error):
+            for instrument in reversed(instruments):
+                instrument.request_finished(request, response, error)
+
+        if has_coroutine(function, api):
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                started = perf_counter()
+                request = get_request(*args, **kwargs)
+                while asyncio.iscoroutine(request):
+                    request = await request
+                request_started(request, started)
+
+                response = error = None
+                try:
+                    connexion_response = function(request)
+                    while asyncio.iscoroutine(connexion_response):
+                        connexion_response = await connexion_response
+
+                    started = perf_counter()
+                    response = api.get_response(connexion_response, mimetype, request)
+                    while asyncio.iscoroutine(response):
+                        response = await response
+                    request.timings[RESPONSE] = perf_counter() - started
+                    return response
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    request_finished(request, response, error)
+
+        else:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                started = perf_counter()
+                request = get_request(*args, **kwargs)
+                request_started(request, started)
+
+                response = error = None
+                try:
+                    connexion_response = function(request)
+
+                    started = perf_counter()
+                    response = api.get_response(connexion_response, mimetype, request)
+                    request.timings[RESPONSE] = perf_counter() - started
+                    return response
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    request_finished(request, response, error)
+
+        return wrapper
+
+    def __repr__(self):  # pragma: no cover
+        """
+        :rtype: str
+        """
+        return '<InstrumentedRequestResponseDecorator: {}>'.format(', '.join(map(repr, self.instruments)))
@@ -0,0 +1,261 @@
+# Local verification of JWT bearer tokens against a JSON Web Key Set
+import asyncio
+import functools
+import json
+import logging
+import threading
+import time
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+
+from .security import (get_async_session, session, single_flight,
+                       single_flight_async)
+
+try:
+    import jwt
+except ImportError:  # pragma: no cover
+    jwt = None
+
+logger = logging.getLogger('connexion.decorators.jwks')
+
+DEFAULT_ALGORITHMS = ('RS256',)
+DEFAULT_REFRESH_INTERVAL = 300
+# the key set is reloaded at most this often, e.g. for unknown key ids (seconds)
+UNKNOWN_KID_REFRESH_INTERVAL = 10
+MAX_CACHED_TOKENS = 10000
+
+NO_JWT_MSG = """PyJWT could not be imported.
+    Please install connexion with extra install: pip install connexion[jwt]
+"""
+
+
+class JWKSet(object):
+    """
+    Keys of a JSON Web Key Set loaded from a file or URL. The keys are parsed
+    once per refresh and looked up by their key id (`kid`).
+    """
+
+    def __init__(self, uri, refresh_interval=DEFAULT_REFRESH_INTERVAL):
+        """
+        :param uri: http(s) URL, file URL or path of the JSON Web Key Set
+        :type uri: str
+        :param refresh_interval: seconds after which the key set is reloaded
+        :type refresh_interval: int | float
+        """
+        if jwt is None:
+            raise ImportError(NO_JWT_MSG)
+        self.uri = uri
+        self.refresh_interval = refresh_interval
+        self.is_remote = urlsplit(uri).scheme in ('http', 'https')
+        self._keys = {}
+        self._loaded_at = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def needs_refresh(self, kid):
+        """
+        :param kid: key id of the token to verify
+        :type kid: str | None
+        :rtype: bool
+        """
+        if self._checked_at is None:
+            return True
+        now = time.monotonic()
+        if now - self._checked_at < UNKNOWN_KID_REFRESH_INTERVAL:
+            return False
+        if self._loaded_at is None or now - self._loaded_at >= self.refresh_interval:
+            return True
+        # the key set may have been rotated since it was loaded
+        return self.get_key(kid) is None
+
+    def get_key(self, kid):
+        """
+        :param kid: key id, may be omitted if the key set has a single key
+        :type kid: str | None
+        :rtype: jwt.PyJWK | None
+        """
+        if kid is None and len(self._keys) == 1:
+            return next(iter(self._keys.values()))
+        return self._keys.get(kid)
+
+    def load(self, jwks):
+        """
+        Parses the keys of a JSON Web Key Set, skipping unusable keys.
+
+        :type jwks: dict
+        """
+        keys = {}
+        for jwk in jwks.get('keys', []):
+            if jwk.get('use', 'sig') != 'sig':
+                continue
+            try:
+                keys[jwk.get('kid')] = jwt.PyJWK(jwk)
+            except jwt.PyJWTError as e:
+                logger.warning('... Skipping key %s of %s: %s', jwk.get('kid'), self.uri, e)
+        with self._lock:
+            self._keys = keys
+            self._loaded_at = time.monotonic()
+
+    def _read_file(self):
+        parts = urlsplit(self.uri)
+        path = url2pathname(parts.path) if parts.scheme == 'file' else self.uri
+        with open(path, 'rb') as jwks_file:
+            return json.load(jwks_file)
+
+    def refresh(self):
+        """
+        (Re)loads the key set. Concurrent refreshes share one request.
+        """
+        self._checked_at = time.monotonic()
+        try:
+            if self.is_remote:
+                response = session.get(self.uri, timeout=5)
+                response.raise_for_status()
+                jwks = response.json()
+            else:
+                jwks = self._read_file()
+        except Exception as e:
+            # keep the previous keys, the key set is reloaded on a later request
+            logger.error('... Could not load JSON Web Key Set %s: %s', self.uri, e)
+        else:
+            self.load(jwks)
+
+    async def refresh_async(self):
+        """
+        (Re)loads the key set without blocking the event loop.
+        """
+        self._checked_at = time.monotonic()
+        try:
+            if self.is_remote:
+                async with get_async_session().get(self.uri, timeout=5) as response:
+                    response.raise_for_status()
+                    jwks = await response.json(content_type=None)
+            else:
+                jwks = await asyncio.get_event_loop().run_in_executor(None, self._read_file)
+        except Exception as e:
+            # keep the previous keys, the key set is reloaded on a later request
+            logger.error('... Could not load JSON Web Key Set %s: %s', self.uri, e)
+        else:
+            self.load(jwks)
+
+
+class JWTBearerInfo(object):
+    """
+    Bearer info function verifying the signature and the `exp`, `nbf`, `aud`
+    and `iss` claims of a JWT locally. Decoded claims are memoized per token
+    until the token expires, each request getting its own copy.
+    """
+
+    def __init__(self, jwks, audience=None, issuer=None, algorithms=DEFAULT_ALGORITHMS, leeway=0,
+                 max_cached_tokens=MAX_CACHED_TOKENS):
+        """
+        :type jwks: JWKSet
+        :param audience: accepted audience(s), the `aud` claim is not verified if None
+        :type audience: str | tuple | None
+        :param issuer: expected issuer, the `iss` claim is not verified if None
+        :type issuer: str | None
+        :param algorithms: accepted signature algorithms
+        :type algorithms: tuple
+        :param leeway: seconds of clock skew tolerated when checking `exp` and `nbf`
+        :type leeway: int | float
+        """
+        self.jwks = jwks
+        self.audience = list(audience) if isinstance(audience, tuple) else audience
+        self.issuer = issuer
+        self.algorithms = list(algorithms)
+        self.leeway = leeway
+        self.max_cached_tokens = max_cached_tokens
+        self._claims = {}
+        self._refresh = single_flight(jwks.refresh)
+        self._refresh_async = single_flight_async(jwks.refresh_async)
+
+    def _get_cached(self, token):
+        try:
+            claims, expires = self._claims[token]
+        except KeyError:
+            return None
+        if time.time() < expires:
+            # a copy, which the request can change
+            return dict(claims)
+        self._claims.pop(token, None)
+        return None
+
+    def _cache(self, token, claims):
+        if 'exp' not in claims:
+            return
+        if len(self._claims) >= self.max_cached_tokens:
+            now = time.time()
+            for cached_token, (_, expires) in list(self._claims.items()):
+                if expires <= now:
+                    self._claims.pop(cached_token, None)
+            if len(self._claims) >= self.max_cached_tokens:
+                self._claims.clear()
+        self._claims[token] = dict(claims), claims['exp'] + self.leeway
+
+    @staticmethod
+    def _get_kid(token):
+        try:
+            return jwt.get_unverified_header(token).get('kid')
+        except jwt.PyJWTError:
+            return None
+
+    def _decode(self, token, kid):
+        key = self.jwks.get_key(kid)
+        if key is None:
+            logger.info('... No key %s in JSON Web Key Set %s', kid, self.jwks.uri)
+            return None
+        try:
+            claims = jwt.decode(token, key.key,
+                                algorithms=self.algorithms,
+                                audience=self.audience,
+                                issuer=self.issuer,
+                                leeway=self.leeway,
+                                options={'verify_aud': self.audience is not None})
+        except jwt.PyJWTError as e:
+            logger.info('... Invalid JWT: %s', e)
+            return None
+        self._cache(token, claims)
+        return claims
+
+    def decode(self, token):
+        """
+        :param token: JWT of the Authorization header
+        :type token: str
+        :return: the claims of a valid token, None otherwise
+        :rtype: dict | None
+        """
+        claims = self._get_cached(token)
+        if claims is not None:
+            return claims
+        kid = self._get_kid(token)
+        if self.jwks.needs_refresh(kid):
+            self._refresh()
+        return self._decode(token, kid)
+
+    async def decode_async(self, token):
+        """
+        :param token: JWT of the Authorization header
+        :type token: str
+        :return: the claims of a valid token, None otherwise
+        :rtype: dict | None
+        """
+        claims = self._get_cached(token)
+        if claims is not None:
+            return claims
+        kid = self._get_kid(token)
+        if self.jwks.needs_refresh(kid):
+            await self._refresh_async()
+        return self._decode(token, kid)
+
+
+@functools.lru_cache(maxsize=None)
+def get_jwt_bearer_info(jwks_uri, audience=None, issuer=None, algorithms=DEFAULT_ALGORITHMS,
+                        refresh_interval=DEFAULT_REFRESH_INTERVAL, leeway=0):
+    """
+    Returns the JWTBearerInfo for the given settings, shared by all security
+    schemes using them so that keys and claims are cached once.
+
+    :rtype: JWTBearerInfo
+    """
+    jwks = JWKSet(jwks_uri, refresh_interval=refresh_interval)
+    return JWTBearerInfo(jwks, audience=audience, issuer=issuer, algorithms=algorithms, leeway=leeway)
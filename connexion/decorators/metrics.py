@@ -1,3 +1,4 @@
+import asyncio
 import functools
 import os
 import time
@@ -52,3 +53,89 @@ class UWSGIMetricsCollector(object):
             return response
 
         return wrapper
+
+
+def get_status(response):
+    """
+    :return: the status code of a framework response
+    :rtype: int
+    """
+    status = getattr(response, 'status_code', None)
+    if isinstance(status, int):
+        return status
+    # aiohttp
+    return getattr(response, 'status', 200)
+
+
+def get_error_status(error):
+    """
+    :return: the status code of the response an error is converted to
+    :rtype: int
+    """
+    if isinstance(error, HTTPException):
+        return error.code
+    if isinstance(error, ProblemException):
+        return error.status
+    # aiohttp web exceptions
+    status = getattr(error, 'status_code', None)
+    if isinstance(status, int):
+        return status
+    return 500
+
+
+class MetricsCollector(object):
+    """
+    Records the count and latency of the requests of an operation in a
+    `connexion.metrics.MetricsRegistry`.
+    """
+
+    def __init__(self, registry, path, method):
+        """
+        :type registry: connexion.metrics.MetricsRegistry
+        :param path: path template of the operation, including the base path
+        :type path: str
+        :type method: str
+        """
+        self.metrics = registry.operation(method, path)
+
+    def __call__(self, function):
+        """
+        :type function: types.FunctionType
+        :rtype: types.FunctionType
+        """
+        observe = self.metrics.observe
+        perf_counter = time.perf_counter
+
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    response = function(*args, **kwargs)
+                    while asyncio.iscoroutine(response):
+                        response = await response
+                except BaseException as error:
+                    observe(get_error_status(error), perf_counter() - start)
+                    raise
+                observe(get_status(response), perf_counter() - start)
+                return response
+
+        else:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    response = function(*args, **kwargs)
+                except BaseException as error:
+                    observe(get_error_status(error), perf_counter() - start)
+                    raise
+                observe(get_status(response), perf_counter() - start)
+                return response
+
+        return wrapper
+
+    def __repr__(self):  # pragma: no cover
+        """
+        :rtype: str
+        """
+        return '<MetricsCollector: {} {}>'.format(*self.metrics.labels)
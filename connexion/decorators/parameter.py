@@ -69,6 +69,7 @@ def parameter_to_arg(operation, function, pythonic_params=False,
     :type pass_context_arg_name: str|None
     """
     consumes = operation.consumes
+    stream_body = getattr(operation, 'stream_body', False)
 
     def sanitized(name):
         return name and re.sub('^[^a-zA-Z_]+', '', re.sub('[^0-9a-zA-Z_]', '', name))
@@ -86,7 +87,9 @@ def parameter_to_arg(operation, function, pythonic_params=False,
         logger.debug('Function Arguments: %s', arguments)
         kwargs = {}
 
-        if all_json(consumes):
+        if stream_body:
+            request_body = request.stream
+        elif all_json(consumes):
             request_body = request.json
         elif consumes[0] in FORM_CONTENT_TYPES:
             request_body = {sanitize(k): v for k, v in request.form.items()}
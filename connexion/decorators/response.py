@@ -1,11 +1,14 @@
 # Decorators to change the return type of endpoints
 import functools
 import logging
+from enum import Enum
 
 from jsonschema import ValidationError
 
 from ..exceptions import (NonConformingResponseBody,
                           NonConformingResponseHeaders)
+from ..lifecycle import ConnexionResponse
+from ..streaming import is_file, is_ndjson_mimetype, is_stream, map_stream
 from ..utils import all_json, has_coroutine
 from .decorator import BaseDecorator
 from .validation import ResponseBodyValidator
@@ -25,6 +28,8 @@ class ResponseValidator(BaseDecorator):
         self.operation = operation
         self.mimetype = mimetype
         self.validator = validator
+        # (status code, content type, streamed) -> ResponseBodyValidator
+        self._body_validators = {}
 
     def validate_response(self, data, status_code, headers, url):
         """
@@ -43,13 +48,36 @@ class ResponseValidator(BaseDecorator):
         response_schema = self.operation.response_schema(str(status_code), content_type)
 
         if self.is_json_schema_compatible(response_schema):
-            v = ResponseBodyValidator(response_schema, validator=self.validator)
+            v = self.get_body_validator(response_schema, status_code, content_type)
             try:
                 data = self.operation.json_loads(data)
                 v.validate_schema(data, url)
             except ValidationError as e:
                 raise NonConformingResponseBody(message=str(e))
 
+        self.validate_headers(response_definition, headers)
+        return True
+
+    def get_body_validator(self, schema, status_code, content_type, streamed=False):
+        """
+        Gets the validator of the response bodies with a status code and content type,
+        created the first time from the schema, or that of their items if streamed.
+        :rtype: ResponseBodyValidator
+        """
+        key = (str(status_code), content_type, streamed)
+        validator = self._body_validators.get(key)
+        if validator is None:
+            registry = getattr(self.operation.api, 'validator_registry', None)
+            validator = ResponseBodyValidator(schema, validator=self.validator, registry=registry)
+            self._body_validators[key] = validator
+        return validator
+
+    def validate_headers(self, response_definition, headers):
+        """
+        Ensures the response has the headers declared in the specification.
+        :type response_definition: dict
+        :type headers: dict
+        """
         if response_definition and response_definition.get("headers"):
             # converting to set is needed to support python 2.7
             response_definition_header_keys = set(response_definition.get("headers").keys())
@@ -60,7 +88,67 @@ class ResponseValidator(BaseDecorator):
                 msg = ("Keys in header don't match response specification. "
                        "Difference: {0}").format(pretty_list)
                 raise NonConformingResponseHeaders(message=msg)
-        return True
+
+    def validate_stream(self, response, url):
+        """
+        Validates the items of a response body produced by a generator as they
+        are produced, the response is cut short by the first invalid one. Only
+        the headers of the file bodies are validated, they are not read.
+        :return: the response with its generator wrapped, None if it is not streamed
+        """
+        def is_streamed(body):
+            return is_stream(body) or is_file(body)
+
+        status_code, headers = 200, {}
+        if isinstance(response, ConnexionResponse) and is_streamed(response.body):
+            items = response.body
+            status_code = response.status_code or status_code
+            headers = response.headers or headers
+        elif isinstance(response, tuple) and response and is_streamed(response[0]):
+            items = response[0]
+            if len(response) == 2 and not isinstance(response[1], (int, Enum)):
+                headers = response[1]
+            elif len(response) > 1:
+                status_code = response[1]
+                headers = response[2] if len(response) > 2 else headers
+        elif is_streamed(response):
+            items = response
+        else:
+            return None
+        status_code = str(getattr(status_code, 'value', status_code))
+
+        content_type = headers.get("Content-Type", self.mimetype).rsplit(";", 1)[0]
+        self.validate_headers(self.operation.response_definition(status_code, content_type), headers)
+        if is_file(items):
+            return response
+
+        response_schema = self.operation.response_schema(status_code, content_type)
+        if response_schema.get('type') == 'array':
+            item_schema = response_schema.get('items')
+        elif is_ndjson_mimetype(content_type):
+            # every line is an item
+            item_schema = response_schema
+        else:
+            item_schema = None
+        if not item_schema:
+            return response
+
+        v = self.get_body_validator(item_schema, status_code, content_type, streamed=True)
+        jsonifier = self.operation.api.jsonifier
+
+        def validate_item(item):
+            try:
+                v.validate_schema(self.operation.json_loads(jsonifier.dumps(item)), url)
+            except ValidationError as e:
+                raise NonConformingResponseBody(message=str(e))
+
+        items = map_stream(items, validate_item)
+        if isinstance(response, ConnexionResponse):
+            response.body = items
+            return response
+        if isinstance(response, tuple):
+            return (items,) + response[1:]
+        return items
 
     def is_json_schema_compatible(self, response_schema):
         """
@@ -85,6 +173,10 @@ class ResponseValidator(BaseDecorator):
         """
 
         def _wrapper(request, response):
+            stream_response = self.validate_stream(response, request.url)
+            if stream_response is not None:
+                return stream_response
+
             connexion_response = \
                 self.operation.api.get_connexion_response(response, self.mimetype)
             self.validate_response(
@@ -1,12 +1,16 @@
 # Authentication and authorization related decorators
+import asyncio
 import base64
 import functools
+import inspect
 import logging
 import os
 import textwrap
+import threading
+import weakref
 
 import requests
-from connexion.utils import get_function_from_name
+from connexion.utils import get_function_from_name, has_coroutine
 import http.cookies
 
 from ..exceptions import (ConnexionException, OAuthProblem,
@@ -20,10 +24,290 @@ session = requests.Session()
 session.mount('http://', adapter)
 session.mount('https://', adapter)
 
+# connection pools for OAuth tokeninfo on asyncio frameworks, one per event loop
+# because an aiohttp.ClientSession is bound to the loop it was created in
+async_sessions = weakref.WeakKeyDictionary()
 
-def get_tokeninfo_func(security_definition):
+
+# token lookups in progress, shared by concurrent requests for the same credentials
+in_flight_calls = {}
+in_flight_tasks = {}
+
+
+class InFlightCall(object):
+    """
+    A lookup in progress in one thread that other threads can wait for.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        # interrupted, e.g. by KeyboardInterrupt, which only stops the thread of the call
+        self.aborted = False
+
+
+class RequestCredentials(object):
+    """
+    The credentials of a request. The Authorization and Cookie headers are
+    parsed at most once and shared by all security schemes of an operation.
+    """
+
+    __slots__ = ('headers', '_authorization', '_cookies')
+
+    def __init__(self, request):
+        self.headers = request.headers
+        self._authorization = None
+        self._cookies = None
+
+    @property
+    def authorization(self):
+        """
+        :return: the lower case auth type and the credentials of the Authorization header
+        :rtype: tuple[str, str] | tuple[None, None]
+        :raises: OAuthProblem if the header is malformed
+        """
+        if self._authorization is None:
+            authorization = self.headers.get('Authorization')
+            if not authorization:
+                self._authorization = None, None
+            else:
+                try:
+                    auth_type, value = authorization.split(None, 1)
+                except ValueError:
+                    self._authorization = ()
+                else:
+                    self._authorization = auth_type.lower(), value
+        if not self._authorization:
+            raise OAuthProblem(description='Invalid authorization header')
+        return self._authorization
+
+    @property
+    def cookies(self):
+        """
+        :return: the values of the Cookie header by name
+        :rtype: dict
+        """
+        if self._cookies is None:
+            cookie_parser = http.cookies.SimpleCookie()
+            cookie_parser.load(str(self.headers.get('Cookie')))
+            self._cookies = {name: morsel.value for name, morsel in cookie_parser.items()}
+        return self._cookies
+
+
+class RequiredScopes(list):
+    """
+    The scopes required by an operation. Security functions get a list, the
+    default scope validation uses the precomputed frozenset.
+    """
+
+    __slots__ = ('scope_set',)
+
+    def __init__(self, scopes):
+        super(RequiredScopes, self).__init__(scopes)
+        self.scope_set = frozenset(self)
+
+    @classmethod
+    def of(cls, scopes):
+        """
+        :type scopes: RequiredScopes | list | None
+        :rtype: RequiredScopes | None
+        """
+        if scopes is None or isinstance(scopes, cls):
+            return scopes
+        return cls(scopes)
+
+
+class SecurityPlan(object):
+    """
+    The auth functions of an operation compiled for dispatch on the auth type
+    of the Authorization header. Functions bound to an auth type (e.g. bearer
+    or basic) are only tried for requests using it, the others (e.g. apikey)
+    always, in the order of the security requirements. The auth functions
+    taking two arguments are adapted to the calls passing the credentials.
+    """
+
+    def __init__(self, auth_funcs):
+        self.auth_funcs = tuple(pass_credentials(func) for func in auth_funcs)
+        auth_types = [getattr(func, 'auth_type', None) for func in self.auth_funcs]
+        self.default = tuple(func for func, auth_type in zip(self.auth_funcs, auth_types)
+                             if not isinstance(auth_type, str))
+        self.by_auth_type = {
+            auth_type: tuple(func for func, func_auth_type in zip(self.auth_funcs, auth_types)
+                             if func_auth_type == auth_type or not isinstance(func_auth_type, str))
+            for auth_type in auth_types if isinstance(auth_type, str)
+        }
+
+    @classmethod
+    def of(cls, auth_funcs):
+        """
+        :type auth_funcs: SecurityPlan | list
+        :rtype: SecurityPlan
+        """
+        if isinstance(auth_funcs, cls):
+            return auth_funcs
+        return cls(auth_funcs)
+
+    def select(self, credentials):
+        """
+        :type credentials: RequestCredentials
+        :return: the auth functions that apply to the request
+        :rtype: tuple
+        """
+        if not self.by_auth_type:
+            return self.auth_funcs
+        try:
+            auth_type, _ = credentials.authorization
+        except OAuthProblem:
+            # the first function reading the Authorization header reports it
+            return self.auth_funcs
+        return self.by_auth_type.get(auth_type, self.default)
+
+
+def pass_credentials(func):
+    """
+    Adapts the auth functions called with the request and the required scopes
+    only, e.g. those of the applications, to be called with the credentials of
+    the request as well.
+
+    :rtype: types.FunctionType
+    """
+    try:
+        signature = inspect.signature(func)
+    except (TypeError, ValueError):
+        # nothing to inspect, e.g. a builtin
+        return func
+    try:
+        signature.bind(None, None, None)
+    except TypeError:
+        pass
+    else:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(request, required_scopes, credentials=None):
+        return func(request, required_scopes)
+
+    return wrapper
+
+
+def _flight_key(func, args, kwargs):
+    """
+    Key identifying a lookup. Partials are compared by function and arguments
+    because a new one is created for every security scheme.
+    """
+    def func_key(func):
+        if isinstance(func, functools.partial):
+            return func_key(func.func), func.args, tuple(sorted(func.keywords.items()))
+        return func
+
+    def hashable(value):
+        if isinstance(value, list):
+            return tuple(value)
+        return value
+
+    return (func_key(func), args,
+            tuple((key, hashable(value)) for key, value in sorted(kwargs.items())))
+
+
+def single_flight(func):
+    """
+    Concurrent calls with the same arguments from different threads share a
+    single call of `func`. Its result or error is returned to all callers.
+
+    :type func: types.FunctionType
+    :rtype: types.FunctionType
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = _flight_key(func, args, kwargs)
+        # no lock: setdefault is atomic, the calls only wait for each other when they share a lookup
+        call = in_flight_calls.get(key)
+        is_leader = False
+        if call is None:
+            new_call = InFlightCall()
+            call = in_flight_calls.setdefault(key, new_call)
+            is_leader = call is new_call
+
+        if not is_leader:
+            call.done.wait()
+            if call.aborted:
+                # the waiters would otherwise take the missing result for an invalid token
+                return wrapper(*args, **kwargs)
+            if call.error is not None:
+                # raised with the traceback of this thread
+                raise _copy_error(call.error) from call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            call.aborted = True
+            raise
+        finally:
+            del in_flight_calls[key]
+            call.done.set()
+        return call.result
+
+    return wrapper
+
+
+def _copy_error(error):
+    """
+    A copy of an exception, for another thread to raise. Its constructor is not
+    called again, as it may not take the arguments it passed to the base class.
+
+    :type error: Exception
+    :rtype: Exception
+    """
+    copied = type(error).__new__(type(error), *error.args)
+    copied.__dict__.update(error.__dict__)
+    return copied
+
+
+def single_flight_async(func):
+    """
+    Concurrent calls with the same arguments on one event loop share a
+    single task awaiting `func`. Its result or error is returned to all
+    callers. A cancelled caller does not cancel the shared task. A function
+    which is not a coroutine function is called in the default executor.
+
+    :param func: types.FunctionType or coroutine function
+    :rtype: types.FunctionType
+    """
+    is_coroutine = has_coroutine(func)
+
+    async def call(*args, **kwargs):
+        if is_coroutine:
+            result = func(*args, **kwargs)
+        else:
+            result = await asyncio.get_event_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+        while asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_event_loop()
+        key = (loop, _flight_key(func, args, kwargs))
+        task = in_flight_tasks.get(key)
+        if task is None:
+            task = in_flight_tasks[key] = loop.create_task(call(*args, **kwargs))
+            task.add_done_callback(lambda _: in_flight_tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+    return wrapper
+
+
+def get_tokeninfo_func(security_definition, is_async=False):
     """
     :type security_definition: dict
+    :param is_async: return a coroutine function for `x-tokenInfoUrl`
+    :type is_async: bool
     :rtype: function
 
     >>> get_tokeninfo_url({'x-tokenInfoFunc': 'foo.bar'})
@@ -37,6 +321,8 @@ def get_tokeninfo_func(security_definition):
     token_info_url = (security_definition.get('x-tokenInfoUrl') or
                       os.environ.get('TOKENINFO_URL'))
     if token_info_url:
+        if is_async:
+            return functools.partial(get_tokeninfo_remote_async, token_info_url)
         return functools.partial(get_tokeninfo_remote, token_info_url)
 
     return None
@@ -87,9 +373,11 @@ def get_apikeyinfo_func(security_definition):
     return None
 
 
-def get_bearerinfo_func(security_definition):
+def get_bearerinfo_func(security_definition, is_async=False):
     """
     :type security_definition: dict
+    :param is_async: return a coroutine function for `x-jwksUri`
+    :type is_async: bool
     :rtype: function
 
     >>> get_bearerinfo_func({'x-bearerInfoFunc': 'foo.bar'})
@@ -99,9 +387,39 @@ def get_bearerinfo_func(security_definition):
             os.environ.get('BEARERINFO_FUNC'))
     if func:
         return get_function_from_name(func)
+
+    jwks_uri = (security_definition.get('x-jwksUri') or
+                os.environ.get('JWKS_URI'))
+    if jwks_uri:
+        from .jwks import get_jwt_bearer_info
+        bearer_info = get_jwt_bearer_info(jwks_uri, **get_jwt_settings(security_definition))
+        return bearer_info.decode_async if is_async else bearer_info.decode
+
     return None
 
 
+def get_jwt_settings(security_definition):
+    """
+    Reads the settings of the built-in JWT bearer info function.
+
+    :type security_definition: dict
+    :rtype: dict
+    """
+    settings = {}
+    audience = security_definition.get('x-jwtAudience')
+    if audience is not None:
+        settings['audience'] = tuple(audience) if isinstance(audience, list) else audience
+    if 'x-jwtIssuer' in security_definition:
+        settings['issuer'] = security_definition['x-jwtIssuer']
+    if 'x-jwtAlgorithms' in security_definition:
+        settings['algorithms'] = tuple(security_definition['x-jwtAlgorithms'])
+    if 'x-jwksRefreshInterval' in security_definition:
+        settings['refresh_interval'] = security_definition['x-jwksRefreshInterval']
+    if 'x-jwtLeeway' in security_definition:
+        settings['leeway'] = security_definition['x-jwtLeeway']
+    return settings
+
+
 def security_passthrough(function):
     """
     :type function: types.FunctionType
@@ -122,9 +440,33 @@ def security_deny(function):
     return deny
 
 
-def get_authorization_info(auth_funcs, request, required_scopes):
+def get_authorization_info(auth_funcs, request, required_scopes, credentials=None):
+    """
+    :param auth_funcs: the auth functions to try in order. They get the credentials
+        if given, e.g. those selected by a `SecurityPlan`, else the request and the
+        required scopes only
+    :type credentials: RequestCredentials | None
+    """
+    args = (request, required_scopes) if credentials is None else (request, required_scopes, credentials)
+    for func in auth_funcs:
+        token_info = func(*args)
+        if token_info is not None:
+            return token_info
+
+    logger.info("... No auth provided. Aborting with 401.")
+    raise OAuthProblem(description='No authorization token provided')
+
+
+async def get_authorization_info_async(auth_funcs, request, required_scopes, credentials=None):
+    """
+    :param auth_funcs: the auth functions to try in order, as for `get_authorization_info`
+    :type credentials: RequestCredentials | None
+    """
+    args = (request, required_scopes) if credentials is None else (request, required_scopes, credentials)
     for func in auth_funcs:
-        token_info = func(request, required_scopes)
+        token_info = func(*args)
+        while asyncio.iscoroutine(token_info):
+            token_info = await token_info
         if token_info is not None:
             return token_info
 
@@ -138,11 +480,14 @@ def validate_scope(required_scopes, token_scopes):
     :param token_scopes: Scopes granted by authorization server
     :rtype: bool
     """
-    required_scopes = set(required_scopes)
+    if isinstance(required_scopes, RequiredScopes):
+        required_scopes = required_scopes.scope_set
+    else:
+        required_scopes = frozenset(required_scopes)
     if isinstance(token_scopes, list):
-        token_scopes = set(token_scopes)
+        token_scopes = frozenset(token_scopes)
     else:
-        token_scopes = set(token_scopes.split())
+        token_scopes = frozenset(token_scopes.split())
     logger.debug("... Scopes required: %s", required_scopes)
     logger.debug("... Token scopes: %s", token_scopes)
     if not required_scopes <= token_scopes:
@@ -154,25 +499,56 @@ def validate_scope(required_scopes, token_scopes):
     return True
 
 
-def verify_authorization_token(request, token_info_func):
+def get_bearer_token(request, credentials=None):
+    """
+    :param request: ConnexionRequest
+    :type credentials: RequestCredentials
+    :return: the bearer token of the Authorization header, if any
+    :rtype: str | None
+    """
+    credentials = credentials or RequestCredentials(request)
+    auth_type, token = credentials.authorization
+    if auth_type != 'bearer':
+        return None
+
+    return token
+
+
+def verify_authorization_token(request, token_info_func, credentials=None):
     """
     :param request: ConnexionRequest
     :param token_info_func: types.FunctionType
+    :type credentials: RequestCredentials
     :rtype: dict
     """
-    authorization = request.headers.get('Authorization')
-    if not authorization:
+    token = get_bearer_token(request, credentials)
+    if token is None:
         return None
 
-    try:
-        auth_type, token = authorization.split(None, 1)
-    except ValueError:
-        raise OAuthProblem(description='Invalid authorization header')
+    token_info = token_info_func(token)
+    if token_info is None:
+        raise OAuthResponseProblem(
+            description='Provided token is not valid',
+            token_response=None
+        )
+
+    return token_info
+
 
-    if auth_type.lower() != 'bearer':
+async def verify_authorization_token_async(request, token_info_func, credentials=None):
+    """
+    :param request: ConnexionRequest
+    :param token_info_func: types.FunctionType or coroutine function
+    :type credentials: RequestCredentials
+    :rtype: dict
+    """
+    token = get_bearer_token(request, credentials)
+    if token is None:
         return None
 
     token_info = token_info_func(token)
+    while asyncio.iscoroutine(token_info):
+        token_info = await token_info
     if token_info is None:
         raise OAuthResponseProblem(
             description='Provided token is not valid',
@@ -182,47 +558,96 @@ def verify_authorization_token(request, token_info_func):
     return token_info
 
 
+def get_token_scopes(token_info):
+    """
+    :type token_info: dict
+    :return: the scopes granted to the token
+    """
+    # Fallback to 'scopes' for backward compability
+    return token_info.get('scope', token_info.get('scopes', ''))
+
+
+def scope_problem(required_scopes, token_scopes):
+    return OAuthScopeProblem(
+        description='Provided token doesn\'t have the required scope',
+        required_scopes=required_scopes,
+        token_scopes=token_scopes
+    )
+
+
 def verify_oauth(token_info_func, scope_validate_func):
+    token_info_func = single_flight(token_info_func)
 
-    def wrapper(request, required_scopes):
-        token_info = verify_authorization_token(request, token_info_func)
+    def wrapper(request, required_scopes, credentials=None):
+        token_info = verify_authorization_token(request, token_info_func, credentials)
         if token_info is None:
             return None
 
-        # Fallback to 'scopes' for backward compability
-        token_scopes = token_info.get('scope', token_info.get('scopes', ''))
+        token_scopes = get_token_scopes(token_info)
         if not scope_validate_func(required_scopes, token_scopes):
-            raise OAuthScopeProblem(
-                description='Provided token doesn\'t have the required scope',
-                required_scopes=required_scopes,
-                token_scopes=token_scopes
-            )
+            raise scope_problem(required_scopes, token_scopes)
 
         return token_info
 
+    wrapper.auth_type = 'bearer'
     return wrapper
 
 
-def verify_basic(basic_info_func):
+def verify_oauth_async(token_info_func, scope_validate_func):
+    """
+    :param token_info_func: types.FunctionType or coroutine function
+    :param scope_validate_func: types.FunctionType or coroutine function
+    :rtype: types.FunctionType
+    """
+    token_info_func = single_flight_async(token_info_func)
 
-    def wrapper(request, required_scopes):
-        authorization = request.headers.get('Authorization')
-        if not authorization:
+    async def wrapper(request, required_scopes, credentials=None):
+        token_info = await verify_authorization_token_async(request, token_info_func, credentials)
+        if token_info is None:
             return None
 
-        try:
-            auth_type, user_pass = authorization.split(None, 1)
-        except ValueError:
-            raise OAuthProblem(description='Invalid authorization header')
+        token_scopes = get_token_scopes(token_info)
+        valid = scope_validate_func(required_scopes, token_scopes)
+        while asyncio.iscoroutine(valid):
+            valid = await valid
+        if not valid:
+            raise scope_problem(required_scopes, token_scopes)
 
-        if auth_type.lower() != 'basic':
-            return None
+        return token_info
 
-        try:
-            username, password = base64.b64decode(user_pass).decode('latin1').split(':', 1)
-        except Exception:
-            raise OAuthProblem(description='Invalid authorization header')
+    wrapper.auth_type = 'bearer'
+    return wrapper
+
+
+def get_basic_credentials(request, credentials=None):
+    """
+    :param request: ConnexionRequest
+    :type credentials: RequestCredentials
+    :return: username and password of the Authorization header, if any
+    :rtype: tuple[str, str] | None
+    """
+    credentials = credentials or RequestCredentials(request)
+    auth_type, user_pass = credentials.authorization
+    if auth_type != 'basic':
+        return None
+
+    try:
+        username, password = base64.b64decode(user_pass).decode('latin1').split(':', 1)
+    except Exception:
+        raise OAuthProblem(description='Invalid authorization header')
+
+    return username, password
 
+
+def verify_basic(basic_info_func):
+    basic_info_func = single_flight(basic_info_func)
+
+    def wrapper(request, required_scopes, credentials=None):
+        basic_credentials = get_basic_credentials(request, credentials)
+        if basic_credentials is None:
+            return None
+
+        username, password = basic_credentials
         token_info = basic_info_func(username, password, required_scopes=required_scopes)
         if token_info is None:
             raise OAuthResponseProblem(
@@ -231,57 +656,103 @@ def verify_basic(basic_info_func):
             )
         return token_info
 
+    wrapper.auth_type = 'basic'
     return wrapper
 
 
-def get_cookie_value(cookies, name):
-    '''
-    Returns cookie value by its name. None if no such value.
-    :param cookies: str: cookies raw data
-    :param name: str: cookies key
-    '''
-    cookie_parser = http.cookies.SimpleCookie()
-    cookie_parser.load(str(cookies))
-    try:
-        return cookie_parser[name].value
-    except KeyError:
+def verify_basic_async(basic_info_func):
+    """
+    :param basic_info_func: coroutine function
+    :rtype: types.FunctionType
+    """
+    basic_info_func = single_flight_async(basic_info_func)
+
+    async def wrapper(request, required_scopes, credentials=None):
+        basic_credentials = get_basic_credentials(request, credentials)
+        if basic_credentials is None:
+            return None
+
+        username, password = basic_credentials
+        token_info = await basic_info_func(username, password, required_scopes=required_scopes)
+        if token_info is None:
+            raise OAuthResponseProblem(
+                description='Provided authorization is not valid',
+                token_response=None
+            )
+        return token_info
+
+    wrapper.auth_type = 'basic'
+    return wrapper
+
+
+def get_apikey(request, loc, name, credentials=None):
+    """
+    Returns the api key of the request. An api key passed in the query is
+    removed from the request query.
+
+    :param request: ConnexionRequest
+    :param loc: where the api key is passed: query, header or cookie
+    :type loc: str
+    :param name: name of the query parameter, header or cookie
+    :type name: str
+    :type credentials: RequestCredentials
+    :rtype: str | None
+    """
+    if loc == 'query':
+        query = request.query
+        if name not in query:
+            return None
+        if hasattr(query, 'to_dict'):
+            # the immutable MultiDict of werkzeug is left untouched, replaced by the dict of
+            # lists the uri parsing then uses as it is
+            query = request.query = query.to_dict(flat=False)
+            apikey = query.pop(name)[0]
+        else:
+            # e.g. the query of aiohttp, parsed for this request
+            apikey = query.pop(name)
+    elif loc == 'header':
+        apikey = request.headers.get(name)
+    elif loc == 'cookie':
+        credentials = credentials or RequestCredentials(request)
+        apikey = credentials.cookies.get(name)
+    else:
         return None
 
+    return apikey
+
 
 def verify_apikey(apikey_info_func, loc, name):
+    apikey_info_func = single_flight(apikey_info_func)
 
-    def wrapper(request, required_scopes):
-
-        def _immutable_pop(_dict, key):
-            """
-            Pops the key from an immutable dict and returns the value that was popped,
-            and a new immutable dict without the popped key.
-            """
-            cls = type(_dict)
-            try:
-                _dict = _dict.to_dict(flat=False)
-                return _dict.pop(key)[0], cls(_dict)
-            except AttributeError:
-                _dict = dict(_dict.items())
-                return _dict.pop(key), cls(_dict)
-
-        if loc == 'query':
-            try:
-                apikey, request.query = _immutable_pop(request.query, name)
-            except KeyError:
-                apikey = None
-        elif loc == 'header':
-            apikey = request.headers.get(name)
-        elif loc == 'cookie':
-            cookieslist = request.headers.get('Cookie')
-            apikey = get_cookie_value(cookieslist, name)
-        else:
+    def wrapper(request, required_scopes, credentials=None):
+        apikey = get_apikey(request, loc, name, credentials)
+        if apikey is None:
             return None
 
+        token_info = apikey_info_func(apikey, required_scopes=required_scopes)
+        if token_info is None:
+            raise OAuthResponseProblem(
+                description='Provided apikey is not valid',
+                token_response=None
+            )
+        return token_info
+
+    return wrapper
+
+
+def verify_apikey_async(apikey_info_func, loc, name):
+    """
+    :param apikey_info_func: coroutine function
+    :rtype: types.FunctionType
+    """
+    apikey_info_func = single_flight_async(apikey_info_func)
+
+    async def wrapper(request, required_scopes, credentials=None):
+        apikey = get_apikey(request, loc, name, credentials)
         if apikey is None:
             return None
 
-        token_info = apikey_info_func(apikey, required_scopes=required_scopes)
+        token_info = await apikey_info_func(apikey, required_scopes=required_scopes)
         if token_info is None:
             raise OAuthResponseProblem(
                 description='Provided apikey is not valid',
@@ -297,10 +768,26 @@ def verify_bearer(bearer_info_func):
     :param bearer_info_func: types.FunctionType
     :rtype: types.FunctionType
     """
+    bearer_info_func = single_flight(bearer_info_func)
+
+    def wrapper(request, required_scopes, credentials=None):
+        return verify_authorization_token(request, bearer_info_func, credentials)
+
+    wrapper.auth_type = 'bearer'
+    return wrapper
+
+
+def verify_bearer_async(bearer_info_func):
+    """
+    :param bearer_info_func: coroutine function
+    :rtype: types.FunctionType
+    """
+    bearer_info_func = single_flight_async(bearer_info_func)
 
-    def wrapper(request, required_scopes):
-        return verify_authorization_token(request, bearer_info_func)
+    async def wrapper(request, required_scopes, credentials=None):
+        return await verify_authorization_token_async(request, bearer_info_func, credentials)
 
+    wrapper.auth_type = 'bearer'
     return wrapper
 
 
@@ -309,17 +796,27 @@ def verify_none():
     :rtype: types.FunctionType
     """
 
-    def wrapper(request, required_scopes):
+    def wrapper(request, required_scopes, credentials=None):
         return {}
 
     return wrapper
 
 
 def verify_security(auth_funcs, required_scopes, function):
+    """
+    :param auth_funcs: the plan of the operation, built once with its security, or its auth functions
+    :type auth_funcs: SecurityPlan | list
+    :type required_scopes: RequiredScopes | list | None
+    :type function: types.FunctionType
+    :rtype: types.FunctionType
+    """
+    plan = SecurityPlan.of(auth_funcs)
+    required_scopes = RequiredScopes.of(required_scopes)
 
     @functools.wraps(function)
     def wrapper(request):
-        token_info = get_authorization_info(auth_funcs, request, required_scopes)
+        credentials = RequestCredentials(request)
+        token_info = get_authorization_info(plan.select(credentials), request, required_scopes, credentials)
 
         # Fallback to 'uid' for backward compability
         request.context['user'] = token_info.get('sub', token_info.get('uid'))
@@ -329,6 +826,34 @@ def verify_security(auth_funcs, required_scopes, function):
     return wrapper
 
 
+def verify_security_async(auth_funcs, required_scopes, function):
+    """
+    :param auth_funcs: the plan of the operation, built once with its security, or its auth functions
+    :type auth_funcs: SecurityPlan | list
+    :type required_scopes: RequiredScopes | list | None
+    :type function: types.FunctionType
+    :rtype: types.FunctionType
+    """
+    plan = SecurityPlan.of(auth_funcs)
+    required_scopes = RequiredScopes.of(required_scopes)
+
+    @functools.wraps(function)
+    async def wrapper(request):
+        credentials = RequestCredentials(request)
+        token_info = await get_authorization_info_async(plan.select(credentials), request, required_scopes,
+                                                        credentials)
+
+        # Fallback to 'uid' for backward compability
+        request.context['user'] = token_info.get('sub', token_info.get('uid'))
+        request.context['token_info'] = token_info
+        response = function(request)
+        while asyncio.iscoroutine(response):
+            response = await response
+        return response
+
+    return wrapper
+
+
 def get_tokeninfo_remote(token_info_url, token):
     """
     Retrieve oauth token_info remotely using HTTP
@@ -342,3 +867,50 @@ def get_tokeninfo_remote(token_info_url, token):
     if not token_request.ok:
         return None
     return token_request.json()
+
+
+def get_async_session():
+    """
+    Returns the aiohttp client session of the running event loop, creating it
+    if needed. Connections are pooled and kept alive between token lookups.
+
+    :rtype: aiohttp.ClientSession
+    """
+    import aiohttp
+
+    loop = asyncio.get_event_loop()
+    client_session = async_sessions.get(loop)
+    if client_session is None or client_session.closed:
+        connector = aiohttp.TCPConnector(limit=100, keepalive_timeout=30)
+        client_session = aiohttp.ClientSession(connector=connector)
+        async_sessions[loop] = client_session
+    return client_session
+
+
+async def close_async_session():
+    """
+    Closes the aiohttp client session of the running event loop, if any.
+    """
+    client_session = async_sessions.pop(asyncio.get_event_loop(), None)
+    if client_session is not None:
+        await client_session.close()
+
+
+async def get_tokeninfo_remote_async(token_info_url, token):
+    """
+    Retrieve oauth token_info remotely using HTTP without blocking the event loop
+    :param token_info_url: Url to get information about the token
+    :type token_info_url: str
+    :param token: oauth token from authorization header
+    :type token: str
+    :rtype: dict
+    """
+    import aiohttp
+
+    client_session = get_async_session()
+    async with client_session.get(token_info_url,
+                                  headers={'Authorization': 'Bearer {}'.format(token)},
+                                  timeout=aiohttp.ClientTimeout(total=5)) as token_request:
+        if token_request.status >= 400:
+            return None
+        return await token_request.json(content_type=None)
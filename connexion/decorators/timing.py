@@ -0,0 +1,132 @@
+# Decorators measuring the time spent in each stage of the operation pipeline
+import asyncio
+import functools
+import logging
+import time
+
+
+logger = logging.getLogger('connexion.decorators.timing')
+
+REQUEST = 'request'
+SECURITY = 'security'
+URI_PARSING = 'uri_parsing'
+PARAMETER_VALIDATION = 'parameter_validation'
+BODY_VALIDATION = 'body_validation'
+RESPONSE_VALIDATION = 'response_validation'
+HANDLER = 'handler'
+RESPONSE = 'response'
+
+
+def time_stage(stage, function, is_async=False):
+    """
+    Wraps one stage of the operation pipeline to record the time spent in it,
+    including the stages it calls, in `request.timings`.
+
+    :param stage: name of the stage
+    :type stage: str
+    :type function: types.FunctionType
+    :param is_async: await the result of the stage
+    :type is_async: bool
+    :rtype: types.FunctionType
+    """
+    perf_counter = time.perf_counter
+
+    if is_async:
+        @functools.wraps(function)
+        async def wrapper(request):
+            start = perf_counter()
+            try:
+                response = function(request)
+                while asyncio.iscoroutine(response):
+                    response = await response
+                return response
+            finally:
+                request.timings[stage] = perf_counter() - start
+
+    else:
+        @functools.wraps(function)
+        def wrapper(request):
+            start = perf_counter()
+            try:
+                return function(request)
+            finally:
+                request.timings[stage] = perf_counter() - start
+
+    return wrapper
+
+
+def exclusive_timings(timings, stages):
+    """
+    Converts the time spent in nested stages to the time spent in each stage
+    alone.
+
+    :param timings: seconds spent in each stage, including the stages it calls
+    :type timings: dict
+    :param stages: names of the nested stages, innermost first
+    :type stages: tuple
+    :return: (stage, seconds) pairs, outermost first
+    :rtype: list
+    """
+    result = []
+    inner = 0.0
+    for stage in stages:
+        duration = timings.get(stage)
+        if duration is None:
+            continue
+        result.append((stage, duration - inner))
+        inner = duration
+    result.reverse()
+    return result
+
+
+def server_timing(timings):
+    """
+    :param timings: (stage, seconds) pairs
+    :type timings: list
+    :return: value of the Server-Timing header
+    :rtype: str
+    """
+    return ', '.join('{};dur={:.3f}'.format(stage, duration * 1000) for stage, duration in timings)
+
+
+class StageTimings(object):
+    """
+    Instrument of `InstrumentedRequestResponseDecorator` reporting the time
+    spent in each stage of the operation pipeline.
+    """
+
+    def __init__(self, stages, metrics=None, server_timing=False):
+        """
+        :param stages: names of the timed stages of the operation, innermost first
+        :type stages: tuple
+        :param metrics: metrics of the operation the stage timings are fed to
+        :type metrics: connexion.metrics.OperationMetrics | None
+        :param server_timing: add the timings as Server-Timing header to the response
+        :type server_timing: bool
+        """
+        self.stages = tuple(stages)
+        self.metrics = metrics
+        self.server_timing = server_timing
+
+    def request_started(self, request):
+        pass
+
+    def request_finished(self, request, response, error):
+        timings = request.timings
+        stage_timings = exclusive_timings(timings, self.stages)
+        if REQUEST in timings:
+            stage_timings.insert(0, (REQUEST, timings[REQUEST]))
+        if RESPONSE in timings:
+            stage_timings.append((RESPONSE, timings[RESPONSE]))
+
+        if self.metrics is not None:
+            for stage, duration in stage_timings:
+                self.metrics.observe_stage(stage, duration)
+        if self.server_timing and response is not None:
+            response.headers['Server-Timing'] = server_timing(stage_timings)
+
+    def __repr__(self):  # pragma: no cover
+        """
+        :rtype: str
+        """
+        return '<StageTimings: {}>'.format(', '.join(self.stages))
@@ -0,0 +1,131 @@
+# Decorators creating tracing spans for the stages of the operation pipeline
+import asyncio
+import functools
+import logging
+
+from .metrics import get_error_status, get_status
+
+logger = logging.getLogger('connexion.decorators.tracing')
+
+
+def trace_stage(stage, function, is_async=False, outcome_attribute=None):
+    """
+    Wraps one stage of the operation pipeline in a child span of the current
+    span of the request. Requests that are not sampled are passed through.
+
+    :param stage: name of the stage and its span
+    :type stage: str
+    :type function: types.FunctionType
+    :param is_async: await the result of the stage
+    :type is_async: bool
+    :param outcome_attribute: span attribute telling if the stage itself
+        succeeded, e.g. `validation.valid` for validators
+    :type outcome_attribute: str | None
+    :rtype: types.FunctionType
+    """
+
+    def start(request):
+        parent = request.span
+        span = parent.child(stage)
+        request.span = span
+        return parent, span
+
+    def fail(span, error):
+        span.record_error(error)
+        if outcome_attribute is not None:
+            # the stage failed itself if it did not get to call the next stage
+            span.set_attribute(outcome_attribute, span.children > 0)
+
+    def finish(request, parent, span):
+        if outcome_attribute is not None and span.status == 'ok':
+            span.set_attribute(outcome_attribute, True)
+        request.span = parent
+        span.end()
+
+    if is_async:
+        @functools.wraps(function)
+        async def wrapper(request):
+            if request.span is None:
+                response = function(request)
+                while asyncio.iscoroutine(response):
+                    response = await response
+                return response
+
+            parent, span = start(request)
+            try:
+                response = function(request)
+                while asyncio.iscoroutine(response):
+                    response = await response
+                return response
+            except BaseException as error:
+                fail(span, error)
+                raise
+            finally:
+                finish(request, parent, span)
+
+    else:
+        @functools.wraps(function)
+        def wrapper(request):
+            if request.span is None:
+                return function(request)
+
+            parent, span = start(request)
+            try:
+                return function(request)
+            except BaseException as error:
+                fail(span, error)
+                raise
+            finally:
+                finish(request, parent, span)
+
+    return wrapper
+
+
+class RequestTracing(object):
+    """
+    Instrument of `InstrumentedRequestResponseDecorator` creating the root
+    span of every sampled request. The span continues the trace of the W3C
+    `traceparent` request header; the `traceparent` of calls made by the
+    handler is available in the request context.
+    """
+
+    def __init__(self, tracer, operation_id, method, path):
+        """
+        :type tracer: connexion.tracing.Tracer
+        :type operation_id: str
+        :type method: str
+        :param path: path template of the operation, including the base path
+        :type path: str
+        """
+        self.tracer = tracer
+        self.name = '{} {}'.format(method.upper(), path)
+        self.attributes = {
+            'connexion.operation_id': operation_id,
+            'http.method': method.upper(),
+            'http.route': path,
+        }
+
+    def request_started(self, request):
+        span = self.tracer.start_request_span(self.name, request.headers.get('traceparent'), dict(self.attributes))
+        request.span = span
+        if span is not None:
+            request.context['traceparent'] = span.traceparent
+
+    def request_finished(self, request, response, error):
+        span = request.span
+        if span is None:
+            return
+        if error is not None:
+            span.record_error(error)
+            status = get_error_status(error)
+        else:
+            status = get_status(response)
+        span.set_attribute('http.status_code', status)
+        request.span = None
+        span.end()
+
+    def __repr__(self):  # pragma: no cover
+        """
+        :rtype: str
+        """
+        return '<RequestTracing: {}>'.format(self.name)
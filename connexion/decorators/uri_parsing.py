@@ -129,6 +129,9 @@ class AbstractURIParser(BaseDecorator, metaclass=abc.ABCMeta):
             def coerce_dict(md):
                 """ MultiDict -> dict of lists
                 """
+                if type(md) is dict:
+                    # already built for this request, e.g. the query an api key was removed from
+                    return md
                 try:
                     return md.to_dict(flat=False)
                 except AttributeError:
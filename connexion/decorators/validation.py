@@ -11,6 +11,7 @@ from werkzeug.datastructures import FileStorage
 from ..exceptions import ExtraParameterProblem, BadRequestProblem, UnsupportedMediaTypeProblem
 from ..http_facts import FORM_CONTENT_TYPES
 from ..json_schema import Draft4RequestValidator, Draft4ResponseValidator
+from ..streaming import check_content_length
 from ..utils import all_json, boolean, is_json_mimetype, is_null, is_nullable
 
 _jsonschema_3_or_newer = pkg_resources.parse_version(
@@ -116,7 +117,11 @@ class RequestBodyValidator(object):
         self.has_default = schema.get('default', False)
         self.is_null_value_valid = is_null_value_valid
         validatorClass = validator or Draft4RequestValidator
-        self.validator = validatorClass(schema, format_checker=draft4_format_checker)
+        registry = getattr(api, 'validator_registry', None)
+        if registry is None:
+            self.validator = validatorClass(schema, format_checker=draft4_format_checker)
+        else:
+            self.validator = registry.get(schema, validatorClass, draft4_format_checker)
         self.api = api
         self.strict_validation = strict_validation
 
@@ -209,16 +214,47 @@ class RequestBodyValidator(object):
         return None
 
 
+class RequestStreamValidator(object):
+    def __init__(self, max_length):
+        """
+        Enforces the `maxLength` of a streamed request body: the requests
+        announcing a larger body are rejected, the others once they sent more.
+
+        :param max_length: maximum number of bytes of the body
+        :type max_length: int
+        """
+        self.max_length = max_length
+
+    def __call__(self, function):
+        """
+        :type function: types.FunctionType
+        :rtype: types.FunctionType
+        """
+
+        @functools.wraps(function)
+        def wrapper(request):
+            check_content_length(request.headers, self.max_length)
+            request.stream.max_length = self.max_length
+            return function(request)
+
+        return wrapper
+
+
 class ResponseBodyValidator(object):
-    def __init__(self, schema, validator=None):
+    def __init__(self, schema, validator=None, registry=None):
         """
         :param schema: The schema of the response body
         :param validator: Validator class that should be used to validate passed data
                           against API schema. Default is jsonschema.Draft4Validator.
         :type validator: jsonschema.IValidator
+        :param registry: Registry of the validators of the API, sharing them between the operations
+        :type registry: connexion.json_schema.ValidatorRegistry | None
         """
         ValidatorClass = validator or Draft4ResponseValidator
-        self.validator = ValidatorClass(schema, format_checker=draft4_format_checker)
+        if registry is None:
+            self.validator = ValidatorClass(schema, format_checker=draft4_format_checker)
+        else:
+            self.validator = registry.get(schema, ValidatorClass, draft4_format_checker)
 
     def validate_schema(self, data, url):
         # type: (dict, AnyStr) -> Union[ConnexionResponse, None]
@@ -91,12 +91,30 @@ class BadRequestProblem(ProblemException):
         super(BadRequestProblem, self).__init__(status=400, title=title, detail=detail)
 
 
+class PayloadTooLargeProblem(ProblemException):
+
+    def __init__(self, title="Payload Too Large", detail=None):
+        super(PayloadTooLargeProblem, self).__init__(status=413, title=title, detail=detail)
+
+
 class UnsupportedMediaTypeProblem(ProblemException):
 
     def __init__(self, title="Unsupported Media Type", detail=None):
         super(UnsupportedMediaTypeProblem, self).__init__(status=415, title=title, detail=detail)
 
 
+class ServiceUnavailableProblem(ProblemException):
+
+    def __init__(self, title="Service Unavailable", detail=None, headers=None):
+        super(ServiceUnavailableProblem, self).__init__(status=503, title=title, detail=detail, headers=headers)
+
+
+class DeadlineExceededProblem(ProblemException):
+
+    def __init__(self, title="Gateway Timeout", detail="The deadline of the request was exceeded"):
+        super(DeadlineExceededProblem, self).__init__(status=504, title=title, detail=detail)
+
+
 class NonConformingResponseBody(NonConformingResponse):
     def __init__(self, message, reason="Response body does not conform to specification"):
         super(NonConformingResponseBody, self).__init__(reason=reason, message=message)
@@ -1,11 +1,11 @@
 from copy import deepcopy
 
-from jsonschema import Draft4Validator, RefResolver, _utils
+from jsonschema import Draft4Validator, RefResolver, _utils, draft4_format_checker
 from jsonschema.exceptions import RefResolutionError, ValidationError  # noqa
 from jsonschema.validators import extend
 from openapi_spec_validator.handlers import UrlHandler
 
-from .utils import deep_get
+from .utils import content_hash, deep_get
 
 try:
     from collections.abc import Mapping
@@ -13,6 +13,9 @@ except ImportError:
     from collections import Mapping
 
 
+# keys of the definitions attached to the schemas by `with_definitions`
+_DEFINITIONS = ('components', 'definitions')
+
 default_handlers = {
     'http': UrlHandler('http'),
     'https': UrlHandler('https'),
@@ -112,3 +115,64 @@ Draft4ResponseValidator = extend(Draft4Validator, {
                                  'required': validate_required,
                                  'writeOnly': validate_writeOnly,
                                  'x-writeOnly': validate_writeOnly})
+
+
+class ValidatorRegistry(object):
+    """
+    Validators of the schemas of a specification, shared by the operations
+    of the APIs mounting it.
+
+    The references of a spec are inlined when it is loaded, so the operations
+    referring to the same schema get equal copies of it, which share one
+    validator. The `components` or `definitions` attached to a schema for the
+    validator are the same map for every operation of the specification and are
+    compared by identity.
+    """
+
+    #: Whether the equal schemas share a validator
+    shared = True
+
+    def __init__(self):
+        self._validators = {}
+        self._count = 0
+
+    def __len__(self):
+        """
+        :return: the number of validators created by the registry
+        :rtype: int
+        """
+        return self._count
+
+    def get(self, schema, validator_class, format_checker=draft4_format_checker):
+        """
+        :param schema: schema of the validator, with its definitions attached
+        :type schema: dict
+        :type validator_class: jsonschema.IValidator
+        :type format_checker: jsonschema.FormatChecker
+        :rtype: jsonschema.IValidator
+        """
+        key = (validator_class, format_checker, schema_key(schema)) if self.shared else None
+        validator = self._validators.get(key)
+        if validator is None:
+            validator = validator_class(schema, format_checker=format_checker)
+            self._count += 1
+            if key is not None:
+                self._validators[key] = validator
+        return validator
+
+
+def schema_key(schema):
+    """
+    Hashes the structure of a schema, the definitions attached to it by their identity.
+    The schemas which cannot be serialized are identified by their own identity.
+
+    :type schema: dict
+    :rtype: tuple
+    """
+    definitions = tuple((name, id(schema[name])) for name in _DEFINITIONS if isinstance(schema.get(name), Mapping))
+    body = {name: value for name, value in schema.items() if name not in _DEFINITIONS}
+    try:
+        return content_hash(body), definitions
+    except (TypeError, ValueError):
+        # circular or with keys of several types
+        return id(schema), definitions
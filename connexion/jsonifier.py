@@ -1,7 +1,11 @@
 import datetime
+import functools
 import json
 import uuid
 
+# containers with more items are encoded incrementally, this many items at a time
+ENCODE_BATCH_SIZE = 1000
+
 
 class JSONEncoder(json.JSONEncoder):
     def default(self, o):
@@ -43,6 +47,72 @@ class Jsonifier(object):
             kwargs.setdefault(k, v)
         return self.json.dumps(data, **kwargs) + '\n'
 
+    def iterencode(self, data, **kwargs):
+        """ Incremental version of dumps(), for the large bodies: yields the
+        same JSON document in pieces of bounded size. The large lists and
+        dicts are encoded in slices of `ENCODE_BATCH_SIZE` items by dumps()
+        of the json library, so that it keeps its speed.
+        """
+        for k, v in self.dumps_args.items():
+            kwargs.setdefault(k, v)
+        dumps = functools.partial(self.json.dumps, **kwargs)
+        indent = kwargs.get('indent')
+        if isinstance(indent, int):
+            indent = ' ' * indent
+        item_separator, key_separator = kwargs.get('separators') or (
+            (',', ': ') if indent is not None else (', ', ': '))
+        # the json library may sort the keys by default, e.g. Flask
+        probe = dumps({'b': 0, 'a': 0})
+        sort_keys = probe.index('"a"') < probe.index('"b"')
+
+        def encode_slice(values, depth):
+            # the items of the slice, without the brackets but with their indentation
+            text = dumps(values)[1:-1]
+            if indent is not None:
+                text = text[:-1].replace('\n', '\n' + indent * depth)
+            return text
+
+        def encode_key(key):
+            if isinstance(key, str):
+                return dumps(key)
+            # converted to a string like the json library does
+            return dumps({key: 0})[1:-1].strip()[:-len(key_separator) - 1]
+
+        def encode(value, depth):
+            if not is_large(value):
+                text = dumps(value)
+                if indent is not None and depth:
+                    text = text.replace('\n', '\n' + indent * depth)
+                yield text
+                return
+
+            is_dict = isinstance(value, dict)
+            newline = '\n' + indent * (depth + 1) if indent is not None else ''
+            yield '{' if is_dict else '['
+            separator = ''
+            batch = []
+            for key in (sorted(value) if is_dict and sort_keys else value):
+                item = value[key] if is_dict else key
+                if is_large(item):
+                    if batch:
+                        yield separator + encode_slice(dict(batch) if is_dict else batch, depth)
+                        separator, batch = item_separator, []
+                    yield separator + newline + (encode_key(key) + key_separator if is_dict else '')
+                    yield from encode(item, depth + 1)
+                    separator = item_separator
+                    continue
+                batch.append((key, item) if is_dict else item)
+                if len(batch) == ENCODE_BATCH_SIZE:
+                    yield separator + encode_slice(dict(batch) if is_dict else batch, depth)
+                    separator, batch = item_separator, []
+            if batch:
+                yield separator + encode_slice(dict(batch) if is_dict else batch, depth)
+            closing = '}' if is_dict else ']'
+            yield '\n' + indent * depth + closing if indent is not None else closing
+
+        yield from encode(data, 0)
+        yield '\n'
+
     def loads(self, data):
         """ Central point where JSON deserialization happens inside
         Connexion.
@@ -55,3 +125,17 @@ class Jsonifier(object):
         except Exception:
             if isinstance(data, str):
                 return data
+
+
+def is_large(data):
+    """
+    Whether a body is worth encoding incrementally: a list with more than
+    `ENCODE_BATCH_SIZE` items, or a dict with as many items or a large value.
+
+    :rtype: bool
+    """
+    if isinstance(data, (list, tuple)):
+        return len(data) > ENCODE_BATCH_SIZE
+    if isinstance(data, dict):
+        return len(data) > ENCODE_BATCH_SIZE or any(is_large(value) for value in data.values())
+    return False
@@ -10,7 +10,8 @@ class ConnexionRequest(object):
                  body=None,
                  json_getter=None,
                  files=None,
-                 context=None):
+                 context=None,
+                 stream=None):
         self.url = url
         self.method = method
         self.path_params = path_params or {}
@@ -21,6 +22,12 @@ class ConnexionRequest(object):
         self.json_getter = json_getter
         self.files = files
         self.context = context if context is not None else {}
+        # unread body of the operations streaming their request body
+        self.stream = stream
+        # seconds spent in each stage of the operation pipeline, if recorded
+        self.timings = None
+        # span of the current stage of the request, if traced
+        self.span = None
 
     @property
     def json(self):
@@ -0,0 +1,147 @@
+"""
+Limits of the request bodies, enforced before they are buffered or parsed.
+
+The size of a body is checked against its Content-Length before it is read,
+and counted while it is read for the chunked requests, the forms included. The
+nesting depth and the number of elements of a JSON body are counted on its
+brackets and commas outside of its strings, with bytes operations that cost
+less than parsing it, before the JSON parser builds any object out of it.
+"""
+import itertools
+import operator
+
+from .exceptions import BadRequestProblem, PayloadTooLargeProblem
+
+_WHITESPACE = b' \t\n\r'
+_VALUES = bytes(set(range(256)) - set(b'[]{},' + _WHITESPACE))
+# the objects as arrays and the values as zeros
+_STRUCTURE = bytes.maketrans(b'{}' + _VALUES, b'[]' + b'0' * len(_VALUES))
+_OPEN = ord('[')
+
+
+class BodyLimits(object):
+    __slots__ = ('max_size', 'max_json_depth', 'max_json_items')
+
+    def __init__(self, max_size=None, max_json_depth=None, max_json_items=None):
+        """
+        :param max_size: maximum size of the body in bytes, unlimited if None
+        :type max_size: int | None
+        :param max_json_depth: maximum nesting depth of the arrays and objects of a JSON body,
+            unlimited if None
+        :type max_json_depth: int | None
+        :param max_json_items: maximum number of elements of all the arrays and objects of a
+            JSON body, unlimited if None
+        :type max_json_items: int | None
+        """
+        self.max_size = max_size
+        self.max_json_depth = max_json_depth
+        self.max_json_items = max_json_items
+
+    @classmethod
+    def from_options(cls, options):
+        """
+        The default limits of the API, e.g. for its batch requests.
+
+        :type options: connexion.options.ConnexionOptions
+        :rtype: BodyLimits
+        """
+        return cls(options.max_body_size, options.max_json_depth, options.max_json_items)
+
+    @property
+    def limits_json(self):
+        """
+        :rtype: bool
+        """
+        return self.max_json_depth is not None or self.max_json_items is not None
+
+
+def check_json(body, max_depth=None, max_items=None):
+    """
+    Rejects the JSON bodies nested too deep or with too many elements, without parsing them.
+    The malformed bodies are left to the JSON parser.
+
+    :type body: bytes | str
+    :type max_depth: int | None
+    :type max_items: int | None
+    :raises BadRequestProblem: if the body is nested deeper than `max_depth`
+    :raises PayloadTooLargeProblem: if the body has more than `max_items` elements
+    """
+    if not body:
+        return
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    # the brackets and commas within the strings are counted too, most bodies are within the limits anyway
+    opening = body.count(b'[') + body.count(b'{')
+    if (max_depth is None or opening <= max_depth) and \
+            (max_items is None or opening + body.count(b',') <= max_items):
+        return
+    structure = _structure(body)
+    # an element per comma, plus the first one of each non-empty array or object
+    if max_items is not None and \
+            structure.count(b',') + structure.count(b'[') - structure.count(b'[]') > max_items:
+        raise PayloadTooLargeProblem(detail='The JSON body has more than {} elements'.format(max_items))
+    if max_depth is not None and _nested_deeper(structure.translate(None, b',0'), max_depth):
+        raise BadRequestProblem(detail='The JSON body is nested deeper than {} levels'.format(max_depth))
+
+
+def _structure(body):
+    """
+    The brackets and commas of a JSON body, with its objects as arrays and each of its values as
+    zeros, a string being a single zero.
+
+    :type body: bytes
+    :rtype: bytes
+    """
+    if b'"' in body:
+        if b'\\' in body:
+            # the escaped backslashes first, so that the quote of "\\" still ends its string
+            body = body.replace(b'\\\\', b'').replace(b'\\"', b'')
+        body = b'0'.join(body.split(b'"')[::2])
+    return body.translate(_STRUCTURE, _WHITESPACE)
+
+
+def _nested_deeper(brackets, max_depth):
+    """
+    Whether balanced brackets are nested deeper than `max_depth`.
+
+    :type brackets: bytes
+    :type max_depth: int
+    :rtype: bool
+    """
+    while brackets:
+        pairs = brackets.count(b'[]')
+        if pairs * 8 < len(brackets):
+            break
+        if not max_depth:
+            return True
+        # removing the innermost arrays takes a level off, in the time of a copy
+        brackets = brackets.replace(b'[]', b'')
+        max_depth -= 1
+    else:
+        return False
+    if brackets[0] != _OPEN:
+        return False
+    # the few remaining runs of brackets, the deepest level being at the end of a run of opening ones
+    runs = brackets.replace(b'[]', b'[ ]').replace(b'][', b'] [').split()
+    opened = itertools.accumulate(map(len, runs[::2]))
+    closed = itertools.chain((0,), itertools.accumulate(map(len, runs[1::2])))
+    return max(map(operator.sub, opened, closed)) > max_depth
+
+
+def limit_json(request, limits):
+    """
+    Makes the JSON body of a request checked against the limits before it is parsed.
+
+    :type request: connexion.lifecycle.ConnexionRequest
+    :type limits: BodyLimits
+    """
+    json_getter = request.json_getter
+    checked = []
+
+    def get_json():
+        if not checked:
+            check_json(request.body, limits.max_json_depth, limits.max_json_items)
+            checked.append(True)
+        return json_getter()
+
+    request.json_getter = get_json
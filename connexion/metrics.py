@@ -0,0 +1,389 @@
+"""
+Request metrics in the Prometheus text exposition format.
+
+A registry counts the requests and records their latency in a histogram per
+operation and status code, and optionally the latency of every stage of the
+operation pipeline (see the `stage_timings` option) and the state of the
+concurrency limits of the operations. `MetricsRegistry` keeps the metrics of one
+process, `MultiProcessMetricsRegistry` aggregates the metrics of prefork
+workers through one file per worker in a shared directory.
+"""
+import atexit
+import bisect
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import weakref
+
+logger = logging.getLogger('connexion.metrics')
+
+DEFAULT_BUCKETS = (.005, .01, .025, .05, .075, .1, .25, .5, .75, 1.0, 2.5, 5.0, 7.5, 10.0)
+DEFAULT_PREFIX = 'connexion'
+METRICS_DIR_ENV = 'CONNEXION_METRICS_DIR'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+REQUESTS = 'requests'
+STAGES = 'stages'
+LIMITS = 'limits'
+LABEL_NAMES = {
+    REQUESTS: ('method', 'path', 'status'),
+    STAGES: ('method', 'path', 'stage'),
+    LIMITS: ('method', 'path'),
+}
+
+# the registries writing to a file, flushed before a worker exits
+_multi_process_registries = weakref.WeakSet()
+
+
+class OperationMetrics(object):
+    """
+    Metrics of one operation. The histogram of every status code (or stage) is
+    allocated on its first request, later requests only increment
+    preallocated counters.
+    """
+
+    __slots__ = ('registry', 'labels', '_series', '_stage_series')
+
+    def __init__(self, registry, labels):
+        """
+        :type registry: MetricsRegistry
+        :param labels: method and path of the operation
+        :type labels: tuple
+        """
+        self.registry = registry
+        self.labels = labels
+        self._series = {}
+        self._stage_series = {}
+
+    def observe(self, status, duration):
+        """
+        :param status: HTTP status code of the response
+        :type status: int
+        :param duration: latency of the request in seconds
+        :type duration: float
+        """
+        series = self._series.get(status)
+        if series is None:
+            series = self.registry.get_series(REQUESTS, self.labels + (str(status),))
+            self._series[status] = series
+        self.registry.observe(series, duration)
+
+    def observe_stage(self, stage, duration):
+        """
+        :param stage: name of the stage of the operation pipeline
+        :type stage: str
+        :param duration: time spent in the stage in seconds
+        :type duration: float
+        """
+        series = self._stage_series.get(stage)
+        if series is None:
+            series = self.registry.get_series(STAGES, self.labels + (stage,))
+            self._stage_series[stage] = series
+        self.registry.observe(series, duration)
+
+
+class MetricsRegistry(object):
+    """
+    Request counts and latency histograms of one process.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix=DEFAULT_PREFIX):
+        """
+        :param buckets: upper bounds of the latency histogram buckets in seconds
+        :type buckets: tuple
+        :param prefix: prefix of the metric names
+        :type prefix: str
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._series = {REQUESTS: {}, STAGES: {}}
+        # (method, path) -> concurrency limiter of the operation
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def operation(self, method, path):
+        """
+        :rtype: OperationMetrics
+        """
+        return OperationMetrics(self, (method.upper(), path))
+
+    def register_limiter(self, method, path, limiter):
+        """
+        Exposes the requests in flight, queued and rejected by the concurrency limiter of an operation.
+
+        :type method: str
+        :param path: path template of the operation, including the base path
+        :type path: str
+        :type limiter: connexion.decorators.concurrency.ConcurrencyLimiter
+        """
+        with self._lock:
+            self._limiters[(method.upper(), path)] = limiter
+
+    def get_series(self, family, labels):
+        """
+        Returns the counters of a label tuple: one per bucket, one for
+        requests above the last bucket and the sum of the latencies.
+
+        :param family: REQUESTS or STAGES
+        :type family: str
+        :type labels: tuple
+        :rtype: list
+        """
+        with self._lock:
+            return self._series[family].setdefault(labels, [0] * (len(self.buckets) + 1) + [0.0])
+
+    def observe(self, series, duration):
+        """
+        :type series: list
+        :type duration: float
+        """
+        index = bisect.bisect_left(self.buckets, duration)
+        with self._lock:
+            series[index] += 1
+            series[-1] += duration
+
+    def collect(self):
+        """
+        :return: a copy of the counters by family and label tuple
+        :rtype: dict
+        """
+        with self._lock:
+            collected = {family: {labels: list(counters) for labels, counters in series.items()}
+                         for family, series in self._series.items()}
+            collected[LIMITS] = {labels: [limiter.in_flight, limiter.queued, limiter.rejected, limiter.limit]
+                                 for labels, limiter in self._limiters.items()}
+            return collected
+
+    def render(self):
+        """
+        :return: the metrics in the Prometheus text exposition format
+        :rtype: str
+        """
+        return render_text(self.collect(), self.buckets, self.prefix)
+
+
+class MultiProcessMetricsRegistry(MetricsRegistry):
+    """
+    Metrics of prefork workers. Each process writes its counters to its own
+    file in `directory` at most every `flush_interval` seconds, rendering
+    sums the files of all processes. Files of exited workers are kept so that
+    the counters never decrease, without their requests in flight and queued.
+    """
+
+    def __init__(self, directory, flush_interval=1.0, **kwargs):
+        """
+        :param directory: directory shared by all workers
+        :type directory: str
+        :param flush_interval: seconds between two writes of the counters
+        :type flush_interval: float
+        """
+        super(MultiProcessMetricsRegistry, self).__init__(**kwargs)
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._flushed_at = time.monotonic()
+        self.path = self._get_path()
+        os.makedirs(directory, exist_ok=True)
+        atexit.register(self.flush)
+        _multi_process_registries.add(self)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _get_path(self):
+        return os.path.join(self.directory, 'metrics-{pid}.json'.format(pid=os.getpid()))
+
+    def _reset(self):
+        # the counters of the parent are written by the parent
+        self._lock = threading.Lock()
+        self.path = self._get_path()
+        for series in self._series.values():
+            for counters in series.values():
+                counters[:] = [0] * (len(counters) - 1) + [0.0]
+
+    def observe(self, series, duration):
+        super(MultiProcessMetricsRegistry, self).observe(series, duration)
+        if time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Atomically writes the counters of this process to its file.
+        """
+        self._flushed_at = time.monotonic()
+        series = {family: [[list(labels), counters] for labels, counters in family_series.items()]
+                  for family, family_series in self.collect().items()}
+        if not any(series.values()):
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.metrics-')
+        try:
+            with os.fdopen(fd, 'w') as tmp_file:
+                json.dump({'buckets': self.buckets, 'series': series}, tmp_file)
+            os.replace(tmp_path, self.path)
+        except OSError:  # pragma: no cover
+            logger.exception('Could not write metrics to %s', self.directory)
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def collect_all(self):
+        """
+        :return: the sum of the counters of all processes by family and label tuple
+        :rtype: dict
+        """
+        self.flush()
+        total = {family: {} for family in LABEL_NAMES}
+        for path in glob.glob(os.path.join(self.directory, 'metrics-*.json')):
+            try:
+                with open(path) as metrics_file:
+                    data = json.load(metrics_file)
+            except (OSError, ValueError):
+                logger.warning('Skipping unreadable metrics file %s', path)
+                continue
+            if tuple(data['buckets']) != self.buckets:
+                logger.warning('Skipping metrics file %s with other buckets', path)
+                continue
+            if not _is_running(path):
+                # the gauges of an exited worker, only its rejected requests still count
+                for labels, values in data['series'].get(LIMITS, ()):
+                    values[:] = [0, 0, values[2], 0]
+            for family, family_series in data['series'].items():
+                if family not in total:
+                    continue
+                for labels, counters in family_series:
+                    series = total[family].setdefault(tuple(labels), [0] * len(counters))
+                    for index, value in enumerate(counters):
+                        series[index] += value
+        return total
+
+    def render(self):
+        return render_text(self.collect_all(), self.buckets, self.prefix)
+
+
+def _is_running(path):
+    """
+    :param path: metrics file of a process
+    :return: whether the process is running, True if its pid is unknown
+    :rtype: bool
+    """
+    try:
+        pid = int(os.path.basename(path)[len('metrics-'):-len('.json')])
+        os.kill(pid, 0)
+    except (ValueError, PermissionError):
+        return True
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def flush_multi_process_registries():
+    """
+    Writes the counters of the `MultiProcessMetricsRegistry` of this process,
+    before it exits without running the atexit handlers, e.g. with `os._exit()`.
+    """
+    for registry in list(_multi_process_registries):
+        registry.flush()
+
+
+def escape_label_value(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(names, values):
+    return ','.join('{}="{}"'.format(name, escape_label_value(value)) for name, value in zip(names, values))
+
+
+def format_value(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def render_histogram(lines, name, label_names, series, bounds):
+    """
+    Appends the bucket, sum and count samples of a histogram to `lines`.
+
+    :return: the number of observations by label tuple
+    :rtype: dict
+    """
+    bucket_label_names = label_names + ('le',)
+    counts = {}
+    for labels in sorted(series):
+        counters = series[labels]
+        labels_text = format_labels(label_names, labels)
+        cumulative = 0
+        for bound, count in zip(bounds, counters[:-1]):
+            cumulative += count
+            lines.append('{}_bucket{{{}}} {}'.format(
+                name, format_labels(bucket_label_names, labels + (bound,)), cumulative))
+        lines.append('{}_sum{{{}}} {}'.format(name, labels_text, format_value(counters[-1])))
+        lines.append('{}_count{{{}}} {}'.format(name, labels_text, cumulative))
+        counts[labels] = cumulative
+    return counts
+
+
+def render_text(series, buckets, prefix=DEFAULT_PREFIX):
+    """
+    :param series: counters by family and label tuple, as returned by `MetricsRegistry.collect`
+    :type series: dict
+    :type buckets: tuple
+    :type prefix: str
+    :rtype: str
+    """
+    requests_name = '{}_requests_total'.format(prefix)
+    duration_name = '{}_request_duration_seconds'.format(prefix)
+    stage_name = '{}_request_stage_duration_seconds'.format(prefix)
+    bounds = [format_value(float(bound)) for bound in buckets] + ['+Inf']
+
+    counts = ['# HELP {} Total number of requests.'.format(requests_name),
+              '# TYPE {} counter'.format(requests_name)]
+    histograms = ['# HELP {} Request latency in seconds.'.format(duration_name),
+                  '# TYPE {} histogram'.format(duration_name)]
+    label_names = LABEL_NAMES[REQUESTS]
+    request_counts = render_histogram(histograms, duration_name, label_names, series[REQUESTS], bounds)
+    for labels, count in sorted(request_counts.items()):
+        counts.append('{}{{{}}} {}'.format(requests_name, format_labels(label_names, labels), count))
+    lines = counts + histograms
+
+    if series[STAGES]:
+        lines.append('# HELP {} Time spent in each stage of the operation pipeline in seconds.'.format(stage_name))
+        lines.append('# TYPE {} histogram'.format(stage_name))
+        render_histogram(lines, stage_name, LABEL_NAMES[STAGES], series[STAGES], bounds)
+
+    if series.get(LIMITS):
+        limits = sorted(series[LIMITS].items())
+        for index, (suffix, metric_type, help_text) in enumerate([
+                ('requests_in_flight', 'gauge', 'Requests handled by the operations with a concurrency limit.'),
+                ('requests_queued', 'gauge', 'Requests waiting for a slot of the operations with a concurrency limit.'),
+                ('requests_rejected_total', 'counter', 'Requests rejected by the concurrency limits.'),
+                ('concurrency_limit', 'gauge', 'Current concurrency limits, which vary if they are adaptive.')]):
+            name = '{}_{}'.format(prefix, suffix)
+            lines.append('# HELP {} {}'.format(name, help_text))
+            lines.append('# TYPE {} {}'.format(name, metric_type))
+            for labels, values in limits:
+                lines.append('{}{{{}}} {}'.format(name, format_labels(LABEL_NAMES[LIMITS], labels), values[index]))
+    return '\n'.join(lines) + '\n'
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_default_registry():
+    """
+    Returns the registry shared by all APIs enabling metrics with
+    `options={'metrics': True}`. The metrics of all workers are aggregated in
+    the directory of the `CONNEXION_METRICS_DIR` env var, if set.
+
+    :rtype: MetricsRegistry
+    """
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            directory = os.environ.get(METRICS_DIR_ENV)
+            if directory:
+                _default_registry = MultiProcessMetricsRegistry(directory)
+            else:
+                _default_registry = MetricsRegistry()
+        return _default_registry
@@ -1,16 +1,27 @@
-import functools
 import logging
+import re
 
+from connexion.lifecycle import ConnexionResponse
 from connexion.resolver import Resolution, Resolver, ResolverError
+from connexion.utils import deep_get
 
 logger = logging.getLogger(__name__)
 
+PREFER_PARAMETER = re.compile(r'\s*([\w-]+)\s*=\s*"?([^",;]*)"?')
+
 
 class MockResolver(Resolver):
 
-    def __init__(self, mock_all):
+    def __init__(self, mock_all, prefer=False):
+        """
+        :param mock_all: mock all the operations, not only those whose handler is not found
+        :type mock_all: bool
+        :param prefer: let clients choose the example returned with a ``Prefer: code=404, example=name`` header
+        :type prefer: bool
+        """
         super(MockResolver, self).__init__()
         self.mock_all = mock_all
+        self.prefer = prefer
         self._operation_id_counter = 1
 
     def resolve(self, operation):
@@ -25,7 +36,7 @@ class MockResolver(Resolver):
             operation_id = 'mock-{}'.format(self._operation_id_counter)
             self._operation_id_counter += 1
 
-        mock_func = functools.partial(self.mock_operation, operation=operation)
+        mock_func = MockResponses(self, operation)
         if self.mock_all:
             func = mock_func
         else:
@@ -45,3 +56,98 @@ class MockResolver(Resolver):
         if resp is not None:
             return resp, code
         return 'No example response was defined.', code
+
+
+class MockResponses(object):
+    """
+    Mock handler of an operation.
+
+    The example responses of the operation are rendered and serialized once, when its
+    handler is built, and every request is served one of them as is.
+    """
+
+    def __init__(self, resolver, operation):
+        """
+        :type resolver: MockResolver
+        :type operation: connexion.operations.AbstractOperation
+        """
+        self.resolver = resolver
+        self.operation = operation
+        self._default = None
+        # (status code, example name) -> response, example name None is the first example
+        self._responses = {}
+
+    def __call__(self, *args, **kwargs):
+        return self.resolver.mock_operation(self.operation, *args, **kwargs)
+
+    def request_handler(self):
+        """
+        Returns the handler serving the rendered responses, it is called with the ConnexionRequest.
+        """
+        # the responses of the operation are not parsed yet when it is resolved
+        if self._default is None:
+            self._render_responses()
+        if self.resolver.prefer:
+            return self._preferred_response
+        return self._default_response
+
+    def _render_responses(self):
+        body, status_code = self.resolver.mock_operation(self.operation)
+        self._default = self._render(status_code, body, self._example_headers(status_code))
+
+        mimetype = self.operation.get_mimetype()
+        for status in sorted(self.operation.responses, key=str):
+            body, status_code = self.operation.example_response(status)
+            headers = self._example_headers(status)
+            self._responses.setdefault((status_code, None), self._render(status_code, body, headers))
+            try:
+                examples = deep_get(self.operation.responses, [status, 'content', mimetype, 'examples'])
+            except KeyError:
+                continue
+            for name, example in examples.items():
+                if 'value' in example:
+                    rendered = self._render(status_code, example['value'], headers)
+                    self._responses.setdefault((status_code, name), rendered)
+
+    def _example_headers(self, status):
+        headers = {}
+        responses = self.operation.responses
+        response_headers = (responses.get(status) or responses.get(str(status)) or {}).get('headers', {})
+        for name, header in response_headers.items():
+            example = header.get('example', header.get('schema', {}).get('example'))
+            if example is not None:
+                headers[name] = str(example)
+        return headers
+
+    def _render(self, status_code, body, headers):
+        mimetype = self.operation.get_mimetype()
+        body, mimetype = self.operation.api._serialize_data(body, mimetype)
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        return status_code, mimetype, body, headers
+
+    @staticmethod
+    def _response(rendered):
+        status_code, mimetype, body, headers = rendered
+        return ConnexionResponse(status_code=status_code, mimetype=mimetype, body=body, headers=headers)
+
+    def _default_response(self, request):
+        return self._response(self._default)
+
+    def _preferred_response(self, request):
+        prefer = request.headers.get('Prefer')
+        if not prefer:
+            return self._response(self._default)
+
+        preferences = dict(PREFER_PARAMETER.findall(prefer))
+        example = preferences.get('example')
+        try:
+            status_code = int(preferences['code'])
+        except (KeyError, ValueError):
+            # the example is looked for in the default status code first
+            status_code = self._default[0]
+            if example is not None and (status_code, example) not in self._responses:
+                status_code = next((code for code, name in self._responses if name == example), status_code)
+
+        rendered = self._responses.get((status_code, example)) or self._responses.get((status_code, None))
+        return self._response(rendered or self._default)
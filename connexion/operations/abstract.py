@@ -3,11 +3,24 @@ import logging
 
 from connexion.operations.secure import SecureOperation
 
-from ..decorators.metrics import UWSGIMetricsCollector
+from ..decorators import timing, tracing
+from ..decorators.concurrency import (AdaptiveConcurrencyLimiter,
+                                      ConcurrencyLimiter,
+                                      GradientConcurrencyLimiter)
+from ..decorators.deadline import DeadlineDecorator, check_deadline
+from ..decorators.decorator import (InstrumentedRequestResponseDecorator,
+                                    RequestResponseDecorator)
+from ..decorators.metrics import MetricsCollector, UWSGIMetricsCollector
 from ..decorators.parameter import parameter_to_arg
 from ..decorators.produces import BaseSerializer, Produces
 from ..decorators.response import ResponseValidator
-from ..decorators.validation import ParameterValidator, RequestBodyValidator
+from ..decorators.validation import (ParameterValidator, RequestBodyValidator,
+                                     RequestStreamValidator)
+from ..exceptions import ConnexionException
+from ..http_facts import FORM_CONTENT_TYPES
+from ..limits import BodyLimits
+from ..mock import MockResponses
+from ..options import ConnexionOptions
 from ..utils import all_json, is_nullable
 
 logger = logging.getLogger('connexion.operations.abstract')
@@ -98,6 +111,9 @@ class AbstractOperation(SecureOperation, metaclass=abc.ABCMeta):
 
         self._responses = self._operation.get("responses", {})
 
+        self._concurrency_limiter = None
+        self._stream_body = None
+
         self._validator_map = dict(VALIDATOR_MAP)
         self._validator_map.update(validator_map or {})
 
@@ -343,16 +359,41 @@ class AbstractOperation(SecureOperation, metaclass=abc.ABCMeta):
 
         :rtype: types.FunctionType
         """
-        function = parameter_to_arg(
-            self, self._resolution.function, self.pythonic_params,
-            self._pass_context_arg_name
-        )
+        # stage timers and spans are only added if enabled, so that they cost nothing otherwise
+        options = self._options
+        stage_timings = options is not None and options.stage_timings
+        tracer = options.tracer if options is not None else None
+        timed_stages = []
+
+        def instrument_stage(stage, function, outcome_attribute=None):
+            if stage_timings:
+                timed_stages.append(stage)
+                function = timing.time_stage(stage, function, self.is_async)
+            if tracer is not None:
+                function = tracing.trace_stage(stage, function, self.is_async, outcome_attribute)
+            return function
+
+        function = self._resolution.function
+        if isinstance(function, MockResponses):
+            # mock responses are rendered once and chosen from the request
+            function = function.request_handler()
+        else:
+            function = parameter_to_arg(
+                self, function, self.pythonic_params,
+                self._pass_context_arg_name
+            )
+        deadline_decorator = self._deadline_decorator
+        if deadline_decorator is not None and not self.is_async:
+            # the worker threads can't be interrupted, the deadline is checked once validated
+            function = check_deadline(function)
+        function = instrument_stage(timing.HANDLER, function)
 
         if self.validate_responses:
             logger.debug('... Response validation enabled.')
             response_decorator = self.__response_validation_decorator
             logger.debug('... Adding response decorator (%r)', response_decorator)
             function = response_decorator(function)
+            function = instrument_stage(timing.RESPONSE_VALIDATION, function, 'validation.valid')
 
         produces_decorator = self.__content_type_decorator
         logger.debug('... Adding produces decorator (%r)', produces_decorator)
@@ -360,23 +401,185 @@ class AbstractOperation(SecureOperation, metaclass=abc.ABCMeta):
 
         for validation_decorator in self.__validation_decorators:
             function = validation_decorator(function)
+            if isinstance(validation_decorator, self.validator_map['parameter']):
+                function = instrument_stage(timing.PARAMETER_VALIDATION, function, 'validation.valid')
+            else:
+                function = instrument_stage(timing.BODY_VALIDATION, function, 'validation.valid')
 
         uri_parsing_decorator = self._uri_parsing_decorator
         function = uri_parsing_decorator(function)
+        function = instrument_stage(timing.URI_PARSING, function)
 
         # NOTE: the security decorator should be applied last to check auth before anything else :-)
         security_decorator = self.security_decorator
         logger.debug('... Adding security decorator (%r)', security_decorator)
         function = security_decorator(function)
+        if self.security:
+            function = instrument_stage(timing.SECURITY, function, 'security.authorized')
+
+        if deadline_decorator is not None:
+            logger.debug('... Adding deadline decorator (%r)', deadline_decorator)
+            function = deadline_decorator(function)
+
+        instruments = []
+        if stage_timings:
+            metrics_registry = self._metrics_registry
+            instruments.append(timing.StageTimings(
+                timed_stages,
+                metrics=metrics_registry and metrics_registry.operation(self.method, self.api.base_path + self.path),
+                server_timing=options.server_timing
+            ))
+        if tracer is not None:
+            instruments.append(tracing.RequestTracing(tracer, self.operation_id, self.method,
+                                                      self.api.base_path + self.path))
+
+        body_limits = self.body_limits
+        if instruments:
+            decorator = InstrumentedRequestResponseDecorator(self.api, self.get_mimetype(), instruments,
+                                                             stream_body=self.stream_body, body_limits=body_limits)
+            logger.debug('... Adding instruments (%r)', decorator)
+            function = decorator(function)
+        elif self.stream_body or body_limits is not None:
+            function = RequestResponseDecorator(self.api, self.get_mimetype(), stream_body=self.stream_body,
+                                                body_limits=body_limits)(function)
+        else:
+            function = self._request_response_decorator(function)
 
-        function = self._request_response_decorator(function)
+        concurrency_limiter = self.concurrency_limiter
+        if concurrency_limiter is not None:
+            # excess requests are rejected before their body is read or their credentials checked
+            logger.debug('... Adding concurrency limiter (%r)', concurrency_limiter)
+            function = concurrency_limiter(function)
 
         if UWSGIMetricsCollector.is_available():  # pragma: no cover
             decorator = UWSGIMetricsCollector(self.path, self.method)
             function = decorator(function)
 
+        metrics_registry = self._metrics_registry
+        if metrics_registry is not None:
+            decorator = MetricsCollector(metrics_registry, self.api.base_path + self.path, self.method)
+            logger.debug('... Adding metrics decorator (%r)', decorator)
+            function = decorator(function)
+
         return function
 
+    @property
+    def _options(self):
+        """
+        :return: the options of the API, if any
+        :rtype: ConnexionOptions | None
+        """
+        options = getattr(self.api, 'options', None)
+        if isinstance(options, ConnexionOptions):
+            return options
+        return None
+
+    @property
+    def _metrics_registry(self):
+        """
+        :return: the metrics registry of the API, if metrics are enabled
+        :rtype: MetricsRegistry | None
+        """
+        options = self._options
+        if options is None:
+            return None
+        return options.metrics
+
+    @property
+    def _deadline_decorator(self):
+        """
+        :return: the decorator enforcing the `x-timeout` of the operation or the deadline header, if any
+        :rtype: DeadlineDecorator | None
+        """
+        options = self._options
+        timeout = self._operation.get('x-timeout', options and options.timeout)
+        header = options and options.deadline_header
+        if timeout is None and not header:
+            return None
+        return DeadlineDecorator(timeout, header, self.is_async)
+
+    @property
+    def stream_body(self):
+        """
+        Whether the handler gets the request body as a stream instead of
+        buffered, if `x-stream` is set on the body of a binary operation.
+
+        :rtype: bool
+        """
+        if self._stream_body is None:
+            # computed once, when the operation is built, so that the warning is logged once
+            stream_body = bool(self._body_extension('x-stream'))
+            if stream_body and (all_json(self.consumes) or self.consumes[0] in FORM_CONTENT_TYPES):
+                logger.warning('... Ignoring x-stream on the %s body of %s %s',
+                               self.consumes[0], self.method.upper(), self.path)
+                stream_body = False
+            self._stream_body = stream_body
+        return self._stream_body
+
+    @property
+    def body_limits(self):
+        """
+        The limits of the request body, from the `x-max-body-size` of the operation or the
+        defaults of the API.
+
+        :return: None if the body is not limited
+        :rtype: BodyLimits | None
+        """
+        options = self._options
+        max_size = self._operation.get('x-max-body-size', options and options.max_body_size)
+        max_json_depth = options and options.max_json_depth
+        max_json_items = options and options.max_json_items
+        if max_size is None and max_json_depth is None and max_json_items is None:
+            return None
+        return BodyLimits(max_size, max_json_depth, max_json_items)
+
+    def _body_extension(self, name):
+        """
+        :return: the value of the extension `name` of the request body, if any
+        """
+        return self.body_definition.get(name)
+
+    @property
+    def concurrency_limiter(self):
+        """
+        The limiter of the requests handled at the same time, from the `x-concurrency-limit` and
+        `x-max-queue` of the operation or the defaults of the API. An `x-concurrency-limit` of
+        `adaptive` or the `adaptive_concurrency` option adjust the limit to the latency.
+
+        :rtype: ConcurrencyLimiter | None
+        """
+        if self._concurrency_limiter is None:
+            options = self._options
+            limit = self._operation.get('x-concurrency-limit')
+            adaptive = options.adaptive_concurrency if options else False
+            if limit is None and not adaptive:
+                limit = options and options.concurrency_limit
+                if limit is None:
+                    return None
+            max_queue = self._operation.get('x-max-queue', options.max_queue if options else 0)
+            retry_after = options.retry_after if options else 1
+            metrics_labels = (self.method, self.api.base_path + self.path)
+            if limit == 'adaptive' or (limit is None and adaptive is True):
+                limiter = GradientConcurrencyLimiter(max_queue=max_queue, retry_after=retry_after)
+            elif limit is None:
+                if not isinstance(adaptive, AdaptiveConcurrencyLimiter):
+                    raise ConnexionException(
+                        'adaptive_concurrency must be True or an AdaptiveConcurrencyLimiter, got {!r}'.format(adaptive))
+                # the limiter instance is shared by all the operations of the API
+                limiter = adaptive
+                metrics_labels = ('*', self.api.base_path)
+            elif isinstance(limit, int) and not isinstance(limit, bool):
+                limiter = ConcurrencyLimiter(limit, max_queue, retry_after)
+            else:
+                raise ConnexionException(
+                    "x-concurrency-limit of {} {} must be an integer or 'adaptive', got {!r}".format(
+                        self.method.upper(), self.path, limit))
+            self._concurrency_limiter = limiter
+            metrics_registry = self._metrics_registry
+            if metrics_registry is not None:
+                metrics_registry.register_limiter(*metrics_labels, limiter=limiter)
+        return self._concurrency_limiter
+
     @property
     def __content_type_decorator(self):
         """
@@ -421,7 +624,15 @@ class AbstractOperation(SecureOperation, metaclass=abc.ABCMeta):
             yield ParameterValidator(self.parameters,
                                      self.api,
                                      strict_validation=self.strict_validation)
-        if self.body_schema:
+        if self.stream_body:
+            # the body is read by the handler, only its length can be checked
+            max_length = self.body_schema.get('maxLength')
+            body_limits = self.body_limits
+            if body_limits is not None and body_limits.max_size is not None:
+                max_length = body_limits.max_size if max_length is None else min(max_length, body_limits.max_size)
+            if max_length is not None:
+                yield RequestStreamValidator(max_length)
+        elif self.body_schema:
             yield RequestBodyValidator(self.body_schema, self.consumes, self.api,
                                        is_nullable(self.body_definition),
                                        strict_validation=self.strict_validation)
@@ -267,6 +267,10 @@ class OpenAPIOperation(AbstractOperation):
             return self.with_definitions(res)
         return {}
 
+    def _body_extension(self, name):
+        # set on the request body or on the media type of its content
+        return self._request_body.get(name, self.body_definition.get(name))
+
     def _get_body_argument(self, body, arguments, has_kwargs, sanitize):
         x_body_name = sanitize(self.body_schema.get('x-body-name', 'body'))
         if is_nullable(self.body_schema) and is_null(body):
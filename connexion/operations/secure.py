@@ -2,12 +2,19 @@ import functools
 import logging
 
 from ..decorators.decorator import RequestResponseDecorator
-from ..decorators.security import (get_apikeyinfo_func, get_basicinfo_func,
+from ..decorators.security import (RequiredScopes, SecurityPlan,
+                                   get_apikeyinfo_func, get_basicinfo_func,
                                    get_bearerinfo_func,
                                    get_scope_validate_func, get_tokeninfo_func,
                                    security_deny, security_passthrough,
-                                   verify_apikey, verify_basic, verify_bearer,
-                                   verify_none, verify_oauth, verify_security)
+                                   verify_apikey, verify_apikey_async,
+                                   verify_basic, verify_basic_async,
+                                   verify_bearer, verify_bearer_async,
+                                   verify_none, verify_oauth,
+                                   verify_oauth_async, verify_security,
+                                   verify_security_async)
+from ..exceptions import ConnexionException
+from ..utils import has_coroutine
 
 logger = logging.getLogger("connexion.operations.secure")
 
@@ -40,6 +47,14 @@ class SecureOperation(object):
     def security_schemes(self):
         return self._security_schemes
 
+    @property
+    def is_async(self):
+        """
+        True if the API runs on an asyncio framework, in which case the
+        security chain is awaited instead of blocking the event loop.
+        """
+        return has_coroutine(self.api.get_request)
+
     @property
     def security_decorator(self):
         """
@@ -76,6 +91,7 @@ class SecureOperation(object):
         if not self.security:
             return security_passthrough
 
+        is_async = self.is_async
         auth_funcs = []
         required_scopes = None
         for security_req in self.security:
@@ -92,13 +108,16 @@ class SecureOperation(object):
 
             if security_scheme['type'] == 'oauth2':
                 required_scopes = scopes
-                token_info_func = get_tokeninfo_func(security_scheme)
+                token_info_func = get_tokeninfo_func(security_scheme, is_async=is_async)
                 scope_validate_func = get_scope_validate_func(security_scheme)
                 if not token_info_func:
                     logger.warning("... x-tokenInfoFunc missing", extra=vars(self))
                     continue
 
-                auth_funcs.append(verify_oauth(token_info_func, scope_validate_func))
+                if self._any_coroutine(token_info_func, scope_validate_func):
+                    auth_funcs.append(verify_oauth_async(token_info_func, scope_validate_func))
+                else:
+                    auth_funcs.append(verify_oauth(token_info_func, scope_validate_func))
 
             # Swagger 2.0
             elif security_scheme['type'] == 'basic':
@@ -107,7 +126,7 @@ class SecureOperation(object):
                     logger.warning("... x-basicInfoFunc missing", extra=vars(self))
                     continue
 
-                auth_funcs.append(verify_basic(basic_info_func))
+                auth_funcs.append(self._verify_basic(basic_info_func))
 
             # OpenAPI 3.0.0
             elif security_scheme['type'] == 'http':
@@ -118,36 +137,72 @@ class SecureOperation(object):
                         logger.warning("... x-basicInfoFunc missing", extra=vars(self))
                         continue
 
-                    auth_funcs.append(verify_basic(basic_info_func))
+                    auth_funcs.append(self._verify_basic(basic_info_func))
                 elif scheme == 'bearer':
-                    bearer_info_func = get_bearerinfo_func(security_scheme)
+                    bearer_info_func = get_bearerinfo_func(security_scheme, is_async=is_async)
                     if not bearer_info_func:
-                        logger.warning("... x-bearerInfoFunc missing", extra=vars(self))
+                        logger.warning("... x-bearerInfoFunc or x-jwksUri missing", extra=vars(self))
                         continue
-                    auth_funcs.append(verify_bearer(bearer_info_func))
+                    auth_funcs.append(self._verify_bearer(bearer_info_func))
                 else:
                     logger.warning("... Unsupported http authorization scheme %s" % scheme, extra=vars(self))
 
             elif security_scheme['type'] == 'apiKey':
                 scheme = security_scheme.get('x-authentication-scheme', '').lower()
                 if scheme == 'bearer':
-                    bearer_info_func = get_bearerinfo_func(security_scheme)
+                    bearer_info_func = get_bearerinfo_func(security_scheme, is_async=is_async)
                     if not bearer_info_func:
-                        logger.warning("... x-bearerInfoFunc missing", extra=vars(self))
+                        logger.warning("... x-bearerInfoFunc or x-jwksUri missing", extra=vars(self))
                         continue
-                    auth_funcs.append(verify_bearer(bearer_info_func))
+                    auth_funcs.append(self._verify_bearer(bearer_info_func))
                 else:
                     apikey_info_func = get_apikeyinfo_func(security_scheme)
                     if not apikey_info_func:
                         logger.warning("... x-apikeyInfoFunc missing", extra=vars(self))
                         continue
 
-                    auth_funcs.append(verify_apikey(apikey_info_func, security_scheme['in'], security_scheme['name']))
+                    auth_funcs.append(self._verify_apikey(apikey_info_func, security_scheme['in'],
+                                                          security_scheme['name']))
 
             else:
                 logger.warning("... Unsupported security scheme type %s" % security_scheme['type'], extra=vars(self))
 
-        return functools.partial(verify_security, auth_funcs, required_scopes)
+        # compiled once, for all the functions the operation decorates
+        plan = SecurityPlan(auth_funcs)
+        if required_scopes is not None:
+            required_scopes = RequiredScopes(required_scopes)
+        if is_async:
+            return functools.partial(verify_security_async, plan, required_scopes)
+        return functools.partial(verify_security, plan, required_scopes)
+
+    def _any_coroutine(self, *funcs):
+        """
+        Checks if any of the user supplied security functions is a coroutine
+        function, in which case its result has to be awaited.
+
+        :raises: ConnexionException if the API can not await coroutines
+        """
+        if not any(has_coroutine(func) for func in funcs):
+            return False
+        if not self.is_async:
+            raise ConnexionException(
+                "Coroutine security functions are only supported by asyncio APIs (e.g. AioHttpApi)")
+        return True
+
+    def _verify_basic(self, basic_info_func):
+        if self._any_coroutine(basic_info_func):
+            return verify_basic_async(basic_info_func)
+        return verify_basic(basic_info_func)
+
+    def _verify_bearer(self, bearer_info_func):
+        if self._any_coroutine(bearer_info_func):
+            return verify_bearer_async(bearer_info_func)
+        return verify_bearer(bearer_info_func)
+
+    def _verify_apikey(self, apikey_info_func, loc, name):
+        if self._any_coroutine(apikey_info_func):
+            return verify_apikey_async(apikey_info_func, loc, name)
+        return verify_apikey(apikey_info_func, loc, name)
 
     def get_mimetype(self):
         return DEFAULT_MIMETYPE
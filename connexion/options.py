@@ -1,6 +1,9 @@
 import logging
 import pathlib
-from typing import Optional  # NOQA
+from typing import Any, Optional  # NOQA
+
+from .metrics import MetricsRegistry, get_default_registry  # NOQA
+from .tracing import Tracer  # NOQA
 
 try:
     from swagger_ui_bundle import (swagger_ui_2_path,
@@ -121,6 +124,237 @@ class ConnexionOptions(object):
         """
         return self._options.get('swagger_ui_config', None)
 
+    @property
+    def metrics(self):
+        # type: () -> Optional[MetricsRegistry]
+        """
+        Registry recording the request count and latency of every operation.
+        `True` uses the registry shared by all APIs of the process.
+
+        Default: None
+        """
+        metrics = self._options.get('metrics')
+        if metrics is True:
+            return get_default_registry()
+        return metrics or None
+
+    @property
+    def metrics_path(self):
+        # type: () -> Optional[str]
+        """
+        Path of the endpoint serving the metrics in the Prometheus text
+        exposition format, or `False` to not serve them.
+
+        Default: /metrics
+        """
+        return self._options.get('metrics_path', '/metrics')
+
+    @property
+    def stage_timings(self):
+        # type: () -> bool
+        """
+        Whether to record the time spent in each stage of the operation
+        pipeline (security, validation, handler...) per request. The timings
+        are fed to the `metrics` registry, if any.
+
+        Default: False, unless `server_timing` is enabled
+        """
+        return bool(self._options.get('stage_timings', False) or self.server_timing)
+
+    @property
+    def server_timing(self):
+        # type: () -> bool
+        """
+        Whether to add the time spent in each stage of the operation pipeline
+        to the responses as `Server-Timing` header.
+
+        Default: False
+        """
+        return bool(self._options.get('server_timing', False))
+
+    @property
+    def tracer(self):
+        # type: () -> Optional[Tracer]
+        """
+        Tracer creating spans for the stages of every sampled request.
+
+        Default: None
+        """
+        return self._options.get('tracer')
+
+    @property
+    def batch_path(self):
+        # type: () -> Optional[str]
+        """
+        Path of the endpoint executing a JSON array of requests to the
+        operations of the API in one HTTP request, e.g. `/batch`.
+
+        Default: None, there is no batch endpoint
+        """
+        return self._options.get('batch_path')
+
+    @property
+    def batch_max_size(self):
+        # type: () -> int
+        """
+        Maximum number of requests in a batch.
+
+        Default: 20
+        """
+        return self._options.get('batch_max_size', 20)
+
+    @property
+    def batch_concurrency(self):
+        # type: () -> int
+        """
+        Maximum number of requests of the batches executed at the same time.
+
+        Default: 8
+        """
+        return self._options.get('batch_concurrency', 8)
+
+    @property
+    def concurrency_limit(self):
+        # type: () -> Optional[int]
+        """
+        Default maximum number of requests of each operation handled at the
+        same time, overridden by the `x-concurrency-limit` of the operations.
+
+        Default: None, the operations without `x-concurrency-limit` are not limited
+        """
+        return self._options.get('concurrency_limit')
+
+    @property
+    def adaptive_concurrency(self):
+        # type: () -> Any
+        """
+        Adjust the concurrency limit of the operations without `x-concurrency-limit`
+        to the latency of their requests. True gives each operation its own
+        `GradientConcurrencyLimiter`, an `AdaptiveConcurrencyLimiter` instance
+        limits all the operations of the API together. Overrides `concurrency_limit`.
+
+        Default: False
+        """
+        return self._options.get('adaptive_concurrency', False)
+
+    @property
+    def max_queue(self):
+        # type: () -> int
+        """
+        Default maximum number of requests waiting for a slot of a limited
+        operation, overridden by the `x-max-queue` of the operations. The
+        requests beyond are rejected with 503 Service Unavailable.
+
+        Default: 0, the requests above the limit are rejected right away
+        """
+        return self._options.get('max_queue', 0)
+
+    @property
+    def retry_after(self):
+        # type: () -> int
+        """
+        Seconds in the Retry-After header of the requests rejected by a concurrency limit.
+
+        Default: 1
+        """
+        return self._options.get('retry_after', 1)
+
+    @property
+    def timeout(self):
+        # type: () -> Optional[float]
+        """
+        Default seconds the operations have to respond, overridden by the
+        `x-timeout` of the operations. Slower requests get a 504 Gateway
+        Timeout problem response.
+
+        Default: None, the operations without `x-timeout` have no timeout
+        """
+        return self._options.get('timeout')
+
+    @property
+    def deadline_header(self):
+        # type: () -> Optional[str]
+        """
+        Request header with the deadline of the client as a Unix timestamp,
+        e.g. `X-Request-Deadline`. The requests past their deadline are
+        rejected with 504 Gateway Timeout.
+
+        Default: None, the deadlines of the clients are ignored
+        """
+        return self._options.get('deadline_header')
+
+    @property
+    def max_body_size(self):
+        # type: () -> Optional[int]
+        """
+        Default maximum size in bytes of the request bodies, overridden by the
+        `x-max-body-size` of the operations. Larger bodies get a 413 Payload
+        Too Large problem response before they are buffered. With AioHttpApi,
+        it replaces the `client_max_size` of the application.
+
+        Default: None, the operations without `x-max-body-size` are not limited
+        """
+        return self._options.get('max_body_size')
+
+    @property
+    def max_json_depth(self):
+        # type: () -> Optional[int]
+        """
+        Maximum nesting depth of the arrays and objects of the JSON request
+        bodies, checked before they are parsed. Deeper bodies get a 400 Bad
+        Request problem response.
+
+        Default: None, unlimited
+        """
+        return self._options.get('max_json_depth')
+
+    @property
+    def max_json_items(self):
+        # type: () -> Optional[int]
+        """
+        Maximum number of elements of all the arrays and objects of the JSON
+        request bodies, checked before they are parsed. Larger bodies get a 413
+        Payload Too Large problem response.
+
+        Default: None, unlimited
+        """
+        return self._options.get('max_json_items')
+
+    @property
+    def multipart_spool_size(self):
+        # type: () -> int
+        """
+        Bytes of an uploaded file kept in memory by AioHttpApi, the larger
+        files are written to temporary files while they are received.
+
+        Default: 512000
+        """
+        return self._options.get('multipart_spool_size', 500 * 1024)
+
+    @property
+    def multipart_max_part_size(self):
+        # type: () -> Optional[int]
+        """
+        Maximum size in bytes of a field or file of the multipart/form-data
+        requests of AioHttpApi. Larger parts get a 413 Payload Too Large
+        problem response.
+
+        Default: None, the parts are only limited by `multipart_max_size`
+        """
+        return self._options.get('multipart_max_part_size')
+
+    @property
+    def multipart_max_size(self):
+        # type: () -> Optional[int]
+        """
+        Maximum size in bytes of all the fields and files of the
+        multipart/form-data requests of AioHttpApi. Larger forms get a 413
+        Payload Too Large problem response.
+
+        Default: None, the `client_max_size` of the aiohttp application
+        """
+        return self._options.get('multipart_max_size')
+
     @property
     def uri_parser_class(self):
         # type: () -> AbstractURIParser
@@ -8,9 +8,9 @@ from openapi_spec_validator.exceptions import OpenAPIValidationError
 from urllib.parse import urlsplit
 
 from .exceptions import InvalidSpecification
-from .json_schema import resolve_refs
+from .json_schema import ValidatorRegistry, resolve_refs
 from .operations import OpenAPIOperation, Swagger2Operation
-from .utils import deep_get
+from .utils import content_hash, deep_get
 
 try:
     import collections.abc as collections_abc  # python 3.3+
@@ -30,6 +30,17 @@ def canonical_base_path(base_path):
     return base_path.rstrip('/')
 
 
+def enforce_string_keys(obj):
+    # YAML supports integer keys, but JSON does not
+    if isinstance(obj, dict):
+        return {
+            str(k): enforce_string_keys(v)
+            for k, v
+            in obj.items()
+        }
+    return obj
+
+
 class Specification(collections_abc.Mapping):
 
     def __init__(self, raw_spec):
@@ -37,6 +48,8 @@ class Specification(collections_abc.Mapping):
         self._set_defaults(raw_spec)
         self._validate_spec(raw_spec)
         self._spec = resolve_refs(raw_spec)
+        # validators of the schemas, shared by the APIs of the specification
+        self.validator_registry = ValidatorRegistry()
 
     @classmethod
     @abc.abstractmethod
@@ -128,16 +141,6 @@ class Specification(collections_abc.Mapping):
         """
         Takes in a dictionary, and returns a Specification
         """
-        def enforce_string_keys(obj):
-            # YAML supports integer keys, but JSON does not
-            if isinstance(obj, dict):
-                return {
-                    str(k): enforce_string_keys(v)
-                    for k, v
-                    in obj.items()
-                }
-            return obj
-
         spec = enforce_string_keys(spec)
         version = cls._get_spec_version(spec)
         if version < (3, 0, 0):
@@ -148,13 +151,39 @@ class Specification(collections_abc.Mapping):
         return type(self)(copy.deepcopy(self._raw_spec))
 
     @classmethod
-    def load(cls, spec, arguments=None):
+    def load(cls, spec, arguments=None, cache=None):
+        """
+        Takes in a path to a YAML file, a dictionary or a Specification, and returns a Specification
+
+        :param cache: content hash -> Specification of the specifications already loaded, the
+            specifications with the same content are only validated and resolved once
+        :type cache: dict | None
+        """
+        if isinstance(spec, Specification):
+            return spec
+        if cache is None:
+            if not isinstance(spec, dict):
+                return cls.from_file(spec, arguments=arguments)
+            return cls.from_dict(spec)
+
         if not isinstance(spec, dict):
-            return cls.from_file(spec, arguments=arguments)
-        return cls.from_dict(spec)
+            spec = cls._load_spec_from_file(arguments, pathlib.Path(spec))
+        spec = enforce_string_keys(spec)
+        key = content_hash(spec)
+        specification = cache.get(key)
+        if specification is None:
+            specification = cache[key] = cls.from_dict(spec)
+        return specification
 
     def with_base_path(self, base_path):
-        new_spec = self.clone()
+        """
+        Returns a copy of the specification with another base path. The copy
+        shares the resolved spec and the validators of the specification, it
+        is not validated nor resolved again.
+        """
+        new_spec = copy.copy(self)
+        new_spec._raw_spec = dict(self._raw_spec)
+        new_spec._spec = dict(self._spec)
         new_spec.base_path = base_path
         return new_spec
 
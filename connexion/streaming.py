@@ -0,0 +1,379 @@
+"""
+Streamed request and response bodies.
+
+The handlers of the operations with `x-stream: true` on their request body get
+the body as it is received instead of buffered in memory: a file-like
+`RequestStream` with Flask and an async iterator of byte chunks,
+`AsyncRequestStream`, with aiohttp. The `maxLength` of the body schema is
+enforced while the body is read.
+
+The handlers can return a generator (or an async generator with aiohttp)
+instead of a list: its items are encoded and sent as they are produced, as a
+JSON array, as NDJSON (one JSON document per line) or as they are for the
+other mimetypes. The large JSON bodies returned at once are also encoded and
+sent in chunks, rather than copied into one string and then into bytes.
+
+The handlers can also return a file: a `pathlib.Path`, an open binary file or
+a buffer (`mmap`, `memoryview`). It is sent by the framework (with `sendfile`
+where possible) without being read into memory, with the byte ranges requested
+by the `Range` headers.
+"""
+import inspect
+import io
+import itertools
+import mimetypes
+import mmap
+import os
+import stat
+import tempfile
+from contextlib import suppress
+from pathlib import PurePath
+
+from .exceptions import PayloadTooLargeProblem
+from .jsonifier import is_large
+from .utils import is_json_mimetype
+
+CHUNK_SIZE = 64 * 1024
+
+NDJSON_MIMETYPES = frozenset([
+    'application/x-ndjson',
+    'application/ndjson',
+    'application/jsonl',
+    'application/x-jsonlines',
+])
+
+
+def check_content_length(headers, max_length):
+    """
+    Rejects the requests announcing a body larger than `max_length` before it is read.
+
+    :type headers: dict
+    :type max_length: int
+    :raises PayloadTooLargeProblem: if the Content-Length header exceeds `max_length`
+    """
+    content_length = headers.get('Content-Length')
+    if content_length and content_length.isdigit() and int(content_length) > max_length:
+        raise PayloadTooLargeProblem(detail='The request body is larger than {} bytes'.format(max_length))
+
+
+class _LimitedStream(object):
+
+    def __init__(self, stream, max_length=None):
+        """
+        :param stream: the raw body stream of the framework
+        :param max_length: maximum number of bytes of the body, unlimited if None
+        :type max_length: int | None
+        """
+        self._stream = stream
+        self.max_length = max_length
+        self.bytes_read = 0
+
+    def _count(self, data):
+        self.bytes_read += len(data)
+        if self.max_length is not None and self.bytes_read > self.max_length:
+            raise PayloadTooLargeProblem(detail='The request body is larger than {} bytes'.format(self.max_length))
+        return data
+
+
+class RequestStream(_LimitedStream):
+    """
+    File-like object over the body of a WSGI request.
+    """
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        """
+        :param size: maximum number of bytes to read, all the remaining ones if negative
+        :type size: int
+        :rtype: bytes
+        """
+        if size is None or size < 0:
+            return b''.join(self)
+        return self._count(self._stream.read(size))
+
+    def __iter__(self):
+        """
+        Iterates over the body in chunks of up to `CHUNK_SIZE` bytes.
+        """
+        chunk = self.read(CHUNK_SIZE)
+        while chunk:
+            yield chunk
+            chunk = self.read(CHUNK_SIZE)
+
+
+class AsyncRequestStream(_LimitedStream):
+    """
+    Async iterator over the chunks of the body of an aiohttp request.
+    """
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        chunk = await self._stream.read(CHUNK_SIZE)
+        if not chunk:
+            raise StopAsyncIteration
+        return self._count(chunk)
+
+    async def read(self):
+        """
+        Reads the remaining body, for the small bodies of otherwise streamed operations.
+
+        :rtype: bytes
+        """
+        return b''.join([chunk async for chunk in self])
+
+
+def is_stream(data):
+    """
+    :return: whether a response body is produced by a generator
+    :rtype: bool
+    """
+    return inspect.isgenerator(data) or inspect.isasyncgen(data)
+
+
+def is_ndjson_mimetype(mimetype):
+    """
+    :type mimetype: str | None
+    :rtype: bool
+    """
+    return mimetype in NDJSON_MIMETYPES
+
+
+def _encode_raw(item):
+    if isinstance(item, bytes):
+        return item
+    if isinstance(item, str):
+        return item.encode('utf-8')
+    raise TypeError('The items of a streamed non-JSON response must be str or bytes, not {}'.format(
+        type(item).__name__))
+
+
+def encode_stream(items, mimetype, jsonifier):
+    """
+    Encodes the items of a generator as they are produced.
+
+    :param items: generator or async generator of the items of the body
+    :param mimetype: mimetype of the response
+    :type mimetype: str | None
+    :type jsonifier: connexion.jsonifier.Jsonifier
+    :return: generator or async generator of the chunks of the body
+    """
+    if is_ndjson_mimetype(mimetype):
+        prefix, separator, suffix = b'', b'', b''
+
+        def encode(item):
+            return jsonifier.dumps(item, indent=None).encode('utf-8')
+    elif isinstance(mimetype, str) and is_json_mimetype(mimetype):
+        prefix, separator, suffix = b'[', b',', b']\n'
+
+        def encode(item):
+            return jsonifier.dumps(item).rstrip('\n').encode('utf-8')
+    else:
+        prefix, separator, suffix = b'', b'', b''
+        encode = _encode_raw
+
+    if inspect.isasyncgen(items):
+        async def chunks():
+            delimiter = prefix
+            empty = True
+            async for item in items:
+                yield delimiter + encode(item)
+                delimiter = separator
+                empty = False
+            if empty:
+                if prefix or suffix:
+                    yield prefix + suffix
+            elif suffix:
+                yield suffix
+    else:
+        def chunks():
+            delimiter = prefix
+            empty = True
+            for item in items:
+                yield delimiter + encode(item)
+                delimiter = separator
+                empty = False
+            if empty:
+                if prefix or suffix:
+                    yield prefix + suffix
+            elif suffix:
+                yield suffix
+
+    return chunks()
+
+
+def map_stream(items, function):
+    """
+    Calls `function` on every item of a generator, as it is produced.
+
+    :param items: generator or async generator
+    :type function: types.FunctionType
+    :return: generator or async generator of the same items
+    """
+    if inspect.isasyncgen(items):
+        async def mapped():
+            async for item in items:
+                function(item)
+                yield item
+    else:
+        def mapped():
+            for item in items:
+                function(item)
+                yield item
+
+    return mapped()
+
+
+def encode_json(data, jsonifier, buffer_size):
+    """
+    Encodes a JSON body, incrementally if it is large.
+
+    :param buffer_size: number of characters above which the body is sent in chunks
+    :type buffer_size: int
+    :type jsonifier: connexion.jsonifier.Jsonifier
+    :return: the body, or a generator of its chunks if it is larger than `buffer_size`
+    :rtype: str | types.GeneratorType
+    """
+    if not is_large(data):
+        return jsonifier.dumps(data)
+
+    pieces = jsonifier.iterencode(data)
+    buffered = []
+    size = 0
+    for piece in pieces:
+        buffered.append(piece)
+        size += len(piece)
+        if size > buffer_size:
+            return _chunks(itertools.chain(buffered, pieces))
+    return ''.join(buffered)
+
+
+def _chunks(pieces, chunk_size=CHUNK_SIZE):
+    """
+    Joins the pieces of an encoded body into chunks of at least `chunk_size` characters.
+    """
+    chunk = []
+    size = 0
+    for piece in pieces:
+        chunk.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(chunk).encode('utf-8')
+            chunk = []
+            size = 0
+    if chunk:
+        yield ''.join(chunk).encode('utf-8')
+
+
+def is_file(data):
+    """
+    :return: whether a response body is a file to send as it is
+    :rtype: bool
+    """
+    return (isinstance(data, (PurePath, mmap.mmap, memoryview)) or
+            (hasattr(data, 'read') and hasattr(data, 'close')))
+
+
+class BufferFile(io.RawIOBase):
+    """
+    Read-only file over a buffer, the chunks read are the only copies made.
+    Closing it closes the buffer if it is a `mmap`.
+    """
+
+    def __init__(self, buffer):
+        """
+        :type buffer: mmap.mmap | memoryview
+        """
+        super().__init__()
+        self._buffer = buffer
+        self.view = memoryview(buffer).cast('B')
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        data = self.view[self._position:self._position + len(b)]
+        size = len(data)
+        b[:size] = data
+        self._position += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        self._position = max(offset, 0)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        if not self.closed:
+            self.view.release()
+            if isinstance(self._buffer, mmap.mmap):
+                self._buffer.close()
+        super().close()
+
+
+class FileBody(object):
+    """
+    File returned by a handler, opened to be sent.
+    """
+    __slots__ = ('file', 'size', 'mtime', 'name')
+
+    def __init__(self, data):
+        """
+        :param data: path, open binary file or buffer. The files are sent from their start and
+            closed once sent.
+        :type data: pathlib.PurePath | io.IOBase | mmap.mmap | memoryview
+        """
+        self.size = self.mtime = self.name = None
+        if isinstance(data, (mmap.mmap, memoryview)):
+            self.file = BufferFile(data)
+            self.size = len(self.file.view)
+            return
+
+        if isinstance(data, PurePath):
+            self.file = open(str(data), 'rb')
+        else:
+            self.file = data
+        name = getattr(self.file, 'name', None)
+        if isinstance(name, str):
+            self.name = name
+
+        file_stat = None
+        if not isinstance(self.file, tempfile.SpooledTemporaryFile):
+            # the fileno() of a spooled file writes it to disk
+            with suppress(AttributeError, OSError, ValueError):
+                file_stat = os.fstat(self.file.fileno())
+        if file_stat is not None:
+            # the size of pipes and sockets is unknown
+            if stat.S_ISREG(file_stat.st_mode):
+                self.size = file_stat.st_size
+                self.mtime = file_stat.st_mtime
+                self.file.seek(0)
+        else:
+            # in memory files
+            with suppress(AttributeError, OSError, ValueError):
+                self.size = self.file.seek(0, io.SEEK_END)
+                self.file.seek(0)
+
+    @property
+    def mimetype(self):
+        """
+        :return: the mimetype guessed from the name of the file
+        :rtype: str
+        """
+        return (self.name and mimetypes.guess_type(self.name)[0]) or 'application/octet-stream'
+
+    def close(self):
+        self.file.close()
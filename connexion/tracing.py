@@ -0,0 +1,226 @@
+"""
+Tracing of the request lifecycle.
+
+A `Tracer` creates a span for every sampled request with child spans for
+the stages of the operation pipeline (security, validation, handler...).
+The W3C `traceparent` header of the request is continued, finished spans are
+handed to a pluggable exporter.
+"""
+import atexit
+import json
+import logging
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger('connexion.tracing')
+
+TRACEPARENT_RE = re.compile(r'^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+INVALID_TRACE_ID = '0' * 32
+INVALID_SPAN_ID = '0' * 16
+
+
+def new_trace_id():
+    return '{:032x}'.format(random.getrandbits(128))
+
+
+def new_span_id():
+    return '{:016x}'.format(random.getrandbits(64))
+
+
+def parse_traceparent(header):
+    """
+    :param header: value of a W3C `traceparent` header
+    :type header: str | None
+    :return: trace id, parent span id and whether the parent was sampled, or None if invalid
+    :rtype: tuple[str, str, bool] | None
+    """
+    if not header:
+        return None
+    match = TRACEPARENT_RE.match(header.strip().lower())
+    if match is None:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    if version == 'ff' or trace_id == INVALID_TRACE_ID or span_id == INVALID_SPAN_ID:
+        return None
+    return trace_id, span_id, bool(int(flags, 16) & 1)
+
+
+class Span(object):
+    """
+    A timed stage of a request.
+    """
+
+    __slots__ = ('tracer', 'name', 'trace_id', 'span_id', 'parent_id', 'start_time', 'end_time',
+                 'attributes', 'status', 'children')
+
+    def __init__(self, tracer, name, trace_id, parent_id=None, attributes=None):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = new_span_id()
+        self.parent_id = parent_id
+        self.start_time = time.time()
+        self.end_time = None
+        self.attributes = attributes or {}
+        self.status = 'ok'
+        self.children = 0
+
+    @property
+    def traceparent(self):
+        """
+        :return: the W3C `traceparent` header of calls made within this span
+        :rtype: str
+        """
+        return '00-{}-{}-01'.format(self.trace_id, self.span_id)
+
+    @property
+    def duration(self):
+        """
+        :return: duration in seconds, None while the span is not finished
+        :rtype: float | None
+        """
+        if self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+    def child(self, name, attributes=None):
+        """
+        :rtype: Span
+        """
+        self.children += 1
+        return Span(self.tracer, name, self.trace_id, self.span_id, attributes)
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_error(self, error):
+        """
+        :type error: BaseException
+        """
+        self.status = 'error'
+        self.attributes['error.type'] = type(error).__name__
+
+    def end(self):
+        self.end_time = time.time()
+        self.tracer.exporter.export(self)
+
+    def to_dict(self):
+        """
+        :rtype: dict
+        """
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'attributes': self.attributes,
+            'status': self.status,
+        }
+
+    def __repr__(self):  # pragma: no cover
+        return '<Span {} {}/{}>'.format(self.name, self.trace_id, self.span_id)
+
+
+class Tracer(object):
+    """
+    Creates the spans of sampled requests.
+    """
+
+    def __init__(self, exporter, sample_ratio=1.0):
+        """
+        :param exporter: receives the finished spans, see `InMemorySpanExporter`
+        :param sample_ratio: share of the requests traced (0.0 - 1.0), unless
+            the `traceparent` header of the request decides
+        :type sample_ratio: float
+        """
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+
+    def start_request_span(self, name, traceparent=None, attributes=None):
+        """
+        Starts the root span of a request, continuing the trace of the
+        `traceparent` header, if any.
+
+        :return: the span or None if the request is not sampled
+        :rtype: Span | None
+        """
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id = None, None
+            sampled = self.sample_ratio >= 1.0 or random.random() < self.sample_ratio
+        if not sampled:
+            return None
+        return Span(self, name, trace_id or new_trace_id(), parent_id, attributes)
+
+
+class InMemorySpanExporter(object):
+    """
+    Keeps the finished spans in memory, e.g. for tests.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self):
+        with self._lock:
+            self.spans = []
+
+
+class BatchFileSpanExporter(object):
+    """
+    Appends the finished spans to a file as JSON lines. Spans are written in
+    batches, when `max_batch_size` spans are waiting, after `flush_interval`
+    seconds, or on exit.
+    """
+
+    def __init__(self, path, max_batch_size=512, flush_interval=5.0):
+        """
+        :type path: str
+        :type max_batch_size: int
+        :param flush_interval: maximum seconds a span waits to be written
+        :type flush_interval: float
+        """
+        self.path = path
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self._batch = []
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def export(self, span):
+        with self._lock:
+            self._batch.append(span.to_dict())
+            if (len(self._batch) < self.max_batch_size and
+                    time.monotonic() - self._flushed_at < self.flush_interval):
+                return
+            batch, self._batch = self._batch, []
+            self._flushed_at = time.monotonic()
+        self._write(batch)
+
+    def flush(self):
+        with self._lock:
+            batch, self._batch = self._batch, []
+            self._flushed_at = time.monotonic()
+        self._write(batch)
+
+    def _write(self, batch):
+        if not batch:
+            return
+        lines = ''.join(json.dumps(span) + '\n' for span in batch)
+        try:
+            with open(self.path, 'a') as spans_file:
+                spans_file.write(lines)
+        except OSError:  # pragma: no cover
+            logger.exception('Could not write %d spans to %s', len(batch), self.path)
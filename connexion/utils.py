@@ -1,5 +1,7 @@
 import functools
+import hashlib
 import importlib
+import json
 
 import yaml
 
@@ -88,6 +90,19 @@ def deep_get(obj, keys):
         return deep_get(obj[keys[0]], keys[1:])
 
 
+def content_hash(obj):
+    """
+    Hashes the structure of a JSON-like object, the values of other types by their type and repr.
+
+    :type obj: dict | list
+    :rtype: bytes
+    :raises TypeError: if the object has keys of several types
+    :raises ValueError: if the object is circular
+    """
+    dumped = json.dumps(obj, sort_keys=True, default=lambda value: '{}:{!r}'.format(type(value).__name__, value))
+    return hashlib.sha1(dumped.encode('utf-8')).digest()
+
+
 def get_function_from_name(function_name):
     """
     Tries to get function by fully qualified name (e.g. "mymodule.myobj.myfunc")
@@ -181,11 +196,14 @@ def has_coroutine(function, api=None):
     """
     Checks if function is a coroutine.
     If ``function`` is a decorator (has a ``__wrapped__`` attribute)
-    this function will also look at the wrapped function.
+    or a ``functools.partial`` this function will also look at the
+    wrapped function.
     """
     import asyncio
 
     def iscorofunc(func):
+        while isinstance(func, functools.partial):
+            func = func.func
         iscorofunc = asyncio.iscoroutinefunction(func)
         while not iscorofunc and hasattr(func, '__wrapped__'):
             func = func.__wrapped__
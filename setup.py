@@ -31,6 +31,8 @@ install_requires = [
 
 swagger_ui_require = 'swagger-ui-bundle>=0.0.2'
 flask_require = 'flask>=1.0.4'
+jwt_require = 'PyJWT[crypto]>=2.0.0'
+uvloop_require = 'uvloop>=0.14.0'
 aiohttp_require = [
     'aiohttp>=2.3.10',
     'aiohttp-jinja2>=0.14.0'
@@ -48,6 +50,7 @@ tests_require = [
 tests_require.extend(aiohttp_require)
 tests_require.append('pytest-aiohttp')
 tests_require.append('aiohttp-remotes')
+tests_require.append(jwt_require)
 
 
 class PyTest(TestCommand):
@@ -83,7 +86,7 @@ def readme():
 
 setup(
     name='connexion',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     version=version,
     description='Connexion - API first applications with OpenAPI/Swagger and Flask',
     long_description=readme(),
@@ -99,7 +102,9 @@ setup(
         'tests': tests_require,
         'flask': flask_require,
         'swagger-ui': swagger_ui_require,
-        'aiohttp': aiohttp_require
+        'aiohttp': aiohttp_require,
+        'jwt': jwt_require,
+        'uvloop': uvloop_require
     },
     cmdclass={'test': PyTest},
     test_suite='tests',
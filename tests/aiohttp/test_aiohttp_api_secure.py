@@ -1,15 +1,18 @@
 import asyncio
 import base64
 
-from connexion import AioHttpApp
+import pytest
+from aiohttp import web
+from connexion import AioHttpApp, App
+from connexion.exceptions import ConnexionException
 
 
 @asyncio.coroutine
-def test_auth_all_paths(oauth_requests, aiohttp_api_spec_dir, aiohttp_client):
+def test_auth_all_paths(aiohttp_token_info_url, aiohttp_api_spec_dir, aiohttp_client):
     app = AioHttpApp(__name__, port=5001,
                      specification_dir=aiohttp_api_spec_dir,
                      debug=True, auth_all_paths=True)
-    app.add_api('swagger_secure.yaml')
+    app.add_api('swagger_secure.yaml', arguments={'token_info_url': aiohttp_token_info_url})
 
     app_client = yield from aiohttp_client(app.app)
 
@@ -29,12 +32,12 @@ def test_auth_all_paths(oauth_requests, aiohttp_api_spec_dir, aiohttp_client):
 
 
 @asyncio.coroutine
-def test_secure_app(oauth_requests, aiohttp_api_spec_dir, aiohttp_client):
+def test_secure_app(aiohttp_token_info_url, aiohttp_api_spec_dir, aiohttp_client):
     # Create the app and run the test_app testcase below.
     app = AioHttpApp(__name__, port=5001,
                      specification_dir=aiohttp_api_spec_dir,
                      debug=True)
-    app.add_api('swagger_secure.yaml')
+    app.add_api('swagger_secure.yaml', arguments={'token_info_url': aiohttp_token_info_url})
     app_client = yield from aiohttp_client(app.app)
 
     post_hello = yield from app_client.post('/v1.0/greeting/jsantos')
@@ -75,6 +78,54 @@ def test_secure_app(oauth_requests, aiohttp_api_spec_dir, aiohttp_client):
     assert no_authorization.content_type == 'application/problem+json'
 
 
+@asyncio.coroutine
+def test_secure_app_invalid_token(aiohttp_token_info_url, aiohttp_api_spec_dir, aiohttp_client):
+    app = AioHttpApp(__name__, port=5001,
+                     specification_dir=aiohttp_api_spec_dir,
+                     debug=True)
+    app.add_api('swagger_secure.yaml', arguments={'token_info_url': aiohttp_token_info_url})
+    app_client = yield from aiohttp_client(app.app)
+
+    headers = {'Authorization': 'Bearer 300'}
+    post_hello = yield from app_client.post('/v1.0/greeting/jsantos', headers=headers)
+    assert post_hello.status == 401
+
+    headers = {'Authorization': 'Bearer 200'}
+    post_hello = yield from app_client.post('/v1.0/greeting/jsantos', headers=headers)
+    assert post_hello.status == 403
+
+
+async def test_token_info_remote_does_not_block(aiohttp_server, aiohttp_api_spec_dir, aiohttp_client):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_token_info(request):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.1)
+        in_flight -= 1
+        return web.json_response({"uid": "test-user", "scope": ["myscope"]})
+
+    token_info_app = web.Application()
+    token_info_app.router.add_get('/token_info', slow_token_info)
+    token_info_server = await aiohttp_server(token_info_app)
+
+    app = AioHttpApp(__name__, port=5001,
+                     specification_dir=aiohttp_api_spec_dir,
+                     debug=True)
+    app.add_api('swagger_secure.yaml',
+                arguments={'token_info_url': str(token_info_server.make_url('/token_info'))})
+    app_client = await aiohttp_client(app.app)
+
+    responses = await asyncio.gather(*[
+        app_client.post('/v1.0/greeting/jsantos', headers={'Authorization': 'Bearer {}'.format(token)})
+        for token in ('100', '101', '102')
+    ])
+    assert [response.status for response in responses] == [200, 200, 200]
+    assert max_in_flight == 3
+
+
 @asyncio.coroutine
 def test_basic_auth_secure(oauth_requests, aiohttp_api_spec_dir, aiohttp_client):
     # Create the app and run the test_app testcase below.
@@ -106,3 +157,37 @@ def test_basic_auth_secure(oauth_requests, aiohttp_api_spec_dir, aiohttp_client)
     )
     assert no_auth.status == 401, "Wrong header should result into Unauthorized"
     assert no_auth.content_type == 'application/problem+json'
+
+
+async def test_async_security_funcs(aiohttp_api_spec_dir, aiohttp_client):
+    app = AioHttpApp(__name__, port=5001,
+                     specification_dir=aiohttp_api_spec_dir,
+                     debug=True)
+    app.add_api('openapi_secure_async.yaml')
+    app_client = await aiohttp_client(app.app)
+
+    post_hello = await app_client.post('/v1.0/greeting/jsantos')
+    assert post_hello.status == 401
+
+    for headers in ({'Authorization': 'Bearer valid-token'},
+                    {'Authorization': 'Basic ' + base64.b64encode(b'user:user').decode('ascii')},
+                    {'X-Auth': 'valid-key'}):
+        post_hello = await app_client.post('/v1.0/greeting/jsantos', headers=headers)
+        assert post_hello.status == 200, headers
+        assert (await post_hello.json()) == {"greeting": "Hello jsantos"}
+
+    for headers in ({'Authorization': 'Bearer invalid-token'},
+                    {'Authorization': 'Basic ' + base64.b64encode(b'user:other').decode('ascii')},
+                    {'X-Auth': 'invalid-key'}):
+        post_hello = await app_client.post('/v1.0/greeting/jsantos', headers=headers)
+        assert post_hello.status == 401, headers
+
+    headers = {'Authorization': 'Bearer wrong-scope-token'}
+    post_hello = await app_client.post('/v1.0/greeting/jsantos', headers=headers)
+    assert post_hello.status == 403
+
+
+def test_async_security_funcs_not_supported_by_flask(aiohttp_api_spec_dir):
+    app = App(__name__, port=5001, specification_dir=aiohttp_api_spec_dir)
+    with pytest.raises(ConnexionException):
+        app.add_api('openapi_secure_async.yaml')
@@ -73,6 +73,36 @@ def test_app_run_access_log(web_run_app_mock, aiohttp_api_spec_dir):
     ]
 
 
+def test_app_run_server_options(web_run_app_mock, aiohttp_api_spec_dir):
+    app = AioHttpApp(__name__, port=5001,
+                     specification_dir=aiohttp_api_spec_dir)
+    app.run(backlog=1024, keepalive_timeout=0, shutdown_timeout=5.0)
+    assert web_run_app_mock.call_args_list == [
+        mock.call(app.app, port=5001, host='0.0.0.0', access_log=None,
+                  backlog=1024, keepalive_timeout=0, shutdown_timeout=5.0)
+    ]
+
+
+def test_app_run_uvloop(web_run_app_mock, aiohttp_api_spec_dir, monkeypatch):
+    uvloop = mock.MagicMock()
+    set_event_loop_policy = mock.MagicMock()
+    monkeypatch.setattr('connexion.apps.aiohttp_app.uvloop', uvloop)
+    monkeypatch.setattr('connexion.apps.aiohttp_app.asyncio.set_event_loop_policy', set_event_loop_policy)
+    app = AioHttpApp(__name__, port=5001,
+                     specification_dir=aiohttp_api_spec_dir)
+
+    app.run(use_uvloop=True)
+    set_event_loop_policy.assert_called_once_with(uvloop.EventLoopPolicy.return_value)
+    assert web_run_app_mock.call_count == 1
+
+    # the default event loop is used if uvloop is not installed
+    set_event_loop_policy.reset_mock()
+    monkeypatch.setattr('connexion.apps.aiohttp_app.uvloop', None)
+    app.run(use_uvloop=True)
+    assert not set_event_loop_policy.called
+    assert web_run_app_mock.call_count == 2
+
+
 def test_app_run_server_error(web_run_app_mock, aiohttp_api_spec_dir):
     app = AioHttpApp(__name__, port=5001,
                      specification_dir=aiohttp_api_spec_dir)
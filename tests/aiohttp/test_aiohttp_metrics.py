@@ -0,0 +1,34 @@
+from connexion import AioHttpApp
+from connexion.metrics import MetricsRegistry
+
+
+async def test_aiohttp_app_metrics(aiohttp_api_spec_dir, aiohttp_client):
+    registry = MetricsRegistry()
+    app = AioHttpApp(__name__, port=5001,
+                     specification_dir=aiohttp_api_spec_dir,
+                     debug=True)
+    app.add_api('swagger_simple.yaml', options={'metrics': registry})
+    app_client = await aiohttp_client(app.app)
+
+    get_bye = await app_client.get('/v1.0/bye/jsantos')
+    assert get_bye.status == 200
+
+    metrics = await app_client.get('/v1.0/metrics')
+    assert metrics.status == 200
+    assert metrics.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+    text = await metrics.text()
+    assert 'connexion_requests_total{method="GET",path="/v1.0/bye/{name}",status="200"} 1' in text
+    assert 'connexion_request_duration_seconds_count{method="GET",path="/v1.0/bye/{name}",status="200"} 1' in text
+
+
+async def test_aiohttp_app_server_timing(aiohttp_api_spec_dir, aiohttp_client):
+    app = AioHttpApp(__name__, port=5001,
+                     specification_dir=aiohttp_api_spec_dir,
+                     debug=True)
+    app.add_api('swagger_simple.yaml', options={'server_timing': True})
+    app_client = await aiohttp_client(app.app)
+
+    get_bye = await app_client.get('/v1.0/bye/jsantos')
+    assert get_bye.status == 200
+    stages = [metric.split(';')[0] for metric in get_bye.headers['Server-Timing'].split(', ')]
+    assert stages == ['request', 'uri_parsing', 'parameter_validation', 'handler', 'response']
@@ -0,0 +1,118 @@
+import aiohttp
+import pytest
+from connexion import AioHttpApp
+
+FORM_SPEC = {
+    'openapi': '3.0.0',
+    'info': {'title': 'Forms', 'version': '1.0'},
+    'paths': {
+        '/form': {
+            'post': {
+                'operationId': 'fakeapi.aiohttp_handlers.aiohttp_post_form',
+                'requestBody': {'content': {'application/x-www-form-urlencoded': {'schema': {
+                    'type': 'object',
+                    'properties': {'name': {'type': 'string'}, 'count': {'type': 'integer'}},
+                    'required': ['name'],
+                }}}},
+                'responses': {'200': {'description': 'The form'}}
+            }
+        },
+        '/upload': {
+            'post': {
+                'operationId': 'fakeapi.aiohttp_handlers.aiohttp_upload',
+                'requestBody': {'content': {'multipart/form-data': {'schema': {
+                    'type': 'object',
+                    'properties': {'description': {'type': 'string'}, 'file': {'type': 'string', 'format': 'binary'}},
+                    'required': ['file'],
+                }}}},
+                'responses': {'200': {'description': 'The upload'}}
+            }
+        }
+    }
+}
+
+
+@pytest.fixture
+def form_app():
+    def make_app(**options):
+        app = AioHttpApp(__name__)
+        app.add_api(FORM_SPEC, base_path='/v1', options=options)
+        return app.app
+    return make_app
+
+
+def upload(contents, description='report', filename='report.txt'):
+    data = aiohttp.FormData()
+    if description is not None:
+        data.add_field('description', description)
+    data.add_field('file', contents, filename=filename, content_type='text/plain')
+    return data
+
+
+async def test_urlencoded_form(form_app, aiohttp_client):
+    app_client = await aiohttp_client(form_app())
+
+    response = await app_client.post('/v1/form', data={'name': 'jsantos', 'count': '3'})
+    assert response.status == 200
+    assert await response.json() == {'name': 'jsantos', 'count': 3}
+
+    response = await app_client.post('/v1/form', data={'count': '3'})
+    assert response.status == 400
+    assert "'name' is a required property" in (await response.json())['detail']
+
+    response = await app_client.post('/v1/form', data={'name': 'jsantos', 'count': 'three'})
+    assert response.status == 400
+
+
+async def test_multipart_upload(form_app, aiohttp_client):
+    app_client = await aiohttp_client(form_app(multipart_spool_size=1024))
+
+    response = await app_client.post('/v1/upload', data=upload(b'x' * 100))
+    assert response.status == 200
+    assert await response.json() == {
+        'description': 'report', 'filename': 'report.txt', 'content_type': 'text/plain', 'size': 100,
+        'spilled': False,
+    }
+
+    # the larger files are written to disk
+    response = await app_client.post('/v1/upload', data=upload(b'x' * 200000, description=None))
+    assert response.status == 200
+    assert await response.json() == {
+        'description': None, 'filename': 'report.txt', 'content_type': 'text/plain', 'size': 200000,
+        'spilled': True,
+    }
+
+    response = await app_client.post('/v1/upload', data={'description': 'report'})
+    assert response.status == 400
+    assert "'file' is a required property" in (await response.json())['detail']
+
+
+async def test_multipart_limits(form_app, aiohttp_client):
+    app_client = await aiohttp_client(form_app(multipart_max_part_size=1000, multipart_max_size=1500))
+
+    assert (await app_client.post('/v1/upload', data=upload(b'x' * 1000))).status == 200
+
+    response = await app_client.post('/v1/upload', data=upload(b'x' * 1001))
+    assert response.status == 413
+    problem = await response.json()
+    assert problem['title'] == 'Payload Too Large'
+    assert "The part 'file' of the form is larger than 1000 bytes" in problem['detail']
+
+    response = await app_client.post('/v1/upload', data=upload(b'x' * 1000, description='y' * 600))
+    assert response.status == 413
+    assert 'The form is larger than 1500 bytes' in (await response.json())['detail']
+
+    # the urlencoded forms are read in chunks under the same limit
+    assert (await app_client.post('/v1/form', data={'name': 'x' * 1000})).status == 200
+    response = await app_client.post('/v1/form', data={'name': 'x' * 2000})
+    assert response.status == 413
+    assert 'The form is larger than 1500 bytes' in (await response.json())['detail']
+
+
+async def test_multipart_client_max_size(form_app, aiohttp_client):
+    app = form_app()
+    # the parts are streamed, the client_max_size of the application still applies to the whole form
+    app._client_max_size = 10000
+    app_client = await aiohttp_client(app)
+    assert (await app_client.post('/v1/upload', data=upload(b'x' * 5000))).status == 200
+    assert (await app_client.post('/v1/upload', data=upload(b'x' * 20000))).status == 413
@@ -0,0 +1,31 @@
+from connexion import AioHttpApp
+from connexion.tracing import InMemorySpanExporter, Tracer
+
+
+async def test_aiohttp_app_tracing(aiohttp_api_spec_dir, aiohttp_client):
+    exporter = InMemorySpanExporter()
+    app = AioHttpApp(__name__, port=5001,
+                     specification_dir=aiohttp_api_spec_dir,
+                     debug=True)
+    app.add_api('swagger_simple.yaml', options={'tracer': Tracer(exporter)})
+    app_client = await aiohttp_client(app.app)
+
+    get_bye = await app_client.get('/v1.0/bye/jsantos')
+    assert get_bye.status == 200
+
+    names = [span.name for span in exporter.spans]
+    assert names == ['handler', 'parameter_validation', 'uri_parsing', 'GET /v1.0/bye/{name}']
+    root = exporter.spans[-1]
+    assert root.attributes['http.status_code'] == 200
+    assert exporter.spans[0].duration >= 0
+
+    exporter.clear()
+    tracer = Tracer(exporter, sample_ratio=0)
+    app = AioHttpApp(__name__, port=5001,
+                     specification_dir=aiohttp_api_spec_dir,
+                     debug=True)
+    app.add_api('swagger_simple.yaml', options={'tracer': tracer})
+    app_client = await aiohttp_client(app.app)
+    get_bye = await app_client.get('/v1.0/bye/jsantos')
+    assert get_bye.status == 200
+    assert exporter.spans == []
@@ -10,6 +10,7 @@ from conftest import TEST_FOLDER, build_app_from_fixture
 from connexion import App
 from connexion.exceptions import InvalidSpecification
 from connexion.http_facts import METHODS
+from connexion.spec import Specification
 
 SPECS = ["swagger.yaml", "openapi.yaml"]
 
@@ -318,3 +319,32 @@ def test_using_all_fields_in_path_item(simple_api_spec_dir):
             continue
         test_methods.update({method.lower() for method in rule.methods})
     assert set(test_methods) == METHODS
+
+
+@pytest.mark.parametrize("spec", SPECS)
+def test_add_api_under_several_base_paths(simple_api_spec_dir, spec):
+    app = App(__name__, specification_dir=simple_api_spec_dir)
+    with mock.patch.object(Specification, 'from_dict', wraps=Specification.from_dict) as from_dict:
+        api1 = app.add_api(spec, base_path='/tenant1')
+        api2 = app.add_api(spec, base_path='/tenant2')
+        api3 = app.add_api(api1.specification, base_path='/tenant3')
+        other_api = app.add_api(spec, base_path='/other', arguments={'title': 'other'})
+    # the spec is only loaded again with other arguments
+    assert from_dict.call_count == 2
+    assert api1.specification['paths'] is api2.specification['paths'] is api3.specification['paths']
+    assert api1.validator_registry is api2.validator_registry is api3.validator_registry
+    assert other_api.specification['paths'] is not api1.specification['paths']
+    assert other_api.validator_registry is not api1.validator_registry
+
+    app_client = app.app.test_client()
+    spec_name = 'swagger.json' if spec == 'swagger.yaml' else 'openapi.json'
+    for base_path in ('/tenant1', '/tenant2', '/tenant3', '/other'):
+        get_bye = app_client.get(base_path + '/bye/jsantos')  # type: flask.Response
+        assert get_bye.status_code == 200
+        assert get_bye.data == b'Goodbye jsantos'
+
+        served_spec = json.loads(app_client.get(base_path + '/' + spec_name).data.decode('utf-8'))
+        if spec == 'swagger.yaml':
+            assert served_spec['basePath'] == base_path
+        else:
+            assert served_spec['servers'] == [{'url': base_path}]
@@ -17,6 +17,24 @@ OPENAPI3_SPEC = ["openapi.yaml"]
 SPECS = OPENAPI2_SPEC + OPENAPI3_SPEC
 
 
+def pytest_addoption(parser):
+    parser.addoption('--run-slow', action='store_true',
+                     help='also run the slow tests, e.g. the memory measures of the benchmarks')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'slow: slow or machine dependent test, run with --run-slow')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--run-slow'):
+        return
+    skip_slow = pytest.mark.skip(reason='slow test, run with --run-slow')
+    for item in items:
+        if 'slow' in item.keywords:
+            item.add_marker(skip_slow)
+
+
 class FakeResponse(object):
     def __init__(self, status_code, text):
         """
@@ -35,6 +53,25 @@ class FakeResponse(object):
 # =========================
 
 
+def fake_tokeninfo(token):
+    """
+    :type token: str
+    :return: status code and body of the token info response
+    :rtype: tuple[int, str] | None
+    """
+    if token in ["100", "has_myscope"]:
+        return 200, '{"uid": "test-user", "scope": ["myscope"]}'
+    if token in ["200", "has_wrongscope"]:
+        return 200, '{"uid": "test-user", "scope": ["wrongscope"]}'
+    if token == "has_myscope_otherscope":
+        return 200, '{"uid": "test-user", "scope": ["myscope", "otherscope"]}'
+    if token in ["300", "is_not_invalid"]:
+        return 404, ''
+    if token == "has_scopes_in_scopes_with_s":
+        return 200, '{"uid": "test-user", "scopes": ["myscope", "otherscope"]}'
+    return None
+
+
 @pytest.fixture
 def oauth_requests(monkeypatch):
     def fake_get(url, params=None, headers=None, timeout=None):
@@ -45,21 +82,32 @@ def oauth_requests(monkeypatch):
         headers = headers or {}
         if url == "https://oauth.example/token_info":
             token = headers.get('Authorization', 'invalid').split()[-1]
-            if token in ["100", "has_myscope"]:
-                return FakeResponse(200, '{"uid": "test-user", "scope": ["myscope"]}')
-            if token in ["200", "has_wrongscope"]:
-                return FakeResponse(200, '{"uid": "test-user", "scope": ["wrongscope"]}')
-            if token == "has_myscope_otherscope":
-                return FakeResponse(200, '{"uid": "test-user", "scope": ["myscope", "otherscope"]}')
-            if token in ["300", "is_not_invalid"]:
-                return FakeResponse(404, '')
-            if token == "has_scopes_in_scopes_with_s":
-                return FakeResponse(200, '{"uid": "test-user", "scopes": ["myscope", "otherscope"]}')
+            tokeninfo = fake_tokeninfo(token)
+            if tokeninfo is not None:
+                return FakeResponse(*tokeninfo)
         return url
 
     monkeypatch.setattr('connexion.decorators.security.session.get', fake_get)
 
 
+@pytest.fixture
+def aiohttp_token_info_url(loop, aiohttp_server):
+    """
+    Starts a local stand-in for an OAuth token info endpoint and returns its URL.
+    """
+    from aiohttp import web
+
+    async def token_info(request):
+        token = request.headers.get('Authorization', 'invalid').split()[-1]
+        status, text = fake_tokeninfo(token) or (401, '')
+        return web.Response(status=status, text=text, content_type='application/json')
+
+    token_info_app = web.Application()
+    token_info_app.router.add_get('/token_info', token_info)
+    server = loop.run_until_complete(aiohttp_server(token_info_app))
+    return str(server.make_url('/token_info'))
+
+
 @pytest.fixture
 def app():
     cnx_app = App(__name__, port=5001, specification_dir=SPEC_FOLDER, debug=True)
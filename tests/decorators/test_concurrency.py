@@ -0,0 +1,304 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from connexion import AioHttpApp, App
+from connexion.decorators.concurrency import (AdaptiveConcurrencyLimiter,
+                                              AIMDConcurrencyLimiter,
+                                              ConcurrencyLimiter,
+                                              GradientConcurrencyLimiter)
+from connexion.exceptions import ConnexionException, ServiceUnavailableProblem
+from connexion.metrics import MetricsRegistry
+
+
+def limited_spec(bye, greeting):
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': 'Limited', 'version': '1.0'},
+        'paths': {
+            '/bye/{name}': {
+                'get': {
+                    'operationId': bye,
+                    'x-concurrency-limit': 2,
+                    'x-max-queue': 0,
+                    'parameters': [{'name': 'name', 'in': 'path', 'required': True, 'schema': {'type': 'string'}}],
+                    'responses': {'200': {'description': 'Goodbye', 'content': {'text/plain': {}}}}
+                }
+            },
+            '/greeting/{name}': {
+                'post': {
+                    'operationId': greeting,
+                    'parameters': [{'name': 'name', 'in': 'path', 'required': True, 'schema': {'type': 'string'}}],
+                    'requestBody': {'content': {'application/json': {'schema': {'type': 'object'}}}},
+                    'responses': {'200': {'description': 'Greeting'}}
+                }
+            }
+        }
+    }
+
+
+def test_limiter_threads():
+    limiter = ConcurrencyLimiter(1, max_queue=1, retry_after=5)
+    started = threading.Event()
+    finish = threading.Event()
+    calls = []
+
+    @limiter
+    def handler(name):
+        calls.append(name)
+        if name == 'first':
+            started.set()
+            finish.wait(5)
+        return name
+
+    first = threading.Thread(target=handler, args=('first',))
+    first.start()
+    assert started.wait(5)
+    second = threading.Thread(target=handler, args=('second',))
+    second.start()
+    while limiter.queued != 1:
+        pass
+
+    with pytest.raises(ServiceUnavailableProblem) as exc_info:
+        handler('third')
+    assert exc_info.value.status == 503
+    assert exc_info.value.headers == {'Retry-After': '5'}
+    assert (limiter.in_flight, limiter.queued, limiter.rejected) == (1, 1, 1)
+
+    finish.set()
+    first.join(5)
+    second.join(5)
+    assert calls == ['first', 'second']
+    assert (limiter.in_flight, limiter.queued, limiter.rejected) == (0, 0, 1)
+
+
+async def test_limiter_coroutines():
+    limiter = ConcurrencyLimiter(1, max_queue=2)
+    finish = asyncio.Event()
+    calls = []
+
+    @limiter
+    async def handler(name):
+        calls.append(name)
+        await finish.wait()
+        return name
+
+    first = asyncio.ensure_future(handler('first'))
+    second = asyncio.ensure_future(handler('second'))
+    third = asyncio.ensure_future(handler('third'))
+    await asyncio.sleep(0)
+    assert (limiter.in_flight, limiter.queued) == (1, 2)
+    with pytest.raises(ServiceUnavailableProblem):
+        await handler('fourth')
+
+    # a cancelled request gives up its place in the queue
+    second.cancel()
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+
+    finish.set()
+    assert await asyncio.gather(first, third) == ['first', 'third']
+    assert calls == ['first', 'third']
+    assert (limiter.in_flight, limiter.queued, limiter.rejected) == (0, 0, 1)
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        ConcurrencyLimiter(0)
+    with pytest.raises(ValueError):
+        ConcurrencyLimiter(1, max_queue=-1)
+    # the adjustment of the limit is left to the subclasses
+    with pytest.raises(TypeError):
+        AdaptiveConcurrencyLimiter()
+
+
+def observe_window(limiter, latency, in_flight):
+    limiter.in_flight = in_flight
+    for _ in range(limiter.window):
+        limiter.observe(latency)
+
+
+@pytest.mark.parametrize('limiter_class', [GradientConcurrencyLimiter, AIMDConcurrencyLimiter])
+def test_adaptive_limiter(limiter_class):
+    limiter = limiter_class(initial_limit=4, max_limit=100, window=10)
+
+    # slow start: the limit doubles while the latency stays at the baseline
+    observe_window(limiter, 0.01, 3)
+    assert (limiter.baseline, limiter.limit) == (pytest.approx(0.01), 8)
+    observe_window(limiter, 0.012, 7)
+    assert limiter.limit == 16
+
+    # the latency rises above the tolerance: the limit goes down
+    observe_window(limiter, 0.03, 15)
+    assert not limiter.slow_start
+    assert limiter.limit < 16
+    for _ in range(5):
+        estimate = limiter.estimate
+        observe_window(limiter, 0.03, limiter.limit - 1)
+        assert limiter.estimate < estimate
+    assert limiter.baseline == pytest.approx(0.01)
+
+    # back to normal: the limit grows again, only when it is used
+    limit = limiter.limit
+    observe_window(limiter, 0.01, 0)
+    assert limiter.limit == limit
+    for _ in range(10):
+        observe_window(limiter, 0.01, limiter.limit - 1)
+    assert limiter.limit > limit
+
+
+def test_adaptive_limiter_bounds():
+    limiter = AIMDConcurrencyLimiter(initial_limit=2, min_limit=2, max_limit=4, window=1)
+    for _ in range(5):
+        observe_window(limiter, 0.01, limiter.limit)
+    assert limiter.limit == 4
+
+    # at the minimum limit, a lasting slowdown becomes the new baseline
+    limits = []
+    for _ in range(10):
+        observe_window(limiter, 0.1, limiter.limit)
+        limits.append(limiter.limit)
+    assert limits == [3, 3, 2, 3, 4, 4, 4, 4, 4, 4]
+    assert limiter.baseline == pytest.approx(0.1)
+
+    with pytest.raises(ValueError):
+        GradientConcurrencyLimiter(initial_limit=1, min_limit=2)
+
+
+def test_adaptive_limiter_wakes_waiters():
+    limiter = GradientConcurrencyLimiter(initial_limit=1, window=1)
+    finish = threading.Event()
+
+    @limiter
+    def handler():
+        finish.wait(5)
+
+    threads = [threading.Thread(target=handler) for _ in range(3)]
+    limiter.max_queue = 2
+    for thread in threads:
+        thread.start()
+    while limiter.queued != 2:
+        pass
+    # the first request doubles the limit, both queued requests get a slot
+    finish.set()
+    for thread in threads:
+        thread.join(5)
+    assert limiter.limit == 4
+    assert (limiter.in_flight, limiter.queued, limiter.rejected) == (0, 0, 0)
+
+
+def test_flask_concurrency_limits():
+    registry = MetricsRegistry()
+    app = App(__name__)
+    api = app.add_api(limited_spec('fakeapi.hello.get_bye', 'fakeapi.hello.post_greeting'), options={
+        'concurrency_limit': 4, 'max_queue': 8, 'retry_after': 3, 'metrics': registry
+    })
+    app_client = app.app.test_client()
+
+    bye = api.concurrency_limiters[('GET', '/bye/{name}')]
+    greeting = api.concurrency_limiters[('POST', '/greeting/{name}')]
+    assert (bye.limit, bye.max_queue) == (2, 0)
+    assert (greeting.limit, greeting.max_queue) == (4, 8)
+
+    assert app_client.get('/bye/jsantos').data == b'Goodbye jsantos'
+    bye.in_flight = bye.limit
+    response = app_client.get('/bye/jsantos')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '3'
+    assert response.content_type == 'application/problem+json'
+    assert json.loads(response.data.decode())['title'] == 'Service Unavailable'
+
+    metrics = registry.render()
+    assert 'connexion_requests_in_flight{method="GET",path="/bye/{name}"} 2' in metrics
+    assert 'connexion_requests_rejected_total{method="GET",path="/bye/{name}"} 1' in metrics
+    assert 'connexion_requests_total{method="GET",path="/bye/{name}",status="503"} 1' in metrics
+
+    bye.in_flight = 0
+    assert app_client.get('/bye/jsantos').status_code == 200
+    assert bye.rejected == 1
+
+    # the rejected requests don't get their body parsed
+    greeting.in_flight, greeting.max_queue = greeting.limit, 0
+    response = app_client.post('/greeting/jsantos', data='{', content_type='application/json')
+    assert response.status_code == 503
+
+
+def test_flask_without_concurrency_limits():
+    app = App(__name__)
+    spec = limited_spec('fakeapi.hello.get_bye', 'fakeapi.hello.post_greeting')
+    del spec['paths']['/bye/{name}']['get']['x-concurrency-limit']
+    api = app.add_api(spec)
+    assert api.concurrency_limiters == {}
+    assert app.app.test_client().get('/bye/jsantos').status_code == 200
+
+
+def test_flask_adaptive_concurrency():
+    spec = limited_spec('fakeapi.hello.get_bye', 'fakeapi.hello.post_greeting')
+    spec['paths']['/bye/{name}']['get']['x-concurrency-limit'] = 'adaptive'
+    del spec['paths']['/bye/{name}']['get']['x-max-queue']
+    registry = MetricsRegistry()
+    app = App(__name__)
+    api = app.add_api(spec, options={'concurrency_limit': 3, 'max_queue': 5, 'metrics': registry})
+    bye = api.concurrency_limiters[('GET', '/bye/{name}')]
+    assert isinstance(bye, GradientConcurrencyLimiter)
+    assert bye.max_queue == 5
+    assert type(api.concurrency_limiters[('POST', '/greeting/{name}')]) is ConcurrencyLimiter
+    assert app.app.test_client().get('/bye/jsantos').status_code == 200
+    assert 'connexion_concurrency_limit{method="GET",path="/bye/{name}"} 4' in registry.render()
+
+    # one limiter per operation
+    api = App(__name__).add_api(spec, options={'adaptive_concurrency': True, 'concurrency_limit': 3})
+    greeting = api.concurrency_limiters[('POST', '/greeting/{name}')]
+    assert isinstance(greeting, GradientConcurrencyLimiter)
+    assert greeting is not api.concurrency_limiters[('GET', '/bye/{name}')]
+
+    # one limiter for the API
+    limiter = AIMDConcurrencyLimiter()
+    del spec['paths']['/bye/{name}']['get']['x-concurrency-limit']
+    registry = MetricsRegistry()
+    api = App(__name__).add_api(spec, options={'adaptive_concurrency': limiter, 'metrics': registry})
+    assert set(api.concurrency_limiters.values()) == {limiter}
+    assert 'connexion_concurrency_limit{method="*",path=""} 4' in registry.render()
+
+
+@pytest.mark.parametrize('extension, options', [
+    ('gradient', {}),
+    (True, {}),
+    (None, {'adaptive_concurrency': 'gradient'}),
+    (None, {'adaptive_concurrency': 1}),
+    (None, {'adaptive_concurrency': ConcurrencyLimiter(3)}),
+])
+def test_invalid_concurrency_limits(extension, options):
+    spec = limited_spec('fakeapi.hello.get_bye', 'fakeapi.hello.post_greeting')
+    spec['paths']['/bye/{name}']['get']['x-concurrency-limit'] = extension
+    if extension is None:
+        del spec['paths']['/bye/{name}']['get']['x-concurrency-limit']
+    with pytest.raises(ConnexionException):
+        App(__name__).add_api(spec, options=options)
+
+
+async def test_aiohttp_concurrency_limits(aiohttp_client):
+    app = AioHttpApp(__name__)
+    spec = limited_spec('fakeapi.aiohttp_handlers.get_bye', 'fakeapi.aiohttp_handlers.aiohttp_post_greeting')
+    api = app.add_api(spec, base_path='/v1', options={'retry_after': 2})
+    app_client = await aiohttp_client(app.app)
+
+    assert list(api.concurrency_limiters) == [('GET', '/bye/{name}')]
+    bye = api.concurrency_limiters[('GET', '/bye/{name}')]
+
+    response = await app_client.get('/v1/bye/jsantos')
+    assert response.status == 200
+    assert await response.text() == 'Goodbye jsantos'
+
+    bye.in_flight = bye.limit
+    response = await app_client.get('/v1/bye/jsantos')
+    assert response.status == 503
+    assert response.headers['Retry-After'] == '2'
+    assert (await response.json())['title'] == 'Service Unavailable'
+    assert bye.rejected == 1
+
+    bye.in_flight = 0
+    response = await app_client.get('/v1/bye/jsantos')
+    assert response.status == 200
+    assert bye.in_flight == 0
@@ -0,0 +1,123 @@
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from connexion import AioHttpApp, App
+from connexion.decorators.deadline import Deadline, DeadlineDecorator
+from connexion.exceptions import DeadlineExceededProblem
+from fakeapi import aiohttp_handlers
+
+
+def deadline_spec(operation_id):
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': 'Deadlines', 'version': '1.0'},
+        'paths': {
+            '/deadline': {
+                'get': {
+                    'operationId': operation_id,
+                    'x-timeout': 0.5,
+                    'parameters': [{'name': 'delay', 'in': 'query', 'schema': {'type': 'number'}}],
+                    'responses': {'200': {'description': 'Remaining time'}}
+                }
+            }
+        }
+    }
+
+
+def test_deadline():
+    deadline = Deadline(time.time() + 10)
+    assert 9 < deadline.remaining() <= 10
+    assert not deadline.expired
+    deadline.check()
+
+    deadline = Deadline(time.time() - 1)
+    assert deadline.expired
+    with pytest.raises(DeadlineExceededProblem) as exc_info:
+        deadline.check()
+    assert exc_info.value.status == 504
+
+
+@pytest.mark.parametrize('timeout, header_offset, remaining', [
+    (None, None, None),
+    (10, None, 10),
+    (None, 5, 5),
+    (10, 5, 5),
+    (5, 10, 5),
+    (10, 'tomorrow', 10),
+    (None, 'tomorrow', None),
+])
+def test_get_deadline(timeout, header_offset, remaining):
+    request = MagicMock(headers={})
+    if isinstance(header_offset, int):
+        request.headers['X-Request-Deadline'] = str(time.time() + header_offset)
+    elif header_offset is not None:
+        request.headers['X-Request-Deadline'] = header_offset
+    deadline = DeadlineDecorator(timeout, 'X-Request-Deadline').get_deadline(request)
+    if remaining is None:
+        assert deadline is None
+    else:
+        assert remaining - 1 < deadline.remaining() <= remaining
+
+
+def test_flask_deadlines():
+    app = App(__name__)
+    app.add_api(deadline_spec('fakeapi.hello.get_deadline'), options={'deadline_header': 'X-Request-Deadline'})
+    app_client = app.app.test_client()
+
+    response = app_client.get('/deadline')
+    assert response.status_code == 200
+    assert 0 < json.loads(response.data.decode())['remaining'] <= 0.5
+
+    # the deadline of the client is earlier than the timeout of the operation
+    response = app_client.get('/deadline', headers={'X-Request-Deadline': str(time.time() + 0.2)})
+    assert json.loads(response.data.decode())['remaining'] <= 0.2
+
+    # the handler checks the deadline
+    response = app_client.get('/deadline?delay=0.6')
+    assert response.status_code == 504
+    assert response.content_type == 'application/problem+json'
+    assert json.loads(response.data.decode())['title'] == 'Gateway Timeout'
+
+    # requests past their deadline are rejected before their validation
+    response = app_client.get('/deadline?delay=soon', headers={'X-Request-Deadline': str(time.time() - 1)})
+    assert response.status_code == 504
+
+
+def test_flask_timeout_option():
+    spec = deadline_spec('fakeapi.hello.get_deadline')
+    del spec['paths']['/deadline']['get']['x-timeout']
+    app = App(__name__)
+    app.add_api(spec, options={'timeout': 0.05})
+    app_client = app.app.test_client()
+    # the deadline header is only honored if enabled
+    response = app_client.get('/deadline', headers={'X-Request-Deadline': str(time.time() - 1)})
+    assert response.status_code == 200
+    assert app_client.get('/deadline?delay=0.1').status_code == 504
+
+
+async def test_aiohttp_deadlines(aiohttp_client):
+    app = AioHttpApp(__name__)
+    app.add_api(deadline_spec('fakeapi.aiohttp_handlers.aiohttp_deadline'), base_path='/v1',
+                pass_context_arg_name='request_ctx', options={'deadline_header': 'X-Request-Deadline'})
+    app_client = await aiohttp_client(app.app)
+
+    response = await app_client.get('/v1/deadline')
+    assert response.status == 200
+    assert 0 < (await response.json())['remaining'] <= 0.5
+
+    response = await app_client.get('/v1/deadline', headers={'X-Request-Deadline': str(time.time() + 0.2)})
+    assert (await response.json())['remaining'] <= 0.2
+
+    # the handler is cancelled at the deadline
+    start = time.time()
+    response = await app_client.get('/v1/deadline', params={'delay': '2'})
+    assert response.status == 504
+    assert (await response.json())['title'] == 'Gateway Timeout'
+    assert time.time() - start < 1.5
+    assert aiohttp_handlers.cancelled_deadline_delays[-1] == 2
+
+    response = await app_client.get('/v1/deadline', params={'delay': 'soon'},
+                                    headers={'X-Request-Deadline': str(time.time() - 1)})
+    assert response.status == 504
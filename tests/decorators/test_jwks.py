@@ -0,0 +1,193 @@
+import json
+import threading
+import time
+
+import pytest
+from connexion.decorators import jwks as jwks_module
+from connexion.decorators.jwks import JWKSet, JWTBearerInfo, get_jwt_bearer_info
+from connexion.decorators.security import get_bearerinfo_func
+from unittest.mock import MagicMock
+
+jwt = pytest.importorskip('jwt')
+rsa = pytest.importorskip('cryptography.hazmat.primitives.asymmetric.rsa')
+
+ISSUER = 'https://issuer.example.com/'
+AUDIENCE = 'test-api'
+
+
+@pytest.fixture(scope='module')
+def private_keys():
+    return {kid: rsa.generate_private_key(public_exponent=65537, key_size=2048)
+            for kid in ('key-1', 'key-2')}
+
+
+def make_jwks(private_keys, *kids):
+    keys = []
+    for kid in kids:
+        jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_keys[kid].public_key()))
+        jwk.update(kid=kid, use='sig', alg='RS256')
+        keys.append(jwk)
+    return {'keys': keys}
+
+
+@pytest.fixture
+def jwks_file(tmp_path, private_keys):
+    path = tmp_path / 'jwks.json'
+    path.write_text(json.dumps(make_jwks(private_keys, 'key-1')))
+    return path
+
+
+def make_token(private_keys, kid='key-1', **claims):
+    now = int(time.time())
+    payload = {'sub': 'user', 'iss': ISSUER, 'aud': AUDIENCE, 'iat': now, 'exp': now + 60}
+    payload.update(claims)
+    payload = {key: value for key, value in payload.items() if value is not None}
+    return jwt.encode(payload, private_keys[kid], algorithm='RS256', headers={'kid': kid})
+
+
+def test_get_bearerinfo_func_jwks_uri(jwks_file, private_keys):
+    security_definition = {'x-jwksUri': str(jwks_file),
+                           'x-jwtAudience': [AUDIENCE, 'other-api'],
+                           'x-jwtIssuer': ISSUER,
+                           'x-jwtAlgorithms': ['RS256']}
+    bearer_info_func = get_bearerinfo_func(security_definition)
+    assert bearer_info_func.__self__ is get_jwt_bearer_info(str(jwks_file), audience=(AUDIENCE, 'other-api'),
+                                                            issuer=ISSUER, algorithms=('RS256',))
+    assert bearer_info_func(make_token(private_keys))['sub'] == 'user'
+
+    async_func = get_bearerinfo_func(security_definition, is_async=True)
+    assert async_func.__func__ is JWTBearerInfo.decode_async
+    assert async_func.__self__ is bearer_info_func.__self__
+
+
+def test_get_bearerinfo_func_prefers_function():
+    security_definition = {'x-bearerInfoFunc': 'math.ceil', 'x-jwksUri': 'jwks.json'}
+    assert get_bearerinfo_func(security_definition).__name__ == 'ceil'
+
+
+def test_decode(jwks_file, private_keys):
+    bearer_info = JWTBearerInfo(JWKSet(jwks_file.as_uri()), audience=AUDIENCE, issuer=ISSUER)
+
+    claims = bearer_info.decode(make_token(private_keys))
+    assert claims['sub'] == 'user'
+
+    assert bearer_info.decode(make_token(private_keys, exp=int(time.time()) - 1)) is None
+    assert bearer_info.decode(make_token(private_keys, nbf=int(time.time()) + 60)) is None
+    assert bearer_info.decode(make_token(private_keys, aud='other-api')) is None
+    assert bearer_info.decode(make_token(private_keys, iss='https://evil.example.com/')) is None
+    assert bearer_info.decode(make_token(private_keys, kid='key-2')) is None
+    assert bearer_info.decode('not-a-jwt') is None
+
+
+def test_decode_without_audience(jwks_file, private_keys):
+    bearer_info = JWTBearerInfo(JWKSet(str(jwks_file)))
+    assert bearer_info.decode(make_token(private_keys, aud='any-api'))['sub'] == 'user'
+
+
+def test_decode_leeway(jwks_file, private_keys):
+    bearer_info = JWTBearerInfo(JWKSet(str(jwks_file)), leeway=30)
+    assert bearer_info.decode(make_token(private_keys, exp=int(time.time()) - 5))['sub'] == 'user'
+
+
+def test_decode_memoizes_claims(monkeypatch, jwks_file, private_keys):
+    bearer_info = JWTBearerInfo(JWKSet(str(jwks_file)), audience=AUDIENCE)
+    token = make_token(private_keys)
+    decode = MagicMock(wraps=jwt.decode)
+    monkeypatch.setattr(jwks_module.jwt, 'decode', decode)
+
+    claims = bearer_info.decode(token)
+    assert bearer_info.decode(token) == claims
+    assert decode.call_count == 1
+    # each request gets its own claims
+    bearer_info.decode(token)['sub'] = 'other'
+    claims['scope'] = 'admin'
+    assert bearer_info.decode(token) == {key: value for key, value in claims.items() if key != 'scope'}
+
+    # expired claims are verified again
+    bearer_info._claims[token] = bearer_info._claims[token][0], time.time() - 1
+    assert bearer_info.decode(token)['sub'] == 'user'
+    assert decode.call_count == 2
+
+    # tokens without expiry are not memoized
+    token = make_token(private_keys, exp=None)
+    bearer_info.decode(token)
+    bearer_info.decode(token)
+    assert decode.call_count == 4
+
+
+def test_decode_max_cached_tokens(jwks_file, private_keys):
+    bearer_info = JWTBearerInfo(JWKSet(str(jwks_file)), audience=AUDIENCE, max_cached_tokens=2)
+    for sub in ('a', 'b', 'c'):
+        bearer_info.decode(make_token(private_keys, sub=sub))
+    assert len(bearer_info._claims) <= 2
+
+
+def test_jwks_refresh(monkeypatch, jwks_file, private_keys):
+    jwk_set = JWKSet(str(jwks_file), refresh_interval=300)
+    bearer_info = JWTBearerInfo(jwk_set, audience=AUDIENCE)
+    refresh = MagicMock(wraps=jwk_set.refresh)
+    monkeypatch.setattr(jwk_set, 'refresh', refresh)
+    bearer_info._refresh = refresh
+
+    assert bearer_info.decode(make_token(private_keys))['sub'] == 'user'
+    assert bearer_info.decode(make_token(private_keys, sub='other'))['sub'] == 'other'
+    assert refresh.call_count == 1
+
+    # the keys were rotated, an unknown key id reloads the key set once it is old enough
+    jwks_file.write_text(json.dumps(make_jwks(private_keys, 'key-1', 'key-2')))
+    assert bearer_info.decode(make_token(private_keys, kid='key-2')) is None
+    assert refresh.call_count == 1
+    jwk_set._loaded_at -= jwks_module.UNKNOWN_KID_REFRESH_INTERVAL
+    jwk_set._checked_at -= jwks_module.UNKNOWN_KID_REFRESH_INTERVAL
+    assert bearer_info.decode(make_token(private_keys, kid='key-2'))['sub'] == 'user'
+    assert refresh.call_count == 2
+
+    # the key set is reloaded after the refresh interval
+    jwk_set._loaded_at -= 300
+    jwk_set._checked_at -= 300
+    assert bearer_info.decode(make_token(private_keys, sub='again'))['sub'] == 'again'
+    assert refresh.call_count == 3
+
+
+def test_jwks_refresh_failure(tmp_path):
+    jwk_set = JWKSet(str(tmp_path / 'missing.json'))
+    jwk_set.refresh()
+    assert jwk_set.get_key('key-1') is None
+    # failed loads are retried, but not on every request
+    assert not jwk_set.needs_refresh('key-1')
+    jwk_set._checked_at -= jwks_module.UNKNOWN_KID_REFRESH_INTERVAL
+    assert jwk_set.needs_refresh('key-1')
+
+
+def test_jwks_refresh_remote(monkeypatch, private_keys):
+    response = MagicMock()
+    response.json.return_value = make_jwks(private_keys, 'key-1')
+    get = MagicMock(return_value=response)
+    monkeypatch.setattr(jwks_module.session, 'get', get)
+
+    jwk_set = JWKSet('https://issuer.example.com/jwks.json')
+    jwk_set.refresh()
+    get.assert_called_once_with('https://issuer.example.com/jwks.json', timeout=5)
+    assert jwk_set.get_key('key-1') is not None
+    assert jwk_set.get_key(None) is jwk_set.get_key('key-1')
+
+
+def test_jwks_skips_encryption_keys(private_keys):
+    jwks = make_jwks(private_keys, 'key-1', 'key-2')
+    jwks['keys'][1]['use'] = 'enc'
+    jwk_set = JWKSet('jwks.json')
+    jwk_set.load(jwks)
+    assert jwk_set.get_key('key-1') is not None
+    assert jwk_set.get_key('key-2') is None
+
+
+async def test_decode_async(monkeypatch, jwks_file, private_keys):
+    read_file = JWKSet._read_file
+    reads = []
+    monkeypatch.setattr(JWKSet, '_read_file', lambda jwk_set: reads.append(threading.current_thread()) or
+                        read_file(jwk_set))
+    bearer_info = JWTBearerInfo(JWKSet(str(jwks_file)), audience=AUDIENCE, issuer=ISSUER)
+    assert (await bearer_info.decode_async(make_token(private_keys)))['sub'] == 'user'
+    # the file is read out of the event loop
+    assert reads and threading.main_thread() not in reads
+    assert await bearer_info.decode_async(make_token(private_keys, aud='other-api')) is None
@@ -1,13 +1,25 @@
+import asyncio
 import json
+import threading
+import time
 
 import pytest
 import requests
 from unittest.mock import MagicMock
+from werkzeug.datastructures import ImmutableMultiDict
 
-from connexion.decorators.security import (get_tokeninfo_func,
+from connexion.decorators.security import (RequestCredentials,
+                                           RequiredScopes, SecurityPlan,
+                                           get_async_session,
+                                           get_tokeninfo_func,
                                            get_tokeninfo_remote,
+                                           get_tokeninfo_remote_async,
+                                           single_flight, single_flight_async,
                                            validate_scope, verify_apikey,
-                                           verify_basic, verify_oauth)
+                                           verify_apikey_async, verify_basic,
+                                           verify_basic_async, verify_bearer,
+                                           verify_none, verify_oauth,
+                                           verify_oauth_async, verify_security)
 from connexion.exceptions import (OAuthProblem, OAuthResponseProblem,
                                   OAuthScopeProblem)
 
@@ -32,6 +44,10 @@ def test_get_tokeninfo_url(monkeypatch):
     assert func.args == ('bar',)
     logger.warn.assert_not_called()
 
+    func = get_tokeninfo_func(security_def, is_async=True)
+    assert func.func is get_tokeninfo_remote_async
+    assert func.args == ('bar',)
+
 
 def test_verify_oauth_missing_auth_header():
     def somefunc(token):
@@ -156,6 +172,21 @@ def test_verify_apikey_query():
     assert wrapped_func(request, ['admin']) is not None
 
 
+def test_verify_apikey_query_multidict():
+    apikey_info = MagicMock(return_value={'sub': 'foo'})
+    wrapped_func = verify_apikey(apikey_info, 'query', 'auth')
+
+    request = MagicMock()
+    query = ImmutableMultiDict([('auth', 'foobar'), ('other', 'a'), ('other', 'b')])
+    request.query = query
+
+    assert wrapped_func(request, ['admin']) == {'sub': 'foo'}
+    apikey_info.assert_called_once_with('foobar', required_scopes=['admin'])
+    # the query of the framework is left untouched
+    assert request.query == {'other': ['a', 'b']}
+    assert 'auth' in query
+
+
 def test_verify_apikey_header():
     def apikey_info(apikey, required_scopes=None):
         if apikey == 'foobar':
@@ -168,3 +199,323 @@ def test_verify_apikey_header():
     request.headers = {"X-Auth": 'foobar'}
 
     assert wrapped_func(request, ['admin']) is not None
+
+
+def test_verify_apikey_cookie():
+    def apikey_info(apikey, required_scopes=None):
+        if apikey == 'foobar':
+            return {'sub': 'foo'}
+        return None
+
+    wrapped_func = verify_apikey(apikey_info, 'cookie', 'auth')
+
+    request = MagicMock()
+    request.headers = {"Cookie": 'theme=dark; auth=foobar'}
+
+    assert wrapped_func(request, ['admin']) is not None
+
+
+def test_request_credentials_parsed_once():
+    headers = MagicMock()
+    headers.get.side_effect = {"Authorization": 'Bearer abc', "Cookie": 'a=1; b=2'}.get
+    request = MagicMock()
+    request.headers = headers
+
+    credentials = RequestCredentials(request)
+    assert credentials.authorization == ('bearer', 'abc')
+    assert credentials.authorization == ('bearer', 'abc')
+    assert credentials.cookies == {'a': '1', 'b': '2'}
+    assert credentials.cookies == {'a': '1', 'b': '2'}
+    assert headers.get.call_count == 2
+
+    request.headers = {"Authorization": 'Bearer'}
+    credentials = RequestCredentials(request)
+    with pytest.raises(OAuthProblem):
+        credentials.authorization
+
+
+def test_security_plan_dispatches_on_auth_type():
+    bearer_info = MagicMock(return_value={'sub': 'bearer'})
+    basic_info = MagicMock(return_value={'sub': 'basic'})
+    apikey_info = MagicMock(return_value=None)
+    bearer = verify_bearer(bearer_info)
+    basic = verify_basic(basic_info)
+    apikey = verify_apikey(apikey_info, 'header', 'X-Auth')
+    plan = SecurityPlan([bearer, apikey, basic])
+
+    def select(headers):
+        request = MagicMock()
+        request.headers = headers
+        return plan.select(RequestCredentials(request))
+
+    assert select({"Authorization": 'Bearer abc'}) == (bearer, apikey)
+    assert select({"Authorization": 'Basic Zm9vOmJhcg=='}) == (apikey, basic)
+    assert select({"Authorization": 'Digest abc'}) == (apikey,)
+    assert select({}) == (apikey,)
+    # the invalid header is reported by the first scheme using it
+    assert select({"Authorization": 'Bearer'}) == (bearer, apikey, basic)
+
+    plan = SecurityPlan([verify_none()])
+    request = MagicMock()
+    request.headers = {"Authorization": 'Bearer abc'}
+    assert plan.select(RequestCredentials(request)) == plan.auth_funcs
+
+
+def test_verify_security_skips_other_auth_types():
+    bearer_info = MagicMock(return_value={'sub': 'bearer'})
+    basic_info = MagicMock(return_value={'sub': 'basic'})
+    function = MagicMock(return_value='response')
+    wrapped_func = verify_security([verify_bearer(bearer_info), verify_basic(basic_info)], None, function)
+
+    request = MagicMock()
+    request.headers = {"Authorization": 'Basic Zm9vOmJhcg=='}
+    request.context = {}
+
+    assert wrapped_func(request) == 'response'
+    assert request.context['user'] == 'basic'
+    bearer_info.assert_not_called()
+
+    request.headers = {}
+    with pytest.raises(OAuthProblem):
+        wrapped_func(request)
+
+
+def test_verify_security_two_argument_auth_funcs():
+    def auth_func(request, required_scopes):
+        return {'sub': request.headers.get('X-User')}
+
+    bearer_info = MagicMock(return_value=None)
+    function = MagicMock(return_value='response')
+    wrapped_func = verify_security([verify_bearer(bearer_info), auth_func], ['admin'], function)
+
+    request = MagicMock()
+    request.headers = {'X-User': 'foo'}
+    request.context = {}
+
+    assert wrapped_func(request) == 'response'
+    assert request.context['user'] == 'foo'
+
+
+def test_validate_scope_required_scopes():
+    required_scopes = RequiredScopes(['admin', 'read'])
+    assert required_scopes == ['admin', 'read']
+    assert required_scopes.scope_set == frozenset(['admin', 'read'])
+    assert validate_scope(required_scopes, 'admin read write')
+    assert validate_scope(required_scopes, ['admin', 'read'])
+    assert not validate_scope(required_scopes, 'admin')
+    assert validate_scope(['admin'], 'admin')
+
+
+def test_verify_apikey_query_without_key():
+    apikey_info = MagicMock()
+    wrapped_func = verify_apikey(apikey_info, 'query', 'auth')
+
+    request = MagicMock()
+    query = {"other": 'value'}
+    request.query = query
+
+    assert wrapped_func(request, ['admin']) is None
+    assert request.query is query
+    apikey_info.assert_not_called()
+
+
+async def test_get_tokeninfo_remote_async(aiohttp_token_info_url):
+    assert await get_tokeninfo_remote_async(aiohttp_token_info_url, '100') == \
+        {"uid": "test-user", "scope": ["myscope"]}
+    assert await get_tokeninfo_remote_async(aiohttp_token_info_url, '300') is None
+    # connections are pooled in one session per event loop
+    assert get_async_session() is get_async_session()
+    await get_async_session().close()
+
+
+async def test_verify_oauth_async_scopes_remote(aiohttp_token_info_url):
+    token_info_func = get_tokeninfo_func({'x-tokenInfoUrl': aiohttp_token_info_url}, is_async=True)
+    wrapped_func = verify_oauth_async(token_info_func, validate_scope)
+
+    request = MagicMock()
+    request.headers = {"Authorization": "Bearer 200"}
+    with pytest.raises(OAuthScopeProblem, match="Provided token doesn't have the required scope"):
+        await wrapped_func(request, ['myscope'])
+
+    request.headers = {"Authorization": "Bearer 300"}
+    with pytest.raises(OAuthResponseProblem):
+        await wrapped_func(request, ['myscope'])
+
+    request.headers = {"Authorization": "Bearer 100"}
+    assert await wrapped_func(request, ['myscope']) is not None
+
+    request.headers = {}
+    assert await wrapped_func(request, ['myscope']) is None
+    await get_async_session().close()
+
+
+async def test_verify_basic_async():
+    async def basic_info(username, password, required_scopes=None):
+        if username == 'foo' and password == 'bar':
+            return {'sub': 'foo'}
+        return None
+
+    wrapped_func = verify_basic_async(basic_info)
+
+    request = MagicMock()
+    request.headers = {"Authorization": 'Basic Zm9vOmJhcg=='}
+    assert await wrapped_func(request, ['admin']) == {'sub': 'foo'}
+
+    request.headers = {"Authorization": 'Basic Zm9vOmJheg=='}
+    with pytest.raises(OAuthResponseProblem):
+        await wrapped_func(request, ['admin'])
+
+
+async def test_verify_apikey_async_query():
+    async def apikey_info(apikey, required_scopes=None):
+        if apikey == 'foobar':
+            return {'sub': 'foo'}
+        return None
+
+    wrapped_func = verify_apikey_async(apikey_info, 'query', 'auth')
+
+    request = MagicMock()
+    request.query = {"auth": 'foobar', "other": 'value'}
+
+    assert await wrapped_func(request, ['admin']) == {'sub': 'foo'}
+    assert request.query == {"other": 'value'}
+
+
+def test_single_flight_shares_result_between_threads():
+    calls = []
+    started = threading.Event()
+
+    def token_info(token):
+        calls.append(token)
+        started.set()
+        time.sleep(0.1)
+        return {'uid': token}
+
+    wrapped_func = single_flight(token_info)
+    results = []
+
+    def lookup(token):
+        results.append(wrapped_func(token))
+
+    threads = [threading.Thread(target=lookup, args=('123',))]
+    threads[0].start()
+    started.wait()
+    threads += [threading.Thread(target=lookup, args=('123',)) for _ in range(4)]
+    threads.append(threading.Thread(target=lookup, args=('456',)))
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(calls) == ['123', '456']
+    assert len(results) == 6
+    assert results.count({'uid': '123'}) == 5
+
+    # finished lookups are not cached
+    wrapped_func('123')
+    assert calls.count('123') == 2
+
+
+def fail_in_threads(error_class, count=4):
+    """
+    :return: the number of calls of the shared function and the errors of the threads
+    """
+    calls = []
+    started = threading.Event()
+
+    def token_info(token):
+        calls.append(token)
+        started.set()
+        time.sleep(0.1)
+        raise error_class(description='lookup failed')
+
+    wrapped_func = single_flight(token_info)
+    errors = []
+
+    def lookup():
+        try:
+            wrapped_func('123')
+        except error_class as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=lookup)]
+    threads[0].start()
+    started.wait()
+    threads += [threading.Thread(target=lookup) for _ in range(count - 1)]
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(calls), errors
+
+
+def test_single_flight_shares_error_between_threads():
+    calls, errors = fail_in_threads(OAuthProblem)
+    assert calls == 1
+    assert len(errors) == 4
+    # each thread raises its own copy, caused by the error of the call
+    assert len(set(map(id, errors))) == 4
+    error = next(e for e in errors if e.__cause__ is None)
+    assert all(e.__cause__ is error for e in errors if e is not error)
+    assert all(e.description == 'lookup failed' for e in errors)
+
+
+class Interrupted(BaseException):
+    def __init__(self, description):
+        super().__init__(description)
+
+
+def test_single_flight_does_not_share_interruptions():
+    calls, errors = fail_in_threads(Interrupted)
+    # the other threads called the function again
+    assert calls > 1
+    assert len(errors) == 4
+    assert all(e.__cause__ is None for e in errors)
+
+
+async def test_single_flight_async():
+    calls = []
+
+    async def token_info(token):
+        calls.append(token)
+        await asyncio.sleep(0.05)
+        if token == 'invalid':
+            raise OAuthProblem(description='lookup failed')
+        return {'uid': token}
+
+    wrapped_func = single_flight_async(token_info)
+
+    results = await asyncio.gather(*[wrapped_func(token) for token in ('123', '123', '456', '123')])
+    assert results == [{'uid': '123'}, {'uid': '123'}, {'uid': '456'}, {'uid': '123'}]
+    assert sorted(calls) == ['123', '456']
+
+    results = await asyncio.gather(wrapped_func('invalid'), wrapped_func('invalid'), return_exceptions=True)
+    assert all(isinstance(result, OAuthProblem) for result in results)
+    assert calls.count('invalid') == 1
+
+
+async def test_single_flight_async_calls_functions_in_executor():
+    def token_info(token):
+        # e.g. a blocking request
+        time.sleep(0.05)
+        return {'uid': token, 'thread': threading.current_thread()}
+
+    wrapped_func = single_flight_async(token_info)
+
+    results = await asyncio.gather(wrapped_func('123'), wrapped_func('123'))
+    assert results[0] == results[1]
+    assert results[0]['thread'] is not threading.current_thread()
+
+
+async def test_single_flight_async_survives_cancelled_caller():
+    async def token_info(token):
+        await asyncio.sleep(0.05)
+        return {'uid': token}
+
+    wrapped_func = single_flight_async(token_info)
+
+    first = asyncio.ensure_future(wrapped_func('123'))
+    second = asyncio.ensure_future(wrapped_func('123'))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == {'uid': '123'}
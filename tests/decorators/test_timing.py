@@ -0,0 +1,37 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from connexion.decorators.timing import (exclusive_timings, server_timing,
+                                         time_stage)
+
+
+def test_exclusive_timings():
+    timings = {'request': 0.5, 'handler': 1.0, 'parameter_validation': 1.5, 'security': 4.0}
+    stages = ('handler', 'response_validation', 'parameter_validation', 'security')
+    assert exclusive_timings(timings, stages) == [('security', 2.5),
+                                                  ('parameter_validation', 0.5),
+                                                  ('handler', 1.0)]
+    # the security stage failed before calling the other stages
+    assert exclusive_timings({'security': 0.2}, stages) == [('security', 0.2)]
+
+
+def test_server_timing():
+    assert server_timing([('security', 0.0025), ('handler', 0.1)]) == 'security;dur=2.500, handler;dur=100.000'
+
+
+def test_time_stage():
+    request = MagicMock(timings={})
+    wrapped = time_stage('handler', lambda request: 'response')
+    assert wrapped(request) == 'response'
+    assert request.timings['handler'] >= 0
+
+
+def test_time_stage_async(loop):
+    async def handler(request):
+        await asyncio.sleep(0.01)
+        return 'response'
+
+    request = MagicMock(timings={})
+    wrapped = time_stage('handler', handler, is_async=True)
+    assert loop.run_until_complete(wrapped(request)) == 'response'
+    assert request.timings['handler'] >= 0.01
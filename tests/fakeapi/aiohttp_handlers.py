@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
+import asyncio
 import datetime
+import mmap
+import pathlib
+import threading
 import uuid
 
 import aiohttp
@@ -42,6 +46,19 @@ async def aiohttp_access_request_context(request_ctx):
     return None
 
 
+# delays of the deadline requests cancelled while sleeping
+cancelled_deadline_delays = []
+
+
+async def aiohttp_deadline(request_ctx, delay=0):
+    try:
+        await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        cancelled_deadline_delays.append(delay)
+        raise
+    return {'remaining': request_ctx['deadline'].remaining()}
+
+
 async def aiohttp_query_parsing_str(query):
     return {'query': query}
 
@@ -84,3 +101,61 @@ async def get_date():
 
 async def get_uuid():
     return ConnexionResponse(body={'value': uuid.UUID(hex='e7ff66d0-3ec2-4c4e-bed0-6e4723c24c51')})
+
+
+async def aiohttp_post_form(body):
+    return body
+
+
+async def aiohttp_upload(body, file):
+    contents = file.read()
+    return {
+        'description': body.get('description'),
+        'filename': file.filename,
+        'content_type': file.content_type,
+        'size': len(contents),
+        'spilled': file.stream._rolled,
+    }
+
+
+async def aiohttp_forward(body):
+    return body
+
+
+async def aiohttp_upload_stream(body):
+    size = chunks = 0
+    async for chunk in body:
+        size += len(chunk)
+        chunks += 1
+    return {'size': size, 'chunks': chunks, 'type': type(body).__name__}
+
+
+async def aiohttp_stream_rows_blocking(count, invalid=None):
+    def rows():
+        for i in range(count):
+            # e.g. rows fetched from a blocking database cursor, out of the event loop
+            yield {'id': i, 'on_loop': threading.current_thread() is threading.main_thread()}
+    # returned alone, a generator would be awaited as a generator-based coroutine
+    return rows(), 200
+
+
+async def aiohttp_stream_rows(count, invalid=None):
+    for i in range(count):
+        await asyncio.sleep(0)
+        yield {'id': 'row {}'.format(i) if i == invalid else i}
+
+
+async def aiohttp_get_rows(count, invalid=None):
+    return [{'id': 'row {}'.format(i) if i == invalid else i} for i in range(count)]
+
+
+async def aiohttp_get_file(path, kind='path'):
+    path = pathlib.Path(path)
+    if kind == 'file':
+        return path.open('rb')
+    if kind == 'mmap':
+        with path.open('rb') as file:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if kind == 'memoryview':
+        return memoryview(path.read_bytes())
+    return path
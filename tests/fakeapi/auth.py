@@ -2,3 +2,25 @@ def fake_basic_auth(username, password, required_scopes=None):
     if username == password:
         return {'uid': username}
     return None
+
+
+async def fake_async_basic_auth(username, password, required_scopes=None):
+    return fake_basic_auth(username, password, required_scopes)
+
+
+async def fake_async_apikey_auth(apikey, required_scopes=None):
+    if apikey == 'valid-key':
+        return {'uid': 'apikey-user'}
+    return None
+
+
+async def fake_async_token_info(token):
+    if token == 'valid-token':
+        return {'uid': 'token-user', 'scope': ['myscope']}
+    if token == 'wrong-scope-token':
+        return {'uid': 'token-user', 'scope': ['otherscope']}
+    return None
+
+
+async def fake_async_validate_scope(required_scopes, token_scopes):
+    return set(required_scopes) <= set(token_scopes)
@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
 import datetime
+import mmap
+import pathlib
+import time
 import uuid
 
 from flask import jsonify, redirect
@@ -602,3 +605,39 @@ def get_date():
 
 def get_uuid():
     return {'value': uuid.UUID(hex='e7ff66d0-3ec2-4c4e-bed0-6e4723c24c51')}
+
+
+def get_deadline(delay=0):
+    time.sleep(delay)
+    deadline = context['deadline']
+    deadline.check()
+    return {'remaining': deadline.remaining()}
+
+
+def upload_stream(body):
+    size = chunks = 0
+    for chunk in body:
+        size += len(chunk)
+        chunks += 1
+    return {'size': size, 'chunks': chunks, 'type': type(body).__name__}
+
+
+def stream_rows(count, invalid=None):
+    for i in range(count):
+        yield {'id': 'row {}'.format(i) if i == invalid else i}
+
+
+def get_rows(count, invalid=None):
+    return list(stream_rows(count, invalid))
+
+
+def get_file(path, kind='path'):
+    path = pathlib.Path(path)
+    if kind == 'file':
+        return path.open('rb')
+    if kind == 'mmap':
+        with path.open('rb') as file:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if kind == 'memoryview':
+        return memoryview(path.read_bytes())
+    return path
@@ -56,6 +56,18 @@ def test_template():
     assert api2.specification['info']['title'] == 'other test'
 
 
+def test_specification_with_base_path():
+    api = FlaskApi(TEST_FOLDER / "fixtures/simple/swagger.yaml", base_path="/api/v1.0")
+    specification = api.specification.with_base_path('/other')
+    assert specification.base_path == '/other'
+    assert specification.raw['basePath'] == '/other'
+    assert api.specification.base_path == '/api/v1.0'
+    assert api.specification.raw['basePath'] == '/api/v1.0'
+    # the resolved spec is shared
+    assert specification['paths'] is api.specification['paths']
+    assert specification.validator_registry is api.specification.validator_registry
+
+
 def test_invalid_operation_does_stop_application_to_setup():
     with pytest.raises(ImportError):
         FlaskApi(TEST_FOLDER / "fixtures/op_error_api/swagger.yaml",
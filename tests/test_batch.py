@@ -0,0 +1,275 @@
+import base64
+import json
+
+import pytest
+from conftest import build_app_from_fixture
+from connexion import AioHttpApp
+from connexion.batch import BATCH_HEADER, BATCH_KEY, parse_batch, response_item
+from connexion.exceptions import BadRequestProblem, PayloadTooLargeProblem
+from connexion.jsonifier import ENCODE_BATCH_SIZE
+from connexion.streaming import FileBody
+from test_streaming import CONTENT, file_spec, rows_spec
+
+BATCH_OPTIONS = {'batch_path': '/batch', 'batch_max_size': 10, 'batch_concurrency': 4}
+
+
+@pytest.fixture(scope='module')
+def batch_app():
+    return build_app_from_fixture('simple', 'openapi.yaml', validate_responses=True, options=BATCH_OPTIONS)
+
+
+def post_batch(app_client, requests, headers=None):
+    return app_client.post('/v1.0/batch', data=json.dumps(requests), content_type='application/json',
+                           headers=headers)
+
+
+def test_parse_batch():
+    data = json.dumps([
+        {'path': '/pets', 'query': {'tags': ['cat', 'dog'], 'limit': 10, 'details': True}},
+        {'method': 'post', 'path': '/pets', 'headers': {'X-Trace': 'on'}, 'body': {'name': 'Rex'}},
+        {'method': 'PUT', 'path': '/notes/1', 'headers': {'Content-Type': 'text/plain'}, 'body': 'note'},
+    ]).encode()
+    get_pets, post_pet, put_note = parse_batch(data, {'Authorization': 'Bearer 100', 'Content-Length': '42'},
+                                               10, '/batch')
+
+    assert (get_pets.method, get_pets.path) == ('GET', '/pets')
+    assert get_pets.query == [('tags', 'cat'), ('tags', 'dog'), ('limit', '10'), ('details', 'true')]
+    assert get_pets.headers == {'Authorization': 'Bearer 100'}
+    assert get_pets.body is None
+
+    assert post_pet.method == 'POST'
+    assert post_pet.headers == {'Authorization': 'Bearer 100', 'X-Trace': 'on', 'Content-Type': 'application/json'}
+    assert json.loads(post_pet.body.decode()) == {'name': 'Rex'}
+
+    assert put_note.body == b'note'
+    assert put_note.headers['Content-Type'] == 'text/plain'
+
+
+@pytest.mark.parametrize('data, detail', [
+    (b'{"path": "/pets"}', 'must be an array'),
+    (b'[{"path": "/pets"', 'not valid JSON'),
+    (b'[["GET", "/pets"]]', 'request 0 of the batch: not an object'),
+    (b'[{"path": "/pets"}, {"method": "FETCH", "path": "/pets"}]', "request 1 of the batch: 'FETCH'"),
+    (b'[{"path": "pets"}]', "'path' must be a string starting with '/'"),
+    (b'[{"path": "/pets?limit=1"}]', "go in 'query'"),
+    (b'[{"path": "/batch"}]', 'can not be nested'),
+    (b'[{"path": "//batch/"}]', 'can not be nested'),
+    (b'[{"path": "/pets/../batch"}]', 'can not be nested'),
+    (b'[{"path": "/%62atch"}]', 'can not be nested'),
+    (b'[{"path": "/pets", "headers": {"X-Count": 1}}]', "'headers' must be an object of strings"),
+])
+def test_parse_invalid_batch(data, detail):
+    with pytest.raises(BadRequestProblem) as exc_info:
+        parse_batch(data, {}, 10, '/batch')
+    assert detail in exc_info.value.detail
+
+
+def test_parse_batch_too_large():
+    with pytest.raises(PayloadTooLargeProblem) as exc_info:
+        parse_batch(json.dumps([{'path': '/pets'}] * 3).encode(), {}, 2, '/batch')
+    assert exc_info.value.status == 413
+
+
+def test_response_item():
+    assert response_item(200, {'Content-Type': 'application/json', 'Content-Length': '2'}, b'{}',
+                         'application/json') == {'status': 200, 'headers': {'Content-Type': 'application/json'},
+                                                 'body': {}}
+    assert response_item(204, {}, b'', None) == {'status': 204, 'headers': {}, 'body': None}
+    assert response_item(200, {}, b'text', 'text/plain')['body'] == 'text'
+    assert response_item(200, {}, b'\xff\xfe', 'application/octet-stream') == \
+        {'status': 200, 'headers': {}, 'body': '//4=', 'bodyEncoding': 'base64'}
+
+
+def test_batch(batch_app):
+    app_client = batch_app.app.test_client()
+    response = post_batch(app_client, [
+        {'method': 'POST', 'path': '/greeting/jsantos'},
+        {'path': '/bye/jsantos'},
+        {'path': '/test_array_csv_query_param', 'query': {'items': 'squash,banana'}},
+        {'path': '/test_required_query_param'},
+        {'method': 'POST', 'path': '/test-empty-object-body', 'body': {'foo': 'bar'}},
+        {'path': '/does-not-exist'},
+    ])
+    assert response.status_code == 200
+    greeting, bye, items, missing_param, body, not_found = json.loads(response.data.decode())
+
+    assert greeting['status'] == 200
+    assert greeting['headers']['Content-Type'] == 'application/json'
+    assert greeting['body'] == {'greeting': 'Hello jsantos'}
+    assert (bye['status'], bye['body']) == (200, 'Goodbye jsantos')
+    assert (items['status'], items['body']) == (200, ['squash', 'banana'])
+    assert missing_param['status'] == 400
+    assert missing_param['headers']['Content-Type'] == 'application/problem+json'
+    assert missing_param['body']['detail'] == "Missing query parameter 'n'"
+    assert (body['status'], body['body']) == (200, {'stack': {'foo': 'bar'}})
+    assert not_found['status'] == 404
+
+
+def test_batch_limits(batch_app):
+    app_client = batch_app.app.test_client()
+    response = post_batch(app_client, [{'path': '/bye/jsantos'}] * 11)
+    assert response.status_code == 413
+    assert response.content_type == 'application/problem+json'
+    assert json.loads(response.data.decode())['detail'] == 'The batch has 11 requests, the maximum is 10'
+
+    response = app_client.post('/v1.0/batch', data='[{', content_type='application/json')
+    assert response.status_code == 400
+
+    assert post_batch(app_client, []).data.strip() == b'[]'
+    assert app_client.get('/v1.0/batch').status_code == 405
+
+
+def test_batch_nested(batch_app):
+    app_client = batch_app.app.test_client()
+    # e.g. a path the router resolves to the batch endpoint
+    response = app_client.post('/v1.0/batch', data=json.dumps([{'path': '/bye/jsantos'}]),
+                               content_type='application/json', environ_overrides={BATCH_KEY: True})
+    assert response.status_code == 400
+    assert json.loads(response.data.decode())['detail'] == 'Batches can not be nested'
+
+
+def test_batch_body_limits():
+    app = build_app_from_fixture('simple', 'openapi.yaml', options=dict(
+        BATCH_OPTIONS, max_body_size=100, max_json_depth=4))
+    app_client = app.app.test_client()
+    assert post_batch(app_client, [{'path': '/bye/jsantos'}]).status_code == 200
+
+    response = post_batch(app_client, [{'path': '/bye/{}'.format('a' * 100)}])
+    assert response.status_code == 413
+    assert json.loads(response.data.decode())['detail'] == 'The request body is larger than 100 bytes'
+
+    response = post_batch(app_client, [{'path': '/bye/jsantos', 'body': [[[{}]]]}])
+    assert response.status_code == 400
+    assert json.loads(response.data.decode())['detail'] == 'The JSON body is nested deeper than 4 levels'
+
+
+def test_batch_not_enabled(simple_openapi_app):
+    app_client = simple_openapi_app.app.test_client()
+    assert post_batch(app_client, [{'path': '/bye/jsantos'}]).status_code == 404
+
+
+def test_batch_inherits_authorization(oauth_requests):
+    app = build_app_from_fixture('secure_api', 'openapi.yaml', options=BATCH_OPTIONS)
+    app_client = app.app.test_client()
+    response = post_batch(app_client, [
+        {'method': 'POST', 'path': '/greeting/rcaricio'},
+        {'method': 'POST', 'path': '/greeting/rcaricio', 'headers': {'Authorization': 'Bearer 300'}},
+    ], headers={'Authorization': 'Bearer 100'})
+    assert response.status_code == 200
+    assert [item['status'] for item in json.loads(response.data.decode())] == [200, 401]
+
+    response = post_batch(app_client, [{'method': 'POST', 'path': '/greeting/rcaricio'}])
+    assert json.loads(response.data.decode())[0]['status'] == 401
+
+
+async def test_batch_aiohttp(aiohttp_api_spec_dir, aiohttp_client):
+    app = AioHttpApp(__name__, specification_dir=aiohttp_api_spec_dir)
+    app.add_api('swagger_simple.yaml', options=BATCH_OPTIONS)
+    app_client = await aiohttp_client(app.app)
+
+    response = await app_client.post('/v1.0/batch', json=[
+        {'path': '/bye/jsantos'},
+        {'path': '/aiohttp_query_parsing_array', 'query': {'query': 'a,b'}},
+        {'method': 'POST', 'path': '/users/', 'body': {'name': 1}},
+        {'path': '/does-not-exist'},
+        {'path': '/bye/jsantos', 'headers': {'Content-Type': 'text/plain'}},
+    ])
+    assert response.status == 200
+    bye, query, invalid_body, not_found, bye_again = await response.json()
+    assert (bye['status'], bye['body']) == (200, 'Goodbye jsantos')
+    assert bye['headers']['Content-Type'] == 'text/plain; charset=utf-8'
+    assert (query['status'], query['body']) == (200, {'query': ['a', 'b']})
+    assert invalid_body['status'] == 400
+    assert invalid_body['body']['title'] == 'Bad Request'
+    assert not_found['status'] == 404
+    assert bye_again == bye
+
+    response = await app_client.post('/v1.0/batch', json=[{'path': '/bye/jsantos'}] * 11)
+    assert response.status == 413
+
+    # the header of the sub-requests
+    response = await app_client.post('/v1.0/batch', json=[{'path': '/bye/jsantos'}], headers={BATCH_HEADER: '1'})
+    assert response.status == 400
+
+
+async def test_batch_aiohttp_body_limits(aiohttp_api_spec_dir, aiohttp_client):
+    app = AioHttpApp(__name__, specification_dir=aiohttp_api_spec_dir)
+    app.add_api('swagger_simple.yaml', options=dict(BATCH_OPTIONS, max_body_size=100))
+    app_client = await aiohttp_client(app.app)
+
+    response = await app_client.post('/v1.0/batch', json=[{'path': '/bye/jsantos'}])
+    assert response.status == 200
+
+    response = await app_client.post('/v1.0/batch', json=[{'path': '/bye/{}'.format('a' * 100)}])
+    assert response.status == 413
+
+    async def chunks():
+        yield b'[{"path": "/bye/jsantos"}'
+        for _ in range(10):
+            yield b', {"path": "/bye/jsantos"}'
+        yield b']'
+
+    # counted while it is read
+    response = await app_client.post('/v1.0/batch', data=chunks(), headers={'Content-Type': 'application/json'})
+    assert response.status == 413
+
+
+async def test_batch_aiohttp_chunked_response(aiohttp_client, monkeypatch):
+    app = AioHttpApp(__name__)
+    api = app.add_api(rows_spec('fakeapi.aiohttp_handlers.aiohttp_get_rows'), base_path='/v1',
+                      options=BATCH_OPTIONS)
+    app_client = await aiohttp_client(app.app)
+    # the large lists are encoded in chunks
+    monkeypatch.setattr(type(api), 'response_buffer_size', 10000)
+
+    count = ENCODE_BATCH_SIZE * 3
+    response = await app_client.post('/v1/batch', json=[
+        {'path': '/rows', 'query': {'count': count}},
+        {'path': '/rows', 'query': {'count': 2}},
+    ])
+    assert response.status == 200
+    rows, few_rows = await response.json()
+    assert (rows['status'], rows['body']) == (200, [{'id': i} for i in range(count)])
+    assert (few_rows['status'], few_rows['body']) == (200, [{'id': 0}, {'id': 1}])
+
+
+async def test_batch_aiohttp_streamed_response(aiohttp_client):
+    app = AioHttpApp(__name__)
+    app.add_api(rows_spec('fakeapi.aiohttp_handlers.aiohttp_stream_rows'), base_path='/v1',
+                validate_responses=True, options=BATCH_OPTIONS)
+    app_client = await aiohttp_client(app.app)
+
+    response = await app_client.post('/v1/batch', json=[
+        {'path': '/rows', 'query': {'count': 3}},
+        {'path': '/rows', 'query': {'count': 3, 'invalid': 1}},
+        {'path': '/rows', 'query': {'count': 'a'}},
+    ])
+    assert response.status == 200
+    rows, invalid_rows, invalid_count = await response.json()
+    assert (rows['status'], rows['body']) == (200, [{'id': 0}, {'id': 1}, {'id': 2}])
+    # the stream fails once sent, only this sub-request fails
+    assert invalid_rows['status'] == 500
+    assert invalid_rows['body']['title'] == 'Internal Server Error'
+    assert invalid_count['status'] == 400
+
+
+async def test_batch_aiohttp_file_response(aiohttp_client, tmp_path, monkeypatch):
+    path = tmp_path / 'content.bin'
+    path.write_bytes(CONTENT)
+    closed = []
+    close = FileBody.close
+    monkeypatch.setattr(FileBody, 'close', lambda body: closed.append(body) or close(body))
+    app = AioHttpApp(__name__)
+    app.add_api(file_spec('fakeapi.aiohttp_handlers.aiohttp_get_file'), base_path='/v1', options=BATCH_OPTIONS)
+    app_client = await aiohttp_client(app.app)
+
+    response = await app_client.post('/v1/batch', json=[
+        {'path': '/file', 'query': {'path': str(path), 'kind': kind}} for kind in ('path', 'file', 'memoryview')
+    ])
+    assert response.status == 200
+    for item in await response.json():
+        assert item['status'] == 200
+        assert item['bodyEncoding'] == 'base64'
+        assert base64.b64decode(item['body']) == CONTENT
+    # the files opened by the handlers are closed once read
+    assert len(closed) == 2
@@ -0,0 +1,139 @@
+import json
+
+import pytest
+from conftest import FIXTURES_FOLDER
+from connexion import AioHttpApp, App
+from connexion.bench import (RequestGenerator, bench, format_report,
+                             generate_requests, percentile, sample_value)
+from connexion.mock import MockResolver
+from connexion.operations import make_operation
+from connexion.spec import Specification
+
+
+def get_operation(folder, spec_file, path, method):
+    spec = Specification.load(FIXTURES_FOLDER / folder / spec_file, arguments={'title': 'Bench'})
+    return make_operation(spec, None, path, method, MockResolver(mock_all=True))
+
+
+def test_sample_value():
+    assert sample_value({'type': 'string', 'example': 'ex', 'default': 'def'}) == 'ex'
+    assert sample_value({'type': 'string', 'default': 'def'}) == 'def'
+    assert sample_value({'type': 'string', 'enum': ['a', 'b']}) == 'a'
+    assert sample_value({'type': 'string', 'format': 'date'}) == '2020-01-01'
+    assert sample_value({'type': 'string', 'minLength': 10}) == 'stringxxxx'
+    assert sample_value({'type': 'string', 'maxLength': 3}) == 'str'
+    assert sample_value({'type': 'integer', 'minimum': 5, 'exclusiveMinimum': True}) == 6
+    assert sample_value({'type': 'integer', 'maximum': -3}) == -3
+    assert sample_value({'type': 'integer', 'minimum': 1, 'multipleOf': 4}) == 4
+    assert sample_value({'type': 'number'}) == 0.0
+    assert sample_value({'type': 'boolean'}) is True
+    assert sample_value({'type': 'array', 'items': {'type': 'integer'}, 'minItems': 2}) == [0, 0]
+    assert sample_value({'type': 'object',
+                         'properties': {'id': {'type': 'integer', 'readOnly': True},
+                                        'name': {'type': 'string'}}}) == {'name': 'string'}
+    assert sample_value({'allOf': [{'properties': {'a': {'type': 'integer'}}},
+                                   {'properties': {'b': {'type': 'boolean'}}}]}) == {'a': 0, 'b': True}
+    assert sample_value({'oneOf': [{'type': 'integer'}, {'type': 'string'}]}) == 0
+
+
+def test_generate_openapi_parameters():
+    operation = get_operation('simple', 'openapi.yaml', '/test-array-in-path/{names}', 'get')
+    assert RequestGenerator(operation, '/v1.0').generate().url == '/v1.0/test-array-in-path/string'
+
+    operation = get_operation('simple', 'openapi.yaml', '/test_required_query_param', 'get')
+    template = RequestGenerator(operation, '/v1.0').generate()
+    assert template.name == 'GET /test_required_query_param'
+    assert template.url == '/v1.0/test_required_query_param?n=0.0'
+    assert template.body == b''
+
+    operation = get_operation('simple', 'openapi.yaml', '/exploded-deep-object-param', 'get')
+    template = RequestGenerator(operation, '').generate()
+    assert template.url == ('/exploded-deep-object-param?id%5Bfoo%5D=string&id%5Bfooint%5D=0'
+                            '&id%5Bfooboo%5D=true&id%5Bfoo4%5D=blubb')
+
+
+def test_generate_openapi_body():
+    operation = get_operation('json_validation', 'openapi.yaml', '/user', 'post')
+    template = RequestGenerator(operation, '/v1.0').generate()
+    assert template.method == 'POST'
+    assert template.headers == {'Content-Type': 'application/json'}
+    assert json.loads(template.body.decode()) == {'name': 'string', 'password': 'string'}
+
+    operation = get_operation('simple', 'openapi.yaml', '/test_array_pipes_form_param', 'post')
+    template = RequestGenerator(operation, '/v1.0').generate()
+    assert template.headers == {'Content-Type': 'application/x-www-form-urlencoded'}
+    assert template.body == b'items=0'
+
+
+def test_generate_swagger_parameters():
+    operation = get_operation('simple', 'swagger.yaml', '/test_array_multi_query_param', 'get')
+    assert RequestGenerator(operation, '/v1.0').generate().url == '/v1.0/test_array_multi_query_param'
+    # optional parameters are sent if they have an example
+    operation.parameters[0]['x-example'] = ['squash', 'banana']
+    template = RequestGenerator(operation, '/v1.0').generate()
+    assert template.url == '/v1.0/test_array_multi_query_param?items=squash&items=banana'
+
+    operation = get_operation('simple', 'swagger.yaml', '/test-formData-param', 'post')
+    template = RequestGenerator(operation, '/v1.0').generate()
+    assert template.headers == {'Content-Type': 'application/x-www-form-urlencoded'}
+    assert template.body == b'formData=string'
+
+
+def test_generate_requests_patterns():
+    app = App(__name__, specification_dir=FIXTURES_FOLDER / 'simple')
+    api = app.add_api('openapi.yaml', arguments={'title': 'Bench'})
+    templates = generate_requests(api, ['fakeapi.hello.get_bye', 'POST /greeting/*'])
+    assert sorted(template.name for template in templates) == \
+        ['GET /bye/{name}', 'POST /greeting/{name}', 'POST /greeting/{name}/{remainder}']
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) == 0.0
+
+
+def test_bench_flask():
+    app = App(__name__, specification_dir=FIXTURES_FOLDER / 'simple')
+    api = app.add_api('openapi.yaml', arguments={'title': 'Bench'})
+    templates = generate_requests(api, ['GET /bye/*', 'GET /test_apikey_query_parameter_validation'])
+
+    report = bench(app, 'flask', templates, total=20, concurrency=3, profile=True, top=3)
+    assert report['requests'] == 20
+    assert report['throughput'] > 0
+    bye = report['operations']['GET /bye/{name}']
+    assert bye['requests'] == 10
+    assert bye['statuses'] == {'200': 10}
+    assert bye['p50'] <= bye['p95'] <= bye['p99'] <= bye['max']
+    assert report['operations']['GET /test_apikey_query_parameter_validation']['statuses'] == {'401': 10}
+    assert len(report['profile']['cpu']) == 3
+    assert report['profile']['peak_memory'] > 0
+
+    text = format_report(report)
+    assert 'GET /bye/{name}' in text
+    assert '20 requests in' in text
+    assert 'Top CPU time' in text
+
+
+def test_bench_aiohttp(aiohttp_api_spec_dir):
+    app = AioHttpApp(__name__, specification_dir=aiohttp_api_spec_dir)
+    api = app.add_api('swagger_simple.yaml')
+    templates = generate_requests(api, ['GET /bye/*', 'GET /aiohttp_query_parsing_array'])
+
+    report = bench(app, 'aiohttp', templates, total=10, concurrency=2)
+    assert report['requests'] == 10
+    assert report['operations']['GET /bye/{name}']['statuses'] == {'200': 5}
+    assert report['operations']['GET /aiohttp_query_parsing_array']['statuses'] == {'200': 5}
+    assert 'profile' not in report
+
+
+@pytest.mark.parametrize('spec_file', ['openapi.yaml', 'swagger.yaml'])
+def test_generated_requests_are_valid(spec_file):
+    app = App(__name__, specification_dir=FIXTURES_FOLDER / 'json_validation')
+    api = app.add_api(spec_file, arguments={'title': 'Bench'}, resolver=MockResolver(mock_all=True))
+    templates = generate_requests(api, ['POST /user'])
+    report = bench(app, 'flask', templates, total=2, concurrency=1, warmup=0)
+    assert report['operations']['POST /user']['statuses'] == {'200': 2}
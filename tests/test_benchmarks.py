@@ -0,0 +1,157 @@
+import asyncio
+import json
+import logging
+
+import pytest
+from benchmarks import memory, overload, runner, stats, validators
+from benchmarks.__main__ import main
+from click.testing import CliRunner
+
+
+def test_rank_ties():
+    assert stats.rank([3.0, 1.0, 3.0, 2.0]) == [3.5, 1.0, 3.5, 2.0]
+
+
+def test_mann_whitney_u():
+    u, p_value = stats.mann_whitney_u([1, 2, 3, 4, 5, 6, 7, 8], [9, 10, 11, 12, 13, 14, 15, 16])
+    assert u == 0
+    assert p_value == pytest.approx(0.00092, abs=1e-4)
+
+    u, p_value = stats.mann_whitney_u([1, 3, 5, 7, 9, 11, 13, 15], [2, 4, 6, 8, 10, 12, 14, 16])
+    assert u == 28
+    assert p_value > 0.5
+
+    assert stats.mann_whitney_u([1, 1, 1], [1, 1, 1]) == (4.5, 1.0)
+
+
+def test_compare_samples():
+    base = [1.0 + i / 100 for i in range(20)]
+    slower = [2.0 + i / 100 for i in range(20)]
+    assert stats.compare_samples(base, slower)['verdict'] == stats.SLOWER
+    assert stats.compare_samples(slower, base)['verdict'] == stats.FASTER
+    assert stats.compare_samples(base, list(reversed(base)))['verdict'] == stats.NOT_SIGNIFICANT
+    assert stats.compare_samples(base, slower)['ratio'] == pytest.approx(2.095 / 1.095)
+
+
+def test_get_benchmarks():
+    names = [bench.name for bench in runner.get_benchmarks()]
+    for name in ('parameter_validator.query', 'request_body_validator.object', 'uri_parser.resolve_query',
+                 'parameter_to_arg.query', 'jsonifier.dumps_small', 'specification.load_openapi',
+                 'flask.post_json_body', 'aiohttp.get_path_param'):
+        assert name in names
+    assert [bench.name for bench in runner.get_benchmarks(['jsonifier.*'])] == \
+        ['jsonifier.dumps_list', 'jsonifier.dumps_small']
+
+
+def test_run_benchmarks():
+    # every benchmark must set up and run, the timings are not relevant here
+    benchmarks = [bench for bench in runner.get_benchmarks() if not bench.name.startswith('specification.')]
+    results = runner.run(benchmarks, samples=2, warmups=0, loops=1)
+    assert set(results['benchmarks']) == {bench.name for bench in benchmarks}
+    for result in results['benchmarks'].values():
+        assert result['loops'] == 1
+        assert len(result['samples']) == 2
+        assert result['min'] <= result['median'] <= result['max']
+
+
+def test_run_benchmark_loop_factory():
+    loops = []
+
+    def loop_factory():
+        loop = asyncio.new_event_loop()
+        loops.append(loop)
+        return loop
+
+    async def fixtures():
+        async def call():
+            assert asyncio.get_event_loop() is loops[0]
+        yield call
+
+    result = runner.run_benchmark(runner.Benchmark('async', fixtures, loop_factory), samples=2, warmups=0, loops=1)
+    assert len(result['samples']) == 2
+    assert len(loops) == 1
+    assert loops[0].is_closed()
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('framework', ['flask', 'aiohttp'])
+def test_overload_simulation(framework, caplog):
+    # the debug logs of every request would make the CPU the bottleneck
+    caplog.set_level(logging.INFO)
+    # the clients time out with every request in flight, the limiter sheds the excess load
+    unlimited = overload.simulate(framework, 'none', duration=0.5)
+    limited = overload.simulate(framework, 'gradient', duration=0.5)
+    assert unlimited['late'] > unlimited['good']
+    assert unlimited['rejected'] == 0
+    assert limited['rejected'] > 0
+    assert limited['goodput'] > 2 * unlimited['goodput']
+
+
+def test_cli_overload():
+    result = CliRunner().invoke(main, ['overload', '-f', 'flask', '-l', 'aimd', '--duration', '0.2'])
+    assert result.exit_code == 0, result.output
+    assert 'flask    aimd' in result.output
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('framework', ['flask', 'aiohttp'])
+def test_memory(framework):
+    buffered = memory.run(framework, size=10, buffered=True)
+    chunked = memory.run(framework, size=10, buffered=False)
+    assert chunked['size'] == buffered['size'] > 5 * 10 ** 6
+    # the buffered body is held at least twice: as a string and as bytes
+    assert buffered['peak_rss'] > 2 * buffered['size'] * 0.9
+    assert chunked['peak_rss'] < buffered['size'] / 2
+
+
+@pytest.mark.slow
+def test_cli_memory():
+    result = CliRunner().invoke(main, ['memory', '-f', 'aiohttp', '--size', '1'])
+    assert result.exit_code == 0, result.output
+    assert 'aiohttp  buffered' in result.output
+    assert 'aiohttp  chunked' in result.output
+
+
+def test_validators():
+    result = validators.run(operations=5)
+    # a request and a response validator per operation, or one per schema
+    assert result['unshared']['validators'] == 10
+    assert result['shared']['validators'] == 2
+    assert result['shared']['memory'] < result['unshared']['memory']
+
+
+def test_cli_validators():
+    result = CliRunner().invoke(main, ['validators', '--operations', '3'])
+    assert result.exit_code == 0, result.output
+    assert 'unshared       6 validators' in result.output
+    assert 'shared         2 validators' in result.output
+
+
+def test_cli_run_and_compare(tmp_path):
+    cli = CliRunner()
+    base = str(tmp_path / 'base.json')
+    head = str(tmp_path / 'head.json')
+    for path in (base, head):
+        result = cli.invoke(main, ['run', 'jsonifier.dumps_small', '-n', '5', '--loops', '10', '-o', path])
+        assert result.exit_code == 0, result.output
+        assert 'jsonifier.dumps_small' in result.output
+
+    with open(base) as results_file:
+        results = json.load(results_file)
+    assert results['version'] == runner.RESULTS_VERSION
+    assert len(results['benchmarks']['jsonifier.dumps_small']['samples']) == 5
+
+    result = cli.invoke(main, ['compare', base, head])
+    assert result.exit_code == 0, result.output
+    assert 'jsonifier.dumps_small' in result.output
+
+    # a significant regression fails the comparison
+    results['benchmarks']['jsonifier.dumps_small']['samples'] = [1e-9] * 5
+    with open(base, 'w') as results_file:
+        json.dump(results, results_file)
+    result = cli.invoke(main, ['compare', base, head, '--fail-above', '1.1'])
+    assert result.exit_code == 1
+    assert 'slower' in result.output
+
+    result = cli.invoke(main, ['run', 'no-such-benchmark'])
+    assert result.exit_code != 0
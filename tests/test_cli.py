@@ -1,3 +1,4 @@
+import json
 import logging
 
 import pytest
@@ -309,3 +310,80 @@ def test_run_with_incompatible_server_and_framework(mock_app_run, spec_file):
                            catch_exceptions=False)
     assert "Invalid server 'flask' for app-framework 'aiohttp'" in result.output
     assert result.exit_code == 2
+
+
+def test_bench(spec_file, tmp_path):
+    output = str(tmp_path / 'report.json')
+    runner = CliRunner()
+    result = runner.invoke(main, ['bench', spec_file, '--mock=all', '-n', '6', '-c', '2',
+                                  '-o', 'GET /bye/*', '-o', 'fakeapi.hello.get_list',
+                                  '--header', 'X-Test: yes', '--output', output],
+                           catch_exceptions=False)
+    assert result.exit_code == 0, result.output
+    assert 'GET /bye/{name}' in result.output
+    assert '6 requests in' in result.output
+
+    with open(output) as report_file:
+        report = json.load(report_file)
+    assert sorted(report['operations']) == ['GET /bye/{name}', 'GET /list/{name}']
+    assert report['operations']['GET /list/{name}']['requests'] == 3
+
+
+def test_bench_invalid_options(spec_file):
+    runner = CliRunner()
+    result = runner.invoke(main, ['bench', spec_file, '--header', 'no-colon'])
+    assert result.exit_code == 2
+    assert "'no-colon' is not a 'Name: value' header" in result.output
+
+    result = runner.invoke(main, ['bench', spec_file, '--mock=all', '-o', 'no_such_operation'])
+    assert result.exit_code == 2
+    assert 'No operation to benchmark' in result.output
+
+
+def test_run_using_option_mock_prefer(mock_app_run, spec_file):
+    runner = CliRunner()
+    runner.invoke(main, ['run', spec_file, '--mock', 'all', '--mock-prefer'], catch_exceptions=False)
+
+    resolver = mock_app_run().add_api.call_args[1]['resolver']
+    assert resolver.mock_all
+    assert resolver.prefer
+
+
+def test_run_using_option_workers(mock_app_run, spec_file):
+    runner = CliRunner()
+    runner.invoke(main, ['run', spec_file, '--workers', '4'], catch_exceptions=False)
+
+    app_instance = mock_app_run()
+    app_instance.run.assert_called_with(
+        port=5000,
+        host=None,
+        server='flask',
+        debug=False,
+        workers=4)
+
+
+def test_run_using_aiohttp_server_options(mock_app_run, spec_file):
+    runner = CliRunner()
+    result = runner.invoke(main, ['run', spec_file, '-f', 'aiohttp', '--uvloop', '--backlog', '1024',
+                                  '--keepalive-timeout', '0', '--shutdown-timeout', '5', '--access-log'],
+                           catch_exceptions=False)
+    assert result.exit_code == 0, result.output
+
+    app_instance = mock_app_run()
+    app_instance.run.assert_called_with(
+        port=5000,
+        host=None,
+        server='aiohttp',
+        debug=False,
+        use_uvloop=True,
+        backlog=1024,
+        keepalive_timeout=0.0,
+        shutdown_timeout=5.0,
+        use_default_access_log=True)
+
+
+def test_run_aiohttp_server_options_with_flask(mock_app_run, spec_file):
+    runner = CliRunner()
+    result = runner.invoke(main, ['run', spec_file, '--uvloop'], catch_exceptions=False)
+    assert result.exit_code == 2
+    assert 'can only be used with the aiohttp app-framework' in result.output
@@ -6,7 +6,8 @@ from jsonschema.validators import _utils, extend
 from conftest import build_app_from_fixture
 from connexion import App
 from connexion.decorators.validation import RequestBodyValidator
-from connexion.json_schema import Draft4RequestValidator
+from connexion.json_schema import (Draft4RequestValidator,
+                                   Draft4ResponseValidator, ValidatorRegistry)
 
 SPECS = ["swagger.yaml", "openapi.yaml"]
 
@@ -35,10 +36,10 @@ def test_validator_map(json_validation_spec_dir, spec):
     app.add_api(spec, validate_responses=True, validator_map=validator_map)
     app_client = app.app.test_client()
 
-    res = app_client.post('/v1.0/minlength', data=json.dumps({'foo': 'bar'}), content_type='application/json') # type: flask.Response
+    res = app_client.post('/v1.0/minlength', data=json.dumps({'foo': 'bar'}), content_type='application/json')  # type: flask.Response
     assert res.status_code == 200
 
-    res = app_client.post('/v1.0/minlength', data=json.dumps({'foo': ''}), content_type='application/json') # type: flask.Response
+    res = app_client.post('/v1.0/minlength', data=json.dumps({'foo': ''}), content_type='application/json')  # type: flask.Response
     assert res.status_code == 400
 
 
@@ -86,3 +87,42 @@ def test_multipart_form_json(json_validation_spec_dir, spec):
     assert res.status_code == 200
     assert json.loads(res.data.decode())['name'] == "joe-reply"
     assert json.loads(res.data.decode())['age'] == 30
+
+
+def test_validator_registry(monkeypatch):
+    registry = ValidatorRegistry()
+    components = {'schemas': {'Name': {'type': 'string'}}}
+    schema = {'type': 'object', 'properties': {'name': {'type': 'string'}}, 'components': components}
+
+    validator = registry.get(schema, Draft4RequestValidator)
+    # an equal copy
+    assert registry.get(dict(schema, properties={'name': {'type': 'string'}}), Draft4RequestValidator) is validator
+    # other definitions, class or structure
+    assert registry.get(dict(schema, components=dict(components)), Draft4RequestValidator) is not validator
+    assert registry.get(schema, Draft4ResponseValidator) is not validator
+    assert registry.get(dict(schema, type='array'), Draft4RequestValidator) is not validator
+    assert len(registry) == 4
+
+    circular = {'type': 'object'}
+    circular['properties'] = {'child': circular}
+    assert registry.get(circular, Draft4RequestValidator) is registry.get(circular, Draft4RequestValidator)
+    assert registry.get(dict(circular), Draft4RequestValidator) is not registry.get(circular, Draft4RequestValidator)
+    assert len(registry) == 6
+
+    monkeypatch.setattr(ValidatorRegistry, 'shared', False)
+    assert registry.get(schema, Draft4RequestValidator) is not validator
+    assert len(registry) == 7
+
+
+@pytest.mark.parametrize("spec", SPECS)
+def test_shared_validators(json_validation_spec_dir, spec):
+    app = App(__name__, specification_dir=json_validation_spec_dir)
+    registry = app.add_api(spec, validate_responses=True).validator_registry
+    app_client = app.app.test_client()
+
+    assert app_client.get('/v1.0/user').status_code == 200
+    count = len(registry)
+    # the response of the same schema is validated by the same validator
+    res = app_client.post('/v1.0/user', data=json.dumps({'name': 'max', 'password': '1234'}), content_type='application/json') # type: flask.Response
+    assert res.status_code == 200
+    assert len(registry) == count
@@ -0,0 +1,180 @@
+import asyncio
+import io
+import json
+import time
+
+import pytest
+from connexion import AioHttpApp, App
+from connexion.exceptions import BadRequestProblem, PayloadTooLargeProblem
+from connexion.limits import check_json
+
+
+def limits_spec(operation_id, default_operation_id=None):
+    def operation(operation_id, **extensions):
+        return dict({
+            'operationId': operation_id,
+            'requestBody': {'content': {'application/json': {'schema': {}}}},
+            'responses': {'200': {'description': 'The body'}}
+        }, **extensions)
+
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': 'Limits', 'version': '1.0'},
+        'paths': {
+            '/small': {'post': operation(operation_id, **{'x-max-body-size': 100})},
+            '/default': {'post': operation(default_operation_id or operation_id)},
+        }
+    }
+
+
+OPTIONS = {'max_body_size': 1000, 'max_json_depth': 3, 'max_json_items': 10}
+
+
+@pytest.mark.parametrize('body, error', [
+    (b'{"a": [1, {"b": 2}], "c": "[[[[,,,,,,,,,,,]"}', None),
+    (b'[[[]]]', None),
+    (b'[[[[]]]]', BadRequestProblem),
+    (b'{"a": {"b": {"c": {}}}}', BadRequestProblem),
+    (b'[1, 2, 3, 4, 5, 6, 7, 8, 9, 10]', None),
+    (b'[1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]', PayloadTooLargeProblem),
+    (b'[[1, 2, 3, 4, 5], [6, 7, 8]]', None),
+    (b'[[1, 2, 3, 4, 5], [6, 7, 8, 9]]', PayloadTooLargeProblem),
+    ('["\\"", "\\u00e9"]', None),
+    (b'', None),
+])
+def test_check_json(body, error):
+    if error is None:
+        check_json(body, max_depth=3, max_items=10)
+    else:
+        with pytest.raises(error):
+            check_json(body, max_depth=3, max_items=10)
+
+
+def test_check_json_costs_less_than_parsing():
+    def best_time(func, body):
+        times = []
+        for _ in range(3):
+            start = time.perf_counter()
+            try:
+                func(body)
+            except (BadRequestProblem, PayloadTooLargeProblem, RecursionError):
+                pass
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    def check_json_limits(body):
+        check_json(body, max_depth=64, max_items=10 ** 7)
+
+    objects = [{'id': i, 'name': 'item [{},', 'tags': ['a', 'b"c'], 'value': {'v': [1, 2, 3]}}
+               for i in range(20000)]
+    body = json.dumps(objects).encode()
+    size = len(body) // 2
+    chains = b'[' + b'[[[[[]]]]],' * (size // 5) + b'[]]'
+    strings = json.dumps(['a\\"[{,' * 10] * (size // 50)).encode()
+    for large in (body, chains, strings):
+        assert best_time(check_json_limits, large) < best_time(json.loads, large)
+    # the parser gives up at once on this one
+    assert best_time(check_json_limits, b'[' * size + b']' * size) < best_time(json.loads, body)
+
+
+def test_flask_body_limits():
+    app = App(__name__)
+    app.add_api(limits_spec('fakeapi.hello.forward', 'fakeapi.hello.test_nested_additional_properties'),
+                options=OPTIONS)
+    app_client = app.app.test_client()
+
+    response = app_client.post('/small', json={'name': 'x' * 50})
+    assert response.status_code == 200
+    assert json.loads(response.data.decode()) == {'name': 'x' * 50}
+
+    response = app_client.post('/small', json={'name': 'x' * 100})
+    assert response.status_code == 413
+    assert json.loads(response.data.decode())['detail'] == 'The request body is larger than 100 bytes'
+
+    # without Content-Length, the limit is enforced while the body is read
+    response = app_client.post('/small', input_stream=io.BytesIO(json.dumps({'name': 'x' * 100}).encode()),
+                               content_type='application/json', environ_overrides={'wsgi.input_terminated': True})
+    assert response.status_code == 413
+
+    assert app_client.post('/default', json={'name': 'x' * 500}).status_code == 200
+    assert app_client.post('/default', json={'name': 'x' * 1000}).status_code == 413
+
+    response = app_client.post('/default', json=[[[[1]]]])
+    assert response.status_code == 400
+    assert json.loads(response.data.decode())['detail'] == 'The JSON body is nested deeper than 3 levels'
+    assert app_client.post('/default', json=list(range(11))).status_code == 413
+
+
+async def test_aiohttp_body_limits(aiohttp_client):
+    app = AioHttpApp(__name__)
+    app.add_api(limits_spec('fakeapi.aiohttp_handlers.aiohttp_forward'), base_path='/v1', options=OPTIONS)
+    app_client = await aiohttp_client(app.app)
+
+    response = await app_client.post('/v1/small', json={'name': 'x' * 50})
+    assert response.status == 200
+    assert await response.json() == {'name': 'x' * 50}
+
+    response = await app_client.post('/v1/small', json={'name': 'x' * 100})
+    assert response.status == 413
+    assert (await response.json())['detail'] == 'The request body is larger than 100 bytes'
+
+    assert (await app_client.post('/v1/default', json={'name': 'x' * 500})).status == 200
+    assert (await app_client.post('/v1/default', json={'name': 'x' * 1000})).status == 413
+
+    response = await app_client.post('/v1/default', json=[[[[1]]]])
+    assert response.status == 400
+    assert (await app_client.post('/v1/default', json=list(range(11)))).status == 413
+
+    # without Content-Length, the limit is enforced while the body is read. The test client waits
+    # to send the whole body before reading the response, the request is sent by hand
+    reader, writer = await asyncio.open_connection(app_client.server.host, app_client.server.port)
+    writer.write(b'POST /v1/small HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+                 b'Transfer-Encoding: chunked\r\n\r\n')
+    for _ in range(3):
+        writer.write(b'40\r\n' + b' ' * 64 + b'\r\n')
+    status_line = await asyncio.wait_for(reader.readline(), 5)
+    writer.close()
+    assert status_line.startswith(b'HTTP/1.1 413')
+
+
+async def test_aiohttp_form_body_limits(aiohttp_client):
+    spec = limits_spec('fakeapi.aiohttp_handlers.aiohttp_forward')
+    spec['paths']['/form'] = {'post': {
+        'operationId': 'fakeapi.aiohttp_handlers.aiohttp_post_form',
+        'x-max-body-size': 100,
+        'requestBody': {'content': {'application/x-www-form-urlencoded': {'schema': {
+            'type': 'object', 'properties': {'name': {'type': 'string'}}
+        }}}},
+        'responses': {'200': {'description': 'The form'}}
+    }}
+    app = AioHttpApp(__name__)
+    app.add_api(spec, base_path='/v1', options=OPTIONS)
+    app_client = await aiohttp_client(app.app)
+
+    response = await app_client.post('/v1/form', data={'name': 'x' * 50})
+    assert response.status == 200
+    assert await response.json() == {'name': 'x' * 50}
+    assert (await app_client.post('/v1/form', data={'name': 'x' * 100})).status == 413
+
+    # the chunked forms are refused as soon as they are larger than the limit
+    reader, writer = await asyncio.open_connection(app_client.server.host, app_client.server.port)
+    writer.write(b'POST /v1/form HTTP/1.1\r\nHost: localhost\r\n'
+                 b'Content-Type: application/x-www-form-urlencoded\r\nTransfer-Encoding: chunked\r\n\r\n')
+    writer.write(b'5\r\nname=\r\n')
+    for _ in range(3):
+        writer.write(b'40\r\n' + b'x' * 64 + b'\r\n')
+    status_line = await asyncio.wait_for(reader.readline(), 5)
+    writer.close()
+    assert status_line.startswith(b'HTTP/1.1 413')
+
+
+async def test_aiohttp_body_limit_beyond_client_max_size(aiohttp_client):
+    app = AioHttpApp(__name__)
+    app.add_api(limits_spec('fakeapi.aiohttp_handlers.aiohttp_forward'), base_path='/v1',
+                options={'max_body_size': 3 * 1024 ** 2})
+    app_client = await aiohttp_client(app.app)
+
+    # the limit of the operations replaces the 1 MiB client_max_size of aiohttp
+    response = await app_client.post('/v1/default', json={'name': 'x' * (2 * 1024 ** 2)})
+    assert response.status == 200
+    assert len((await response.json())['name']) == 2 * 1024 ** 2
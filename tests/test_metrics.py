@@ -1,4 +1,7 @@
 import json
+import subprocess
+import sys
+from types import SimpleNamespace
 
 import flask
 import pytest
@@ -6,7 +9,9 @@ from unittest.mock import MagicMock
 
 import connexion
 from connexion.exceptions import ProblemException
-from connexion.decorators.metrics import UWSGIMetricsCollector
+from connexion.decorators.metrics import MetricsCollector, UWSGIMetricsCollector
+from connexion.metrics import MetricsRegistry, MultiProcessMetricsRegistry
+from connexion.options import ConnexionOptions
 
 
 def test_timer(monkeypatch):
@@ -24,3 +29,138 @@ def test_timer(monkeypatch):
         op(MagicMock())
     assert metrics.timer.call_args[0][:2] == ('connexion.response',
                                               '418.GET.foo.bar.{param}')
+
+
+def test_metrics_collector():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    collector = MetricsCollector(registry, '/v1.0/foo/{param}', 'get')
+
+    op = collector(lambda: MagicMock(status_code=201))
+    op()
+    op()
+
+    def failing_operation():
+        raise ProblemException(418, '', '')
+
+    with pytest.raises(ProblemException):
+        collector(failing_operation)()
+
+    series = registry.collect()['requests']
+    assert sum(series[('GET', '/v1.0/foo/{param}', '201')][:-1]) == 2
+    assert sum(series[('GET', '/v1.0/foo/{param}', '418')][:-1]) == 1
+
+
+def test_registry_render():
+    registry = MetricsRegistry(buckets=(0.1, 1.0), prefix='test')
+    metrics = registry.operation('get', '/foo/"{bar}"')
+    metrics.observe(200, 0.05)
+    metrics.observe(200, 0.5)
+    metrics.observe(200, 5)
+    metrics.observe(404, 0.1)
+
+    lines = registry.render().splitlines()
+    assert lines[:4] == ['# HELP test_requests_total Total number of requests.',
+                         '# TYPE test_requests_total counter',
+                         'test_requests_total{method="GET",path="/foo/\\"{bar}\\"",status="200"} 3',
+                         'test_requests_total{method="GET",path="/foo/\\"{bar}\\"",status="404"} 1']
+    labels = 'method="GET",path="/foo/\\"{bar}\\"",status="200"'
+    assert 'test_request_duration_seconds_bucket{%s,le="0.1"} 1' % labels in lines
+    assert 'test_request_duration_seconds_bucket{%s,le="1.0"} 2' % labels in lines
+    assert 'test_request_duration_seconds_bucket{%s,le="+Inf"} 3' % labels in lines
+    assert 'test_request_duration_seconds_sum{%s} 5.55' % labels in lines
+    assert 'test_request_duration_seconds_count{%s} 3' % labels in lines
+    # the bucket bounds are inclusive
+    assert ('test_request_duration_seconds_bucket{method="GET",path="/foo/\\"{bar}\\"",status="404",le="0.1"} 1'
+            in lines)
+
+
+def test_multi_process_registry(tmp_path):
+    worker1 = MultiProcessMetricsRegistry(str(tmp_path), flush_interval=60)
+    worker2 = MultiProcessMetricsRegistry(str(tmp_path), flush_interval=60)
+    worker2.path = str(tmp_path / 'metrics-other.json')  # pretend to be another process
+
+    worker1.operation('get', '/foo').observe(200, 0.01)
+    worker2.operation('get', '/foo').observe(200, 0.01)
+    worker2.operation('get', '/bar').observe(500, 0.01)
+    worker2.flush()
+
+    series = worker1.collect_all()['requests']
+    assert sum(series[('GET', '/foo', '200')][:-1]) == 2
+    assert sum(series[('GET', '/bar', '500')][:-1]) == 1
+    assert 'connexion_requests_total{method="GET",path="/foo",status="200"} 2' in worker1.render()
+
+
+def test_multi_process_registry_exited_worker(tmp_path):
+    exited = subprocess.Popen([sys.executable, '-c', ''])
+    exited.wait()
+    worker1 = MultiProcessMetricsRegistry(str(tmp_path), flush_interval=60)
+    worker2 = MultiProcessMetricsRegistry(str(tmp_path), flush_interval=60)
+    worker2.path = str(tmp_path / 'metrics-{}.json'.format(exited.pid))  # pretend to have exited
+
+    for worker in (worker1, worker2):
+        worker.operation('get', '/foo').observe(200, 0.01)
+        worker.register_limiter('get', '/foo', SimpleNamespace(in_flight=2, queued=1, rejected=5, limit=4))
+    worker2.flush()
+
+    collected = worker1.collect_all()
+    assert sum(collected['requests'][('GET', '/foo', '200')][:-1]) == 2
+    # the rejected requests are counters, the other values are gauges
+    assert collected['limits'][('GET', '/foo')] == [2, 1, 10, 4]
+
+
+def test_flask_app_metrics(simple_api_spec_dir):
+    registry = MetricsRegistry()
+    app = connexion.FlaskApp(__name__, specification_dir=simple_api_spec_dir)
+    app.add_api('openapi.yaml', options={'metrics': registry})
+    app_client = app.app.test_client()
+
+    assert app_client.get('/v1.0/bye/jsantos').status_code == 200
+    assert app_client.get('/v1.0/bye/jsantos').status_code == 200
+
+    response = app_client.get('/v1.0/metrics')  # type: flask.Response
+    assert response.status_code == 200
+    assert response.content_type == 'text/plain; version=0.0.4; charset=utf-8'
+    assert (b'connexion_requests_total{method="GET",path="/v1.0/bye/{name}",status="200"} 2'
+            in response.data)
+
+
+def test_flask_app_metrics_without_endpoint(simple_api_spec_dir):
+    app = connexion.FlaskApp(__name__, specification_dir=simple_api_spec_dir)
+    app.add_api('openapi.yaml', options={'metrics': MetricsRegistry(), 'metrics_path': False})
+    assert app.app.test_client().get('/v1.0/metrics').status_code == 404
+
+
+def test_metrics_option(monkeypatch, tmp_path):
+    monkeypatch.setattr('connexion.metrics._default_registry', None)
+    assert isinstance(ConnexionOptions({'metrics': True}).metrics, MetricsRegistry)
+    assert ConnexionOptions({'metrics': True}).metrics is ConnexionOptions({'metrics': True}).metrics
+    assert ConnexionOptions({}).metrics is None
+
+    monkeypatch.setattr('connexion.metrics._default_registry', None)
+    monkeypatch.setenv('CONNEXION_METRICS_DIR', str(tmp_path))
+    assert isinstance(ConnexionOptions({'metrics': True}).metrics, MultiProcessMetricsRegistry)
+
+
+def test_flask_app_server_timing(simple_api_spec_dir):
+    registry = MetricsRegistry()
+    app = connexion.FlaskApp(__name__, specification_dir=simple_api_spec_dir)
+    app.add_api('openapi.yaml', validate_responses=True,
+                options={'metrics': registry, 'server_timing': True})
+    app_client = app.app.test_client()
+
+    response = app_client.post('/v1.0/greeting/jsantos')  # type: flask.Response
+    assert response.status_code == 200
+    stages = [metric.split(';')[0] for metric in response.headers['Server-Timing'].split(', ')]
+    assert stages == ['request', 'uri_parsing', 'parameter_validation', 'response_validation', 'handler', 'response']
+
+    text = app_client.get('/v1.0/metrics').data.decode()
+    assert ('connexion_request_stage_duration_seconds_count'
+            '{method="POST",path="/v1.0/greeting/{name}",stage="handler"} 1') in text
+
+
+def test_flask_app_stage_timings_disabled(simple_api_spec_dir):
+    app = connexion.FlaskApp(__name__, specification_dir=simple_api_spec_dir)
+    app.add_api('openapi.yaml')
+    response = app.app.test_client().post('/v1.0/greeting/jsantos')  # type: flask.Response
+    assert response.status_code == 200
+    assert 'Server-Timing' not in response.headers
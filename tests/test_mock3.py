@@ -1,3 +1,8 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from connexion import AioHttpApp, App
 from connexion.mock import MockResolver
 from connexion.operations import OpenAPIOperation
 
@@ -178,3 +183,83 @@ def test_mock_resolver_notimplemented():
     )
     # check if it is using the mock function
     assert operation._resolution.function() == ('No example response was defined.', 418)
+
+
+PETS_SPEC = {
+    'openapi': '3.0.0',
+    'info': {'title': 'Pets', 'version': '1.0'},
+    'paths': {
+        '/pets/{pet_id}': {
+            'get': {
+                'parameters': [{'name': 'pet_id', 'in': 'path', 'required': True, 'schema': {'type': 'integer'}}],
+                'responses': {
+                    '200': {
+                        'description': 'A pet',
+                        'headers': {'ETag': {'schema': {'type': 'string'}, 'example': 'v1'}},
+                        'content': {
+                            'application/json': {
+                                'examples': {
+                                    'dog': {'value': {'name': 'Rex'}},
+                                    'cat': {'value': {'name': 'Tom'}},
+                                }
+                            }
+                        }
+                    },
+                    '404': {
+                        'description': 'No pet',
+                        'content': {'application/json': {'example': {'detail': 'Not found'}}}
+                    }
+                }
+            }
+        }
+    }
+}
+
+
+def test_mock_responses_are_rendered_once():
+    resolver = MockResolver(mock_all=True)
+    app = App(__name__)
+    app.add_api(PETS_SPEC, resolver=resolver)
+    app_client = app.app.test_client()
+
+    example_response = MagicMock(side_effect=AssertionError('examples are rendered when the API is added'))
+    with patch('connexion.operations.OpenAPIOperation.example_response', example_response):
+        for _ in range(2):
+            response = app_client.get('/pets/1', headers={'Prefer': 'code=404'})
+            assert response.status_code == 200
+            assert json.loads(response.data.decode()) == {'name': 'Rex'}
+            assert response.headers['ETag'] == 'v1'
+
+
+@pytest.mark.parametrize('prefer, status_code, body', [
+    (None, 200, {'name': 'Rex'}),
+    ('code=404', 404, {'detail': 'Not found'}),
+    ('example=cat', 200, {'name': 'Tom'}),
+    ('code=200, example="cat"', 200, {'name': 'Tom'}),
+    ('code=200; example=unknown', 200, {'name': 'Rex'}),
+    ('code=500', 200, {'name': 'Rex'}),
+])
+def test_mock_responses_prefer(prefer, status_code, body):
+    app = App(__name__)
+    app.add_api(PETS_SPEC, resolver=MockResolver(mock_all=True, prefer=True))
+    app_client = app.app.test_client()
+
+    response = app_client.get('/pets/1', headers={'Prefer': prefer} if prefer else {})
+    assert response.status_code == status_code
+    assert response.content_type == 'application/json'
+    assert json.loads(response.data.decode()) == body
+
+
+async def test_mock_responses_prefer_aiohttp(aiohttp_client):
+    app = AioHttpApp(__name__)
+    app.add_api(PETS_SPEC, base_path='/v1', resolver=MockResolver(mock_all=True, prefer=True))
+    app_client = await aiohttp_client(app.app)
+
+    response = await app_client.get('/v1/pets/1', headers={'Prefer': 'example=cat'})
+    assert response.status == 200
+    assert response.headers['ETag'] == 'v1'
+    assert await response.json() == {'name': 'Tom'}
+
+    response = await app_client.get('/v1/pets/1', headers={'Prefer': 'code=404'})
+    assert response.status == 404
+    assert await response.json() == {'detail': 'Not found'}
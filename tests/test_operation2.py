@@ -267,8 +267,8 @@ def test_operation(api, monkeypatch):
 
     security_decorator = operation.security_decorator
     assert security_decorator.func is verify_security
-    assert len(security_decorator.args[0]) == 1
-    assert security_decorator.args[0][0] is dummy
+    assert len(security_decorator.args[0].auth_funcs) == 1
+    assert security_decorator.args[0].auth_funcs[0] is dummy
     assert security_decorator.args[1] == ['uid']
     call_args = verify_oauth.call_args[0]
     assert call_args[0].func is get_tokeninfo_remote
@@ -359,8 +359,8 @@ def test_operation_local_security_oauth2(api, monkeypatch):
     assert isinstance(operation.function, types.FunctionType)
     security_decorator = operation.security_decorator
     assert security_decorator.func is verify_security
-    assert len(security_decorator.args[0]) == 1
-    assert security_decorator.args[0][0] is dummy
+    assert len(security_decorator.args[0].auth_funcs) == 1
+    assert security_decorator.args[0].auth_funcs[0] is dummy
     assert security_decorator.args[1] == ['uid']
     call_args = verify_oauth.call_args[0]
     assert call_args[0] is math.ceil
@@ -397,8 +397,8 @@ def test_operation_local_security_duplicate_token_info(api, monkeypatch):
 
     security_decorator = operation.security_decorator
     assert security_decorator.func is verify_security
-    assert len(security_decorator.args[0]) == 1
-    assert security_decorator.args[0][0] is dummy
+    assert len(security_decorator.args[0].auth_funcs) == 1
+    assert security_decorator.args[0].auth_funcs[0] is dummy
     assert security_decorator.args[1] == ['uid']
     call_args = verify_oauth.call_args[0]
     assert call_args[0] is math.ceil
@@ -453,7 +453,7 @@ def test_no_token_info(api):
 
     security_decorator = operation.security_decorator
     assert security_decorator.func is verify_security
-    assert len(security_decorator.args[0]) == 0
+    assert len(security_decorator.args[0].auth_funcs) == 0
 
     assert operation.method == 'GET'
     assert operation.produces == ['application/json']
@@ -0,0 +1,134 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import pytest
+from conftest import FIXTURES_FOLDER, TEST_FOLDER
+from connexion.apps import prefork
+from connexion.apps.prefork import PreforkServer, bind_socket
+from connexion.metrics import MultiProcessMetricsRegistry
+
+SERVER_SCRIPT = '''
+import sys
+import connexion
+
+app = connexion.{app}('connexion', specification_dir=sys.argv[1])
+app.add_api('{spec}', arguments={{'title': 'Prefork'}})
+app.run(host='127.0.0.1', port=int(sys.argv[2]), workers=2)
+'''
+
+
+def test_prefork_server_restarts_crashed_workers(tmp_path):
+    starts = tmp_path / 'starts'
+    sock = bind_socket('127.0.0.1', 0)
+
+    def serve(listening_socket):
+        assert listening_socket.getsockname() == sock.getsockname()
+        with open(str(starts), 'a') as starts_file:
+            starts_file.write('{}\n'.format(os.getpid()))
+        with open(str(starts)) as starts_file:
+            started = len(starts_file.readlines())
+        if started <= 2:
+            # the first workers crash
+            raise RuntimeError('crash')
+        if started == 4:
+            # both workers were restarted
+            os.kill(os.getppid(), signal.SIGTERM)
+        time.sleep(30)
+
+    server = PreforkServer(sock, serve, workers=2, restart_delay=0.01)
+    try:
+        server.run()
+    finally:
+        sock.close()
+
+    assert server.stopping
+    assert not server._running
+    pids = starts.read_text().split()
+    assert len(pids) == 4
+    assert len(set(pids)) == 4
+
+
+def test_prefork_worker_flushes_metrics(tmp_path):
+    starts = tmp_path / 'starts'
+    registry = MultiProcessMetricsRegistry(str(tmp_path / 'metrics'), flush_interval=60)
+    sock = bind_socket('127.0.0.1', 0)
+
+    def serve(listening_socket):
+        with open(str(starts), 'a') as starts_file:
+            starts_file.write('{}\n'.format(os.getpid()))
+        with open(str(starts)) as starts_file:
+            started = len(starts_file.readlines())
+        if started == 1:
+            # the worker exits with os._exit(), without the atexit handlers
+            registry.operation('get', '/foo').observe(200, 0.01)
+            return
+        os.kill(os.getppid(), signal.SIGTERM)
+        time.sleep(30)
+
+    server = PreforkServer(sock, serve, workers=1, restart_delay=0.01)
+    try:
+        server.run()
+    finally:
+        sock.close()
+
+    assert sum(registry.collect_all()['requests'][('GET', '/foo', '200')][:-1]) == 1
+
+
+def test_prefork_server_does_not_spawn_when_stopping(monkeypatch):
+    def fork():
+        raise AssertionError('forked')
+
+    monkeypatch.setattr(os, 'fork', fork)
+    server = PreforkServer(None, None, workers=1)
+    server.stopping = True
+    assert server.spawn() is None
+    # the stop signals are delivered again
+    assert not set(signal.pthread_sigmask(signal.SIG_BLOCK, [])) & {signal.SIGINT, signal.SIGTERM}
+
+
+def test_run_backlog(monkeypatch):
+    backlogs = []
+
+    def bind_socket(host, port, backlog):
+        backlogs.append(backlog)
+        return socket.socket()
+
+    monkeypatch.setattr(prefork, 'bind_socket', bind_socket)
+    monkeypatch.setattr(PreforkServer, 'run', lambda self: None)
+    prefork.run('127.0.0.1', 0, None, 2)
+    prefork.run('127.0.0.1', 0, None, 2, backlog=100)
+    assert backlogs == [prefork.DEFAULT_BACKLOG, 100]
+
+
+@pytest.mark.parametrize('app, spec_folder, spec, path', [
+    ('FlaskApp', FIXTURES_FOLDER / 'simple', 'openapi.yaml', '/v1.0/bye/jsantos'),
+    ('AioHttpApp', FIXTURES_FOLDER / 'aiohttp', 'swagger_simple.yaml', '/v1.0/bye/jsantos'),
+])
+def test_run_workers(app, spec_folder, spec, path):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(TEST_FOLDER), str(TEST_FOLDER.parent)]))
+    script = SERVER_SCRIPT.format(app=app, spec=spec)
+    server = subprocess.Popen([sys.executable, '-c', script, str(spec_folder), str(port)], env=env)
+    try:
+        deadline = time.monotonic() + 20
+        while True:
+            try:
+                with urllib.request.urlopen('http://127.0.0.1:{}{}'.format(port, path)) as response:
+                    assert response.status == 200
+                    assert response.read() == b'Goodbye jsantos'
+                break
+            except OSError:
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise
+                time.sleep(0.1)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=20) == 0
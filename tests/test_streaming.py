@@ -0,0 +1,425 @@
+import asyncio
+import io
+import json
+
+import aiohttp
+import pytest
+from connexion import AioHttpApp, App
+from connexion.exceptions import NonConformingResponseBody, PayloadTooLargeProblem
+from connexion.jsonifier import Jsonifier
+from connexion.streaming import (CHUNK_SIZE, BufferFile, RequestStream,
+                                 check_content_length, encode_json,
+                                 encode_stream)
+
+
+def stream_spec(operation_id, max_length=None, stream=True, content_type='application/octet-stream'):
+    schema = {'type': 'string', 'format': 'binary'}
+    if max_length is not None:
+        schema['maxLength'] = max_length
+    request_body = {'content': {content_type: {'schema': schema}}}
+    if stream:
+        request_body['x-stream'] = True
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': 'Streams', 'version': '1.0'},
+        'paths': {
+            '/upload': {
+                'post': {
+                    'operationId': operation_id,
+                    'requestBody': request_body,
+                    'responses': {'200': {'description': 'Size of the body'}}
+                }
+            }
+        }
+    }
+
+
+def test_request_stream():
+    stream = RequestStream(io.BytesIO(b'x' * (CHUNK_SIZE + 10)))
+    assert stream.readable()
+    assert stream.read(10) == b'x' * 10
+    assert [len(chunk) for chunk in stream] == [CHUNK_SIZE]
+    assert stream.read() == b''
+    assert stream.bytes_read == CHUNK_SIZE + 10
+
+    stream = RequestStream(io.BytesIO(b'x' * 100), max_length=50)
+    assert stream.read(50) == b'x' * 50
+    with pytest.raises(PayloadTooLargeProblem):
+        stream.read()
+
+
+def test_check_content_length():
+    check_content_length({}, 10)
+    check_content_length({'Content-Length': '10'}, 10)
+    with pytest.raises(PayloadTooLargeProblem) as exc_info:
+        check_content_length({'Content-Length': '11'}, 10)
+    assert exc_info.value.status == 413
+
+
+def test_flask_streamed_body():
+    app = App(__name__)
+    app.add_api(stream_spec('fakeapi.hello.upload_stream', max_length=200000))
+    app_client = app.app.test_client()
+
+    response = app_client.post('/upload', data=b'x' * 150000, content_type='application/octet-stream')
+    assert response.status_code == 200
+    assert json.loads(response.data.decode()) == {'size': 150000, 'chunks': 3, 'type': 'RequestStream'}
+
+    response = app_client.post('/upload', data=b'x' * 200001, content_type='application/octet-stream')
+    assert response.status_code == 413
+    assert json.loads(response.data.decode())['title'] == 'Payload Too Large'
+
+    # without Content-Length, the limit is enforced while the body is read
+    response = app_client.post('/upload', input_stream=io.BytesIO(b'x' * 200001),
+                               content_type='application/octet-stream',
+                               environ_overrides={'wsgi.input_terminated': True})
+    assert response.status_code == 413
+
+
+def test_x_stream_is_ignored_on_json_bodies(caplog):
+    app = App(__name__)
+    app.add_api(stream_spec('fakeapi.hello.upload_stream', content_type='application/json'))
+    response = app.app.test_client().post('/upload', json='xyz')
+    assert json.loads(response.data.decode()) == {'size': 3, 'chunks': 3, 'type': 'str'}
+    # logged once, when the operation is built
+    assert caplog.text.count('Ignoring x-stream on the application/json body of POST /upload') == 1
+
+
+async def test_aiohttp_streamed_body(aiohttp_client):
+    app = AioHttpApp(__name__)
+    app.add_api(stream_spec('fakeapi.aiohttp_handlers.aiohttp_upload_stream', max_length=200000), base_path='/v1')
+    app_client = await aiohttp_client(app.app)
+
+    response = await app_client.post('/v1/upload', data=b'x' * 150000,
+                                     headers={'Content-Type': 'application/octet-stream'})
+    assert response.status == 200
+    body = await response.json()
+    assert body['size'] == 150000
+    assert body['type'] == 'AsyncRequestStream'
+
+    response = await app_client.post('/v1/upload', data=b'x' * 200001,
+                                     headers={'Content-Type': 'application/octet-stream'})
+    assert response.status == 413
+
+    # without Content-Length, the limit is enforced while the body is read. The test client waits
+    # to send the whole body before reading the response, the request is sent by hand
+    reader, writer = await asyncio.open_connection(app_client.server.host, app_client.server.port)
+    writer.write(b'POST /v1/upload HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/octet-stream\r\n'
+                 b'Transfer-Encoding: chunked\r\n\r\n')
+    for _ in range(4):
+        writer.write(b'ea60\r\n' + b'x' * 60000 + b'\r\n')
+    status_line = await asyncio.wait_for(reader.readline(), 5)
+    writer.close()
+    assert status_line.startswith(b'HTTP/1.1 413')
+
+
+async def test_aiohttp_streamed_body_beyond_client_max_size(aiohttp_client):
+    app = AioHttpApp(__name__)
+    app.add_api(stream_spec('fakeapi.aiohttp_handlers.aiohttp_upload_stream'), base_path='/v1')
+    app_client = await aiohttp_client(app.app)
+
+    # the streamed bodies are never buffered, the 1 MiB client_max_size of aiohttp doesn't apply
+    response = await app_client.post('/v1/upload', data=b'x' * (3 * 1024 ** 2),
+                                     headers={'Content-Type': 'application/octet-stream'})
+    assert response.status == 200
+    assert (await response.json())['size'] == 3 * 1024 ** 2
+
+
+def rows_spec(operation_id, mimetype='application/json'):
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': 'Streams', 'version': '1.0'},
+        'paths': {
+            '/rows': {
+                'get': {
+                    'operationId': operation_id,
+                    'parameters': [
+                        {'name': 'count', 'in': 'query', 'required': True, 'schema': {'type': 'integer'}},
+                        {'name': 'invalid', 'in': 'query', 'schema': {'type': 'integer'}},
+                    ],
+                    'responses': {'200': {'description': 'Rows', 'content': {mimetype: {'schema': {
+                        'type': 'array',
+                        'items': {'type': 'object', 'properties': {'id': {'type': 'integer'}}, 'required': ['id']}
+                    }}}}}
+                }
+            }
+        }
+    }
+
+
+def test_encode_stream():
+    jsonifier = Jsonifier(json, indent=2)
+
+    def items(count):
+        return ({'id': i} for i in range(count))
+
+    assert list(encode_stream(items(2), 'application/json', jsonifier)) == [
+        b'[{\n  "id": 0\n}', b',{\n  "id": 1\n}', b']\n']
+    assert list(encode_stream(items(0), 'application/json', jsonifier)) == [b'[]\n']
+    assert list(encode_stream(items(2), 'application/x-ndjson', jsonifier)) == [b'{"id": 0}\n', b'{"id": 1}\n']
+    assert list(encode_stream(items(0), 'application/x-ndjson', jsonifier)) == []
+    assert list(encode_stream(iter_text(), 'text/plain', jsonifier)) == [b'a', b'\xc3\xa9']
+    with pytest.raises(TypeError):
+        list(encode_stream(items(1), 'text/plain', jsonifier))
+
+
+def iter_text():
+    yield 'a'
+    yield b'\xc3\xa9'
+
+
+@pytest.mark.parametrize('mimetype, body', [
+    ('application/json', [{'id': 0}, {'id': 1}, {'id': 2}]),
+    ('application/x-ndjson', '{"id": 0}\n{"id": 1}\n{"id": 2}\n'),
+])
+def test_flask_streamed_response(mimetype, body):
+    app = App(__name__)
+    app.add_api(rows_spec('fakeapi.hello.stream_rows', mimetype), validate_responses=True)
+    app_client = app.app.test_client()
+
+    response = app_client.get('/rows?count=3')
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == mimetype
+    assert 'Content-Length' not in response.headers
+    if mimetype == 'application/json':
+        assert json.loads(response.data.decode()) == body
+    else:
+        assert response.data.decode() == body
+
+    # the response is cut short at the first invalid item
+    with pytest.raises(NonConformingResponseBody):
+        app_client.get('/rows?count=3&invalid=1').data
+
+
+@pytest.mark.parametrize('mimetype', ['application/json', 'application/x-ndjson'])
+async def test_aiohttp_streamed_response(aiohttp_client, mimetype):
+    app = AioHttpApp(__name__)
+    app.add_api(rows_spec('fakeapi.aiohttp_handlers.aiohttp_stream_rows', mimetype), base_path='/v1',
+                validate_responses=True)
+    app_client = await aiohttp_client(app.app)
+
+    response = await app_client.get('/v1/rows', params={'count': '1000'})
+    assert response.status == 200
+    assert response.headers['Transfer-Encoding'] == 'chunked'
+    assert response.content_type == mimetype
+    text = await response.text()
+    if mimetype == 'application/json':
+        rows = json.loads(text)
+    else:
+        rows = [json.loads(line) for line in text.splitlines()]
+    assert rows == [{'id': i} for i in range(1000)]
+
+    response = await app_client.get('/v1/rows', params={'count': '3', 'invalid': '1'})
+    with pytest.raises(aiohttp.ClientPayloadError):
+        await response.read()
+
+
+async def test_aiohttp_streamed_response_from_blocking_generator(aiohttp_client):
+    app = AioHttpApp(__name__)
+    app.add_api(rows_spec('fakeapi.aiohttp_handlers.aiohttp_stream_rows_blocking'), base_path='/v1')
+    app_client = await aiohttp_client(app.app)
+
+    response = await app_client.get('/v1/rows', params={'count': '100'})
+    assert response.status == 200
+    assert response.headers['Transfer-Encoding'] == 'chunked'
+    # the generator runs in the executor, not on the event loop
+    assert await response.json() == [{'id': i, 'on_loop': False} for i in range(100)]
+
+
+@pytest.mark.parametrize('data', [
+    list(range(2500)),
+    {'rows': [{'id': i, 'name': 'é'} for i in range(2500)], 'total': 2500, 'page': {'next': None}},
+    {str(i): {'values': list(range(i % 3))} for i in range(1200)},
+    {'pages': [[i] * (1001 if i < 2 else 2) for i in range(1001)]},
+])
+@pytest.mark.parametrize('kwargs', [{}, {'indent': 2}, {'sort_keys': True, 'separators': (',', ':')}])
+def test_iterencode(data, kwargs):
+    jsonifier = Jsonifier(json, **kwargs)
+    pieces = list(jsonifier.iterencode(data))
+    assert len(pieces) > 3
+    assert ''.join(pieces) == jsonifier.dumps(data)
+
+
+def test_encode_json():
+    jsonifier = Jsonifier(json)
+    rows = [{'id': i} for i in range(5000)]
+    assert encode_json(rows[:10], jsonifier, 100) == jsonifier.dumps(rows[:10])
+    assert encode_json(rows, jsonifier, 1024 ** 2) == jsonifier.dumps(rows)
+
+    chunks = list(encode_json(rows, jsonifier, 1000))
+    assert all(len(chunk) >= CHUNK_SIZE for chunk in chunks[:-1])
+    assert b''.join(chunks) == jsonifier.dumps(rows).encode()
+
+
+def test_flask_chunked_json_response(monkeypatch):
+    app = App(__name__)
+    api = app.add_api(rows_spec('fakeapi.hello.get_rows'), validate_responses=True)
+    app_client = app.app.test_client()
+    monkeypatch.setattr(type(api), 'response_buffer_size', 10000)
+
+    response = app_client.get('/rows?count=10')
+    assert int(response.headers['Content-Length']) == len(response.data)
+
+    response = app_client.get('/rows?count=5000')
+    assert 'Content-Length' not in response.headers
+    assert json.loads(response.data.decode()) == [{'id': i} for i in range(5000)]
+
+    # the chunked responses are still validated
+    assert app_client.get('/rows?count=5000&invalid=4000').status_code == 500
+
+
+async def test_aiohttp_chunked_json_response(aiohttp_client, monkeypatch):
+    app = AioHttpApp(__name__)
+    api = app.add_api(rows_spec('fakeapi.aiohttp_handlers.aiohttp_get_rows'), base_path='/v1',
+                      validate_responses=True)
+    app_client = await aiohttp_client(app.app)
+    monkeypatch.setattr(type(api), 'response_buffer_size', 10000)
+
+    response = await app_client.get('/v1/rows', params={'count': '10'})
+    assert 'Content-Length' in response.headers
+    assert len(await response.json()) == 10
+
+    response = await app_client.get('/v1/rows', params={'count': '5000'})
+    assert response.status == 200
+    assert response.headers['Transfer-Encoding'] == 'chunked'
+    assert response.content_type == 'application/json'
+    assert await response.json() == [{'id': i} for i in range(5000)]
+
+    response = await app_client.get('/v1/rows', params={'count': '5000', 'invalid': '4000'})
+    assert response.status == 500
+
+
+FILE_KINDS = ['path', 'file', 'mmap', 'memoryview']
+CONTENT = bytes(range(256)) * 400
+
+
+def file_spec(operation_id, head=False):
+    operation = {
+        'operationId': operation_id,
+        'parameters': [
+            {'name': 'path', 'in': 'query', 'required': True, 'schema': {'type': 'string'}},
+            {'name': 'kind', 'in': 'query', 'schema': {'type': 'string'}},
+        ],
+        'responses': {'200': {'description': 'The file', 'content': {'application/octet-stream': {
+            'schema': {'type': 'string', 'format': 'binary'}}}}}
+    }
+    path = {'get': operation}
+    if head:
+        # Flask routes HEAD to the GET operations, aiohttp doesn't
+        path['head'] = operation
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': 'Files', 'version': '1.0'},
+        'paths': {'/file': path}
+    }
+
+
+@pytest.fixture
+def content_path(tmp_path):
+    path = tmp_path / 'content.bin'
+    path.write_bytes(CONTENT)
+    return str(path)
+
+
+def test_buffer_file():
+    file = BufferFile(memoryview(b'abcdef'))
+    assert file.read(2) == b'ab'
+    assert file.seek(-1, io.SEEK_END) == 5
+    assert file.read() == b'f'
+    file.close()
+    assert file.closed
+
+
+@pytest.mark.parametrize('kind', FILE_KINDS)
+def test_flask_file_response(content_path, kind):
+    app = App(__name__)
+    app.add_api(file_spec('fakeapi.hello.get_file'), validate_responses=True)
+    app_client = app.app.test_client()
+    query = {'path': content_path, 'kind': kind}
+    # the test client closes the file of the buffered responses only
+
+    response = app_client.get('/file', query_string=query, buffered=True)
+    assert response.status_code == 200
+    assert response.data == CONTENT
+    assert response.mimetype == 'application/octet-stream'
+    assert response.headers['Content-Length'] == str(len(CONTENT))
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    last_modified = response.headers.get('Last-Modified')
+
+    response = app_client.get('/file', query_string=query, buffered=True, headers={'Range': 'bytes=100-199'})
+    assert response.status_code == 206
+    assert response.data == CONTENT[100:200]
+    assert response.headers['Content-Range'] == 'bytes 100-199/{}'.format(len(CONTENT))
+
+    response = app_client.get('/file', query_string=query, buffered=True, headers={'Range': 'bytes=-10'})
+    assert response.data == CONTENT[-10:]
+
+    response = app_client.get('/file', query_string=query, buffered=True,
+                              headers={'Range': 'bytes={}-'.format(len(CONTENT))})
+    assert response.status_code == 416
+
+    # the file changed since, the range doesn't apply
+    response = app_client.get('/file', query_string=query, buffered=True,
+                              headers={'Range': 'bytes=0-9', 'If-Range': 'Mon, 01 Jan 2001 00:00:00 GMT'})
+    assert response.status_code == 200
+    assert response.data == CONTENT
+
+    # a resumed download sends back the Last-Modified of the files on disk
+    assert (last_modified is not None) == (kind in ('path', 'file'))
+    if last_modified is not None:
+        response = app_client.get('/file', query_string=query, buffered=True,
+                                  headers={'Range': 'bytes=0-9', 'If-Range': last_modified})
+        assert response.status_code == 206
+        assert response.data == CONTENT[:10]
+
+    response = app_client.head('/file', query_string=query, buffered=True)
+    assert response.status_code == 200
+    assert response.headers['Content-Length'] == str(len(CONTENT))
+    assert response.data == b''
+
+
+@pytest.mark.parametrize('kind', FILE_KINDS)
+async def test_aiohttp_file_response(aiohttp_client, content_path, kind):
+    app = AioHttpApp(__name__)
+    app.add_api(file_spec('fakeapi.aiohttp_handlers.aiohttp_get_file', head=True), base_path='/v1',
+                validate_responses=True)
+    app_client = await aiohttp_client(app.app)
+    query = {'path': content_path, 'kind': kind}
+
+    response = await app_client.get('/v1/file', params=query)
+    assert response.status == 200
+    assert await response.read() == CONTENT
+    assert response.content_type == 'application/octet-stream'
+    assert response.headers['Content-Length'] == str(len(CONTENT))
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    last_modified = response.headers.get('Last-Modified')
+
+    response = await app_client.get('/v1/file', params=query, headers={'Range': 'bytes=100-199'})
+    assert response.status == 206
+    assert await response.read() == CONTENT[100:200]
+    assert response.headers['Content-Range'] == 'bytes 100-199/{}'.format(len(CONTENT))
+
+    response = await app_client.get('/v1/file', params=query, headers={'Range': 'bytes=-10'})
+    assert await response.read() == CONTENT[-10:]
+
+    response = await app_client.get('/v1/file', params=query, headers={'Range': 'bytes={}-'.format(len(CONTENT))})
+    assert response.status == 416
+
+    response = await app_client.get('/v1/file', params=query,
+                                    headers={'Range': 'bytes=0-9', 'If-Range': 'Mon, 01 Jan 2001 00:00:00 GMT'})
+    assert response.status == 200
+    assert await response.read() == CONTENT
+
+    # a resumed download sends back the Last-Modified of the files on disk
+    assert (last_modified is not None) == (kind in ('path', 'file'))
+    if last_modified is not None:
+        response = await app_client.get('/v1/file', params=query,
+                                        headers={'Range': 'bytes=0-9', 'If-Range': last_modified})
+        assert response.status == 206
+        assert await response.read() == CONTENT[:10]
+
+    response = await app_client.head('/v1/file', params=query)
+    assert response.status == 200
+    assert response.headers['Content-Length'] == str(len(CONTENT))
+    assert await response.read() == b''
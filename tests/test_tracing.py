@@ -0,0 +1,102 @@
+import json
+from unittest.mock import patch
+
+import connexion
+import pytest
+from connexion.tracing import (BatchFileSpanExporter, InMemorySpanExporter,
+                               Tracer, parse_traceparent)
+
+TRACE_ID = '4bf92f3577b34da6a3ce929d0e0e4736'
+PARENT_ID = '00f067aa0ba902b7'
+
+
+def test_parse_traceparent():
+    assert parse_traceparent('00-{}-{}-01'.format(TRACE_ID, PARENT_ID)) == (TRACE_ID, PARENT_ID, True)
+    assert parse_traceparent('00-{}-{}-00'.format(TRACE_ID, PARENT_ID)) == (TRACE_ID, PARENT_ID, False)
+    assert parse_traceparent(None) is None
+    assert parse_traceparent('garbage') is None
+    assert parse_traceparent('ff-{}-{}-01'.format(TRACE_ID, PARENT_ID)) is None
+    assert parse_traceparent('00-{}-{}-01'.format('0' * 32, PARENT_ID)) is None
+
+
+def test_sampling():
+    tracer = Tracer(InMemorySpanExporter(), sample_ratio=0.25)
+    with patch('connexion.tracing.random.random', return_value=0.5):
+        assert tracer.start_request_span('GET /') is None
+    with patch('connexion.tracing.random.random', return_value=0.1):
+        assert tracer.start_request_span('GET /') is not None
+
+    # the sampling decision of the caller is respected
+    tracer = Tracer(InMemorySpanExporter(), sample_ratio=0)
+    span = tracer.start_request_span('GET /', '00-{}-{}-01'.format(TRACE_ID, PARENT_ID))
+    assert span.trace_id == TRACE_ID
+    assert span.parent_id == PARENT_ID
+    assert Tracer(InMemorySpanExporter()).start_request_span('GET /', '00-{}-{}-00'.format(TRACE_ID, PARENT_ID)) is None
+
+
+def test_batch_file_exporter(tmp_path):
+    path = tmp_path / 'spans.jsonl'
+    exporter = BatchFileSpanExporter(str(path), max_batch_size=2, flush_interval=60)
+    tracer = Tracer(exporter)
+
+    span = tracer.start_request_span('GET /')
+    span.child('handler').end()
+    assert not path.exists()
+    span.end()
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [s['name'] for s in spans] == ['handler', 'GET /']
+    assert spans[0]['parent_id'] == spans[1]['span_id']
+
+    tracer.start_request_span('GET /other').end()
+    exporter.flush()
+    assert len(path.read_text().splitlines()) == 3
+
+
+@pytest.fixture
+def traced_app(simple_api_spec_dir):
+    exporter = InMemorySpanExporter()
+    app = connexion.FlaskApp(__name__, specification_dir=simple_api_spec_dir)
+    app.add_api('openapi.yaml', validate_responses=True, options={'tracer': Tracer(exporter)})
+    return app, exporter
+
+
+def test_flask_app_tracing(traced_app):
+    app, exporter = traced_app
+    app_client = app.app.test_client()
+
+    headers = {'traceparent': '00-{}-{}-01'.format(TRACE_ID, PARENT_ID)}
+    response = app_client.post('/v1.0/greeting/jsantos', headers=headers)  # type: flask.Response
+    assert response.status_code == 200
+
+    spans = {span.name: span for span in exporter.spans}
+    assert list(spans) == ['handler', 'response_validation', 'parameter_validation', 'uri_parsing',
+                           'POST /v1.0/greeting/{name}']
+    root = spans['POST /v1.0/greeting/{name}']
+    assert root.trace_id == TRACE_ID
+    assert root.parent_id == PARENT_ID
+    assert root.attributes == {'connexion.operation_id': 'fakeapi.hello.post_greeting',
+                               'http.method': 'POST',
+                               'http.route': '/v1.0/greeting/{name}',
+                               'http.status_code': 200}
+    assert spans['uri_parsing'].parent_id == root.span_id
+    assert spans['parameter_validation'].parent_id == spans['uri_parsing'].span_id
+    assert spans['parameter_validation'].attributes == {'validation.valid': True}
+    assert spans['handler'].parent_id == spans['response_validation'].span_id
+    assert all(span.trace_id == TRACE_ID for span in exporter.spans)
+
+
+def test_flask_app_tracing_invalid_parameter(traced_app):
+    app, exporter = traced_app
+    app_client = app.app.test_client()
+
+    response = app_client.get('/v1.0/test_parameter_validation?int=abc')  # type: flask.Response
+    assert response.status_code == 400
+
+    spans = {span.name: span for span in exporter.spans}
+    assert 'handler' not in spans
+    assert spans['parameter_validation'].status == 'error'
+    assert spans['parameter_validation'].attributes == {'validation.valid': False,
+                                                        'error.type': 'BadRequestProblem'}
+    root = spans['GET /v1.0/test_parameter_validation']
+    assert root.status == 'error'
+    assert root.attributes['http.status_code'] == 400